@@ -13,6 +13,8 @@ from torch.utils.data import Sampler
 
 from otx.core.utils.utils import get_idx_list_per_classes
 
+from .utils import sequential_randint
+
 if TYPE_CHECKING:
     from otx.core.data.dataset.base import OTXDataset
 
@@ -107,20 +109,15 @@ class BalancedSampler(Sampler):
         else:
             generator = self.generator
 
-        indices = []
-        for _ in range(self.repeat):
-            for _ in range(self.num_trials):
-                index = torch.cat(
-                    [
-                        self.img_indices[cls_indices][
-                            torch.randint(0, len(self.img_indices[cls_indices]), (1,), generator=self.generator)
-                        ]
-                        for cls_indices in self.img_indices
-                    ],
-                )
-                indices.append(index)
+        # Draw a random index of every class for every trial at once.
+        # It gives the same indices as drawing them one by one in the order of the trials and classes.
+        cls_indices = list(self.img_indices.values())
+        cls_sizes = torch.tensor([len(indices) for indices in cls_indices], dtype=torch.int64)
+        cls_offsets = torch.cumsum(cls_sizes, dim=0) - cls_sizes
+        num_trials = self.repeat * self.num_trials
 
-        indices = torch.cat(indices)
+        draws = sequential_randint(cls_sizes.repeat(num_trials), generator=self.generator)
+        indices = torch.cat(cls_indices)[draws + cls_offsets.repeat(num_trials)]
         indices = indices.tolist()
 
         if self.num_replicas > 1:
@@ -14,6 +14,8 @@ from torch.utils.data import Sampler
 from otx.core.data.dataset.base import OTXDataset
 from otx.core.utils.utils import get_idx_list_per_classes
 
+from .utils import sequential_randint
+
 
 class ClassIncrementalSampler(Sampler):
     """Sampler for Class-Incremental Task.
@@ -124,26 +126,20 @@ class ClassIncrementalSampler(Sampler):
         else:
             generator = self.generator
 
-        indices = []
-        for _ in range(self.repeat):
-            num_batches = self.data_length // self.batch_size
-            for _ in range(num_batches):
-                num_new_per_batch = self.batch_size // (1 + self.old_new_ratio)
-
-                new_indices_random = torch.randint(0, len(self.new_indices), (num_new_per_batch,), generator=generator)
-                old_indices_random = torch.randint(
-                    0,
-                    len(self.old_indices),
-                    (self.batch_size - num_new_per_batch,),
-                    generator=generator,
-                )
-
-                new_samples = self.new_indices[new_indices_random]
-                old_samples = self.old_indices[old_indices_random]
-
-                indices.append(torch.cat([new_samples, old_samples]))
-
-        indices = torch.cat(indices)
+        # Draw the new and old samples of every batch at once.
+        # It gives the same indices as drawing them batch by batch.
+        num_batches = self.repeat * (self.data_length // self.batch_size)
+        num_new_per_batch = self.batch_size // (1 + self.old_new_ratio)
+        num_old_per_batch = self.batch_size - num_new_per_batch
+        high = torch.tensor(
+            [len(self.new_indices)] * num_new_per_batch + [len(self.old_indices)] * num_old_per_batch,
+            dtype=torch.int64,
+        )
+
+        draws = sequential_randint(high.repeat(num_batches, 1), generator=generator)
+        new_samples = self.new_indices[draws[:, :num_new_per_batch]]
+        old_samples = self.old_indices[draws[:, num_new_per_batch:]]
+        indices = torch.cat([new_samples, old_samples], dim=1).flatten()
         if not self.drop_last:
             num_extra = int(
                 np.ceil(self.data_length * self.repeat / self.batch_size),
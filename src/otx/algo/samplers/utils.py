@@ -0,0 +1,45 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Utility functions for the samplers."""
+
+from __future__ import annotations
+
+import torch
+
+# Largest range drawn from a single 32-bit random number by the CPU generator
+_MAX_RANGE = 2**32 - 1
+
+
+def sequential_randint(high: torch.Tensor, generator: torch.Generator | None = None) -> torch.Tensor:
+    """Draw `torch.randint(0, high[i], (1,), generator=generator)` for every element of `high` in one batched draw.
+
+    The CPU generator consumes a 32-bit random number `r` for every draw of a range below 2**32 and returns `r % high`.
+    Drawing `r % (2**32 - 1)` for all elements at once gives `r` back except for `r = 2**32 - 1`,
+    which is mapped to 0 as `r = 0`. Such elements are rare and redrawn from the saved generator state.
+    So that the result and the generator state after the call are the same as drawing one by one in a Python loop.
+
+    Args:
+        high: Upper bounds (exclusive) of the draws. Every bound should be in [1, 2**32).
+        generator: Generator to draw from. If None, the default generator is used.
+
+    Returns:
+        torch.Tensor: Random integers in the shape of `high`.
+    """
+    generator = torch.default_generator if generator is None else generator
+    high = torch.as_tensor(high, dtype=torch.int64)
+    state = generator.get_state()
+    random = torch.randint(0, _MAX_RANGE, high.shape, generator=generator).flatten()
+
+    ambiguous = torch.nonzero(random == 0).flatten().tolist()
+    if ambiguous:
+        end_state = generator.get_state()
+        for pos in ambiguous:
+            generator.set_state(state)
+            torch.randint(0, _MAX_RANGE, (pos,), generator=generator)
+            # r % (2**32 - 2) is 0 for r = 0 and 1 for r = 2**32 - 1
+            if torch.randint(0, _MAX_RANGE - 1, (1,), generator=generator).item() == 1:
+                random[pos] = _MAX_RANGE
+        generator.set_state(end_state)
+
+    return (random % high.flatten()).view(high.shape)
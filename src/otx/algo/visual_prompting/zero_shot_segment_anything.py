@@ -327,6 +327,7 @@ class ZeroShotSegmentAnything(SegmentAnything):
         threshold: float = 0.0,
         num_bg_points: int = 1,
         is_cascade: bool = True,
+        batch_prompts: bool = False,
     ) -> list[list[defaultdict[int, list[Tensor]]]]:
         """Zero-shot inference with reference features.
 
@@ -340,6 +341,9 @@ class ZeroShotSegmentAnything(SegmentAnything):
             threshold (float): Threshold to control masked region. Defaults to 0.0.
             num_bg_points (1): Number of background points. Defaults to 1.
             is_cascade (bool): Whether use cascade inference. Defaults to True.
+            batch_prompts (bool): Whether to decode all point prompts of a label in a single batched
+                decoder call instead of one call per point. Masks of points that turn out to be already
+                covered are discarded afterwards, so this trades memory for latency. Defaults to False.
 
         Returns:
             (list[list[defaultdict[int, list[Tensor]]]]): List of predicted masks and used points.
@@ -364,25 +368,18 @@ class ZeroShotSegmentAnything(SegmentAnything):
             used_points: defaultdict = defaultdict(list)
             for label in total_points_scores:
                 points_scores, bg_coords = total_points_scores[label], total_bg_coords[label]
-                for point_score in points_scores:
-                    x, y = point_score[:2]
-                    is_done = False
-                    for pm in predicted_masks.get(label, []):
-                        # check if that point is already assigned
-                        if pm[int(y), int(x)] > 0:
-                            is_done = True
-                            break
-                    if is_done:
-                        continue
-
-                    point_coords = torch.cat((point_score[:2].unsqueeze(0), bg_coords), dim=0).unsqueeze(0)
-                    point_coords = self._preprocess_coords(point_coords, ori_shape, self.image_size)
-                    point_labels = torch.tensor(
-                        [1] + [0] * len(bg_coords),
-                        dtype=torch.float32,
-                        device=point_coords.device,
-                    ).unsqueeze(0)
-                    mask = self._predict_masks(
+                point_coords = torch.cat(
+                    (points_scores[:, None, :2], bg_coords.unsqueeze(0).expand(len(points_scores), -1, -1)),
+                    dim=1,
+                )
+                point_coords = self._preprocess_coords(point_coords, ori_shape, self.image_size)
+                point_labels = torch.tensor(
+                    [1] + [0] * len(bg_coords),
+                    dtype=torch.float32,
+                    device=point_coords.device,
+                ).expand(len(points_scores), -1)
+                if batch_prompts:
+                    batched_masks = self._predict_batched_masks(
                         mode="infer",
                         image_embeddings=image_embeddings,
                         point_coords=point_coords,
@@ -390,8 +387,30 @@ class ZeroShotSegmentAnything(SegmentAnything):
                         ori_shape=ori_shape,
                         is_cascade=is_cascade,
                     )
+
+                # pixels already covered by the predicted masks of this label
+                occupancy = torch.zeros(*map(int, ori_shape), dtype=torch.bool, device=point_coords.device)
+                for i, point_score in enumerate(points_scores):
+                    x, y = point_score[:2]
+                    if occupancy[int(y), int(x)]:
+                        # that point is already assigned
+                        continue
+
+                    if batch_prompts:
+                        mask = batched_masks[i]
+                    else:
+                        mask = self._predict_masks(
+                            mode="infer",
+                            image_embeddings=image_embeddings,
+                            point_coords=point_coords[[i]],
+                            point_labels=point_labels[[i]],
+                            ori_shape=ori_shape,
+                            is_cascade=is_cascade,
+                        )
                     predicted_masks[label].append(mask * point_score[2])
                     used_points[label].append(point_score)
+                    if point_score[2] > 0:
+                        occupancy |= (mask > 0).to(occupancy.device)
 
             # check overlapping area between different label masks
             self._inspect_overlapping_areas(predicted_masks, used_points)
@@ -524,6 +543,126 @@ class ZeroShotSegmentAnything(SegmentAnything):
         _, best_masks = self._decide_cascade_results(masks, logits, scores)
         return best_masks
 
+    def _predict_batched_masks(
+        self,
+        mode: str,
+        image_embeddings: Tensor,
+        point_coords: Tensor,
+        point_labels: Tensor,
+        ori_shape: Tensor,
+        is_cascade: bool = True,
+    ) -> Tensor:
+        """Predict target masks for a batch of prompts at once.
+
+        Same as `_predict_masks`, but each decoder call handles all prompts which are still refined.
+
+        Args:
+            mode (str): Forward mode of the model.
+            image_embeddings (Tensor): The image embedding with a batch index of length 1.
+            point_coords (Tensor): Preprocessed prompt coordinates with shape BxNx2.
+            point_labels (Tensor): Prompt labels with shape BxN.
+            ori_shape (Tensor): The size of the input image in (H,W) format.
+            is_cascade (bool): Whether use cascade inference. Defaults to True.
+
+        Returns:
+            (Tensor): Predicted boolean masks with shape BxHxW.
+        """
+        num_prompts = len(point_coords)
+        best_masks = torch.zeros(num_prompts, *map(int, ori_shape), dtype=torch.bool, device=point_coords.device)
+        # indices of the prompts which are still refined
+        indices = torch.arange(num_prompts, device=point_coords.device)
+
+        # First-step prediction
+        mask_input = torch.zeros(
+            num_prompts,
+            1,
+            *(x * 4 for x in image_embeddings.shape[2:]),
+            device=image_embeddings.device,
+        )
+        has_mask_input = self.has_mask_inputs[0].to(mask_input.device)
+        high_res_masks, scores, logits = self(
+            mode=mode,
+            image_embeddings=image_embeddings,
+            point_coords=point_coords,
+            point_labels=point_labels,
+            mask_input=mask_input,
+            has_mask_input=has_mask_input,
+            ori_shape=ori_shape,
+        )
+        masks = high_res_masks > self.mask_threshold
+
+        if is_cascade:
+            for i in range(2):
+                if i == 0:
+                    # Cascaded Post-refinement-1
+                    mask_input, step_masks = logits[:, [0]], masks[:, 0]
+                    is_valid = step_masks.flatten(1).any(dim=1)
+                else:
+                    # Cascaded Post-refinement-2
+                    mask_input, step_masks, is_valid = self._decide_batched_cascade_results(masks, logits, scores)
+
+                best_masks[indices] = step_masks
+                # prompts whose masks became empty keep their empty masks
+                indices, mask_input, step_masks = indices[is_valid], mask_input[is_valid], step_masks[is_valid]
+                point_coords, point_labels = point_coords[is_valid], point_labels[is_valid]
+                if len(indices) == 0:
+                    return best_masks
+
+                has_mask_input = self.has_mask_inputs[1].to(mask_input.device)
+                if i == 1:
+                    box_coords = self._preprocess_coords(self._get_mask_boxes(step_masks), ori_shape, self.image_size)
+                    point_coords = torch.cat((point_coords, box_coords), dim=1)
+                    point_labels = torch.cat(
+                        (point_labels, self.point_labels_box.to(point_labels.device).expand(len(indices), -1)),
+                        dim=1,
+                    )
+
+                high_res_masks, scores, logits = self(
+                    mode=mode,
+                    image_embeddings=image_embeddings,
+                    point_coords=point_coords,
+                    point_labels=point_labels,
+                    mask_input=mask_input,
+                    has_mask_input=has_mask_input,
+                    ori_shape=ori_shape,
+                )
+                masks = high_res_masks > self.mask_threshold
+
+        _, best_masks[indices], _ = self._decide_batched_cascade_results(masks, logits, scores)
+        return best_masks
+
+    def _decide_batched_cascade_results(
+        self,
+        masks: Tensor,
+        logits: Tensor,
+        scores: Tensor,
+    ) -> tuple[Tensor, Tensor, Tensor]:
+        """Post-process a batch of masks for cascaded post-refinements.
+
+        For each prompt, pick the highest scored non-empty mask among all but the first mask.
+
+        Returns:
+            (tuple[Tensor, Tensor, Tensor]): Logits of the best masks with shape Bx1xhxw,
+                the best masks with shape BxHxW and whether any non-empty mask was found with shape B.
+        """
+        # skip the first index components
+        scores, masks, logits = (x[:, 1:] for x in (scores, masks, logits))
+
+        is_non_empty = masks.flatten(2).any(dim=2)
+        best_idx = torch.argmax(scores.masked_fill(~is_non_empty, float("-inf")), dim=1)
+        rows = torch.arange(len(masks), device=masks.device)
+        is_valid = is_non_empty.any(dim=1)
+        best_masks = masks[rows, best_idx] & is_valid[:, None, None]
+        return logits[rows, best_idx].unsqueeze(1), best_masks, is_valid
+
+    def _get_mask_boxes(self, masks: Tensor) -> Tensor:
+        """Get the bounding boxes of non-empty masks as corner points with shape Bx2x2."""
+        rows, cols = masks.any(dim=2), masks.any(dim=1)
+        height, width = rows.shape[1], cols.shape[1]
+        x_min, x_max = cols.float().argmax(dim=1), width - 1 - cols.flip(1).float().argmax(dim=1)
+        y_min, y_max = rows.float().argmax(dim=1), height - 1 - rows.flip(1).float().argmax(dim=1)
+        return torch.stack((x_min, y_min, x_max, y_max), dim=1).reshape(-1, 2, 2).to(torch.float32)
+
     def _preprocess_coords(
         self,
         coords: Tensor,
@@ -647,6 +786,7 @@ class OTXZeroShotSegmentAnything(OTXZeroShotVisualPromptingModel):
         return_single_mask: bool = False,
         return_extra_metrics: bool = False,
         stability_score_offset: float = 1.0,
+        batch_prompts: bool = False,
     ) -> None:
         self.config = {
             "backbone": backbone,
@@ -670,6 +810,7 @@ class OTXZeroShotSegmentAnything(OTXZeroShotVisualPromptingModel):
         )
 
         self.save_outputs = save_outputs
+        self.batch_prompts = batch_prompts
         self.reference_info_dir: Path = Path(reference_info_dir)
         self.infer_reference_info_root: Path = Path(infer_reference_info_root)
 
@@ -721,6 +862,7 @@ class OTXZeroShotSegmentAnything(OTXZeroShotVisualPromptingModel):
         outputs = self.model.infer(
             **self._customize_inputs(inputs, reference_feats=reference_feats, used_indices=used_indices),
             is_cascade=is_cascade,
+            batch_prompts=self.batch_prompts,
         )
         return self._customize_outputs(outputs, inputs)
 
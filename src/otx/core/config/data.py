@@ -12,7 +12,7 @@ from dataclasses import dataclass, field
 from typing import Any, Optional
 
 from otx.core.types.device import DeviceType
-from otx.core.types.image import ImageColorChannel
+from otx.core.types.image import ImageColorChannel, ImageDecodeBackend
 from otx.core.types.transformer_libs import TransformLibType
 
 
@@ -31,6 +31,10 @@ class SubsetConfig:
             (`TransformLibType.MMCV`, `TransformLibType.MMPRETRAIN`, ...).
         transform_lib_type (TransformLibType): Transform library type used by this subset.
         num_workers (int): Number of workers for the dataloader of this subset.
+        batch_transforms (list[dict[str, Any] | Transform]): List of the batch transforms
+            (`otx.core.data.transform_libs.batch.*`) applied to the collated batch on the model's device
+            after `transforms` are applied to each sample in the dataloader workers.
+            It is only available for `TransformLibType.TORCHVISION`.
 
     Example:
         ```python
@@ -61,6 +65,7 @@ class SubsetConfig:
     transform_lib_type: TransformLibType = TransformLibType.TORCHVISION
     num_workers: int = 2
     sampler: SamplerConfig = field(default_factory=lambda: SamplerConfig())
+    batch_transforms: list[dict[str, Any]] = field(default_factory=list)
 
 
 @dataclass
@@ -105,7 +110,12 @@ class DataModuleConfig:
 
     mem_cache_size: str = "1GB"
     mem_cache_img_max_size: Optional[tuple[int, int]] = None
+    mem_cache_eviction: bool = False
+    mem_cache_spill_dir: Optional[str] = None
+    mem_cache_spill_size: Optional[str] = None
+    dataset_index_dir: Optional[str] = None
     image_color_channel: ImageColorChannel = ImageColorChannel.RGB
+    image_decode_backend: ImageDecodeBackend = ImageDecodeBackend.DATUMARO
     stack_images: bool = True
 
     include_polygons: bool = False
@@ -28,4 +28,7 @@ class HpoConfig:
     reduction_factor: int = 3
     asynchronous_bracket: bool = True
     asynchronous_sha: bool = torch.cuda.device_count() != 1
+    sampler: Literal["lhs", "tpe"] = "lhs"
+    in_place_promotion: bool = False
+    prefill_mem_cache: bool = False
     metric_name: str | None = None
@@ -25,7 +25,7 @@ from otx.core.data.entity.anomaly import (
 )
 from otx.core.data.entity.base import ImageInfo
 from otx.core.data.mem_cache import NULL_MEM_CACHE_HANDLER, MemCacheHandlerBase
-from otx.core.types.image import ImageColorChannel
+from otx.core.types.image import ImageColorChannel, ImageDecodeBackend
 from otx.core.types.label import AnomalyLabelInfo
 from otx.core.types.task import OTXTaskType
 
@@ -43,6 +43,7 @@ class AnomalyDataset(OTXDataset):
         max_refetch: int = 1000,
         image_color_channel: ImageColorChannel = ImageColorChannel.RGB,
         stack_images: bool = True,
+        image_decode_backend: ImageDecodeBackend = ImageDecodeBackend.DATUMARO,
     ) -> None:
         self.task_type = task_type
         super().__init__(
@@ -53,6 +54,7 @@ class AnomalyDataset(OTXDataset):
             max_refetch,
             image_color_channel,
             stack_images,
+            image_decode_backend,
         )
         self.label_info = AnomalyLabelInfo()
 
@@ -12,18 +12,19 @@ from typing import TYPE_CHECKING, Callable, Generic, Iterator, List, Union
 import cv2
 import numpy as np
 from datumaro.components.annotation import AnnotationType
-from datumaro.components.media import ImageFromFile
+from datumaro.components.media import Image, ImageFromFile
 from datumaro.util.image import _IMAGE_BACKEND, _IMAGE_BACKENDS, IMAGE_COLOR_SCALE, ImageColorScale
 from torch.utils.data import Dataset
 from torchvision.transforms.v2 import Compose
 
 from otx.core.data.entity.base import T_OTXDataEntity
+from otx.core.data.image_decoder import decode_image_reduced, fit_to_max_size
 from otx.core.data.mem_cache import NULL_MEM_CACHE_HANDLER
-from otx.core.types.image import ImageColorChannel
+from otx.core.types.image import ImageColorChannel, ImageDecodeBackend
 from otx.core.types.label import LabelInfo
 
 if TYPE_CHECKING:
-    from datumaro import DatasetSubset, Image
+    from datumaro import DatasetItem, DatasetSubset
 
     from otx.core.data.mem_cache import MemCacheHandlerBase
 
@@ -62,6 +63,8 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
         max_refetch: Maximum number of images to fetch in cache
         image_color_channel: Color channel of images
         stack_images: Whether or not to stack images in collate function in OTXBatchData entity.
+        image_decode_backend: Backend to decode the images. With `ImageDecodeBackend.PIL_DRAFT`,
+            JPEG files are decoded in reduced resolution if they are resized to `mem_cache_img_max_size`.
 
     """
 
@@ -74,6 +77,7 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
         max_refetch: int = 1000,
         image_color_channel: ImageColorChannel = ImageColorChannel.RGB,
         stack_images: bool = True,
+        image_decode_backend: ImageDecodeBackend = ImageDecodeBackend.DATUMARO,
     ) -> None:
         self.dm_subset = dm_subset
         self.ids = [item.id for item in dm_subset]
@@ -83,6 +87,7 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
         self.max_refetch = max_refetch
         self.image_color_channel = image_color_channel
         self.stack_images = stack_images
+        self.image_decode_backend = image_decode_backend
         self.label_info = LabelInfo.from_dm_label_groups(self.dm_subset.categories()[AnnotationType.label])
 
     def __len__(self) -> int:
@@ -128,12 +133,30 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
         msg = f"Reach the maximum refetch number ({self.max_refetch})"
         raise RuntimeError(msg)
 
+    @staticmethod
+    def _get_mem_cache_key(img: Image) -> str | int:
+        """Get the memory cache key of the image."""
+        return img.path if isinstance(img, ImageFromFile) else id(img)
+
     def _get_img_data_and_shape(self, img: Image) -> tuple[np.ndarray, tuple[int, int]]:
-        key = img.path if isinstance(img, ImageFromFile) else id(img)
+        key = self._get_mem_cache_key(img)
 
         if (img_data := self.mem_cache_handler.get(key=key)[0]) is not None:
             return img_data, img_data.shape[:2]
 
+        img_data = self._decode_img(img)
+        img_data = self._cache_img(key=key, img_data=img_data)
+
+        return img_data, img_data.shape[:2]
+
+    def _decode_img(self, img: Image) -> np.ndarray:
+        """Decode the image with the image decode backend."""
+        if self.image_decode_backend == ImageDecodeBackend.PIL_DRAFT:
+            # The image is decoded in reduced resolution only if `_cache_img()` will resize it
+            max_size = None if self.mem_cache_handler.frozen else self.mem_cache_img_max_size
+            if (img_data := decode_image_reduced(img, self.image_color_channel, max_size)) is not None:
+                return img_data
+
         with image_decode_context():
             img_data = (
                 cv2.cvtColor(img.data, cv2.COLOR_BGR2RGB)
@@ -145,9 +168,7 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
             msg = "Cannot get image data"
             raise RuntimeError(msg)
 
-        img_data = self._cache_img(key=key, img_data=img_data.astype(np.uint8))
-
-        return img_data, img_data.shape[:2]
+        return img_data.astype(np.uint8)
 
     def _cache_img(self, key: str | int, img_data: np.ndarray) -> np.ndarray:
         """Cache an image after resizing.
@@ -172,18 +193,12 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
             self.mem_cache_handler.put(key=key, data=img_data, meta=None)
             return img_data
 
-        height, width = img_data.shape[:2]
-        max_height, max_width = self.mem_cache_img_max_size
+        new_height, new_width = fit_to_max_size(img_data.shape[:2], self.mem_cache_img_max_size)
 
-        if height <= max_height and width <= max_width:
+        if (new_height, new_width) == img_data.shape[:2]:
             self.mem_cache_handler.put(key=key, data=img_data, meta=None)
             return img_data
 
-        # Preserve the image size ratio and fit to max_height or max_width
-        # e.g. (1000 / 2000 = 0.5, 1000 / 1000 = 1.0) => 0.5
-        # h, w = 2000 * 0.5 => 1000, 1000 * 0.5 => 500, bounded by max_height
-        min_scale = min(max_height / height, max_width / width)
-        new_height, new_width = int(min_scale * height), int(min_scale * width)
         resized_img = cv2.resize(
             src=img_data,
             dsize=(new_width, new_height),
@@ -197,6 +212,55 @@ class OTXDataset(Dataset, Generic[T_OTXDataEntity]):
         )
         return resized_img
 
+    def _get_cached_ann(self, img: Image, payload: str) -> tuple[np.ndarray | None, dict | None]:
+        """Get the decoded annotation of the image from the memory cache.
+
+        Args:
+            img: The image which the annotation belongs to.
+            payload: The payload type of the annotation, e.g., "class_mask".
+
+        Returns:
+            (np.ndarray, dict) if it is cached, otherwise (None, None).
+        """
+        return self.mem_cache_handler.get(key=(self._get_mem_cache_key(img), payload))
+
+    def _cache_ann(self, img: Image, payload: str, ann_data: np.ndarray, meta: dict | None = None) -> None:
+        """Cache the decoded annotation of the image next to it.
+
+        The annotation is keyed by the image key and its payload type,
+        so that it is looked up together with the image in the next epochs.
+        """
+        if self.mem_cache_handler.frozen:
+            return
+
+        self.mem_cache_handler.put(key=(self._get_mem_cache_key(img), payload), data=ann_data, meta=meta)
+
+    def fill_mem_cache(self, mem_cache_handler: MemCacheHandlerBase | None = None) -> None:
+        """Decode the images and annotations of all items and put them into the memory cache.
+
+        It stops when the memory cache cannot store more items.
+
+        Args:
+            mem_cache_handler: Handler to fill instead of `self.mem_cache_handler`,
+                e.g., a handler whose spill file is shared with the other processes.
+        """
+        ori_mem_cache_handler = self.mem_cache_handler
+        if mem_cache_handler is not None:
+            self.mem_cache_handler = mem_cache_handler
+
+        try:
+            for item in self.dm_subset:
+                if self.mem_cache_handler.frozen:
+                    break
+                if isinstance(item.media, Image):
+                    self._cache_item(item)
+        finally:
+            self.mem_cache_handler = ori_mem_cache_handler
+
+    def _cache_item(self, item: DatasetItem) -> None:
+        """Put the image of the item and its annotations decoded by this dataset into the memory cache."""
+        self._get_img_data_and_shape(item.media_as(Image))
+
     @abstractmethod
     def _get_item_impl(self, idx: int) -> T_OTXDataEntity | None:
         pass
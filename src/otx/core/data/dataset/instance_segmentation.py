@@ -10,7 +10,7 @@ from typing import Callable
 
 import numpy as np
 import torch
-from datumaro import DatasetSubset, Image, Polygon
+from datumaro import DatasetItem, DatasetSubset, Image, Polygon
 from torchvision import tv_tensors
 
 from otx.core.data.entity.base import ImageInfo
@@ -41,24 +41,24 @@ class OTXInstanceSegDataset(OTXDataset[InstanceSegDataEntity]):
         ignored_labels: list[int] = []
         img_data, img_shape = self._get_img_data_and_shape(img)
 
-        gt_bboxes, gt_labels, gt_masks, gt_polygons = [], [], [], []
+        gt_bboxes, gt_labels, gt_polygons = [], [], []
 
         for annotation in item.annotations:
             if isinstance(annotation, Polygon):
                 bbox = np.array(annotation.get_bbox(), dtype=np.float32)
                 gt_bboxes.append(bbox)
                 gt_labels.append(annotation.label)
-
-                if self.include_polygons:
-                    gt_polygons.append(annotation)
-                else:
-                    gt_masks.append(polygon_to_bitmap([annotation], *img_shape)[0])
+                gt_polygons.append(annotation)
 
         # convert xywh to xyxy format
         bboxes = np.array(gt_bboxes, dtype=np.float32) if gt_bboxes else np.empty((0, 4))
         bboxes[:, 2:] += bboxes[:, :2]
 
-        masks = np.stack(gt_masks, axis=0) if gt_masks else np.zeros((0, *img_shape), dtype=bool)
+        if self.include_polygons:
+            masks = np.zeros((0, *img_shape), dtype=bool)
+        else:
+            masks = self._get_masks(img, gt_polygons, img_shape)
+            gt_polygons = []
         labels = np.array(gt_labels, dtype=np.int64)
 
         entity = InstanceSegDataEntity(
@@ -82,6 +82,33 @@ class OTXInstanceSegDataset(OTXDataset[InstanceSegDataEntity]):
 
         return self._apply_transforms(entity)
 
+    def _cache_item(self, item: DatasetItem) -> None:
+        img = item.media_as(Image)
+        _, img_shape = self._get_img_data_and_shape(img)
+        if not self.include_polygons:
+            polygons = [annotation for annotation in item.annotations if isinstance(annotation, Polygon)]
+            self._get_masks(img, polygons, img_shape)
+
+    def _get_masks(self, img: Image, polygons: list[Polygon], img_shape: tuple[int, int]) -> np.ndarray:
+        """Get the bitmasks of the polygons, caching them as packed bits next to the image in the memory cache."""
+        height, width = img_shape
+        packed_masks, meta = self._get_cached_ann(img, "masks")
+        if (
+            packed_masks is not None
+            and meta is not None
+            and packed_masks.shape[:2] == (len(polygons), height)
+            and meta["width"] == width
+        ):
+            return np.unpackbits(packed_masks, axis=-1, count=width).view(bool)
+
+        if not polygons:
+            return np.zeros((0, height, width), dtype=bool)
+
+        masks = polygon_to_bitmap(polygons, height, width)
+        # Bitmasks are 8 times smaller in the memory cache after packing
+        self._cache_ann(img, "masks", np.packbits(masks, axis=-1), meta={"width": width})
+        return masks
+
     @property
     def collate_fn(self) -> Callable:
         """Collection function to collect InstanceSegDataEntity into InstanceSegDataEntity in dataloader."""
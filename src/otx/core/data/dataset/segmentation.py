@@ -17,7 +17,7 @@ from otx.core.data.dataset.base import Transforms
 from otx.core.data.entity.base import ImageInfo
 from otx.core.data.entity.segmentation import SegBatchDataEntity, SegDataEntity
 from otx.core.data.mem_cache import NULL_MEM_CACHE_HANDLER, MemCacheHandlerBase
-from otx.core.types.image import ImageColorChannel
+from otx.core.types.image import ImageColorChannel, ImageDecodeBackend
 from otx.core.types.label import SegLabelInfo
 
 from .base import OTXDataset
@@ -26,64 +26,15 @@ if TYPE_CHECKING:
     from datumaro import DatasetItem, DatasetSubset
 
 
-# NOTE: It is copied from https://github.com/openvinotoolkit/datumaro/pull/1409
-# It will be replaced in the future.
-def _make_index_mask(
-    binary_mask: np.ndarray,
-    index: int,
-    ignore_index: int = 0,
-    dtype: np.dtype | None = None,
-) -> np.ndarray:
-    """Create an index mask from a binary mask by filling a given index value.
-
-    Args:
-        binary_mask: Binary mask to create an index mask.
-        index: Scalar value to fill the ones in the binary mask.
-        ignore_index: Scalar value to fill in the zeros in the binary mask.
-            Defaults to 0.
-        dtype: Data type for the resulting mask. If not specified,
-            it will be inferred from the provided index. Defaults to None.
-
-    Returns:
-        np.ndarray: Index mask created from the binary mask.
-
-    Raises:
-        ValueError: If dtype is not specified and incompatible scalar types are used for index
-            and ignore_index.
-
-    Examples:
-        >>> binary_mask = np.eye(2, dtype=np.bool_)
-        >>> index_mask = make_index_mask(binary_mask, index=10, ignore_index=255, dtype=np.uint8)
-        >>> print(index_mask)
-        array([[ 10, 255],
-               [255,  10]], dtype=uint8)
-    """
-    if dtype is None:
-        dtype = np.min_scalar_type(index)
-        if dtype != np.min_scalar_type(ignore_index):
-            raise ValueError
-
-    flipped_zero_np_scalar = ~np.full((), fill_value=0, dtype=dtype)
-
-    # NOTE: This dispatching rule is required for a performance boost
-    if ignore_index == flipped_zero_np_scalar:
-        flipped_index = ~np.full((), fill_value=index, dtype=dtype)
-        return ~(binary_mask * flipped_index)
-
-    mask = binary_mask * np.full((), fill_value=index, dtype=dtype)
-
-    if ignore_index == 0:
-        return mask
-
-    return np.where(binary_mask, mask, ignore_index)
-
-
 def _extract_class_mask(item: DatasetItem, img_shape: tuple[int, int], ignore_index: int) -> np.ndarray:
     """Extract class mask from Datumaro masks.
 
     This is a temporary workaround and will be replaced with the native Datumaro interfaces
     after some works, e.g., https://github.com/openvinotoolkit/datumaro/pull/1409 are done.
 
+    The masks are painted in z-order straight into a single class mask.
+    A mask is resized only if its size differs from the image size.
+
     Args:
         item: Datumaro dataset item having mask annotations.
         img_shape: Image shape (H, W).
@@ -96,12 +47,12 @@ def _extract_class_mask(item: DatasetItem, img_shape: tuple[int, int], ignore_in
         msg = "It is not currently support an ignore index which is more than 255."
         raise ValueError(msg, ignore_index)
 
-    class_mask = np.full(shape=img_shape[:2], fill_value=ignore_index, dtype=np.uint8)
+    height, width = img_shape[:2]
+    class_mask = np.full(shape=(height, width), fill_value=ignore_index, dtype=np.uint8)
     for mask in sorted(
         [ann for ann in item.annotations if isinstance(ann, Mask)],
         key=lambda ann: ann.z_order,
     ):
-        binary_mask = mask.image
         index = mask.label
 
         if index is None:
@@ -112,21 +63,19 @@ def _extract_class_mask(item: DatasetItem, img_shape: tuple[int, int], ignore_in
             msg = "Mask's label index should not be more than 255."
             raise ValueError(msg, index)
 
-        this_class_mask = _make_index_mask(
-            binary_mask=binary_mask,
-            index=index,
-            ignore_index=ignore_index,
-            dtype=np.uint8,
-        )
+        if index == ignore_index:
+            # Painting the ignore index would not change the class mask
+            continue
 
-        if this_class_mask.shape != img_shape:
-            this_class_mask = cv2.resize(
-                this_class_mask,
-                dsize=(img_shape[1], img_shape[0]),  # NOTE: cv2.resize() uses (width, height) format
+        binary_mask = mask.image
+        if binary_mask.shape[:2] != (height, width):
+            binary_mask = cv2.resize(
+                binary_mask.view(np.uint8) if binary_mask.dtype == bool else binary_mask.astype(np.uint8),
+                dsize=(width, height),  # NOTE: cv2.resize() uses (width, height) format
                 interpolation=cv2.INTER_NEAREST,
             )
 
-        class_mask = np.where(this_class_mask != ignore_index, this_class_mask, class_mask)
+        class_mask[binary_mask.astype(bool, copy=False)] = index
 
     return class_mask
 
@@ -143,6 +92,7 @@ class OTXSegmentationDataset(OTXDataset[SegDataEntity]):
         max_refetch: int = 1000,
         image_color_channel: ImageColorChannel = ImageColorChannel.RGB,
         stack_images: bool = True,
+        image_decode_backend: ImageDecodeBackend = ImageDecodeBackend.DATUMARO,
         ignore_index: int = 255,
     ) -> None:
         super().__init__(
@@ -153,6 +103,7 @@ class OTXSegmentationDataset(OTXDataset[SegDataEntity]):
             max_refetch,
             image_color_channel,
             stack_images,
+            image_decode_backend,
         )
         self.label_info = SegLabelInfo(
             label_names=self.label_info.label_names,
@@ -166,7 +117,7 @@ class OTXSegmentationDataset(OTXDataset[SegDataEntity]):
         img = item.media_as(Image)
         ignored_labels: list[int] = []
         img_data, img_shape = self._get_img_data_and_shape(img)
-        mask = _extract_class_mask(item=item, img_shape=img_shape, ignore_index=self.ignore_index)
+        mask = self._get_class_mask(item=item, img=img, img_shape=img_shape)
 
         entity = SegDataEntity(
             image=img_data,
@@ -183,6 +134,20 @@ class OTXSegmentationDataset(OTXDataset[SegDataEntity]):
         )
         return self._apply_transforms(entity)
 
+    def _cache_item(self, item: DatasetItem) -> None:
+        img = item.media_as(Image)
+        _, img_shape = self._get_img_data_and_shape(img)
+        self._get_class_mask(item=item, img=img, img_shape=img_shape)
+
+    def _get_class_mask(self, item: DatasetItem, img: Image, img_shape: tuple[int, int]) -> np.ndarray:
+        """Get the class mask of the item, caching it next to the image in the memory cache."""
+        if (class_mask := self._get_cached_ann(img, "class_mask")[0]) is not None and class_mask.shape == img_shape:
+            return class_mask
+
+        class_mask = _extract_class_mask(item=item, img_shape=img_shape, ignore_index=self.ignore_index)
+        self._cache_ann(img, "class_mask", class_mask)
+        return class_mask
+
     @property
     def collate_fn(self) -> Callable:
         """Collection function to collect SegDataEntity into SegBatchDataEntity in data loader."""
@@ -48,6 +48,7 @@ if TYPE_CHECKING:
     from otx.core.data.dataset.detection import OTXDetectionDataset
     from otx.core.data.dataset.instance_segmentation import OTXInstanceSegDataset
     from otx.core.data.entity.base import OTXDataEntity
+    from otx.core.data.mem_cache import MemCacheHandlerBase
 
 # ruff: noqa: SLF001
 # NOTE: Disable private-member-access (SLF001).
@@ -218,6 +219,10 @@ class OTXTileDataset(OTXDataset):
         """Collate function from the original dataset."""
         return self._dataset.collate_fn
 
+    def fill_mem_cache(self, mem_cache_handler: MemCacheHandlerBase | None = None) -> None:
+        """Fill the memory cache with the items of the original dataset."""
+        self._dataset.fill_mem_cache(mem_cache_handler)
+
     def _get_item_impl(self, index: int) -> OTXDataEntity | None:
         """Get item implementation from the original dataset."""
         return self._dataset._get_item_impl(index)
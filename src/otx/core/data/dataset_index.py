@@ -0,0 +1,369 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Columnar index of the items and annotations of a Datumaro dataset."""
+
+from __future__ import annotations
+
+import contextvars
+import hashlib
+import logging
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar
+
+import numpy as np
+from datumaro.components.annotation import AnnotationType, Bbox, LabelCategories, Polygon
+from datumaro.components.media import Image, ImageFromFile
+from datumaro.plugins.data_formats.video import VIDEO_EXTENSIONS
+from datumaro.util.image import IMAGE_EXTENSIONS
+from PIL import Image as PILImage
+
+if TYPE_CHECKING:
+    from datumaro import Dataset, DatasetItem, DatasetSubset
+    from datumaro.components.media import MediaElement
+
+logger = logging.getLogger()
+
+__all__ = ["DatasetIndex"]
+
+
+class DatasetIndex:
+    """Columnar index of the items and annotations of a Datumaro dataset.
+
+    It is built by a single pass over the dataset and answers the statistics queries of the samplers,
+    the adaptive tiling and the pre-filtering without iterating the dataset again.
+    Building it does not read the images; the image sizes are read from the image headers
+    on the first query by `get_image_sizes()`.
+    Items are kept in the iteration order of the dataset, and their annotations are stored
+    in the flat arrays indexed by `ann_offsets[i]:ann_offsets[i + 1]` for the i-th item.
+
+    Attributes:
+        ids: Item ids.
+        subsets: Item subset names.
+        image_sizes: Image (height, width) of the items. (-1, -1) if the media is not an image
+            and (0, 0) if it has not been read yet.
+        ann_offsets: Offsets of the item annotations in the annotation arrays.
+        ann_labels: Annotation labels. -1 if the annotation has no label.
+        ann_kinds: Annotation kinds, i.e., `DatasetIndex.BBOX`, `DatasetIndex.POLYGON` or `DatasetIndex.OTHER`.
+        ann_bboxes: Bounding boxes (x, y, w, h) of the boxes and polygons. NaN for the other annotations.
+        ann_areas: Areas of the boxes and polygons. NaN for the other annotations.
+        label_names: Label names of the dataset categories.
+    """
+
+    VERSION: ClassVar[int] = 1
+    OTHER: ClassVar[int] = 0
+    BBOX: ClassVar[int] = 1
+    POLYGON: ClassVar[int] = 2
+
+    _COLUMNS: ClassVar[tuple[str, ...]] = (
+        "ids",
+        "subsets",
+        "image_sizes",
+        "ann_offsets",
+        "ann_labels",
+        "ann_kinds",
+        "ann_bboxes",
+        "ann_areas",
+        "label_names",
+    )
+    # Registered datasets and their index or the arguments to build it lazily
+    _registry: ClassVar[weakref.WeakKeyDictionary] = weakref.WeakKeyDictionary()
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        subsets: np.ndarray,
+        image_sizes: np.ndarray,
+        ann_offsets: np.ndarray,
+        ann_labels: np.ndarray,
+        ann_kinds: np.ndarray,
+        ann_bboxes: np.ndarray,
+        ann_areas: np.ndarray,
+        label_names: np.ndarray,
+    ) -> None:
+        self.ids = ids
+        self.subsets = subsets
+        self.image_sizes = image_sizes
+        self.ann_offsets = ann_offsets
+        self.ann_labels = ann_labels
+        self.ann_kinds = ann_kinds
+        self.ann_bboxes = ann_bboxes
+        self.ann_areas = ann_areas
+        self.label_names = label_names
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def num_annotations(self) -> np.ndarray:
+        """Number of annotations per item."""
+        return np.diff(self.ann_offsets)
+
+    @property
+    def ann_items(self) -> np.ndarray:
+        """Item row of every annotation."""
+        return np.repeat(np.arange(len(self)), self.num_annotations)
+
+    def get_rows(self, subset: str | None = None) -> np.ndarray:
+        """Get the rows of the items in the subset. If None, get all rows."""
+        if subset is None:
+            return np.arange(len(self))
+        return np.flatnonzero(self.subsets == subset)
+
+    def get_ann_slice(self, row: int) -> slice:
+        """Get the slice of the annotation arrays for the item in the given row."""
+        return slice(self.ann_offsets[row], self.ann_offsets[row + 1])
+
+    def get_idx_list_per_classes(
+        self,
+        subset: str | None = None,
+        use_string_label: bool = False,
+    ) -> dict[Any, list[int]]:
+        """Get the item indices in the subset per label, as `otx.core.utils.utils.get_idx_list_per_classes` does.
+
+        An item index appears once per annotation of the label, and labels are in the order of their first appearance.
+        """
+        rows = self.get_rows(subset)
+        # Index of the item in the subset for every annotation, -1 if the item is not in the subset
+        subset_idx = np.full(len(self), -1, dtype=np.int64)
+        subset_idx[rows] = np.arange(len(rows))
+        item_idx = subset_idx[self.ann_items]
+        labels = self.ann_labels[item_idx >= 0]
+        item_idx = item_idx[item_idx >= 0]
+
+        unique_labels, first_idx, counts = np.unique(labels, return_index=True, return_counts=True)
+        groups = np.split(item_idx[np.argsort(labels, kind="stable")], np.cumsum(counts)[:-1])
+
+        stats: dict[Any, list[int]] = {}
+        for idx in np.argsort(first_idx):
+            label = int(unique_labels[idx])
+            key: int | str | None = None if label < 0 else label
+            if use_string_label and key is not None:
+                key = str(self.label_names[label])
+            stats[key] = groups[idx].tolist()
+        return stats
+
+    def get_image_sizes(
+        self,
+        dataset: Dataset | DatasetSubset,
+        rows: np.ndarray,
+        num_workers: int | None = None,
+    ) -> np.ndarray:
+        """Get the image (height, width) of the items in the given rows.
+
+        The sizes not read yet are read from the image headers by a thread pool and kept in the index.
+
+        Args:
+            dataset: Indexed dataset or its subset to get the items from.
+            rows: Rows of the items.
+            num_workers: Number of threads. If None, it is the number of CPUs.
+
+        Returns:
+            np.ndarray: Image sizes of the items.
+        """
+        missing = np.unique(rows[(self.image_sizes[rows] == 0).all(axis=1)])
+        if len(missing) > 0:
+            medias = [dataset.get(id=self.ids[row], subset=self.subsets[row]).media for row in missing]
+            with ThreadPoolExecutor(max_workers=num_workers or os.cpu_count() or 1) as pool:
+                # Datumaro keeps the image backend in a ContextVar, which is not set in the worker threads
+                futures = [pool.submit(contextvars.copy_context().run, _read_image_size, media) for media in medias]
+                self.image_sizes[missing] = [future.result() for future in futures]
+        return self.image_sizes[rows]
+
+    @classmethod
+    def build(cls, dataset: Dataset | DatasetSubset, num_workers: int | None = None) -> DatasetIndex:
+        """Build the index by a single pass over the dataset.
+
+        The items are indexed by a thread pool, so that the polygon area computations overlap.
+        The images are not read, see `get_image_sizes()`.
+
+        Args:
+            dataset: Dataset to index.
+            num_workers: Number of threads. If None, it is the number of CPUs.
+
+        Returns:
+            DatasetIndex: The built index.
+        """
+        num_workers = num_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=num_workers) as pool:
+            entries = list(pool.map(cls._index_item, dataset))
+
+        labels = dataset.categories().get(AnnotationType.label, LabelCategories())
+        num_anns = [len(entry[1]) for entry in entries]
+
+        def _concat(idx: int, dtype: type, shape: tuple[int, ...] = ()) -> np.ndarray:
+            values = [value for entry in entries for value in entry[idx]]
+            return np.array(values, dtype=dtype).reshape(-1, *shape)
+
+        return cls(
+            ids=np.array([entry[0][0] for entry in entries], dtype=str),
+            subsets=np.array([entry[0][1] for entry in entries], dtype=str),
+            image_sizes=np.zeros((len(entries), 2), dtype=np.int64),
+            ann_offsets=np.concatenate([[0], np.cumsum(num_anns)]).astype(np.int64),
+            ann_labels=_concat(1, np.int64),
+            ann_kinds=_concat(2, np.uint8),
+            ann_bboxes=_concat(3, np.float64, (4,)),
+            ann_areas=_concat(4, np.float64),
+            label_names=np.array([label.name for label in labels.items], dtype=str),
+        )
+
+    @classmethod
+    def _index_item(cls, item: DatasetItem) -> tuple:
+        labels, kinds, bboxes, areas = [], [], [], []
+        for ann in item.annotations:
+            label = getattr(ann, "label", None)
+            labels.append(-1 if label is None else label)
+            if isinstance(ann, (Bbox, Polygon)):
+                kinds.append(cls.BBOX if isinstance(ann, Bbox) else cls.POLYGON)
+                bboxes.append(ann.get_bbox())
+                areas.append(ann.get_area())
+            else:
+                kinds.append(cls.OTHER)
+                bboxes.append((np.nan,) * 4)
+                areas.append(np.nan)
+        return (item.id, item.subset), labels, kinds, bboxes, areas
+
+    def save(self, path: str | Path) -> None:
+        """Save the index to the given .npz file."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, version=np.array(self.VERSION), **{name: getattr(self, name) for name in self._COLUMNS})
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> DatasetIndex | None:
+        """Load the index from the given .npz file. Return None if it is not a valid index file."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["version"]) != cls.VERSION:
+                    return None
+                return cls(**{name: data[name] for name in cls._COLUMNS})
+        except (OSError, KeyError, ValueError):
+            return None
+
+    @staticmethod
+    def compute_content_hash(dataset: Dataset, data_root: str | None = None) -> str:
+        """Compute the hash of the dataset content to invalidate the persisted index.
+
+        It covers the item ids, the label names and the size and modification time of the annotation files
+        under `data_root`, so that it does not need to read the images and annotations.
+        The images and videos under `data_root` are skipped without calling `stat()` on them,
+        since the index does not depend on their content.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(DatasetIndex.VERSION).encode())
+        labels = dataset.categories().get(AnnotationType.label, LabelCategories())
+        digest.update(repr([label.name for label in labels.items]).encode())
+        for item in dataset:
+            digest.update(f"{item.subset}/{item.id}\n".encode())
+
+        if data_root is not None:
+            root = Path(data_root)
+            for path in _list_annotation_files(root):
+                stat = path.stat()
+                digest.update(f"{path.relative_to(root.parent)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+
+        return digest.hexdigest()
+
+    @classmethod
+    def load_or_build(
+        cls,
+        dataset: Dataset,
+        data_root: str | None = None,
+        cache_dir: str | None = None,
+        num_workers: int | None = None,
+    ) -> DatasetIndex:
+        """Load the persisted index of the dataset from the cache directory or build and persist it.
+
+        Args:
+            dataset: Dataset to index.
+            data_root: Root of the source files of the dataset. Their changes invalidate the persisted index.
+            cache_dir: Directory to persist the index. If None, the index is built in memory only.
+            num_workers: Number of threads to build the index.
+
+        Returns:
+            DatasetIndex: The loaded or built index.
+        """
+        if cache_dir is None:
+            return cls.build(dataset, num_workers)
+
+        path = Path(cache_dir) / f"dataset_index_{cls.compute_content_hash(dataset, data_root)}.npz"
+        if (index := cls.load(path)) is not None:
+            logger.info(f"Load the dataset index from {path}.")
+            return index
+
+        index = cls.build(dataset, num_workers)
+        index.save(path)
+        logger.info(f"Save the dataset index to {path}.")
+        return index
+
+    @classmethod
+    def register(
+        cls,
+        dataset: Dataset,
+        data_root: str | None = None,
+        cache_dir: str | None = None,
+        num_workers: int | None = None,
+    ) -> None:
+        """Register the dataset, so that its index is loaded or built lazily on the first query by `get()`.
+
+        The dataset should not be modified after the registration.
+        """
+        # Keep the arguments only, the registry should not hold a reference to the dataset
+        cls._registry[dataset] = {"data_root": data_root, "cache_dir": cache_dir, "num_workers": num_workers}
+
+    @classmethod
+    def get(cls, dataset: Dataset | DatasetSubset) -> tuple[DatasetIndex, str | None] | None:
+        """Get the index of the registered dataset and the subset name to query.
+
+        Returns None if the dataset (or the parent dataset of the subset) is not registered
+        or it has been changed since the registration.
+        """
+        parent = getattr(dataset, "parent", dataset)
+        subset = getattr(dataset, "name", None) if parent is not dataset else None
+        try:
+            entry = cls._registry.get(parent)
+        except TypeError:
+            return None
+        if entry is None:
+            return None
+
+        if not isinstance(entry, DatasetIndex):
+            entry = cls._registry[parent] = cls.load_or_build(parent, **entry)
+
+        if len(entry.get_rows(subset)) != len(dataset):
+            return None
+        return entry, subset
+
+
+def _read_image_size(media: MediaElement | None) -> tuple[int, int]:
+    """Read the image (height, width) of the media, from the image header if the image is not loaded."""
+    if not isinstance(media, Image):
+        return (-1, -1)
+    if not media.has_size and isinstance(media, ImageFromFile):
+        with suppress(OSError), PILImage.open(media.path) as image:
+            width, height = image.size
+            return (height, width)
+    return media.size or (-1, -1)
+
+
+def _list_annotation_files(root: Path) -> list[Path]:
+    """List the files under the root in a deterministic order except the images and videos."""
+    if not root.is_dir():
+        return [root] if root.is_file() else []
+
+    media_extensions = {f".{ext.lstrip('.').lower()}" for ext in (*IMAGE_EXTENSIONS, *VIDEO_EXTENSIONS)}
+    paths = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        paths += [
+            Path(dirpath) / filename
+            for filename in sorted(filenames)
+            if Path(filename).suffix.lower() not in media_extensions
+        ]
+    return paths
@@ -60,6 +60,21 @@ class TransformLibFactory:
 
         raise NotImplementedError(config.transform_lib_type)
 
+    @classmethod
+    def generate_batch(cls: type[TransformLibFactory], config: SubsetConfig) -> Transforms | None:
+        """Create batch transforms from factory. Return None if there is no batch transform."""
+        # Configs saved before `batch_transforms` was introduced do not have it
+        if not getattr(config, "batch_transforms", None):
+            return None
+
+        if config.transform_lib_type == TransformLibType.TORCHVISION:
+            from .transform_libs.torchvision import TorchVisionTransformLib
+
+            return TorchVisionTransformLib.generate_batch(config)
+
+        msg = f"Batch transforms are not supported for {config.transform_lib_type}."
+        raise NotImplementedError(msg)
+
 
 class OTXDatasetFactory:
     """Factory class for OTXDataset."""
@@ -82,6 +97,7 @@ class OTXDatasetFactory:
             "mem_cache_img_max_size": cfg_data_module.mem_cache_img_max_size,
             "image_color_channel": cfg_data_module.image_color_channel,
             "stack_images": cfg_data_module.stack_images,
+            "image_decode_backend": cfg_data_module.image_decode_backend,
         }
 
         if task in (
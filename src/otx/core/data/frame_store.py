@@ -0,0 +1,258 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Store of pre-extracted video frames for action datasets."""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import IO, Any, Iterable
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger()
+
+__all__ = ["FrameClipStore", "FrameClipStoreError"]
+
+
+class FrameClipStoreError(Exception):
+    """Exception class for FrameClipStore."""
+
+
+class FrameClipStore:
+    """Chunked memory-mapped store of decoded video frames.
+
+    Every video is decoded once, optionally downscaled, and its frames are appended as one
+    uint8 array of shape (num_frames, height, width, 3) in BGR order to a chunk file.
+    The index file maps the video path to the chunk file, the byte offset and the shape of
+    its array, so the frames of a video are read back as a memory-mapped view without copying.
+    The size and modification time of the source video are recorded to detect stale entries.
+    Each entry is checked against its source video when it is read first, and stale ones are not served.
+
+    Args:
+        root: Directory of the store, which should be built by `FrameClipStore.build()`.
+
+    Example:
+        >>> store = FrameClipStore.build("frame_store", video_paths, short_side=256)
+        >>> frames = store.get(video_paths[0])  # read-only np.memmap, no decoding
+    """
+
+    INDEX_FILE = "index.json"
+    VERSION = 1
+
+    def __init__(self, root: str | Path) -> None:
+        self._root = Path(root)
+        index_path = self._root / self.INDEX_FILE
+        if not index_path.exists():
+            msg = f"There is no frame clip store at {self._root}. Build it with FrameClipStore.build()."
+            raise FrameClipStoreError(msg)
+
+        index = json.loads(index_path.read_text())
+        if index.get("version") != self.VERSION:
+            msg = f"Unsupported frame clip store version {index.get('version')}, expected {self.VERSION}."
+            raise FrameClipStoreError(msg)
+
+        self.short_side: int | None = index["short_side"]
+        self._chunks: list[str] = index["chunks"]
+        self._videos: dict[str, dict[str, Any]] = index["videos"]
+        self._maps: dict[int, np.memmap] = {}
+        # Whether the source video of the entry is unchanged, checked once when it is read first
+        self._up_to_date: dict[str, bool] = {}
+
+    def __len__(self) -> int:
+        return len(self._videos)
+
+    def __contains__(self, video_path: object) -> bool:
+        return isinstance(video_path, (str, Path)) and self._key(video_path) in self._videos
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Memory maps are reopened lazily in the dataloader workers
+        state = self.__dict__.copy()
+        state["_maps"] = {}
+        return state
+
+    @property
+    def root(self) -> Path:
+        """Directory of the store."""
+        return self._root
+
+    @staticmethod
+    def _key(video_path: str | Path) -> str:
+        return str(Path(video_path).resolve())
+
+    @staticmethod
+    def _get_source(key: str) -> list[int] | None:
+        """Get the size and modification time of the source video. Returns None if it does not exist."""
+        try:
+            stat = Path(key).stat()
+        except FileNotFoundError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def get(self, video_path: str | Path) -> np.ndarray | None:
+        """Get the frames of the video as a read-only view of shape (num_frames, height, width, 3).
+
+        Returns None if the video is not in the store or it has changed since the store was built.
+        """
+        key = self._key(video_path)
+        entry = self._videos.get(key)
+        if entry is None:
+            return None
+
+        if (up_to_date := self._up_to_date.get(key)) is None:
+            up_to_date = self._up_to_date[key] = self._get_source(key) == entry["source"]
+            if not up_to_date:
+                logger.warning(f"Source video {key} has changed since the frame clip store was built. Decode it.")
+        if not up_to_date:
+            return None
+
+        chunk = entry["chunk"]
+        if (data := self._maps.get(chunk)) is None:
+            data = self._maps[chunk] = np.memmap(self._root / self._chunks[chunk], dtype=np.uint8, mode="r")
+
+        shape = tuple(entry["shape"])
+        offset = entry["offset"]
+        return data[offset : offset + int(np.prod(shape))].reshape(shape)
+
+    def validate(self, video_paths: Iterable[str | Path] | None = None) -> list[str]:
+        """Check the store against its chunk files and source videos.
+
+        Args:
+            video_paths: Videos which should be in the store. If None, only the stored videos are checked.
+
+        Returns:
+            list[str]: Description of every problem found. The store is valid if it is empty.
+        """
+        errors: list[str] = []
+        chunk_sizes = {}
+        for idx, chunk in enumerate(self._chunks):
+            chunk_path = self._root / chunk
+            if chunk_path.exists():
+                chunk_sizes[idx] = chunk_path.stat().st_size
+            else:
+                errors.append(f"Chunk file {chunk_path} is missing.")
+
+        for key, entry in self._videos.items():
+            nbytes = int(np.prod(entry["shape"]))
+            if entry["chunk"] in chunk_sizes and entry["offset"] + nbytes > chunk_sizes[entry["chunk"]]:
+                errors.append(f"Frames of {key} are truncated in {self._chunks[entry['chunk']]}.")
+
+            source = self._get_source(key)
+            if source is None:
+                errors.append(f"Source video {key} does not exist anymore.")
+            elif source != entry["source"]:
+                errors.append(f"Source video {key} has changed since the store was built.")
+
+        errors.extend(
+            f"Video {self._key(video_path)} is not in the store."
+            for video_path in video_paths or []
+            if video_path not in self
+        )
+
+        return errors
+
+    @classmethod
+    def build(
+        cls,
+        root: str | Path,
+        video_paths: Iterable[str | Path],
+        short_side: int | None = 256,
+        chunk_size: int = 2**30,
+    ) -> FrameClipStore:
+        """Decode the videos into the store, skipping videos already stored and up to date.
+
+        Args:
+            root: Directory of the store. It is created if it does not exist.
+            video_paths: Videos to store.
+            short_side: Frames are downscaled to have this shorter side, keeping the aspect ratio.
+                Frames which are already smaller are kept as is. If None, frames are not resized.
+            chunk_size: New chunk files are started once a chunk exceeds this size in bytes.
+
+        Returns:
+            FrameClipStore: The built store.
+        """
+        root = Path(root)
+        root.mkdir(parents=True, exist_ok=True)
+        index_path = root / cls.INDEX_FILE
+        if index_path.exists():
+            index = json.loads(index_path.read_text())
+            if index.get("version") != cls.VERSION or index["short_side"] != short_side:
+                msg = f"Existing frame clip store at {root} was built with different settings."
+                raise FrameClipStoreError(msg)
+        else:
+            index = {"version": cls.VERSION, "short_side": short_side, "chunks": [], "videos": {}}
+
+        chunks: list[str] = index["chunks"]
+        videos: dict[str, dict[str, Any]] = index["videos"]
+        try:
+            for video_path in video_paths:
+                key = cls._key(video_path)
+                stat = Path(key).stat()
+                source = [stat.st_size, stat.st_mtime_ns]
+                if key in videos and videos[key]["source"] == source:
+                    continue
+
+                if not chunks or (root / chunks[-1]).stat().st_size >= chunk_size:
+                    chunks.append(f"chunk_{len(chunks):05d}.bin")
+                    (root / chunks[-1]).touch()
+
+                chunk_path = root / chunks[-1]
+                offset = chunk_path.stat().st_size
+                with chunk_path.open("ab") as f:
+                    try:
+                        shape = cls._decode(key, short_side, f)
+                    except BaseException:
+                        # Drop the frames of the video written partially
+                        f.truncate(offset)
+                        raise
+                videos[key] = {
+                    "chunk": len(chunks) - 1,
+                    "offset": offset,
+                    "shape": shape,
+                    "source": source,
+                }
+        finally:
+            # Keep the entries of the videos written so far even if building is interrupted
+            tmp_index_path = index_path.with_suffix(".tmp")
+            tmp_index_path.write_text(json.dumps(index))
+            tmp_index_path.replace(index_path)
+
+        logger.info(f"Frame clip store at {root} holds {len(videos)} videos in {len(chunks)} chunks.")
+        return cls(root)
+
+    @staticmethod
+    def _decode(video_path: str, short_side: int | None, f: IO[bytes]) -> list[int]:
+        """Decode the video and write its frames to the file one by one. Returns the shape of the frames."""
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            msg = f"Cannot open video {video_path}."
+            raise FrameClipStoreError(msg)
+
+        num_frames = 0
+        frame_shape = None
+        try:
+            success, frame = cap.read()
+            while success:
+                height, width = frame.shape[:2]
+                if short_side is not None and min(height, width) > short_side:
+                    scale = short_side / min(height, width)
+                    size = (max(round(width * scale), 1), max(round(height * scale), 1))
+                    frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                if frame_shape is None:
+                    frame_shape = frame.shape
+                elif frame.shape != frame_shape:
+                    msg = f"Frames of video {video_path} have different shapes, {frame_shape} and {frame.shape}."
+                    raise FrameClipStoreError(msg)
+                f.write(np.ascontiguousarray(frame, dtype=np.uint8).tobytes())
+                num_frames += 1
+                success, frame = cap.read()
+        finally:
+            cap.release()
+
+        if frame_shape is None:
+            msg = f"Video {video_path} has no frames."
+            raise FrameClipStoreError(msg)
+        return [num_frames, *frame_shape]
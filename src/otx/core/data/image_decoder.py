@@ -0,0 +1,91 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Image decoder reducing the resolution of the images while decoding them."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import cv2
+import numpy as np
+from datumaro.components.media import ImageFromFile
+from PIL import Image as PILImage
+
+from otx.core.types.image import ImageColorChannel
+
+if TYPE_CHECKING:
+    from datumaro import Image
+
+__all__ = ["fit_to_max_size", "decode_image_reduced"]
+
+
+def fit_to_max_size(img_shape: tuple[int, int], max_size: tuple[int, int] | None) -> tuple[int, int]:
+    """Get the (height, width) of the image fitted to the max size with the same aspect ratio.
+
+    Args:
+        img_shape (tuple[int, int]): (height, width) of the image.
+        max_size (tuple[int, int] | None): Max (height, width). If None, the image size is not changed.
+
+    Returns:
+        tuple[int, int]: (height, width) fitted to the max size. It is the same as `img_shape`
+            if the image already fits in the max size.
+    """
+    height, width = img_shape
+    if max_size is None:
+        return height, width
+
+    max_height, max_width = max_size
+    if height <= max_height and width <= max_width:
+        return height, width
+
+    # Preserve the image size ratio and fit to max_height or max_width
+    # e.g. (1000 / 2000 = 0.5, 1000 / 1000 = 1.0) => 0.5
+    # h, w = 2000 * 0.5 => 1000, 1000 * 0.5 => 500, bounded by max_height
+    min_scale = min(max_height / height, max_width / width)
+    return int(min_scale * height), int(min_scale * width)
+
+
+def decode_image_reduced(
+    img: Image,
+    image_color_channel: ImageColorChannel = ImageColorChannel.RGB,
+    max_size: tuple[int, int] | None = None,
+) -> np.ndarray | None:
+    """Decode the image file fitted to the max size without decoding it in full resolution.
+
+    JPEG images are decoded by PIL in the draft mode, where libjpeg scales the DCT blocks down by 1/2, 1/4 or 1/8
+    to the smallest resolution which is not smaller than the max size.
+    The decoded image is then resized to exactly the size given by `fit_to_max_size()`, which is the same size
+    as the full-resolution image resized by `OTXDataset._cache_img()`.
+    The other formats are decoded in full resolution and resized.
+    Unlike Datumaro's PIL backend, the image is decoded in RGB and converted to BGR only if needed,
+    without any intermediate copy.
+
+    Args:
+        img (Image): Datumaro image to decode.
+        image_color_channel (ImageColorChannel): Color channel order of the decoded image.
+        max_size (tuple[int, int] | None): Max (height, width) of the decoded image.
+            If None, the image is decoded in full resolution.
+
+    Returns:
+        np.ndarray | None: HWC uint8 image or None if the image is not a plain file, e.g., an encrypted file
+            or an in-memory image, which should be decoded by Datumaro.
+    """
+    if not isinstance(img, ImageFromFile) or not img._crypter.is_null_crypter:  # noqa: SLF001
+        return None
+
+    with PILImage.open(img.path) as pil_img:
+        width, height = pil_img.size
+        new_height, new_width = fit_to_max_size((height, width), max_size)
+        if (new_height, new_width) != (height, width):
+            # No effect on the other formats
+            pil_img.draft("RGB", (new_width, new_height))
+        img_data = np.asarray(pil_img if pil_img.mode == "RGB" else pil_img.convert("RGB"))
+
+    if img_data.shape[:2] != (new_height, new_width):
+        img_data = cv2.resize(src=img_data, dsize=(new_width, new_height), interpolation=cv2.INTER_LINEAR)
+
+    # The array taken from PIL is read-only, so that it should be copied once if it is not resized
+    if image_color_channel == ImageColorChannel.BGR:
+        return cv2.cvtColor(img_data, cv2.COLOR_RGB2BGR, dst=img_data if img_data.flags.writeable else None)
+    return img_data if img_data.flags.writeable else img_data.copy()
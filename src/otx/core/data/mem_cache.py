@@ -6,10 +6,15 @@
 from __future__ import annotations
 
 import ctypes as ct
+import hashlib
 import logging
 import multiprocessing as mp
+import os
+import pickle
 import re
 import signal
+import struct
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, ClassVar
 
 import numpy as np
@@ -18,7 +23,6 @@ import psutil
 from otx.utils import append_signal_handler
 
 if TYPE_CHECKING:
-    from multiprocessing.managers import DictProxy
     from multiprocessing.synchronize import Lock
 
 logger = logging.getLogger()
@@ -76,29 +80,380 @@ class _DummyLock:
         pass
 
 
+class _SharedAddrTable:
+    """Open-addressing hash table of cached item addresses placed in shared memory.
+
+    It replaces the `multiprocessing.Manager().dict()` of the multiprocessing handler.
+    Every slot holds a 128-bit hash of the key, a generation counter and the pickled item address
+    in the fixed-size region of the second shared buffer.
+    Lookups read the shared buffers directly without any IPC, so that they are lock-free.
+    Insertions and removals should be serialized by the caller's lock.
+    They bump the generation counter before touching a slot, so that readers can detect a concurrent change.
+
+    Args:
+        num_slots: Number of hash table slots. It is rounded up to the power of two.
+    """
+
+    MAX_LOAD_FACTOR: ClassVar[float] = 0.75
+    # Maximum size of the pickled item address stored in a slot
+    DESC_BYTES: ClassVar[int] = 128
+
+    _EMPTY: ClassVar[int] = 0
+    _TOMBSTONE: ClassVar[int] = 1
+
+    def __init__(self, num_slots: int):
+        num_slots = 1 << max(num_slots - 1, 1).bit_length()
+        self._num_slots = num_slots
+        # [tag, check, desc_len, generation] per slot
+        self._slots_buf = mp.Array(ct.c_uint64, num_slots * 4, lock=False)
+        self._descs = mp.Array(ct.c_uint8, num_slots * self.DESC_BYTES, lock=False)
+        self._num_items = mp.Value(ct.c_size_t, 0, lock=False)
+        self._slots = memoryview(self._slots_buf).cast("B").cast("Q")
+
+    def __len__(self) -> int:
+        return self._num_items.value
+
+    @property
+    def num_slots(self) -> int:
+        """Number of hash table slots."""
+        return self._num_slots
+
+    @property
+    def full(self) -> bool:
+        """True if a new address cannot be inserted without removing one."""
+        return self._num_items.value + 1 > self.MAX_LOAD_FACTOR * self._num_slots
+
+    @classmethod
+    def fits(cls, addr: tuple[Any, ...]) -> bool:
+        """True if the pickled item address fits in a slot."""
+        return len(pickle.dumps(addr, protocol=pickle.HIGHEST_PROTOCOL)) <= cls.DESC_BYTES
+
+    @classmethod
+    def _hash(cls, key: Any) -> tuple[int, int]:  # noqa: ANN401
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16).digest()
+        tag = max(int.from_bytes(digest[:8], "little"), cls._TOMBSTONE + 1)
+        return tag, int.from_bytes(digest[8:], "little")
+
+    def _find(self, tag: int, check: int) -> tuple[int, int]:
+        """Return the slot index holding the key hash (-1 if not exist) and the first free slot index to insert."""
+        mask = self._num_slots - 1
+        idx = tag & mask
+        free = -1
+        slots = self._slots
+        for _ in range(self._num_slots):
+            slot_tag = slots[4 * idx]
+            if slot_tag == self._EMPTY:
+                return -1, idx if free < 0 else free
+            if slot_tag == self._TOMBSTONE:
+                free = idx if free < 0 else free
+            elif slot_tag == tag and slots[4 * idx + 1] == check:
+                return idx, free
+            idx = (idx + 1) & mask
+        return -1, free
+
+    def addr_at(self, idx: int) -> tuple[Any, ...]:
+        """Get the item address stored in the given slot."""
+        desc_len = self._slots[4 * idx + 2]
+        return pickle.loads(ct.string_at(ct.byref(self._descs, idx * self.DESC_BYTES), desc_len))  # noqa: S301
+
+    def lookup(self, key: Any) -> tuple[int, int, tuple[Any, ...]] | None:  # noqa: ANN401
+        """Look up the slot index, its generation and the address of the cached item without any IPC."""
+        tag, check = self._hash(key)
+        idx, _ = self._find(tag, check)
+        if idx < 0:
+            return None
+        gen = self._slots[4 * idx + 3]
+        addr = self.addr_at(idx)
+        if not self.is_valid(idx, gen) or self._slots[4 * idx] != tag or self._slots[4 * idx + 1] != check:
+            return None
+        return idx, gen, addr
+
+    def is_valid(self, idx: int, gen: int) -> bool:
+        """True if the slot has not been changed since the given generation."""
+        return self._slots[4 * idx] > self._TOMBSTONE and self._slots[4 * idx + 3] == gen
+
+    def get(self, key: Any, default: tuple[Any, ...] | None = None) -> tuple[Any, ...] | None:  # noqa: ANN401
+        """Look up the address of the cached item without any IPC."""
+        found = self.lookup(key)
+        return default if found is None else found[2]
+
+    def insert(self, key: Any, addr: tuple[Any, ...]) -> int:  # noqa: ANN401
+        """Insert the address of the cached item and return its slot index."""
+        tag, check = self._hash(key)
+        idx, free = self._find(tag, check)
+        if idx >= 0:
+            return idx
+
+        if free < 0 or self.full:
+            msg = "Address table reaches it's limit."
+            raise MemCacheHandlerError(msg)
+
+        desc = pickle.dumps(addr, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(desc) > self.DESC_BYTES:
+            msg = f"Item address ({len(desc)} bytes) is larger than the slot ({self.DESC_BYTES} bytes)."
+            raise MemCacheHandlerError(msg)
+
+        self._slots[4 * free + 3] += 1
+        ct.memmove(ct.byref(self._descs, free * self.DESC_BYTES), desc, len(desc))
+        self._slots[4 * free + 2] = len(desc)
+        self._slots[4 * free + 1] = check
+        # Publish the slot to the lock-free readers at last
+        self._slots[4 * free] = tag
+        self._num_items.value += 1
+        return free
+
+    def __setitem__(self, key: Any, addr: tuple[Any, ...]) -> None:  # noqa: ANN401
+        """Insert the address of the cached item. The caller should hold the writer lock."""
+        self.insert(key, addr)
+
+    def pop_slot(self, idx: int) -> None:
+        """Remove the item address in the given slot. The caller should hold the writer lock."""
+        # Invalidate the readers looking at this slot first
+        self._slots[4 * idx + 3] += 1
+        self._slots[4 * idx] = self._TOMBSTONE
+        self._num_items.value -= 1
+
+
+class _SpillStore:
+    """Append-only memory-mapped file storing the cached items on disk.
+
+    A record consists of a header (magic, header length, data length), the pickled key and item address,
+    the raw item bytes and the trailing magic to confirm that the record is completely written.
+    Records are appended by a single `os.write()` to the file opened with `O_APPEND`,
+    so that DataLoader workers and concurrent runs can share the same file.
+    Every process keeps its own key index and catches up with the records appended by the others on a miss.
+
+    Args:
+        spill_dir: Directory to place the spill file.
+        namespace: Namespace of the spill file, e.g., items decoded with a different resizing
+            should not share the same file.
+        annotation_namespace: Namespace of the annotation payloads in the spill file.
+            They depend on the labels and the annotation files, so that they are stored with it
+            and looked up only by the runs with the same namespace. If None, they are not stored.
+        max_size: Maximum size of the spill file (bytes). If None, it is unlimited.
+    """
+
+    MAGIC: ClassVar[bytes] = b"OTXC"
+    _HEADER: ClassVar[struct.Struct] = struct.Struct("<4sIQ")
+
+    def __init__(
+        self,
+        spill_dir: str | Path,
+        namespace: str = "",
+        annotation_namespace: str | None = None,
+        max_size: int | None = None,
+    ):
+        digest = hashlib.blake2b(namespace.encode(), digest_size=8).hexdigest()
+        self._path = Path(spill_dir) / f"mem_cache_{digest}.bin"
+        self._annotation_namespace = annotation_namespace
+        self._max_size = max_size
+        self._full = False
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.touch(exist_ok=True)
+        self._index: dict[str, tuple[Any, ...]] = {}
+        self._scanned = 0
+        self._pid: int | None = None
+        self._fd = -1
+        self._mmap: np.memmap | None = None
+        self._refresh()
+
+        if self._scanned < (file_size := self._path.stat().st_size):
+            logger.warning(f"Drop {file_size - self._scanned} bytes partially written records from {self._path}.")
+            os.truncate(self._path, self._scanned)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        state.update(_pid=None, _fd=-1, _mmap=None)
+        return state
+
+    @property
+    def path(self) -> Path:
+        """Path to the spill file."""
+        return self._path
+
+    @property
+    def full(self) -> bool:
+        """True if the spill file reached its maximum size."""
+        return self._full
+
+    def _view(self, size: int) -> np.memmap:
+        """Return the memory-mapped view of the spill file covering at least the given size."""
+        if self._mmap is None or len(self._mmap) < size:
+            self._mmap = np.memmap(self._path, dtype=np.uint8, mode="r")
+        return self._mmap
+
+    def _refresh(self) -> None:
+        """Index the records appended after the last scan."""
+        file_size = self._path.stat().st_size
+        if file_size - self._scanned < self._HEADER.size:
+            return
+
+        view = self._view(file_size)
+        pos = self._scanned
+        while pos + self._HEADER.size <= file_size:
+            magic, header_len, data_len = self._HEADER.unpack(view[pos : pos + self._HEADER.size].tobytes())
+            data_offset = pos + self._HEADER.size + header_len
+            end = data_offset + data_len + len(self.MAGIC)
+            if magic != self.MAGIC or end > file_size or view[end - len(self.MAGIC) : end].tobytes() != self.MAGIC:
+                break
+            key, addr = pickle.loads(view[pos + self._HEADER.size : data_offset].tobytes())  # noqa: S301
+            self._index.setdefault(key, (data_offset, *addr))
+            pos = end
+        self._scanned = pos
+
+    def _get_record_key(self, key: Any) -> Any | None:  # noqa: ANN401
+        """Get the key of the record in the spill file. Return None if the item should not be stored.
+
+        Image file paths are stored as is.
+        `(image file path, payload type)` keys of the annotations are stored with the annotation namespace.
+        """
+        if isinstance(key, str):
+            return key
+        if (
+            self._annotation_namespace is not None
+            and isinstance(key, tuple)
+            and len(key) == 2
+            and all(isinstance(part, str) for part in key)
+        ):
+            return (*key, self._annotation_namespace)
+        return None
+
+    def get(self, key: Any) -> tuple[np.ndarray, dict | None] | None:  # noqa: ANN401
+        """Look up the item from the spill file. The returned array is a read-only memory-mapped view."""
+        if (key := self._get_record_key(key)) is None:
+            return None
+        if (addr := self._index.get(key)) is None:
+            self._refresh()
+            if (addr := self._index.get(key)) is None:
+                return None
+
+        offset, dtype, shape, meta = addr
+        dtype = np.dtype(dtype)
+        count = int(np.prod(shape))
+        view = self._view(offset + count * dtype.itemsize)
+        return view[offset : offset + count * dtype.itemsize].view(dtype).reshape(shape), meta
+
+    def put(self, key: Any, data: np.ndarray, meta: dict | None = None) -> bool:  # noqa: ANN401
+        """Append the item to the spill file.
+
+        Only the keys of image files and their annotations are stored, since other keys are not valid across runs.
+        """
+        if self._full or (key := self._get_record_key(key)) is None or key in self._index:
+            return False
+
+        header = pickle.dumps((key, (data.dtype.str, data.shape, meta)), protocol=pickle.HIGHEST_PROTOCOL)
+        data = np.ascontiguousarray(data)
+        record = b"".join(
+            [
+                self._HEADER.pack(self.MAGIC, len(header), data.nbytes),
+                header,
+                data.tobytes(),
+                self.MAGIC,
+            ],
+        )
+
+        if self._pid != os.getpid():
+            self._fd = os.open(self._path, os.O_WRONLY | os.O_APPEND | getattr(os, "O_BINARY", 0))
+            self._pid = os.getpid()
+        if self._max_size is not None and os.fstat(self._fd).st_size + len(record) > self._max_size:
+            self._full = True
+            logger.warning(f"Spill file {self._path} reaches its limit ({self._max_size} bytes). Cannot spill more.")
+            return False
+        os.write(self._fd, record)
+        return True
+
+
 class MemCacheHandlerBase:
     """Base class for memory cache handler.
 
     It will be combined with LoadImageFromOTXDataset to store/retrieve the samples in memory.
+
+    Args:
+        mem_size: The size of memory pool (bytes).
+        eviction: If true, evict the cached items by the clock algorithm when the memory pool is full.
+            Otherwise, freeze the handler.
+        spill_dir: If given, the cached items are also stored in the memory-mapped file in this directory,
+            so that later runs can start with the warm cache.
+        spill_namespace: Namespace of the spill file. Items processed differently before caching,
+            e.g., with a different `mem_cache_img_max_size`, should have a different namespace.
+        spill_annotation_namespace: Namespace of the annotation payloads in the spill file,
+            e.g., the hash of the labels and the annotation files. If None, they are kept in the memory pool only.
+        spill_max_size: Maximum size of the spill file (bytes). If None, it is unlimited.
+        max_items: Maximum number of the cached items to size the address table,
+            e.g., the number of dataset items times the number of payload types.
+            If None, it is estimated from `mem_size` and `MIN_ITEM_BYTES`.
+
+    Besides the images, datasets cache their decoded annotations with the `(image key, payload type)` keys,
+    e.g., `(img.path, "class_mask")`. The memory pool occupancy is reported per payload type.
     """
 
-    def __init__(self, mem_size: int):
+    # Expected minimum size of a cached item to decide the number of address table slots
+    MIN_ITEM_BYTES: ClassVar[int] = 16 * 1024
+    MIN_NUM_SLOTS: ClassVar[int] = 1024
+    # Allocation unit of the memory pool in the eviction mode
+    PAGE_BYTES: ClassVar[int] = 1024
+
+    _STATS: ClassVar[tuple[str, ...]] = ("hits", "spill_hits", "misses", "evictions")
+    # Payload types of the cached items. Unknown annotation payloads are counted as "other".
+    PAYLOAD_TYPES: ClassVar[tuple[str, ...]] = ("image", "class_mask", "masks", "other")
+
+    def __init__(
+        self,
+        mem_size: int,
+        eviction: bool = False,
+        spill_dir: str | None = None,
+        spill_namespace: str = "",
+        spill_annotation_namespace: str | None = None,
+        spill_max_size: int | None = None,
+        max_items: int | None = None,
+    ):
         self._mem_size = mem_size
+        self._eviction = eviction
+        self._spill_dir = spill_dir
+        self._spill_namespace = spill_namespace
+        self._spill_annotation_namespace = spill_annotation_namespace
+        self._spill_max_size = spill_max_size
+        self._max_items = max_items
         self._init_data_structs(mem_size)
+        self._stats = self._new_array(ct.c_uint64, len(self._STATS))
+        # [number of items, bytes] per payload type
+        self._occupancy = np.frombuffer(
+            self._new_array(ct.c_int64, 2 * len(self.PAYLOAD_TYPES)),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        self._spill = (
+            _SpillStore(spill_dir, spill_namespace, spill_annotation_namespace, spill_max_size)
+            if spill_dir is not None
+            else None
+        )
+
+        if eviction:
+            self._page_owner = np.frombuffer(self._new_array(ct.c_int64, mem_size // self.PAGE_BYTES), dtype=np.int64)
+            self._referenced = np.frombuffer(self._new_array(ct.c_uint8, self._cache_addr.num_slots), dtype=np.uint8)
+            self._slot_payload = np.frombuffer(self._new_array(ct.c_uint8, self._cache_addr.num_slots), dtype=np.uint8)
 
     def _init_data_structs(self, mem_size: int) -> None:
         self._arr = (ct.c_uint8 * mem_size)()
         self._cur_page = ct.c_size_t(0)
-        self._cache_addr: (
-            dict[Any, tuple[Any, ...]]
-            | DictProxy[
-                Any,
-                tuple[Any, ...],
-            ]
-        ) = {}
+        self._cache_addr: dict[Any, tuple[Any, ...]] | _SharedAddrTable = (
+            _SharedAddrTable(self._get_num_slots(mem_size, self._max_items)) if self._eviction else {}
+        )
         self._lock: Lock | _DummyLock = _DummyLock()
         self._freeze = ct.c_bool(False)
 
+    @staticmethod
+    def _new_array(dtype: Any, size: int) -> ct.Array:  # noqa: ANN401
+        return (dtype * size)()
+
+    @classmethod
+    def _get_num_slots(cls, mem_size: int, max_items: int | None = None) -> int:
+        # An item takes one page at least in the eviction mode
+        num_items = mem_size // cls.MIN_ITEM_BYTES if max_items is None else min(max_items, mem_size // cls.PAGE_BYTES)
+        return max(cls.MIN_NUM_SLOTS, int(num_items / _SharedAddrTable.MAX_LOAD_FACTOR))
+
     def __len__(self) -> int:
         """Get the number of cached items."""
         return len(self._cache_addr)
@@ -108,17 +463,63 @@ class MemCacheHandlerBase:
         """Get the reserved memory pool size (bytes)."""
         return len(self._arr)
 
+    @property
+    def stats(self) -> dict[str, int]:
+        """Get the hit, spill hit, miss and eviction counters."""
+        return dict(zip(self._STATS, self._stats))
+
+    @property
+    def occupancy(self) -> dict[str, dict[str, int]]:
+        """Get the number of items and bytes in the memory pool per payload type."""
+        return {
+            payload: {"items": int(num_items), "bytes": int(num_bytes)}
+            for payload, (num_items, num_bytes) in zip(self.PAYLOAD_TYPES, self._occupancy)
+        }
+
+    @classmethod
+    def _get_payload_index(cls, key: Any) -> int:  # noqa: ANN401
+        """Get the payload type index of the key. Annotations are keyed by (image key, payload type)."""
+        if not (isinstance(key, tuple) and len(key) == 2 and isinstance(key[1], str)):
+            return 0
+        if key[1] in cls.PAYLOAD_TYPES:
+            return cls.PAYLOAD_TYPES.index(key[1])
+        return len(cls.PAYLOAD_TYPES) - 1
+
     def get(self, key: Any) -> tuple[np.ndarray | None, dict | None]:  # noqa: ANN401
         """Try to look up the cached item with the given key.
 
+        If it is not in the memory pool, look up the spill file and promote it to the memory pool.
+
         Args:
             key (Any): A key for looking up the cached item
 
         Returns:
             If succeed return (np.ndarray, Dict), otherwise return (None, None)
         """
-        try:
-            if self.mem_size == 0 or (addr := self._cache_addr.get(key, None)) is None:
+        if self.mem_size == 0 and self._spill is None:
+            return None, None
+
+        data, meta = self._get_from_pool(key)
+        if data is not None:
+            self._stats[0] += 1
+            return data, meta
+
+        if self._spill is not None and (spilled := self._spill.get(key)) is not None:
+            self._stats[1] += 1
+            data, meta = spilled
+            if self._put_to_pool(key, data, meta) is not None and (cached := self._get_from_pool(key))[0] is not None:
+                return cached
+            return np.array(data), meta
+
+        self._stats[2] += 1
+        return None, None
+
+    def _get_from_pool(self, key: Any) -> tuple[np.ndarray | None, dict | None]:  # noqa: ANN401
+        if self.mem_size == 0:
+            return None, None
+
+        if not self._eviction:
+            if (addr := self._cache_addr.get(key, None)) is None:
                 return None, None
 
             offset, count, dtype, shape, strides, meta = addr
@@ -126,11 +527,19 @@ class MemCacheHandlerBase:
             data = np.frombuffer(self._arr, dtype=dtype, count=count, offset=offset)
             return np.lib.stride_tricks.as_strided(data, shape, strides), meta
 
-        except BrokenPipeError:
-            # It is possible that the manager is dead but
-            # the multi-processing worker in DataLoader is alive.
-            # In this case, we need to handle this error.
+        # The item can be evicted and overwritten by the other process at any time,
+        # so that copy it and then confirm that its slot is not changed meanwhile.
+        if (found := self._cache_addr.lookup(key)) is None:  # type: ignore[union-attr]
+            return None, None
+
+        slot, gen, (offset, count, dtype, shape, strides, meta) = found
+        self._referenced[slot] = 1
+        data = np.frombuffer(self._arr, dtype=dtype, count=count, offset=offset)
+        data = np.array(np.lib.stride_tricks.as_strided(data, shape, strides))
+
+        if not self._cache_addr.is_valid(slot, gen):  # type: ignore[union-attr]
             return None, None
+        return data, meta
 
     def put(
         self,
@@ -140,6 +549,8 @@ class MemCacheHandlerBase:
     ) -> int | None:
         """Try to store np.ndarray and metadata with a key to the reserved memory pool.
 
+        If the spill file is enabled, the item is also appended to it.
+
         Args:
             key (Any): A key to store the cached item
             data (np.ndarray): A data sample to store
@@ -148,63 +559,226 @@ class MemCacheHandlerBase:
         Returns:
             Optional[int]: If succeed return the address of cached item in memory pool
         """
-        if self._freeze.value:
+        if self._spill is not None:
+            self._spill.put(key, data, meta)
+
+        return self._put_to_pool(key, data, meta)
+
+    def _put_to_pool(
+        self,
+        key: Any,  # noqa: ANN401
+        data: np.ndarray,
+        meta: dict | None = None,
+    ) -> int | None:
+        if self._freeze.value or self.mem_size == 0:
             return None
 
-        try:
+        if (addr := self._cache_addr.get(key, None)) is not None:
+            return addr[0]
+
+        data_bytes = data.size * data.itemsize
+
+        with self._lock:
+            # The other worker can cache the same key after the lock-free lookup above,
+            # e.g., tiles of the same image. Do not store it again.
             if (addr := self._cache_addr.get(key, None)) is not None:
                 return addr[0]
 
-            data_bytes = data.size * data.itemsize
+            if self._eviction:
+                return self._put_with_eviction(key, data, meta)
 
-            with self._lock:
-                new_page = self._cur_page.value + data_bytes
+            new_page = self._cur_page.value + data_bytes
 
-                if new_page > self.mem_size:
-                    self.freeze()
-                    msg = "Memory pool reaches it's limit. Cannot cache more. Freeze it."
-                    logger.warning(msg)
-                    return None
+            if new_page > self.mem_size:
+                self.freeze()
+                msg = "Memory pool reaches it's limit. Cannot cache more. Freeze it."
+                logger.warning(msg)
+                return None
 
-                offset = ct.byref(self._arr, self._cur_page.value)
-                ct.memmove(offset, data.ctypes.data, data_bytes)
+            offset = ct.byref(self._arr, self._cur_page.value)
+            ct.memmove(offset, data.ctypes.data, data_bytes)
 
+            try:
                 self._cache_addr[key] = (
                     self._cur_page.value,
                     data.size,
-                    data.dtype,
+                    data.dtype.str,
                     data.shape,
                     data.strides,
                     meta,
                 )
-                self._cur_page.value = new_page
-                return new_page
-        except BrokenPipeError:
-            # It is possible that the manager is dead but
-            # the multi-processing worker in DataLoader is alive.
-            # In this case, we need to handle this error.
+            except MemCacheHandlerError as e:
+                # Only this item cannot be addressed, e.g., its meta is too large. Do not freeze the pool for it.
+                logger.warning(f"{e} Skip caching {key}.")
+                return None
+
+            self._cur_page.value = new_page
+            self._occupancy[self._get_payload_index(key)] += (1, data_bytes)
+            return new_page
+
+    def _put_with_eviction(self, key: Any, data: np.ndarray, meta: dict | None) -> int | None:  # noqa: ANN401
+        """Store the item at the clock hand, evicting the items in the way. The caller should hold the lock."""
+        data_bytes = data.size * data.itemsize
+        num_pages = max(-(-data_bytes // self.PAGE_BYTES), 1)
+
+        # Check that the address can be inserted before evicting any item for it.
+        # The address at the end of the pool is the largest one when pickled.
+        max_addr = (self.mem_size, data.size, data.dtype.str, data.shape, data.strides, meta)
+        if not _SharedAddrTable.fits(max_addr):
+            logger.warning(f"Item address is larger than the address table slot. Skip caching {key}.")
+            return None
+        if self._cache_addr.full and not self._evict_one():  # type: ignore[union-attr]
+            logger.warning(f"Address table reaches it's limit. Skip caching {key}.")
+            return None
+
+        if (page := self._evict_for(num_pages)) is None:
+            return None
+
+        offset = page * self.PAGE_BYTES
+        ct.memmove(ct.byref(self._arr, offset), data.ctypes.data, data_bytes)
+
+        try:
+            slot = self._cache_addr.insert(  # type: ignore[union-attr]
+                key,
+                (offset, data.size, data.dtype.str, data.shape, data.strides, meta),
+            )
+        except MemCacheHandlerError as e:
+            logger.warning(f"{e} Skip caching {key}.")
             return None
 
+        self._page_owner[page : page + num_pages] = slot + 1
+        self._referenced[slot] = 0
+        self._slot_payload[slot] = payload = self._get_payload_index(key)
+        self._occupancy[payload] += (1, data_bytes)
+        self._cur_page.value = offset + num_pages * self.PAGE_BYTES
+        return offset + data_bytes
+
+    def _evict_for(self, num_pages: int) -> int | None:
+        """Sweep the clock hand to find the contiguous pages, evicting the unreferenced items on the way.
+
+        Referenced items get the second chance. Their reference bit is cleared and the hand moves behind them.
+
+        Returns:
+            Index of the first page of the free space or None if the item is larger than the memory pool.
+        """
+        total_pages = len(self._page_owner)
+        if num_pages > total_pages:
+            return None
+
+        hand = self._cur_page.value // self.PAGE_BYTES
+        swept = 0
+        # After sweeping the whole pool once, every reference bit is cleared.
+        while swept <= 2 * total_pages:
+            if hand + num_pages > total_pages:
+                swept += total_pages - hand
+                hand = 0
+                continue
+
+            owners = self._page_owner[hand : hand + num_pages]
+            slots = np.unique(owners[owners > 0]) - 1
+            referenced = slots[self._referenced[slots] > 0]
+
+            if len(referenced) > 0:
+                self._referenced[referenced] = 0
+                last_page = int(np.nonzero(np.isin(owners, referenced + 1))[0][-1])
+                _, end_page = self._get_pages(int(owners[last_page]) - 1)
+                swept += end_page - hand
+                hand = end_page
+                continue
+
+            for slot in slots.tolist():
+                self._evict(slot)
+            return hand
+
+        return None
+
+    def _evict_one(self) -> bool:
+        """Sweep the clock hand to evict an unreferenced item, so that the address table has a free slot.
+
+        Referenced items get the second chance as `_evict_for()` does.
+        The hand stays at the evicted item, so that the new item can take its pages.
+
+        Returns:
+            True if an item is evicted.
+        """
+        hand = self._cur_page.value // self.PAGE_BYTES
+        # After visiting every item once, every reference bit is cleared.
+        for _ in range(2 * len(self._cache_addr)):
+            owned = np.flatnonzero(self._page_owner[hand:])
+            if len(owned) == 0:
+                hand = 0
+                owned = np.flatnonzero(self._page_owner)
+                if len(owned) == 0:
+                    return False
+
+            slot = int(self._page_owner[hand + owned[0]]) - 1
+            start_page, end_page = self._get_pages(slot)
+            if self._referenced[slot] > 0:
+                self._referenced[slot] = 0
+                hand = end_page
+                continue
+
+            self._evict(slot)
+            self._cur_page.value = start_page * self.PAGE_BYTES
+            return True
+
+        return False
+
+    def _get_data_bytes(self, slot: int) -> tuple[int, int]:
+        offset, count, dtype, *_ = self._cache_addr.addr_at(slot)  # type: ignore[union-attr]
+        return offset, count * np.dtype(dtype).itemsize
+
+    def _get_pages(self, slot: int) -> tuple[int, int]:
+        offset, data_bytes = self._get_data_bytes(slot)
+        return offset // self.PAGE_BYTES, offset // self.PAGE_BYTES + max(-(-data_bytes // self.PAGE_BYTES), 1)
+
+    def _evict(self, slot: int) -> None:
+        start_page, end_page = self._get_pages(slot)
+        self._occupancy[self._slot_payload[slot]] -= (1, self._get_data_bytes(slot)[1])
+        self._page_owner[start_page:end_page] = 0
+        self._cache_addr.pop_slot(slot)  # type: ignore[union-attr]
+        self._stats[3] += 1
+
     def __repr__(self) -> str:
         """Representation for the current handler status."""
-        perc = 100.0 * self._cur_page.value / self.mem_size if self.mem_size > 0 else 0.0
+        used = int(np.count_nonzero(self._page_owner)) * self.PAGE_BYTES if self._eviction else self._cur_page.value
+        perc = 100.0 * used / self.mem_size if self.mem_size > 0 else 0.0
+        stats = ", ".join(f"{name}={value}" for name, value in self.stats.items())
+        occupancy = ", ".join(
+            f"{payload}={value['items']} items / {value['bytes']} bytes"
+            for payload, value in self.occupancy.items()
+            if value["items"] > 0
+        )
+        spill = f" Spill file {self._spill.path} stores {len(self._spill)} items." if self._spill is not None else ""
         return (
             f"{self.__class__.__name__} "
-            f"uses {self._cur_page.value} / {self.mem_size} ({perc:.1f}%) memory pool and "
-            f"store {len(self)} items."
+            f"uses {used} / {self.mem_size} ({perc:.1f}%) memory pool and "
+            f"store {len(self)} items ({stats}). Occupancy: {occupancy or 'empty'}.{spill}"
         )
 
     def __reduce__(self):
-        """Dump just mem_size and re-initialize with that value when unpickled."""
-        return (self.__class__, (self._mem_size,))
+        """Dump just the arguments and re-initialize with those values when unpickled."""
+        return (
+            self.__class__,
+            (
+                self._mem_size,
+                self._eviction,
+                self._spill_dir,
+                self._spill_namespace,
+                self._spill_annotation_namespace,
+                self._spill_max_size,
+                self._max_items,
+            ),
+        )
 
     @property
     def frozen(self) -> bool:
-        """True if this handler is frozen, otherwise return False."""
-        return self._freeze.value
+        """True if this handler cannot store a new item anymore, otherwise return False."""
+        pool_full = self._freeze.value or self.mem_size == 0
+        return pool_full and (self._spill is None or self._spill.full)
 
     def freeze(self) -> None:
-        """If frozen, it is impossible to store a new item anymore."""
+        """If frozen, it is impossible to store a new item to the memory pool anymore."""
         self._freeze.value = True
 
     def unfreeze(self) -> None:
@@ -229,23 +803,21 @@ class MemCacheHandlerForMP(MemCacheHandlerBase):
     """Memory caching handler for multi processing.
 
     Use if PyTorch's DataLoader.num_workers > 0.
+    The item addresses are kept in a shared memory hash table,
+    so that DataLoader workers can look up the cached items without IPC to a manager process.
     """
 
     def _init_data_structs(self, mem_size: int) -> None:
         self._arr = mp.Array(ct.c_uint8, mem_size, lock=False)
         self._cur_page = mp.Value(ct.c_size_t, 0, lock=False)
 
-        self._manager = mp.Manager()
-        self._cache_addr: DictProxy = self._manager.dict()
+        self._cache_addr: _SharedAddrTable = _SharedAddrTable(self._get_num_slots(mem_size, self._max_items))
         self._lock = mp.Lock()
         self._freeze = mp.Value(ct.c_bool, False, lock=False)
 
-    def shutdown(self) -> None:
-        """Shutdown mem caching handler.
-
-        It is effective only for the multiprocessing handler.
-        """
-        self._manager.shutdown()
+    @staticmethod
+    def _new_array(dtype: Any, size: int) -> ct.Array:  # noqa: ANN401
+        return mp.Array(dtype, size, lock=False)
 
 
 class MemCacheHandlerError(Exception):
@@ -263,12 +835,28 @@ class MemCacheHandlerSingleton:
     CPU_MEM_LIMITS_GIB: int = 30
 
     @classmethod
-    def create(cls, mode: str, mem_size: int) -> MemCacheHandlerBase:
+    def create(
+        cls,
+        mode: str,
+        mem_size: int,
+        eviction: bool = False,
+        spill_dir: str | Path | None = None,
+        spill_namespace: str = "",
+        spill_annotation_namespace: str | None = None,
+        spill_max_size: int | None = None,
+        max_items: int | None = None,
+    ) -> MemCacheHandlerBase:
         """Create a new MemCacheHandlerBase instance.
 
         Args:
             mode (str): There are two options: null, multiprocessing or singleprocessing.
             mem_size (int): The size of memory pool (bytes).
+            eviction (bool): If true, evict the cached items when the memory pool is full instead of freezing it.
+            spill_dir (str | Path | None): Directory of the spill file storing the cached items.
+            spill_namespace (str): Namespace of the spill file.
+            spill_annotation_namespace (str | None): Namespace of the annotation payloads in the spill file.
+            spill_max_size (int | None): Maximum size of the spill file (bytes).
+            max_items (int | None): Maximum number of the cached items to size the address table.
         """
         # COPY FROM mmcv.runner.get_dist_info
         from torch import distributed
@@ -286,17 +874,28 @@ class MemCacheHandlerSingleton:
                 f"Since world_size={world_size} > 1, each worker a {mem_size} size memory pool.",
             )
 
+        if spill_dir is not None and not isinstance(spill_dir, (str, Path)):
+            msg = f"spill_dir should be a str or Path, but got {type(spill_dir).__name__}."
+            raise TypeError(msg)
+
         logger.info(f"Try to create a {mem_size} size memory pool.")
         if not cls.check_system_memory(mem_size, available_cpu_mem):
             logger.warning("No available CPU memory left, mem_size will be set to 0.")
             mem_size = 0
 
-        if mode == "null" or mem_size == 0:
+        if mode == "null" or (mem_size == 0 and spill_dir is None):
             instance = NULL_MEM_CACHE_HANDLER
-        elif mode == "multiprocessing":
-            instance = MemCacheHandlerForMP(mem_size)
-        elif mode == "singleprocessing":
-            instance = MemCacheHandlerForSP(mem_size)
+        elif mode in ("multiprocessing", "singleprocessing"):
+            handler_cls = MemCacheHandlerForMP if mode == "multiprocessing" else MemCacheHandlerForSP
+            instance = handler_cls(
+                mem_size,
+                eviction,
+                spill_dir,
+                spill_namespace,
+                spill_annotation_namespace,
+                spill_max_size,
+                max_items,
+            )
         else:
             msg = f"{mode} is unknown mode."
             raise MemCacheHandlerError(msg)
@@ -329,6 +928,7 @@ class MemCacheHandlerSingleton:
     def delete(cls) -> None:
         """Shutdown and delete the created instance meantime."""
         for instance in cls.instances:
+            logger.info(repr(instance))
             instance.shutdown()
 
         cls.instances = []
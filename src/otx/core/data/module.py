@@ -6,7 +6,11 @@
 from __future__ import annotations
 
 import logging as log
-from typing import TYPE_CHECKING
+import shutil
+from contextlib import contextmanager
+from copy import copy
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator
 
 from datumaro import Dataset as DmDataset
 from lightning import LightningDataModule
@@ -15,8 +19,12 @@ from torch.utils.data import DataLoader, RandomSampler
 
 from otx.core.config.data import TileConfig
 from otx.core.data.dataset.tile import OTXTileDatasetFactory
-from otx.core.data.factory import OTXDatasetFactory
+from otx.core.data.dataset_index import DatasetIndex
+from otx.core.data.entity.base import OTXBatchDataEntity
+from otx.core.data.factory import OTXDatasetFactory, TransformLibFactory
 from otx.core.data.mem_cache import (
+    NULL_MEM_CACHE_HANDLER,
+    MemCacheHandlerForSP,
     MemCacheHandlerSingleton,
     parse_mem_cache_size_to_int,
 )
@@ -32,7 +40,7 @@ if TYPE_CHECKING:
     from lightning.pytorch.utilities.parsing import AttributeDict
 
     from otx.core.config.data import DataModuleConfig
-    from otx.core.data.dataset.base import OTXDataset
+    from otx.core.data.dataset.base import OTXDataset, Transforms
 
 
 class OTXDataModule(LightningDataModule):
@@ -60,6 +68,10 @@ class OTXDataModule(LightningDataModule):
         dataset = DmDataset.import_from(self.config.data_root, format=self.config.data_format)
         if self.task != "H_LABEL_CLS":
             dataset = pre_filtering(dataset, self.config.data_format, self.config.unannotated_items_ratio)
+        # Statistics queries of the adaptive tiling and the samplers are answered by the dataset index,
+        # which is built on the first query or loaded from the directory if it is persisted.
+        DatasetIndex.register(dataset, data_root=self.config.data_root, cache_dir=self.config.dataset_index_dir)
+        self._dm_dataset = dataset
         if config.tile_config.enable_tiler and config.tile_config.enable_adaptive_tiling:
             adapt_tile_config(config.tile_config, dataset=dataset)
 
@@ -92,7 +104,21 @@ class OTXDataModule(LightningDataModule):
         mem_cache_handler = MemCacheHandlerSingleton.create(
             mode=mem_cache_mode,
             mem_size=mem_size,
+            eviction=config.mem_cache_eviction,
+            spill_dir=config.mem_cache_spill_dir,
+            spill_namespace=_get_spill_namespace(config),
+            spill_annotation_namespace=(
+                _get_spill_annotation_namespace(config, dataset) if config.mem_cache_spill_dir is not None else None
+            ),
+            spill_max_size=(
+                parse_mem_cache_size_to_int(config.mem_cache_spill_size)
+                if config.mem_cache_spill_size is not None
+                else None
+            ),
+            # Every item caches its image and annotation payloads
+            max_items=len(dataset) * len(MemCacheHandlerForSP.PAYLOAD_TYPES),
         )
+        self.mem_cache_handler = mem_cache_handler
 
         label_infos: list[LabelInfo] = []
         for name, dm_subset in dataset.subsets().items():
@@ -125,6 +151,12 @@ class OTXDataModule(LightningDataModule):
 
         self.label_info = next(iter(label_infos))
 
+        self.batch_transforms: dict[str, Transforms | None] = {
+            "train": TransformLibFactory.generate_batch(self.config.train_subset),
+            "val": TransformLibFactory.generate_batch(self.config.val_subset),
+            "test": TransformLibFactory.generate_batch(self.config.test_subset),
+        }
+
     def _is_meta_info_valid(self, label_infos: list[LabelInfo]) -> bool:
         """Check whether there are mismatches in the metainfo for the all subsets."""
         if all(label_info == label_infos[0] for label_info in label_infos):
@@ -211,6 +243,74 @@ class OTXDataModule(LightningDataModule):
             persistent_workers=config.num_workers > 0,
         )
 
+    def on_after_batch_transfer(self, batch: Any, dataloader_idx: int) -> Any:  # noqa: ANN401
+        """Apply the batch transforms of the running stage to the batch transferred to the model's device."""
+        if self.trainer is None or not isinstance(batch, OTXBatchDataEntity):
+            return batch
+
+        if self.trainer.training:
+            transforms = self.batch_transforms["train"]
+        elif self.trainer.validating or self.trainer.sanity_checking:
+            transforms = self.batch_transforms["val"]
+        else:
+            transforms = self.batch_transforms["test"]
+        return batch if transforms is None else transforms(batch)
+
+    @contextmanager
+    def share_mem_cache(self, cache_dir: str | Path, prefill: bool = False) -> Iterator[None]:
+        """Share the decoded images and annotations with the data modules unpickled in this context.
+
+        Unpickled data modules, e.g., in HPO trials, are rebuilt from the config,
+        so that each of them would decode the same images again.
+        Instead, they attach to a spill file shared by all of them in addition to their own memory pool.
+        An item decoded by one of them is appended to the spill file and the others read it
+        through the memory-mapped file, whose pages are shared by the OS page cache.
+        The spill file is limited to `mem_cache_size` (or `mem_cache_spill_size` if it is smaller)
+        and the free disk space. The items which do not fit are cached in their own memory pools as usual.
+        Nothing is shared if the memory cache is disabled.
+
+        Args:
+            cache_dir: Directory to place the spill file if `mem_cache_spill_dir` is not set.
+            prefill: If true, decode the training and validation items into the spill file here
+                before the context starts. Otherwise, the spill file is filled by the data modules lazily.
+        """
+        if self.mem_cache_handler is NULL_MEM_CACHE_HANDLER:
+            yield
+            return
+
+        spill_dir = self.config.mem_cache_spill_dir or str(cache_dir)
+        spill_size = parse_mem_cache_size_to_int(self.config.mem_cache_size)
+        if self.config.mem_cache_spill_size is not None:
+            spill_size = min(spill_size, parse_mem_cache_size_to_int(self.config.mem_cache_spill_size))
+        Path(spill_dir).mkdir(parents=True, exist_ok=True)
+        if (free_disk := shutil.disk_usage(spill_dir).free) < spill_size:
+            log.warning(
+                f"Free disk space of {spill_dir} ({free_disk} bytes) is smaller than the memory cache size "
+                f"({spill_size} bytes). Only {free_disk // 2} bytes of the items are shared.",
+            )
+            spill_size = free_disk // 2
+        if prefill:
+            shared_handler = MemCacheHandlerForSP(
+                mem_size=0,
+                spill_dir=spill_dir,
+                spill_namespace=_get_spill_namespace(self.config),
+                spill_annotation_namespace=_get_spill_annotation_namespace(self.config, self._dm_dataset),
+                spill_max_size=spill_size,
+            )
+            for subset_name in (self.config.train_subset.subset_name, self.config.val_subset.subset_name):
+                if (dataset := self.subsets.get(subset_name)) is not None:
+                    dataset.fill_mem_cache(shared_handler)
+            log.info(f"Memory cache shared by the spill file: {shared_handler}")
+
+        config = self.config
+        self.config = copy(config)
+        self.config.mem_cache_spill_dir = spill_dir
+        self.config.mem_cache_spill_size = str(spill_size)
+        try:
+            yield
+        finally:
+            self.config = config
+
     def setup(self, stage: str) -> None:
         """Setup for each stage."""
 
@@ -218,6 +318,7 @@ class OTXDataModule(LightningDataModule):
         """Teardown for each stage."""
         # clean up after fit or test
         # called on every process in DDP
+        log.info(f"Memory cache status after {stage}: {self.mem_cache_handler}")
 
     @property
     def hparams_initial(self) -> AttributeDict:
@@ -243,3 +344,24 @@ class OTXDataModule(LightningDataModule):
     def __reduce__(self):
         """Re-initialize object when unpickled."""
         return (self.__class__, (self.task, self.config))
+
+
+def _get_spill_namespace(config: DataModuleConfig) -> str:
+    """Get the spill file namespace. Cached images depend on the resizing, color channel order and decoding."""
+    color_channel = config.image_color_channel
+    decode_backend = config.image_decode_backend
+    return (
+        f"{config.mem_cache_img_max_size}-{getattr(color_channel, 'value', color_channel)}"
+        f"-{getattr(decode_backend, 'value', decode_backend)}"
+    )
+
+
+def _get_spill_annotation_namespace(config: DataModuleConfig, dataset: DmDataset) -> str:
+    """Get the namespace of the annotation payloads in the spill file.
+
+    Decoded annotations, e.g., class maps, depend on the label indices remapped by `pre_filtering`,
+    the ignore index and the annotation files, so that they are not shared across the runs if any of them changes.
+    The images under `data_root` are not hashed, see `DatasetIndex.compute_content_hash()`.
+    """
+    content_hash = DatasetIndex.compute_content_hash(dataset, config.data_root)
+    return f"{content_hash}-{config.data_format}-{config.ignore_index}"
@@ -5,10 +5,15 @@
 
 from __future__ import annotations
 
+import multiprocessing as mp
+import os
 import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 from random import sample
 from typing import TYPE_CHECKING
 
+import numpy as np
 from datumaro.components.annotation import Annotation, Bbox, Polygon
 from datumaro.components.dataset import Dataset as DmDataset
 
@@ -16,7 +21,12 @@ if TYPE_CHECKING:
     from datumaro.components.dataset_base import DatasetItem
 
 
-def pre_filtering(dataset: DmDataset, data_format: str, unannotated_items_ratio: float) -> DmDataset:
+def pre_filtering(
+    dataset: DmDataset,
+    data_format: str,
+    unannotated_items_ratio: float,
+    num_workers: int | None = None,
+) -> DmDataset:
     """Pre-filtering function to filter the dataset based on certain criteria.
 
     Args:
@@ -24,6 +34,8 @@ def pre_filtering(dataset: DmDataset, data_format: str, unannotated_items_ratio:
         data_format (str): The format of the dataset.
         unannotated_items_ratio (float): The ratio of background unannotated items to be used.
             This must be a float between 0 and 1.
+        num_workers (int | None): The number of processes to validate the polygons.
+            If None, it is the number of CPUs.
 
     Returns:
         DmDataset: The filtered dataset.
@@ -31,7 +43,16 @@ def pre_filtering(dataset: DmDataset, data_format: str, unannotated_items_ratio:
     used_background_items = set()
     msg = f"There are empty annotation items in train set, Of these, only {unannotated_items_ratio*100}% are used."
     warnings.warn(msg, stacklevel=2)
-    dataset = DmDataset.filter(dataset, is_valid_annot, filter_annotations=True)
+    dataset, summary = filter_invalid_annotations(dataset, num_workers=num_workers)
+    if summary["bboxes"] > 0:
+        msg = (
+            f"There are {summary['bboxes']} bounding boxes which are not `x1 < x2 and y1 < y2`, "
+            "they will be filtered out before training."
+        )
+        warnings.warn(msg, stacklevel=2)
+    if summary["polygons"] > 0:
+        msg = f"There are {summary['polygons']} invalid polygons, they will be filtered out before training."
+        warnings.warn(msg, stacklevel=2)
     dataset = remove_unused_labels(dataset, data_format)
     if unannotated_items_ratio > 0:
         empty_items = [item.id for item in dataset if item.subset == "train" and len(item.annotations) == 0]
@@ -45,6 +66,128 @@ def pre_filtering(dataset: DmDataset, data_format: str, unannotated_items_ratio:
     )
 
 
+def filter_invalid_annotations(
+    dataset: DmDataset,
+    num_workers: int | None = None,
+    chunk_size: int = 100_000,
+) -> tuple[DmDataset, dict[str, int]]:
+    """Remove the invalid bounding boxes and polygons from the dataset items.
+
+    It gives the same result as `DmDataset.filter(dataset, is_valid_annot, filter_annotations=True)`.
+    The boxes and polygons are gathered into NumPy arrays by a single pass over the dataset
+    and their coordinates are checked in bulk. The polygon chunks are checked across a process pool,
+    where only the polygons having a valid extent are rasterized to check their area.
+    Only the items having invalid annotations are updated.
+
+    Args:
+        dataset (DmDataset): The input dataset to be filtered.
+        num_workers (int | None): The number of processes to validate the polygons.
+            If None, it is the number of CPUs. The polygons are validated in this process
+            if there is only one chunk.
+        chunk_size (int): The number of polygons validated at once.
+
+    Returns:
+        tuple[DmDataset, dict[str, int]]: The filtered dataset and the number of
+            invalid "bboxes", invalid "polygons" and "items" having them.
+    """
+    items: list[DatasetItem] = []
+    bboxes: list[list[float]] = []
+    bbox_locs: list[tuple[int, int]] = []
+    polygons: list[list[float]] = []
+    polygon_locs: list[tuple[int, int]] = []
+    for row, item in enumerate(dataset):
+        items.append(item)
+        for ann_idx, ann in enumerate(item.annotations):
+            if isinstance(ann, Bbox):
+                bboxes.append(ann.points)
+                bbox_locs.append((row, ann_idx))
+            elif isinstance(ann, Polygon):
+                polygons.append(ann.points)
+                polygon_locs.append((row, ann_idx))
+
+    x1, y1, x2, y2 = np.array(bboxes, dtype=np.float64).reshape(-1, 4).T
+    invalid_bboxes = ~((x1 < x2) & (y1 < y2))
+
+    lengths = np.fromiter((len(points) for points in polygons), dtype=np.int64, count=len(polygons))
+    # Polygons having an odd number of coordinates are not valid and not packed into the coordinate array
+    packed = (lengths > 0) & (lengths % 2 == 0)
+    coords = np.fromiter(
+        chain.from_iterable(points for points, is_packed in zip(polygons, packed) if is_packed),
+        dtype=np.float64,
+        count=int(lengths[packed].sum()),
+    )
+    offsets = np.concatenate([[0], np.cumsum(lengths[packed])])
+
+    bounds = np.append(np.arange(0, len(offsets) - 1, chunk_size), len(offsets) - 1)
+    chunks = [
+        (coords[offsets[start] : offsets[end]], offsets[start : end + 1] - offsets[start])
+        for start, end in zip(bounds[:-1], bounds[1:])
+    ]
+    if len(chunks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(num_workers or os.cpu_count() or 1, len(chunks)),
+            mp_context=mp.get_context("spawn"),
+        ) as pool:
+            results = list(pool.map(_validate_polygons, *zip(*chunks)))
+    else:
+        results = [_validate_polygons(*chunk) for chunk in chunks]
+
+    invalid_polygons = ~packed
+    invalid_polygons[packed] = ~np.concatenate([[], *results]).astype(bool)
+
+    invalid_anns: dict[int, set[int]] = {}
+    for locs, invalid in ((bbox_locs, invalid_bboxes), (polygon_locs, invalid_polygons)):
+        for idx in np.flatnonzero(invalid):
+            row, ann_idx = locs[idx]
+            invalid_anns.setdefault(row, set()).add(ann_idx)
+
+    for row, ann_indices in invalid_anns.items():
+        item = items[row]
+        annotations = [ann for ann_idx, ann in enumerate(item.annotations) if ann_idx not in ann_indices]
+        dataset.put(item.wrap(annotations=annotations))
+
+    summary = {
+        "bboxes": int(invalid_bboxes.sum()),
+        "polygons": int(invalid_polygons.sum()),
+        "items": len(invalid_anns),
+    }
+    return dataset, summary
+
+
+def _validate_polygons(coords: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """Check the polygons packed into the flat coordinate array as `is_valid_annot` does.
+
+    The x and y extents are checked by the segment-wise reductions.
+    Only the polygons having the positive extents are rasterized to check their area.
+    Unlike `is_valid_annot`, the polygons lying on the negative side of the axes are invalid instead of an error.
+
+    Args:
+        coords (np.ndarray): Coordinates of the polygons, i.e., [x0, y0, x1, y1, ...] of all polygons.
+        offsets (np.ndarray): Offsets of the polygons in the coordinate array.
+
+    Returns:
+        np.ndarray: Whether each polygon is valid.
+    """
+    from pycocotools import mask as mask_utils
+
+    starts = offsets[:-1] // 2
+    xs, ys = coords[0::2], coords[1::2]
+    x_min, x_max = np.minimum.reduceat(xs, starts), np.maximum.reduceat(xs, starts)
+    y_min, y_max = np.minimum.reduceat(ys, starts), np.maximum.reduceat(ys, starts)
+    valid = (x_min < x_max) & (y_min < y_max)
+    # Polygons lying on the negative side have no area on the canvas, which cannot even be made by pycocotools
+    valid &= (x_max > 0) & (y_max > 0)
+
+    # NOTE: Same as `Polygon.get_area()`, which rasterizes the polygon on the canvas bounded by its bbox
+    for idx in np.flatnonzero(valid):
+        points = coords[offsets[idx] : offsets[idx + 1]].tolist()
+        height = y_min[idx] + (y_max[idx] - y_min[idx])
+        width = x_min[idx] + (x_max[idx] - x_min[idx])
+        valid[idx] = mask_utils.area(mask_utils.frPyObjects([points], float(height), float(width)))[0] > 0
+
+    return valid
+
+
 def is_valid_annot(item: DatasetItem, annotation: Annotation) -> bool:  # noqa: ARG001
     """Return whether DatasetItem's annotation is valid."""
     if isinstance(annotation, Bbox):
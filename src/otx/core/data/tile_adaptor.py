@@ -11,6 +11,7 @@ import numpy as np
 from datumaro import Bbox, Dataset, DatasetSubset, Polygon
 
 from otx.core.config.data import TileConfig
+from otx.core.data.dataset_index import DatasetIndex
 
 
 def compute_robust_statistics(values: np.array) -> dict[str, float]:
@@ -75,6 +76,9 @@ def compute_robust_dataset_statistics(
 ) -> dict[str, Any]:
     """Computes robust statistics of image & annotation sizes.
 
+    If the dataset is registered to `DatasetIndex`, the statistics are computed from the index
+    instead of reading the items.
+
     Args:
         dataset (DatasetSubset): Input dataset.
         ann_stat (bool, optional): Whether to compute annotation size statistics. Defaults to False.
@@ -94,6 +98,14 @@ def compute_robust_dataset_statistics(
     if len(dataset) == 0 or max_samples <= 0:
         return stat
 
+    if (found := DatasetIndex.get(dataset)) is not None:
+        return _compute_robust_dataset_statistics_from_index(
+            dataset,
+            *found,
+            ann_stat=ann_stat,
+            max_samples=max_samples,
+        )
+
     data_ids = [item.id for item in dataset]
     max_image_samples = min(max_samples, len(dataset))
     # NOTE: current OTX does not set seed globally
@@ -141,6 +153,53 @@ def compute_robust_dataset_statistics(
     return stat
 
 
+def _compute_robust_dataset_statistics_from_index(
+    dataset: DatasetSubset,
+    index: DatasetIndex,
+    subset: str | None,
+    ann_stat: bool,
+    max_samples: int,
+) -> dict[str, Any]:
+    """Computes the same statistics as `compute_robust_dataset_statistics()` from the dataset index."""
+    stat: dict = {}
+    rows = index.get_rows(subset)
+    max_image_samples = min(max_samples, len(rows))
+    # NOTE: Sample the items in the same way as reading them from the dataset
+    rng = np.random.default_rng(42)
+    rows = rng.choice(rows, max_image_samples, replace=False)[:max_image_samples]
+
+    heights, widths = index.get_image_sizes(dataset, rows).T
+    stat["image"] = compute_robust_scale_statistics(np.sqrt(widths * heights))
+
+    if ann_stat:
+        num_per_images: list[int] = []
+        size_of_box_shapes: list[float] = []
+        size_of_polygon_shapes: list[float] = []
+        for row in rows:
+            ann_slice = index.get_ann_slice(row)
+            kinds = index.ann_kinds[ann_slice]
+            sizes = np.sqrt(index.ann_areas[ann_slice])
+            box_sizes = sizes[kinds == DatasetIndex.BBOX]
+            polygon_sizes = sizes[kinds == DatasetIndex.POLYGON]
+
+            num_per_images.append(max(len(box_sizes), len(polygon_sizes)))
+
+            if len(size_of_box_shapes) >= max_samples or len(size_of_polygon_shapes) >= max_samples:
+                continue
+
+            size_of_box_shapes.extend(box_sizes[box_sizes >= 1].tolist())
+            size_of_polygon_shapes.extend(polygon_sizes[polygon_sizes >= 1].tolist())
+
+        stat["annotation"] = {
+            "num_per_image": compute_robust_statistics(np.array(num_per_images)),
+            "size_of_shape": compute_robust_scale_statistics(
+                np.array(size_of_polygon_shapes) if len(size_of_polygon_shapes) else np.array(size_of_box_shapes),
+            ),
+        }
+
+    return stat
+
+
 def adapt_tile_config(tile_config: TileConfig, dataset: Dataset) -> None:
     """Config tile parameters.
 
@@ -0,0 +1,315 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Batch transforms applied to the collated batch on the model's device."""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import TYPE_CHECKING, Any, ClassVar, Sequence
+
+import torch
+import torchvision.transforms.v2 as tvt_v2
+from torchvision import tv_tensors
+from torchvision.transforms.v2 import InterpolationMode
+from torchvision.transforms.v2 import functional as F  # noqa: N812
+
+from otx.core.data.entity.base import (
+    OTXBatchDataEntity,
+    _normalize_image_info,
+    _pad_image_info,
+    _resize_image_info,
+)
+from otx.core.data.transform_libs.utils import clip_bboxes, flip_bboxes, rescale_bboxes, rescale_size
+
+if TYPE_CHECKING:
+    from torch import Tensor
+
+__all__ = ["BatchTransform", "BatchResize", "BatchRandomFlip", "BatchPad", "BatchNormalize"]
+
+
+class BatchTransform(tvt_v2.Transform):
+    """Base class of the transforms applied to the whole `OTXBatchDataEntity`.
+
+    They are given by `batch_transforms` of the subset config and applied after the batch is collated
+    and transferred to the model's device, instead of one image at a time in the DataLoader workers.
+    The images can be a stacked tensor or a list of tensors, and the boxes, masks and `ImageInfo`
+    of the batch entity are updated together.
+    """
+
+    def forward(self, *_inputs: OTXBatchDataEntity) -> OTXBatchDataEntity:
+        """Transform the batch."""
+        assert len(_inputs) == 1, "[tmp] Multiple entity is not supported yet."  # noqa: S101
+        return self.transform_batch(_inputs[0])
+
+    def transform_batch(self, batch: OTXBatchDataEntity) -> OTXBatchDataEntity:
+        """Transform the batch."""
+        raise NotImplementedError
+
+    @staticmethod
+    def _check_geometric(batch: OTXBatchDataEntity) -> None:
+        if any(getattr(batch, "polygons", None) or []):
+            msg = "Batch geometric transforms do not support polygons. Use the per-sample transforms instead."
+            raise ValueError(msg)
+
+    @staticmethod
+    def _replace(batch: OTXBatchDataEntity, **changes: Any) -> OTXBatchDataEntity:  # noqa: ANN401
+        # `batch.wrap()` deep-copies all fields by `asdict()`
+        return dataclasses.replace(batch, **changes)
+
+
+class BatchResize(BatchTransform):
+    """Resize the images, boxes and masks of the batch as `Resize` does.
+
+    The stacked images are resized by a single call.
+
+    Args:
+        scale (int | tuple[int, int]): Images scales for resizing with (height, width).
+        keep_ratio (bool): Whether to keep the aspect ratio when resizing the image. Defaults to False.
+        clip_object_border (bool): Whether to clip the objects outside the border of the image. Defaults to True.
+        interpolation (str): Interpolation method, "nearest", "bilinear" or "bicubic". Defaults to "bilinear".
+    """
+
+    def __init__(
+        self,
+        scale: int | Sequence[int],
+        keep_ratio: bool = False,
+        clip_object_border: bool = True,
+        interpolation: str = "bilinear",
+    ) -> None:
+        super().__init__()
+
+        self.scale = (scale, scale) if isinstance(scale, int) else (int(scale[0]), int(scale[1]))
+        self.keep_ratio = keep_ratio
+        self.clip_object_border = clip_object_border
+        self.interpolation = InterpolationMode(interpolation)
+
+    def _get_size(self, img_shape: Sequence[int]) -> tuple[int, int]:
+        if self.keep_ratio:
+            width, height = rescale_size((img_shape[1], img_shape[0]), self.scale)
+            return height, width
+        return self.scale
+
+    def _resize(self, image: Tensor, size: tuple[int, int]) -> Tensor:
+        return tv_tensors.wrap(
+            F.resize(image.as_subclass(torch.Tensor), list(size), interpolation=self.interpolation, antialias=False),
+            like=image,
+        )
+
+    def transform_batch(self, batch: OTXBatchDataEntity) -> OTXBatchDataEntity:
+        """Resize the batch."""
+        self._check_geometric(batch)
+
+        if isinstance(batch.images, list):
+            images = [self._resize(image, self._get_size(image.shape[-2:])) for image in batch.images]
+            img_shapes = [tuple(image.shape[-2:]) for image in batch.images]
+        else:
+            images = self._resize(batch.images, self._get_size(batch.images.shape[-2:]))
+            img_shapes = [tuple(batch.images.shape[-2:])] * batch.batch_size
+        sizes = [tuple(image.shape[-2:]) for image in images]
+
+        changes: dict[str, Any] = {
+            "images": images,
+            "imgs_info": [_resize_image_info(img_info, list(size)) for img_info, size in zip(batch.imgs_info, sizes)],
+        }
+        if (bboxes := getattr(batch, "bboxes", None)) is not None:
+            changes["bboxes"] = []
+            for bbox, img_shape, size in zip(bboxes, img_shapes, sizes):
+                bbox = rescale_bboxes(bbox, (size[1] / img_shape[1], size[0] / img_shape[0]))  # noqa: PLW2901
+                if self.clip_object_border:
+                    bbox = clip_bboxes(bbox, size)  # noqa: PLW2901
+                changes["bboxes"].append(tv_tensors.BoundingBoxes(bbox, format="XYXY", canvas_size=size))
+        if (masks := getattr(batch, "masks", None)) is not None:
+            # The mask kernel always uses the nearest interpolation and handles 2D and empty masks
+            changes["masks"] = [F.resize(tv_tensors.Mask(mask), list(size)) for mask, size in zip(masks, sizes)]
+        return self._replace(batch, **changes)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(scale={self.scale}, keep_ratio={self.keep_ratio}, "
+            f"clip_object_border={self.clip_object_border}, interpolation={self.interpolation.value})"
+        )
+
+
+class BatchRandomFlip(BatchTransform):
+    """Flip the images, boxes and masks of the randomly chosen samples in the batch as `RandomFlip` does.
+
+    The region of `img_shape` is flipped, so that the padding of the images stays on the right and bottom.
+    The stacked images without padding are flipped by a single call.
+
+    Args:
+        prob (float): The flipping probability of each sample. Defaults to 0.5.
+        direction (str): The flipping direction, "horizontal", "vertical" or "diagonal". Defaults to "horizontal".
+    """
+
+    _FLIP_DIMS: ClassVar[dict[str, tuple[int, ...]]] = {"horizontal": (-1,), "vertical": (-2,), "diagonal": (-2, -1)}
+
+    def __init__(self, prob: float = 0.5, direction: str = "horizontal") -> None:
+        super().__init__()
+
+        assert 0 <= prob <= 1, f"The probability should be in range [0,1]. got {prob}."  # noqa: S101
+        assert direction in self._FLIP_DIMS, f"Invalid direction {direction}."  # noqa: S101
+        self.prob = prob
+        self.direction = direction
+
+    def _flip_region(self, tensor: Tensor, img_shape: tuple[int, int]) -> Tensor:
+        if tensor.numel() == 0:
+            return tensor
+        height, width = img_shape
+        flipped = tensor.clone()
+        flipped[..., :height, :width] = tensor[..., :height, :width].flip(self._FLIP_DIMS[self.direction])
+        return flipped
+
+    def transform_batch(self, batch: OTXBatchDataEntity) -> OTXBatchDataEntity:
+        """Flip the batch."""
+        self._check_geometric(batch)
+
+        is_flipped = (torch.rand(batch.batch_size) < self.prob).tolist()
+        if not any(is_flipped):
+            return batch
+        img_shapes = [tuple(img_info.img_shape) for img_info in batch.imgs_info]
+
+        images: list[Tensor] | Tensor
+        if isinstance(batch.images, list):
+            images = [
+                tv_tensors.wrap(self._flip_region(image, img_shape), like=image) if flip else image
+                for image, img_shape, flip in zip(batch.images, img_shapes, is_flipped)
+            ]
+        elif all(img_shape == tuple(batch.images.shape[-2:]) for img_shape in img_shapes):
+            condition = torch.tensor(is_flipped, device=batch.images.device).view(-1, 1, 1, 1)
+            images = tv_tensors.wrap(
+                torch.where(condition, batch.images.flip(self._FLIP_DIMS[self.direction]), batch.images),
+                like=batch.images,
+            )
+        else:
+            images = batch.images.clone()
+            for idx in (idx for idx, flip in enumerate(is_flipped) if flip):
+                images[idx] = self._flip_region(batch.images[idx], img_shapes[idx])
+
+        changes: dict[str, Any] = {"images": images}
+        if (bboxes := getattr(batch, "bboxes", None)) is not None:
+            changes["bboxes"] = [
+                tv_tensors.wrap(flip_bboxes(bbox, img_shape, direction=self.direction), like=bbox) if flip else bbox
+                for bbox, img_shape, flip in zip(bboxes, img_shapes, is_flipped)
+            ]
+        if (masks := getattr(batch, "masks", None)) is not None:
+            changes["masks"] = [
+                tv_tensors.wrap(self._flip_region(mask, img_shape), like=mask) if flip else mask
+                for mask, img_shape, flip in zip(masks, img_shapes, is_flipped)
+            ]
+        return self._replace(batch, **changes)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(prob={self.prob}, direction={self.direction})"
+
+
+class BatchPad(BatchTransform):
+    """Pad the images of the batch on the right and bottom borders and stack them as `Pad` does.
+
+    Unlike `Pad`, all images are padded to the largest padded size in the batch, so that they can be stacked.
+
+    Args:
+        size (tuple[int, int], optional): Fixed padding size (height, width). Defaults to None.
+        size_divisor (int, optional): The divisor of padded size. Defaults to None.
+        pad_to_square (bool): Whether to pad the image into a square. Defaults to False.
+        pad_val (int | float): Padding value of the images. Defaults to 0.
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int] | None = None,
+        size_divisor: int | None = None,
+        pad_to_square: bool = False,
+        pad_val: float = 0,
+    ) -> None:
+        super().__init__()
+
+        if pad_to_square:
+            assert size is None, "The size and size_divisor must be None when pad2square is True"  # noqa: S101
+        else:
+            assert size is not None or size_divisor is not None, "only one of size and size_divisor should be valid"  # noqa: S101
+            assert size is None or size_divisor is None  # noqa: S101
+        self.size = size
+        self.size_divisor = size_divisor
+        self.pad_to_square = pad_to_square
+        self.pad_val = pad_val
+
+    def _get_size(self, img_shape: Sequence[int]) -> tuple[int, int]:
+        height, width = img_shape
+        if self.pad_to_square:
+            height = width = max(height, width)
+        if self.size_divisor is not None:
+            height = -(-height // self.size_divisor) * self.size_divisor
+            width = -(-width // self.size_divisor) * self.size_divisor
+        elif self.size is not None:
+            height, width = self.size
+        return height, width
+
+    def transform_batch(self, batch: OTXBatchDataEntity) -> OTXBatchDataEntity:
+        """Pad the batch."""
+        images = batch.images if isinstance(batch.images, list) else list(batch.images)
+        sizes = [self._get_size(image.shape[-2:]) for image in images]
+        height = max(size[0] for size in sizes)
+        width = max(size[1] for size in sizes)
+
+        paddings = [[0, 0, max(width - image.shape[-1], 0), max(height - image.shape[-2], 0)] for image in images]
+        if isinstance(batch.images, list):
+            padded = torch.stack(
+                [
+                    F.pad(image.as_subclass(torch.Tensor), padding, fill=self.pad_val)
+                    for image, padding in zip(images, paddings)
+                ],
+            )
+        else:
+            padded = F.pad(batch.images.as_subclass(torch.Tensor), paddings[0], fill=self.pad_val)
+
+        return self._replace(
+            batch,
+            images=tv_tensors.Image(padded),
+            imgs_info=[_pad_image_info(img_info, padding) for img_info, padding in zip(batch.imgs_info, paddings)],
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(size={self.size}, size_divisor={self.size_divisor}, "
+            f"pad_to_square={self.pad_to_square}, pad_val={self.pad_val})"
+        )
+
+
+class BatchNormalize(BatchTransform):
+    """Convert the images of the batch to float32 and normalize them.
+
+    It is the same as `ToDtype(torch.float32)` followed by `Normalize(mean, std)`,
+    so that the images are transferred to the device as uint8 and converted there.
+
+    Args:
+        mean (Sequence[float]): Mean values of the channels.
+        std (Sequence[float]): Standard deviation values of the channels.
+    """
+
+    def __init__(self, mean: Sequence[float], std: Sequence[float]) -> None:
+        super().__init__()
+
+        self.mean = list(mean)
+        self.std = list(std)
+
+    def _normalize(self, image: Tensor) -> Tensor:
+        mean = torch.tensor(self.mean, dtype=torch.float32, device=image.device).view(-1, 1, 1)
+        std = torch.tensor(self.std, dtype=torch.float32, device=image.device).view(-1, 1, 1)
+        return tv_tensors.wrap((image.as_subclass(torch.Tensor).float() - mean) / std, like=image)
+
+    def transform_batch(self, batch: OTXBatchDataEntity) -> OTXBatchDataEntity:
+        """Normalize the batch."""
+        images = (
+            [self._normalize(image) for image in batch.images]
+            if isinstance(batch.images, list)
+            else self._normalize(batch.images)
+        )
+        return self._replace(
+            batch,
+            images=images,
+            imgs_info=[_normalize_image_info(img_info, self.mean, self.std) for img_info in batch.imgs_info],
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(mean={self.mean}, std={self.std})"
@@ -0,0 +1,169 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Sample pool placed in shared memory for the mixing transforms."""
+
+from __future__ import annotations
+
+import ctypes as ct
+import multiprocessing as mp
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import numpy as np
+import torch
+from numpy import random
+
+if TYPE_CHECKING:
+    from torch import Tensor
+
+__all__ = ["PooledSample", "SharedSamplePool"]
+
+
+class PooledSample(NamedTuple):
+    """Sample read from the shared sample pool."""
+
+    image: np.ndarray
+    bboxes: Tensor
+    labels: Tensor
+
+
+class SharedSamplePool:
+    """Fixed-size pool of image and box samples placed in shared memory.
+
+    It replaces the per-worker `results_cache` list of `CachedMosaic` and `CachedMixUp`.
+    The pool is allocated when the transform is built in the main process, so that all DataLoader workers
+    inherit it, read and write the same slots and mix the images seen by any worker.
+    Every slot holds an image up to `img_shape` with up to 3 channels and up to `max_bboxes` boxes and labels.
+
+    Writers are serialized by a lock. A slot has a generation counter which is odd while it is written,
+    so that readers copy the slot without the lock and retry if it has been changed in the meantime.
+
+    Args:
+        num_slots (int): Number of samples in the pool.
+        img_shape (tuple[int, int]): The maximum (height, width) of the images.
+        max_bboxes (int): The maximum number of boxes of a sample.
+        random_pop (bool): Whether to overwrite a random sample when the pool is full.
+            If False, the oldest sample is overwritten.
+    """
+
+    MAX_CHANNELS = 3
+    # Number of lock-free read attempts before reading under the lock
+    NUM_READ_RETRIES = 8
+
+    def __init__(
+        self,
+        num_slots: int,
+        img_shape: tuple[int, int] | list[int],
+        max_bboxes: int = 512,
+        random_pop: bool = True,
+    ) -> None:
+        self.num_slots = num_slots
+        self.img_shape = (int(img_shape[0]), int(img_shape[1]))
+        self.max_bboxes = max_bboxes
+        self.random_pop = random_pop
+
+        height, width = self.img_shape
+        self._images_buf = mp.Array(ct.c_uint8, num_slots * height * width * self.MAX_CHANNELS, lock=False)
+        self._bboxes_buf = mp.Array(ct.c_float, num_slots * max_bboxes * 4, lock=False)
+        self._labels_buf = mp.Array(ct.c_int64, num_slots * max_bboxes, lock=False)
+        # [generation, height, width, channels, num_bboxes] per slot, channels is 0 for 2D images
+        self._meta_buf = mp.Array(ct.c_int64, num_slots * 5, lock=False)
+        # [number of filled slots, next slot to overwrite in FIFO order]
+        self._state_buf = mp.Array(ct.c_int64, 2, lock=False)
+        self._lock = mp.Lock()
+        self._init_views()
+
+    def _init_views(self) -> None:
+        height, width = self.img_shape
+        self._images = np.frombuffer(self._images_buf, dtype=np.uint8).reshape(
+            self.num_slots,
+            height,
+            width,
+            self.MAX_CHANNELS,
+        )
+        self._bboxes = np.frombuffer(self._bboxes_buf, dtype=np.float32).reshape(self.num_slots, self.max_bboxes, 4)
+        self._labels = np.frombuffer(self._labels_buf, dtype=np.int64).reshape(self.num_slots, self.max_bboxes)
+        self._meta = np.frombuffer(self._meta_buf, dtype=np.int64).reshape(self.num_slots, 5)
+        self._state = np.frombuffer(self._state_buf, dtype=np.int64)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The views are rebuilt from the shared buffers, which are sent to the spawned workers
+        return {key: value for key, value in self.__dict__.items() if not isinstance(value, np.ndarray)}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_views()
+
+    def __len__(self) -> int:
+        return int(self._state[0])
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the shared buffers in bytes."""
+        return sum(array.nbytes for array in (self._images, self._bboxes, self._labels, self._meta, self._state))
+
+    def num_bboxes(self, index: int) -> int:
+        """Get the number of boxes of the sample in the given slot."""
+        return int(self._meta[index, 4])
+
+    def put(self, image: np.ndarray, bboxes: Tensor, labels: Tensor) -> bool:
+        """Put the sample into the pool.
+
+        Args:
+            image (np.ndarray): HWC or HW uint8 image. It should fit in `img_shape`.
+            bboxes (Tensor): Boxes of the sample.
+            labels (Tensor): Labels of the boxes.
+
+        Returns:
+            bool: False if the sample does not fit in a slot and is not put.
+        """
+        height, width = image.shape[:2]
+        channels = image.shape[2] if image.ndim == 3 else 0
+        if (
+            image.dtype != np.uint8
+            or height > self.img_shape[0]
+            or width > self.img_shape[1]
+            or channels > self.MAX_CHANNELS
+            or len(bboxes) > self.max_bboxes
+        ):
+            return False
+
+        num_bboxes = len(bboxes)
+        with self._lock:
+            num_filled, next_slot = self._state
+            if num_filled < self.num_slots:
+                index = int(num_filled)
+                self._state[0] += 1
+            elif self.random_pop:
+                index = random.randint(0, self.num_slots)
+            else:
+                index = int(next_slot)
+                self._state[1] = (next_slot + 1) % self.num_slots
+
+            self._meta[index, 0] += 1
+            self._images[index, :height, :width, : max(channels, 1)] = image.reshape(height, width, -1)
+            self._bboxes[index, :num_bboxes] = bboxes.numpy(force=True)
+            self._labels[index, :num_bboxes] = labels.numpy(force=True)
+            self._meta[index, 1:] = height, width, channels, num_bboxes
+            self._meta[index, 0] += 1
+        return True
+
+    def get(self, index: int) -> PooledSample:
+        """Get a copy of the sample in the given slot."""
+        for _ in range(self.NUM_READ_RETRIES):
+            generation = self._meta[index, 0]
+            if generation % 2 == 0:
+                sample = self._read(index)
+                if self._meta[index, 0] == generation:
+                    return sample
+        with self._lock:
+            return self._read(index)
+
+    def _read(self, index: int) -> PooledSample:
+        height, width, channels, num_bboxes = self._meta[index, 1:].tolist()
+        image = self._images[index, :height, :width, : max(channels, 1)].copy()
+        return PooledSample(
+            image=image if channels > 0 else image[..., 0],
+            bboxes=torch.from_numpy(self._bboxes[index, :num_bboxes].copy()),
+            labels=torch.from_numpy(self._labels[index, :num_bboxes].copy()),
+        )
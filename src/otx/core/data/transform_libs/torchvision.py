@@ -7,6 +7,7 @@ from __future__ import annotations
 
 import copy
 import math
+import warnings
 from inspect import isclass
 from typing import TYPE_CHECKING, Any, ClassVar, Iterable, Sequence
 
@@ -31,6 +32,8 @@ from otx.core.data.entity.base import (
     _resize_image_info,
     _resized_crop_image_info,
 )
+from otx.core.data.frame_store import FrameClipStore
+from otx.core.data.transform_libs.sample_pool import SharedSamplePool
 from otx.core.data.transform_libs.utils import (
     cache_randomness,
     centers_bboxes,
@@ -161,7 +164,30 @@ class ResizetoLongestEdge(tvt_v2.Transform):
 
 
 class DecodeVideo(tvt_v2.Transform):
-    """Sample video frames from original data video."""
+    """Sample video frames from original data video.
+
+    The number of frames is read from the container metadata and cached per video path, so it is
+    computed once per process instead of decoding the whole video for every sample.
+    Only the sampled frames are decoded, seeking to them when they are far apart.
+    Inputs without a readable file fall back to the frame access of the Datumaro video.
+
+    If a frame clip store built by `FrameClipStore.build()` is given, the frames of the videos
+    in the store are sliced from its memory-mapped arrays instead of being decoded.
+
+    Args:
+        test_mode (bool): Whether to sample the clips deterministically.
+        clip_len (int): Number of frames of each clip. Defaults to 8.
+        frame_interval (int): Interval between the sampled frames. Defaults to 4.
+        num_clips (int): Number of clips to sample. Defaults to 1.
+        out_of_bound_opt (str): How to handle indices past the end of the video, "loop" or "repeat_last".
+            Defaults to "loop".
+        frame_store (str | None): Directory of the frame clip store. Defaults to None.
+    """
+
+    # Number of frames per video path, shared by all instances and kept across epochs
+    _frame_counts: ClassVar[dict[str, int]] = {}
+    # Seek instead of decoding sequentially when the next sampled frame is further than this
+    seek_threshold: int = 16
 
     def __init__(
         self,
@@ -170,6 +196,7 @@ class DecodeVideo(tvt_v2.Transform):
         frame_interval: int = 4,
         num_clips: int = 1,
         out_of_bound_opt: str = "loop",
+        frame_store: str | None = None,
     ) -> None:
         super().__init__()
         self.test_mode = test_mode
@@ -177,10 +204,14 @@ class DecodeVideo(tvt_v2.Transform):
         self.frame_interval = frame_interval
         self.num_clips = num_clips
         self.out_of_bound_opt = out_of_bound_opt
+        self.frame_store = FrameClipStore(frame_store) if frame_store is not None else None
         self._transformed_types = [Video]
 
     def _transform(self, inpt: Video, params: dict) -> tv_tensors.Video:
-        total_frames = self._get_total_frames(inpt)
+        stored_frames = None
+        if self.frame_store is not None and (path := getattr(inpt, "path", None)) is not None:
+            stored_frames = self.frame_store.get(path)
+        total_frames = len(stored_frames) if stored_frames is not None else self._get_total_frames(inpt)
         fps_scale_ratio = 1.0
         ori_clip_len = self._get_ori_clip_len(fps_scale_ratio)
         clip_offsets = self._sample_clips(total_frames, ori_clip_len)
@@ -204,20 +235,73 @@ class DecodeVideo(tvt_v2.Transform):
         start_index = 0
         frame_inds = np.concatenate(frame_inds) + start_index
 
-        outputs = torch.stack([torch.tensor(inpt[idx].data) for idx in frame_inds], dim=0)
+        if stored_frames is not None:
+            outputs = torch.from_numpy(stored_frames[frame_inds].astype(float))
+        else:
+            outputs = torch.stack([torch.tensor(frame) for frame in self._decode_frames(inpt, frame_inds)], dim=0)
         outputs = outputs.permute(0, 3, 1, 2)
         outputs = tv_tensors.Video(outputs)
         inpt.close()
 
         return outputs
 
-    @staticmethod
-    def _get_total_frames(inpt: Video) -> int:
-        length = 0
-        for _ in inpt:
-            length += 1
+    @classmethod
+    def _get_total_frames(cls, inpt: Video) -> int:
+        path = getattr(inpt, "path", None)
+        if path is not None and (length := cls._frame_counts.get(path)) is not None:
+            return length
+
+        cap = cv2.VideoCapture(path) if path is not None else None
+        if cap is None or not cap.isOpened():
+            length = 0
+            for _ in inpt:
+                length += 1
+            return length
+
+        try:
+            length = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            # The metadata can be missing or overestimate the length, check that the last frame exists
+            if length <= 0 or not (cap.set(cv2.CAP_PROP_POS_FRAMES, length - 1) and cap.grab()):
+                cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                length = 0
+                while cap.grab():
+                    length += 1
+        finally:
+            cap.release()
+
+        cls._frame_counts[path] = length
         return length
 
+    def _decode_frames(self, inpt: Video, frame_inds: np.ndarray) -> list[np.ndarray]:
+        """Decode the frames at the given indices, decoding each distinct frame once.
+
+        Frames are returned like the Datumaro video frames, as float BGR arrays.
+        """
+        path = getattr(inpt, "path", None)
+        cap = cv2.VideoCapture(path) if path is not None else None
+        if cap is None or not cap.isOpened():
+            return [inpt[idx].data for idx in frame_inds]
+
+        frames: dict[int, np.ndarray] = {}
+        try:
+            # index of the frame the next read returns
+            pos = 0
+            for idx in np.unique(frame_inds).tolist():
+                if idx < pos or idx - pos > self.seek_threshold:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+                else:
+                    while pos < idx and cap.grab():
+                        pos += 1
+                success, frame = cap.read()
+                if not success:
+                    break
+                frames[idx] = frame.astype(float)
+                pos = idx + 1
+        finally:
+            cap.release()
+
+        return [frames[idx] if idx in frames else inpt[idx].data for idx in frame_inds]
+
     def _get_train_clips(self, num_frames: int, ori_clip_len: float) -> np.array:
         """Get clip offsets in train mode.
 
@@ -1224,6 +1308,27 @@ class RandomAffine(tvt_v2.Transform):
         return np.array([[1, 0.0, x], [0.0, 1, y], [0.0, 0.0, 1.0]], dtype=np.float32)
 
 
+def _fit_to_scale(img: np.ndarray, scale: Sequence[int]) -> tuple[np.ndarray, float]:
+    """Resize the image keeping its ratio to fit in the (H, W) scale and return it with the scale ratio."""
+    h, w = img.shape[:2]
+    scale_ratio = min(scale[0] / h, scale[1] / w)
+    img = cv2.resize(img, (int(w * scale_ratio), int(h * scale_ratio)), interpolation=cv2.INTER_LINEAR)
+    return img, scale_ratio
+
+
+def _warn_pool_rejection(transform: CachedMosaic | CachedMixUp) -> None:
+    """Warn once per transform that the sample is not put into the shared pool and thus is not mixed."""
+    if transform._warned_pool_rejection:  # noqa: SLF001
+        return
+    transform._warned_pool_rejection = True  # noqa: SLF001
+    msg = (
+        f"{transform.__class__.__name__} cannot put the sample into the shared pool, "
+        f"since its image is not uint8 or it has more than {transform.shared_pool.max_bboxes} boxes. "  # type: ignore[union-attr]
+        "Such samples are not mixed. Increase max_pooled_bboxes or disable use_shared_pool if it happens often."
+    )
+    warnings.warn(msg, stacklevel=3)
+
+
 class CachedMosaic(tvt_v2.Transform):
     """Implementation of mmdet.datasets.transforms.CachedMosaic with torchvision format.
 
@@ -1252,6 +1357,11 @@ class CachedMosaic(tvt_v2.Transform):
         random_pop (bool): Whether to randomly pop a result from the cache
             when the cache is full. If set to False, use FIFO popping method.
             Defaults to True.
+        use_shared_pool (bool): Whether to cache the results in the `SharedSamplePool`,
+            which is shared by all DataLoader workers, instead of the per-worker cache.
+            The results are resized to fit `img_scale` before they are cached. Defaults to False.
+        max_pooled_bboxes (int): The maximum number of boxes of a result cached in the shared pool.
+            The results having more boxes are not cached. Defaults to 512.
     """
 
     def __init__(
@@ -1263,6 +1373,8 @@ class CachedMosaic(tvt_v2.Transform):
         prob: float = 1.0,
         max_cached_images: int = 40,
         random_pop: bool = True,
+        use_shared_pool: bool = False,
+        max_pooled_bboxes: int = 512,
     ) -> None:
         super().__init__()
 
@@ -1279,15 +1391,21 @@ class CachedMosaic(tvt_v2.Transform):
         self.random_pop = random_pop
         assert max_cached_images >= 4, f"The length of cache must >= 4, but got {max_cached_images}."  # noqa: S101
         self.max_cached_images = max_cached_images
+        self.shared_pool = (
+            SharedSamplePool(max_cached_images, img_scale, max_bboxes=max_pooled_bboxes, random_pop=random_pop)
+            if use_shared_pool
+            else None
+        )
+        self._warned_pool_rejection = False
 
         self.cnt_cached_images = 0
 
     @cache_randomness
-    def get_indexes(self, cache: list) -> list:
+    def get_indexes(self, cache: list | SharedSamplePool) -> list:
         """Call function to collect indexes.
 
         Args:
-            cache (list): The results cache.
+            cache (list | SharedSamplePool): The results cache.
 
         Returns:
             list: indexes.
@@ -1299,19 +1417,18 @@ class CachedMosaic(tvt_v2.Transform):
         assert len(_inputs) == 1, "[tmp] Multiple entity is not supported yet."  # noqa: S101
         inputs = _inputs[0]
 
-        self.results_cache.append(copy.deepcopy(inputs))
-        if len(self.results_cache) > self.max_cached_images:
-            index = random.randint(0, len(self.results_cache) - 1) if self.random_pop else 0
-            self.results_cache.pop(index)
-
-        if len(self.results_cache) <= 4:
+        cache = self._update_cache(inputs)
+        if len(cache) <= 4:
             return inputs
 
         if random.uniform(0, 1) > self.prob:
             return inputs
 
-        indices = self.get_indexes(self.results_cache)
-        mix_results = [copy.deepcopy(self.results_cache[i]) for i in indices]
+        indices = self.get_indexes(cache)
+        if self.shared_pool is not None:
+            mix_results = [self.shared_pool.get(i) for i in indices]
+        else:
+            mix_results = [copy.deepcopy(self.results_cache[i]) for i in indices]
 
         # TODO (mmdetection): refactor mosaic to reuse these code.
         # https://github.com/open-mmlab/mmdetection/blob/v3.2.0/mmdet/datasets/transforms/transforms.py#L3465
@@ -1338,17 +1455,14 @@ class CachedMosaic(tvt_v2.Transform):
 
         loc_strs = ("top_left", "top_right", "bottom_left", "bottom_right")
         for i, loc in enumerate(loc_strs):
-            results_patch = copy.deepcopy(inputs) if loc == "top_left" else copy.deepcopy(mix_results[i - 1])
+            results_patch = copy.deepcopy(inputs) if loc == "top_left" else mix_results[i - 1]
 
             img_i = to_np_image(results_patch.image)
-            h_i, w_i = img_i.shape[:2]
-            # keep_ratio resize
-            scale_ratio_i = min(self.img_scale[0] / h_i, self.img_scale[1] / w_i)
-            img_i = cv2.resize(
-                img_i,
-                (int(w_i * scale_ratio_i), int(h_i * scale_ratio_i)),
-                interpolation=cv2.INTER_LINEAR,
-            )
+            if loc != "top_left" and self.shared_pool is not None:
+                # pooled results are already resized to fit the scale
+                scale_ratio_i = 1.0
+            else:
+                img_i, scale_ratio_i = _fit_to_scale(img_i, self.img_scale)
 
             # compute the combine parameters
             paste_coord, crop_coord = self._mosaic_combine(loc, center_position, img_i.shape[:2][::-1])
@@ -1389,6 +1503,21 @@ class CachedMosaic(tvt_v2.Transform):
         inputs.labels = mosaic_bboxes_labels
         return inputs
 
+    def _update_cache(self, inputs: DetDataEntity) -> list | SharedSamplePool:
+        """Cache the inputs and return the cache."""
+        if self.shared_pool is not None:
+            img, scale_ratio = _fit_to_scale(to_np_image(inputs.image), self.img_scale)
+            bboxes = rescale_bboxes(inputs.bboxes, (scale_ratio, scale_ratio))
+            if not self.shared_pool.put(img, bboxes, inputs.labels):
+                _warn_pool_rejection(self)
+            return self.shared_pool
+
+        self.results_cache.append(copy.deepcopy(inputs))
+        if len(self.results_cache) > self.max_cached_images:
+            index = random.randint(0, len(self.results_cache) - 1) if self.random_pop else 0
+            self.results_cache.pop(index)
+        return self.results_cache
+
     def _mosaic_combine(
         self,
         loc: str,
@@ -1473,7 +1602,8 @@ class CachedMosaic(tvt_v2.Transform):
         repr_str += f"pad_val={self.pad_val}, "
         repr_str += f"prob={self.prob}, "
         repr_str += f"max_cached_images={self.max_cached_images}, "
-        repr_str += f"random_pop={self.random_pop})"
+        repr_str += f"random_pop={self.random_pop}, "
+        repr_str += f"use_shared_pool={self.shared_pool is not None})"
         return repr_str
 
 
@@ -1509,6 +1639,11 @@ class CachedMixUp(tvt_v2.Transform):
             Defaults to True.
         prob (float): Probability of applying this transformation.
             Defaults to 1.0.
+        use_shared_pool (bool): Whether to cache the results in the `SharedSamplePool`,
+            which is shared by all DataLoader workers, instead of the per-worker cache.
+            The results are resized to fit `img_scale` before they are cached. Defaults to False.
+        max_pooled_bboxes (int): The maximum number of boxes of a result cached in the shared pool.
+            The results having more boxes are not cached. Defaults to 512.
     """
 
     def __init__(
@@ -1522,6 +1657,8 @@ class CachedMixUp(tvt_v2.Transform):
         max_cached_images: int = 20,
         random_pop: bool = True,
         prob: float = 1.0,
+        use_shared_pool: bool = False,
+        max_pooled_bboxes: int = 512,
     ) -> None:
         super().__init__()
 
@@ -1539,21 +1676,27 @@ class CachedMixUp(tvt_v2.Transform):
         self.max_cached_images = max_cached_images
         self.random_pop = random_pop
         self.prob = prob
+        self.shared_pool = (
+            SharedSamplePool(max_cached_images, img_scale, max_bboxes=max_pooled_bboxes, random_pop=random_pop)
+            if use_shared_pool
+            else None
+        )
+        self._warned_pool_rejection = False
 
     @cache_randomness
-    def get_indexes(self, cache: list) -> int:
+    def get_indexes(self, cache: list | SharedSamplePool) -> int:
         """Call function to collect indexes.
 
         Args:
-            cache (list): The result cache.
+            cache (list | SharedSamplePool): The result cache.
 
         Returns:
             int: index.
         """
         for _ in range(self.max_iters):
             index = random.randint(0, len(cache) - 1)
-            gt_bboxes_i = cache[index].bboxes
-            if len(gt_bboxes_i) != 0:
+            num_bboxes = cache.num_bboxes(index) if isinstance(cache, SharedSamplePool) else len(cache[index].bboxes)
+            if num_bboxes != 0:
                 break
         return index
 
@@ -1570,19 +1713,18 @@ class CachedMixUp(tvt_v2.Transform):
         assert len(_inputs) == 1, "[tmp] Multiple entity is not supported yet."  # noqa: S101
         inputs = _inputs[0]
 
-        self.results_cache.append(copy.deepcopy(inputs))
-        if len(self.results_cache) > self.max_cached_images:
-            index = random.randint(0, len(self.results_cache) - 1) if self.random_pop else 0
-            self.results_cache.pop(index)
-
-        if len(self.results_cache) <= 1:
+        cache = self._update_cache(inputs)
+        if len(cache) <= 1:
             return inputs
 
         if random.uniform(0, 1) > self.prob:
             return inputs
 
-        index = self.get_indexes(self.results_cache)
-        retrieve_results = copy.deepcopy(self.results_cache[index])
+        index = self.get_indexes(cache)
+        if self.shared_pool is not None:
+            retrieve_results = self.shared_pool.get(index)
+        else:
+            retrieve_results = copy.deepcopy(self.results_cache[index])
 
         # TODO (mmdetection): refactor mixup to reuse these code.
         # https://github.com/open-mmlab/mmdetection/blob/v3.2.0/mmdet/datasets/transforms/transforms.py#L3721
@@ -1603,12 +1745,11 @@ class CachedMixUp(tvt_v2.Transform):
             out_img = np.ones(self.dynamic_scale, dtype=retrieve_img.dtype) * self.pad_val
 
         # 1. keep_ratio resize
-        scale_ratio = min(self.dynamic_scale[0] / retrieve_img.shape[0], self.dynamic_scale[1] / retrieve_img.shape[1])
-        retrieve_img = cv2.resize(
-            retrieve_img,
-            (int(retrieve_img.shape[1] * scale_ratio), int(retrieve_img.shape[0] * scale_ratio)),
-            interpolation=cv2.INTER_LINEAR,
-        )
+        if self.shared_pool is not None:
+            # pooled results are already resized to fit the scale
+            scale_ratio = 1.0
+        else:
+            retrieve_img, scale_ratio = _fit_to_scale(retrieve_img, self.dynamic_scale)
 
         # 2. paste
         out_img[: retrieve_img.shape[0], : retrieve_img.shape[1]] = retrieve_img
@@ -1679,6 +1820,21 @@ class CachedMixUp(tvt_v2.Transform):
         inputs.labels = mixup_gt_bboxes_labels
         return inputs
 
+    def _update_cache(self, inputs: DetDataEntity) -> list | SharedSamplePool:
+        """Cache the inputs and return the cache."""
+        if self.shared_pool is not None:
+            img, scale_ratio = _fit_to_scale(to_np_image(inputs.image), self.dynamic_scale)
+            bboxes = rescale_bboxes(inputs.bboxes, (scale_ratio, scale_ratio))
+            if not self.shared_pool.put(img, bboxes, inputs.labels):
+                _warn_pool_rejection(self)
+            return self.shared_pool
+
+        self.results_cache.append(copy.deepcopy(inputs))
+        if len(self.results_cache) > self.max_cached_images:
+            index = random.randint(0, len(self.results_cache) - 1) if self.random_pop else 0
+            self.results_cache.pop(index)
+        return self.results_cache
+
     def __repr__(self):
         repr_str = self.__class__.__name__
         repr_str += f"(dynamic_scale={self.dynamic_scale}, "
@@ -1689,7 +1845,8 @@ class CachedMixUp(tvt_v2.Transform):
         repr_str += f"bbox_clip_border={self.bbox_clip_border}, "
         repr_str += f"max_cached_images={self.max_cached_images}, "
         repr_str += f"random_pop={self.random_pop}, "
-        repr_str += f"prob={self.prob})"
+        repr_str += f"prob={self.prob}, "
+        repr_str += f"use_shared_pool={self.shared_pool is not None})"
         return repr_str
 
 
@@ -1904,6 +2061,16 @@ class TorchVisionTransformLib:
 
         return tvt_v2.Compose(transforms)
 
+    @classmethod
+    def generate_batch(cls, config: SubsetConfig) -> Compose | None:
+        """Generate the batch transforms from the configuration. Return None if there is no batch transform."""
+        if not config.batch_transforms:
+            return None
+        if isinstance(config.batch_transforms, tvt_v2.Compose):
+            return config.batch_transforms
+
+        return tvt_v2.Compose([cls._dispatch_transform(cfg_transform) for cfg_transform in config.batch_transforms])
+
     @classmethod
     def _dispatch_transform(cls, cfg_transform: DictConfig | dict | tvt_v2.Transform) -> tvt_v2.Transform:
         if isinstance(cfg_transform, (DictConfig, dict)):
@@ -3,6 +3,7 @@
 #
 """Demo based on ModelAPI."""
 
+import logging as log
 import sys
 from argparse import SUPPRESS, ArgumentParser
 from pathlib import Path
@@ -65,6 +66,24 @@ def build_argparser() -> ArgumentParser:
         default="CPU",
         type=str,
     )
+    args.add_argument(
+        "--pipelined",
+        help="Optional. Run decoding, inference and rendering on separate threads for async inference.",
+        default=False,
+        action="store_true",
+    )
+    args.add_argument(
+        "--drop_frames",
+        help="Optional. Drop frames when inference cannot keep up with the input in the pipelined mode.",
+        default=False,
+        action="store_true",
+    )
+    args.add_argument(
+        "--shared_memory",
+        help="Optional. Decode the input on a separate process and pass the frames through shared memory.",
+        default=False,
+        action="store_true",
+    )
     args.add_argument(
         "--output",
         default="./outputs/model_visualization",
@@ -84,6 +103,7 @@ EXECUTORS = {
 def main() -> int:
     """Main function that is used to run demo."""
     args = build_argparser().parse_args()
+    log.basicConfig(format="[ %(levelname)s ] %(message)s", level=log.INFO, stream=sys.stdout)
 
     if args.loop and args.output:
         msg = "--loop and --output cannot be both specified"
@@ -97,7 +117,16 @@ def main() -> int:
     visualizer = create_visualizer(model.task_type, model.labels, no_show=args.no_show, output=args.output)
 
     # create inferencer and run
-    demo = inferencer(model, visualizer)
+    if args.inference_type == "async":
+        demo = inferencer(
+            model,
+            visualizer,
+            pipelined=args.pipelined,
+            drop_frames=args.drop_frames,
+            shared_memory=args.shared_memory,
+        )
+    else:
+        demo = inferencer(model, visualizer, shared_memory=args.shared_memory)
     demo.run(args.input, args.loop and not args.no_show)
 
     return 0
@@ -5,36 +5,119 @@
 
 from __future__ import annotations
 
+import contextlib
+import logging as log
+import queue
+import threading
 import time
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable
 
 from openvino.model_api.pipelines import AsyncPipeline
 
 if TYPE_CHECKING:
     import numpy as np
     from demo_package.model_wrapper import ModelWrapper
+    from demo_package.streamer import BaseStreamer
 
 
 from demo_package.streamer import get_streamer
 from demo_package.visualizers import BaseVisualizer, dump_frames
 
+# Marks the end of the stream in the pipeline queues
+_END_OF_STREAM = object()
+_POLL_INTERVAL = 0.01
+
+
+class StageCounter:
+    """Latency and queue depth counters of a single pipeline stage.
+
+    Args:
+        name (str): name of the stage
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.num_frames = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.total_queue_depth = 0
+        self.max_queue_depth = 0
+        self.num_dropped = 0
+
+    def update(self, latency: float, queue_depth: int) -> None:
+        """Record a processed frame.
+
+        Args:
+            latency (float): time spent on the frame by the stage, in seconds
+            queue_depth (int): number of frames waiting in the stage output queue
+        """
+        self.num_frames += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        self.total_queue_depth += queue_depth
+        self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+
+    @property
+    def mean_latency(self) -> float:
+        """Mean latency of the stage in seconds."""
+        return self.total_latency / self.num_frames if self.num_frames else 0.0
+
+    @property
+    def mean_queue_depth(self) -> float:
+        """Mean depth of the stage output queue."""
+        return self.total_queue_depth / self.num_frames if self.num_frames else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.num_frames} frames, {self.num_dropped} dropped, "
+            f"latency mean {self.mean_latency * 1e3:.1f} ms / max {self.max_latency * 1e3:.1f} ms, "
+            f"queue depth mean {self.mean_queue_depth:.1f} / max {self.max_queue_depth}"
+        )
+
 
 class AsyncExecutor:
     """Async inferencer.
 
+    By default, decoding, submission, waiting and rendering all run on the calling thread.
+    In the pipelined mode, frames are decoded and inferred on background threads connected
+    to the renderer by bounded queues, so rendering does not block new submissions.
+
     Args:
         model: model for inference
         visualizer: visualizer of inference results
+        pipelined: run decode and infer stages on separate threads. Defaults to False.
+        queue_size: capacity of the queues between the pipeline stages. Defaults to 4.
+        drop_frames: drop the oldest decoded frame instead of waiting when the infer stage
+            cannot keep up. Useful for live streams. Defaults to False.
+        shared_memory: decode the input on a separate process and pass the frames through shared memory.
+            The frames are copied when submitted, since they outlive the shared memory slot. Defaults to False.
     """
 
-    def __init__(self, model: ModelWrapper, visualizer: BaseVisualizer) -> None:
+    def __init__(
+        self,
+        model: ModelWrapper,
+        visualizer: BaseVisualizer,
+        pipelined: bool = False,
+        queue_size: int = 4,
+        drop_frames: bool = False,
+        shared_memory: bool = False,
+    ) -> None:
         self.model = model
         self.visualizer = visualizer
         self.async_pipeline = AsyncPipeline(self.model.core_model)
+        self.pipelined = pipelined
+        self.queue_size = queue_size
+        self.drop_frames = drop_frames
+        self.shared_memory = shared_memory
+        self.counters: dict[str, StageCounter] = {}
 
     def run(self, input_stream: int | str, loop: bool = False) -> None:
         """Async inference for input stream (image, video stream, camera)."""
-        streamer = get_streamer(input_stream, loop)
+        if self.pipelined:
+            self.run_pipelined(input_stream, loop)
+            return
+
+        streamer = self._get_streamer(input_stream, loop)
         next_frame_id = 0
         next_frame_id_to_show = 0
         stop_visualization = False
@@ -55,7 +138,8 @@ class AsyncExecutor:
                 results = self.async_pipeline.get_result(next_frame_id_to_show)
             if stop_visualization:
                 break
-            self.async_pipeline.submit_data(frame, next_frame_id, {"frame": frame})
+            kept_frame = self._keep(frame)
+            self.async_pipeline.submit_data(kept_frame, next_frame_id, {"frame": kept_frame})
             next_frame_id += 1
         self.async_pipeline.await_all()
         for next_id in range(next_frame_id_to_show, next_frame_id):
@@ -72,8 +156,157 @@ class AsyncExecutor:
             self.visualizer.video_delay(time.perf_counter() - start_time, streamer)
         dump_frames(saved_frames, self.visualizer.output, input_stream, streamer)
 
+    def run_pipelined(self, input_stream: int | str, loop: bool = False) -> None:
+        """Async inference with decode, infer and render stages running concurrently.
+
+        The streamer is read on a decode thread and the infer requests are fed and collected
+        on an infer thread, while the calling thread renders the results in frame order.
+        Per-stage counters are logged at the end of the run and kept in ``self.counters``.
+        """
+        streamer = self._get_streamer(input_stream, loop)
+        frames: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        results: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop_event = threading.Event()
+        self.counters = {name: StageCounter(name) for name in ("decode", "infer", "render")}
+        errors: list[BaseException] = []
+
+        def run_stage(target: Callable[..., None], *args) -> threading.Thread:
+            def wrapper() -> None:
+                try:
+                    target(*args)
+                except BaseException as error:
+                    errors.append(error)
+                    stop_event.set()
+
+            thread = threading.Thread(target=wrapper, daemon=True)
+            thread.start()
+            return thread
+
+        threads = [
+            run_stage(self._decode_stage, streamer, frames, stop_event),
+            run_stage(self._infer_stage, frames, results, stop_event),
+        ]
+        saved_frames = []
+        try:
+            while True:
+                item = _get(results, stop_event)
+                if item is _END_OF_STREAM:
+                    break
+                start_time = time.perf_counter()
+                output = self.render_result(item)
+                self.visualizer.show(output)
+                if self.visualizer.output:
+                    saved_frames.append(output)
+                self.counters["render"].update(time.perf_counter() - start_time, results.qsize())
+                if self.visualizer.is_quit():
+                    break
+                # visualize video not faster than the original FPS
+                self.visualizer.video_delay(time.perf_counter() - start_time, streamer)
+        finally:
+            stop_event.set()
+            for thread in threads:
+                thread.join()
+            for counter in self.counters.values():
+                log.info(counter)
+        if errors:
+            raise errors[0]
+        dump_frames(saved_frames, self.visualizer.output, input_stream, streamer)
+
+    def _decode_stage(self, streamer: BaseStreamer, frames: queue.Queue, stop_event: threading.Event) -> None:
+        """Read frames from the streamer into the frames queue."""
+        counter = self.counters["decode"]
+        start_time = time.perf_counter()
+        for raw_frame in streamer:
+            if stop_event.is_set():
+                return
+            latency = time.perf_counter() - start_time
+            frame = self._keep(raw_frame)
+            if self.drop_frames:
+                while not _put_nowait(frames, frame):
+                    # Drop the stalest frame to keep the latency of a live stream low
+                    with contextlib.suppress(queue.Empty):
+                        frames.get_nowait()
+                        counter.num_dropped += 1
+            elif not _put(frames, frame, stop_event):
+                return
+            counter.update(latency, frames.qsize())
+            start_time = time.perf_counter()
+        _put(frames, _END_OF_STREAM, stop_event)
+
+    def _infer_stage(self, frames: queue.Queue, results: queue.Queue, stop_event: threading.Event) -> None:
+        """Keep the infer requests busy and pass the results to the renderer in frame order."""
+        counter = self.counters["infer"]
+        submit_times: dict[int, float] = {}
+        next_frame_id = 0
+        next_frame_id_to_show = 0
+        end_of_stream = False
+        while not stop_event.is_set():
+            result = self.async_pipeline.get_result(next_frame_id_to_show)
+            if result:
+                if not _put(results, result, stop_event):
+                    return
+                counter.update(
+                    time.perf_counter() - submit_times.pop(next_frame_id_to_show),
+                    results.qsize(),
+                )
+                next_frame_id_to_show += 1
+                continue
+
+            if end_of_stream:
+                if next_frame_id_to_show == next_frame_id:
+                    break
+                self.async_pipeline.await_all()
+            elif self.async_pipeline.is_ready():
+                try:
+                    frame = frames.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if frame is _END_OF_STREAM:
+                    end_of_stream = True
+                    continue
+                submit_times[next_frame_id] = time.perf_counter()
+                self.async_pipeline.submit_data(frame, next_frame_id, {"frame": frame})
+                next_frame_id += 1
+            else:
+                self.async_pipeline.await_any()
+        self.async_pipeline.await_all()
+        _put(results, _END_OF_STREAM, stop_event)
+
+    def _get_streamer(self, input_stream: int | str, loop: bool) -> BaseStreamer:
+        return get_streamer(input_stream, loop, threaded=self.shared_memory, shared_memory=self.shared_memory)
+
+    def _keep(self, frame: np.ndarray) -> np.ndarray:
+        """Copy the frame out of the shared memory slot, which is reused after the next frame is requested."""
+        return frame.copy() if self.shared_memory else frame
+
     def render_result(self, results: tuple[Any, dict]) -> np.ndarray:
         """Render for results of inference."""
         predictions, frame_meta = results
         current_frame = frame_meta["frame"]
         return self.visualizer.draw(current_frame, predictions)
+
+
+def _put(buffer: queue.Queue, item: Any, stop_event: threading.Event) -> bool:  # noqa: ANN401
+    """Put the item into the queue, giving up when the pipeline is stopped."""
+    while not stop_event.is_set():
+        with contextlib.suppress(queue.Full):
+            buffer.put(item, timeout=_POLL_INTERVAL)
+            return True
+    return False
+
+
+def _put_nowait(buffer: queue.Queue, item: Any) -> bool:  # noqa: ANN401
+    """Put the item into the queue if there is a free slot."""
+    try:
+        buffer.put_nowait(item)
+    except queue.Full:
+        return False
+    return True
+
+
+def _get(buffer: queue.Queue, stop_event: threading.Event) -> Any:  # noqa: ANN401
+    """Get an item from the queue, returning the end of stream when the pipeline is stopped."""
+    while not stop_event.is_set():
+        with contextlib.suppress(queue.Empty):
+            return buffer.get(timeout=_POLL_INTERVAL)
+    return _END_OF_STREAM
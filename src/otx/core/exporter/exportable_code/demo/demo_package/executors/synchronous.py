@@ -22,15 +22,18 @@ class SyncExecutor:
     Args:
         model (ModelContainer): model for inference
         visualizer (Visualizer): visualizer of inference results. Defaults to None.
+        shared_memory (bool): decode the input on a separate process and pass the frames
+            through shared memory. Defaults to False.
     """
 
-    def __init__(self, model: ModelWrapper, visualizer: BaseVisualizer) -> None:
+    def __init__(self, model: ModelWrapper, visualizer: BaseVisualizer, shared_memory: bool = False) -> None:
         self.model = model
         self.visualizer = visualizer
+        self.shared_memory = shared_memory
 
     def run(self, input_stream: int | str, loop: bool = False) -> None:
         """Run demo using input stream (image, video stream, camera)."""
-        streamer = get_streamer(input_stream, loop)
+        streamer = get_streamer(input_stream, loop, threaded=self.shared_memory, shared_memory=self.shared_memory)
         saved_frames = []
 
         for frame in streamer:
@@ -40,7 +43,8 @@ class SyncExecutor:
             output = self.visualizer.draw(frame, predictions)
             self.visualizer.show(output)
             if output is not None:
-                saved_frames.append(output)
+                # The frame drawn in place is reused by the next frame of the shared memory streamer
+                saved_frames.append(output.copy() if self.shared_memory else output)
             if self.visualizer.is_quit():
                 break
             # visualize video not faster than the original FPS
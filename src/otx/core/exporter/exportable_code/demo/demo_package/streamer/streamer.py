@@ -11,14 +11,14 @@ import multiprocessing
 import os
 import queue
 import sys
+import uuid
 from enum import Enum
+from multiprocessing import resource_tracker, shared_memory
 from pathlib import Path
-from typing import TYPE_CHECKING, Iterator
-
-if TYPE_CHECKING:
-    import numpy as np
+from typing import Iterator
 
 import cv2
+import numpy as np
 
 
 class MediaType(Enum):
@@ -79,11 +79,62 @@ def _process_run(streamer: BaseStreamer, buffer: multiprocessing.Queue) -> None:
         buffer.put(frame)
 
 
+def _shared_memory_process_run(
+    streamer: BaseStreamer,
+    prefix: str,
+    free_slots: multiprocessing.Queue,
+    ready_slots: multiprocessing.Queue,
+) -> None:
+    """Private function that writes frames into the shared memory ring buffer.
+
+    Each frame is copied into a free slot and only the slot index and the frame layout
+    are sent to the consumer. A slot is (re)allocated when the frame does not fit into it.
+
+    streamer (BaseStreamer): The streamer to retrieve frames from
+    prefix (str): Prefix of the shared memory slot names
+    free_slots (multiprocessing.Queue): Indices of the slots that can be written
+    ready_slots (multiprocessing.Queue): Indices and layouts of the slots holding a frame
+    """
+    slots: dict[int, shared_memory.SharedMemory] = {}
+    try:
+        for raw_frame in streamer:
+            slot = free_slots.get()
+            frame = np.ascontiguousarray(raw_frame)
+            shm = slots.get(slot)
+            if shm is None or shm.size < frame.nbytes:
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+                shm = slots[slot] = shared_memory.SharedMemory(
+                    name=f"{prefix}_{slot}",
+                    create=True,
+                    size=max(frame.nbytes, 1),
+                )
+            np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)[...] = frame
+            ready_slots.put((slot, frame.shape, frame.dtype.str))
+    finally:
+        for shm in slots.values():
+            shm.close()
+
+
+def _close_shared_memory(shm: shared_memory.SharedMemory) -> None:
+    """Close the shared memory handle unless a yielded frame still references its buffer.
+
+    In that case the mapping is released together with the last frame referencing it.
+    """
+    with contextlib.suppress(BufferError):
+        shm.close()
+
+
 class ThreadedStreamer(BaseStreamer):
     """Runs a BaseStreamer on a separate thread.
 
     streamer (BaseStreamer): The streamer to run on a thread
     buffer_size (int): Number of frame to buffer internally. Defaults to 2.
+    shared_memory (bool): Pass frames through a ring buffer of shared memory slots instead of
+        pickling them through a queue. Yielded frames are views into the ring buffer, which stay
+        valid only until the next frame is requested; copy a frame to keep it longer.
+        Defaults to False.
 
     Example:
         >>> streamer = VideoStreamer(path="../demo.mp4")
@@ -92,9 +143,10 @@ class ThreadedStreamer(BaseStreamer):
         ...    pass
     """
 
-    def __init__(self, streamer: BaseStreamer, buffer_size: int = 2) -> None:
+    def __init__(self, streamer: BaseStreamer, buffer_size: int = 2, shared_memory: bool = False) -> None:
         self.buffer_size = buffer_size
         self.streamer = streamer
+        self.shared_memory = shared_memory
 
     def __iter__(self) -> Iterator[np.ndarray]:
         """Get frames from streamer and yield them.
@@ -102,6 +154,10 @@ class ThreadedStreamer(BaseStreamer):
         Yields:
             Iterator[np.ndarray]: Yield the image or video frame.
         """
+        if self.shared_memory:
+            yield from self._iter_shared_memory()
+            return
+
         buffer: multiprocessing.Queue = multiprocessing.Queue(maxsize=self.buffer_size)
         process = multiprocessing.Process(target=_process_run, args=(self.streamer, buffer))
         # Make thread a daemon so that it will exit when the main program exits as well
@@ -115,11 +171,65 @@ class ThreadedStreamer(BaseStreamer):
         except GeneratorExit:
             process.terminate()
         finally:
-            process.join(timeout=0.1)
-            # The kill() function is only available in Python 3.7.
-            # Skip it if running an older Python version.
-            if sys.version_info >= (3, 7) and process.exitcode is None:
-                process.kill()
+            self._stop_process(process)
+
+    def _iter_shared_memory(self) -> Iterator[np.ndarray]:
+        """Get frames from the shared memory ring buffer and yield them without copying.
+
+        One slot more than the buffer size is allocated, so the producer can fill the whole
+        buffer while the consumer still holds the last yielded frame.
+        """
+        num_slots = self.buffer_size + 1
+        prefix = f"otx_streamer_{uuid.uuid4().hex[:16]}"
+        free_slots: multiprocessing.Queue = multiprocessing.Queue()
+        ready_slots: multiprocessing.Queue = multiprocessing.Queue(maxsize=num_slots)
+        for slot in range(num_slots):
+            free_slots.put(slot)
+
+        # Share a single resource tracker with the producer, otherwise the producer's tracker
+        # would unlink the slots as soon as the producer exits.
+        resource_tracker.ensure_running()
+        process = multiprocessing.Process(
+            target=_shared_memory_process_run,
+            args=(self.streamer, prefix, free_slots, ready_slots),
+        )
+        process.daemon = True
+        process.start()
+
+        slots: dict[int, shared_memory.SharedMemory] = {}
+        try:
+            with contextlib.suppress(queue.Empty):
+                while process.is_alive() or not ready_slots.empty():
+                    slot, shape, dtype = ready_slots.get(timeout=0.1)
+                    nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+                    shm = slots.get(slot)
+                    if shm is None or shm.size < nbytes:
+                        # The producer has reallocated the slot for a larger frame
+                        if shm is not None:
+                            _close_shared_memory(shm)
+                        shm = slots[slot] = shared_memory.SharedMemory(name=f"{prefix}_{slot}")
+                    try:
+                        yield np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+                    finally:
+                        free_slots.put(slot)
+        except GeneratorExit:
+            process.terminate()
+        finally:
+            self._stop_process(process)
+            # The slots are unlinked here rather than by the producer, which may have been terminated
+            for slot in range(num_slots):
+                with contextlib.suppress(FileNotFoundError):
+                    shm = slots.get(slot) or shared_memory.SharedMemory(name=f"{prefix}_{slot}")
+                    shm.unlink()
+                    _close_shared_memory(shm)
+
+    @staticmethod
+    def _stop_process(process: multiprocessing.Process) -> None:
+        process.join(timeout=0.1)
+        # The kill() function is only available in Python 3.7.
+        # Skip it if running an older Python version.
+        if sys.version_info >= (3, 7) and process.exitcode is None:
+            process.kill()
 
     def get_type(self) -> MediaType:
         """Get type of internal streamer.
@@ -315,6 +425,7 @@ def get_streamer(
     input_stream: str,
     loop: bool = False,
     threaded: bool = False,
+    shared_memory: bool = False,
 ) -> BaseStreamer:
     """Get streamer object based on the file path or camera device index provided.
 
@@ -322,6 +433,8 @@ def get_streamer(
         input_stream (str): Path to file or directory or index for camera.
         loop (bool): Enable reading the input in a loop. Defaults to False.
         threaded (bool): Run streaming on a separate thread. Threaded streaming option. Defaults to False.
+        shared_memory (bool): Pass the frames of the threaded streaming through shared memory.
+            Yielded frames are valid only until the next frame is requested. Defaults to False.
 
     Returns:
         BaseStreamer: Streamer object.
@@ -331,12 +444,12 @@ def get_streamer(
     for reader in streamer_types:
         try:
             streamer = reader(input_stream, loop)  # type: ignore [abstract]
-            return ThreadedStreamer(streamer) if threaded else streamer
+            return ThreadedStreamer(streamer, shared_memory=shared_memory) if threaded else streamer
         except RuntimeError as error:  # noqa: PERF203
             errors.append(error)
     try:
         streamer = CameraStreamer(input_stream)
-        return ThreadedStreamer(streamer) if threaded else streamer
+        return ThreadedStreamer(streamer, shared_memory=shared_memory) if threaded else streamer
     except RuntimeError as error:
         errors.append(error)
 
@@ -8,6 +8,7 @@ from __future__ import annotations
 import logging
 
 import numpy as np
+import torch
 from torch import Tensor
 from torchmetrics import Metric
 
@@ -69,41 +70,69 @@ def bounding_box_intersection_over_union(
     return iou
 
 
+def _to_box_array(boxes: list[tuple] | np.ndarray) -> np.ndarray:
+    """Convert the list of boxes to the float array of shape [num_boxes, 4] having (x1, y1, x2, y2)."""
+    if isinstance(boxes, np.ndarray):
+        return boxes[:, :4].astype(np.float64)
+    return np.array([box[:4] for box in boxes], dtype=np.float64).reshape(-1, 4)
+
+
 def get_iou_matrix(
-    ground_truth: list[tuple],
-    predicted: list[tuple],
+    ground_truth: list[tuple] | np.ndarray,
+    predicted: list[tuple] | np.ndarray,
 ) -> np.ndarray:
     """Constructs an iou matrix of shape [num_ground_truth_boxes, num_predicted_boxes].
 
     Each cell(x,y) in the iou matrix contains the intersection over union of ground truth box(x) and predicted box(y)
-    An iou matrix corresponds to a single image
+    An iou matrix corresponds to a single image.
+    It is computed by broadcasting over the box arrays in the same way as `bounding_box_intersection_over_union`.
 
     Args:
-        ground_truth (list[tuple]): list of ground truth boxes.
+        ground_truth (list[tuple] | np.ndarray): list of ground truth boxes.
             Each box is a list of (x,y) coordinates and a label.
             a box: [x1: float, y1, x2, y2, class: str, score: float]
             boxes_per_image: [box1, box2, …]
             boxes1: [boxes_per_image_1, boxes_per_image_2, boxes_per_image_3, …]
-        predicted (list[tuple]): list of predicted boxes.
+        predicted (list[tuple] | np.ndarray): list of predicted boxes.
             Each box is a list of (x,y) coordinates and a label.
             a box: [x1: float, y1, x2, y2, class: str, score: float]
             boxes_per_image: [box1, box2, …]
             boxes2: [boxes_per_image_1, boxes_per_image_2, boxes_per_image_3, …]
 
+    Raises:
+        ValueError: In case the IoU is outside of [0.0, 1.0]
+
     Returns:
         np.ndarray: IoU matrix of shape [ground_truth_boxes, predicted_boxes]
     """
-    return np.array(
-        [[bounding_box_intersection_over_union(gts, preds) for preds in predicted] for gts in ground_truth],
-    )
+    gt_boxes = _to_box_array(ground_truth)[:, None, :]
+    pred_boxes = _to_box_array(predicted)[None, :, :]
+
+    x_left = np.maximum(gt_boxes[..., 0], pred_boxes[..., 0])
+    y_top = np.maximum(gt_boxes[..., 1], pred_boxes[..., 1])
+    x_right = np.minimum(gt_boxes[..., 2], pred_boxes[..., 2])
+    y_bottom = np.minimum(gt_boxes[..., 3], pred_boxes[..., 3])
+
+    intersection_area = (x_right - x_left) * (y_bottom - y_top)
+    bb1_area = (gt_boxes[..., 2] - gt_boxes[..., 0]) * (gt_boxes[..., 3] - gt_boxes[..., 1])
+    bb2_area = (pred_boxes[..., 2] - pred_boxes[..., 0]) * (pred_boxes[..., 3] - pred_boxes[..., 1])
+    union_area = bb1_area + bb2_area - intersection_area
+
+    overlapped = (x_right > x_left) & (y_bottom > y_top) & (union_area != 0)
+    iou = np.divide(intersection_area, union_area, out=np.zeros_like(intersection_area), where=overlapped)
+
+    if np.any((iou < 0.0) | (iou > 1.0)):
+        msg = f"intersection over union should be in range [0,1], actual={iou[(iou < 0.0) | (iou > 1.0)][0]}"
+        raise ValueError(msg)
+    return iou
 
 
 def get_n_false_negatives(iou_matrix: np.ndarray, iou_threshold: float) -> int:
     """Get the number of false negatives inside the IoU matrix for a given threshold.
 
-    The first loop accounts for all the ground truth boxes which do not have a high enough iou with any predicted
+    The first term accounts for all the ground truth boxes which do not have a high enough iou with any predicted
     box (they go undetected)
-    The second loop accounts for the much rarer case where two ground truth boxes are detected by the same predicted
+    The second term accounts for the much rarer case where two ground truth boxes are detected by the same predicted
     box. The principle is that each ground truth box requires a unique prediction box
 
     Args:
@@ -113,14 +142,9 @@ def get_n_false_negatives(iou_matrix: np.ndarray, iou_threshold: float) -> int:
     Returns:
         int: Number of false negatives
     """
-    n_false_negatives = 0
-    for row in iou_matrix:
-        if max(row) < iou_threshold:
-            n_false_negatives += 1
-    for column in np.rot90(iou_matrix):
-        indices = np.where(column > iou_threshold)
-        n_false_negatives += max(len(indices[0]) - 1, 0)
-    return n_false_negatives
+    n_undetected = np.count_nonzero(iou_matrix.max(axis=1) < iou_threshold)
+    n_shared = np.maximum(np.count_nonzero(iou_matrix > iou_threshold, axis=0) - 1, 0).sum()
+    return int(n_undetected + n_shared)
 
 
 class _Metrics:
@@ -245,6 +269,8 @@ class _FMeasureCalculator:
         self.confidence_range = [0.025, 1.0, 0.025]
         self.nms_range = [0.1, 1, 0.05]
         self.default_confidence_threshold = 0.35
+        self._class_ious_cache: dict[str, list[tuple[np.ndarray, np.ndarray, np.ndarray]]] = {}
+        self._labels: set[str] | None = None
 
     def evaluate_detections(
         self,
@@ -272,12 +298,52 @@ class _FMeasureCalculator:
         Returns:
             _OverallResults: _OverallResults object with the result statistics (e.g F-measure).
         """
+        return self.evaluate_counters(
+            classes=classes,
+            counters_per_confidence=self.get_counters_per_confidence(classes, iou_threshold),
+            counters_per_nms=(
+                self.get_counters_per_nms(classes, iou_threshold, cross_class_nms)
+                if result_based_nms_threshold
+                else None
+            ),
+        )
+
+    def evaluate_counters(
+        self,
+        classes: list[str],
+        counters_per_confidence: np.ndarray,
+        counters_per_nms: np.ndarray | None = None,
+        num_images: int | None = None,
+    ) -> _OverallResults:
+        """Evaluates the counters given by `get_counters_per_confidence` and `get_counters_per_nms`.
+
+        The counters are additive over images, so the counters of several calculators can be summed
+        before being evaluated here.
+
+        Args:
+            classes (list[str]): Names of classes to be evaluated.
+            counters_per_confidence (np.ndarray): Counters for each confidence threshold in confidence_range.
+            counters_per_nms (np.ndarray | None): Counters for each NMS threshold in nms_range.
+                If it is None, NMS thresholds are not examined. Defaults to None.
+            num_images (int | None): Number of images the counters are computed from.
+                Defaults to None, which means the images of this calculator.
+
+        Returns:
+            _OverallResults: _OverallResults object with the result statistics (e.g F-measure).
+        """
+        if num_images is None:
+            num_images = len(self.ground_truth_boxes_per_image)
+        if num_images == 0:
+            logger.warning("No ground truth images supplied for f-measure calculation.")
+
         best_f_measure_per_class = {}
 
-        results_per_confidence = self.get_results_per_confidence(
+        results_per_confidence = self.__get_aggregated_results(
             classes=classes,
-            confidence_range=self.confidence_range,
-            iou_threshold=iou_threshold,
+            thresholds=np.arange(*self.confidence_range),
+            counters=counters_per_confidence,
+            num_images=num_images,
+            best_threshold=0.1,
         )
 
         best_f_measure = results_per_confidence.best_f_measure
@@ -287,12 +353,14 @@ class _FMeasureCalculator:
 
         results_per_nms: _AggregatedResults | None = None
 
-        if result_based_nms_threshold:
-            results_per_nms = self.get_results_per_nms(
+        if counters_per_nms is not None:
+            results_per_nms = self.__get_aggregated_results(
                 classes=classes,
-                iou_threshold=iou_threshold,
+                thresholds=np.arange(*self.nms_range),
+                counters=counters_per_nms,
+                num_images=num_images,
                 min_f_measure=results_per_confidence.best_f_measure,
-                cross_class_nms=cross_class_nms,
+                best_threshold=0.5,
             )
 
             for class_name in classes:
@@ -305,6 +373,43 @@ class _FMeasureCalculator:
             best_f_measure,
         )
 
+    def get_counters_per_confidence(self, classes: list[str], iou_threshold: float = 0.5) -> np.ndarray:
+        """Returns the counters of each class for each confidence threshold in confidence_range.
+
+        Args:
+            classes (list[str]): Names of classes to be evaluated.
+            iou_threshold (float): IoU threshold to use for false negatives. Defaults to 0.5.
+
+        Returns:
+            np.ndarray: Counters of shape [3, classes, confidence_thresholds], which has the number of
+                false negatives, true boxes and predicted boxes along the first axis.
+        """
+        return self.__get_counters(classes, iou_threshold, np.arange(*self.confidence_range))
+
+    def get_counters_per_nms(
+        self,
+        classes: list[str],
+        iou_threshold: float = 0.5,
+        cross_class_nms: bool = False,
+    ) -> np.ndarray:
+        """Returns the counters of each class for each NMS threshold in nms_range.
+
+        Args:
+            classes (list[str]): Names of classes to be evaluated.
+            iou_threshold (float): IoU threshold to use for false negatives. Defaults to 0.5.
+            cross_class_nms (bool): Set to True to perform NMS between boxes with different classes. Defaults to False.
+
+        Returns:
+            np.ndarray: Counters of shape [3, classes, nms_thresholds], which has the number of
+                false negatives, true boxes and predicted boxes along the first axis.
+        """
+        return self.__get_counters(
+            classes,
+            iou_threshold,
+            np.arange(*self.nms_range),
+            critical_nms_per_image=self.__get_critical_nms(cross_class_nms),
+        )
+
     def get_results_per_confidence(
         self,
         classes: list[str],
@@ -324,26 +429,14 @@ class _FMeasureCalculator:
         Returns:
             _AggregatedResults: _AggregatedResults object with the result statistics (e.g F-measure).
         """
-        result = _AggregatedResults(classes)
-        result.best_threshold = 0.1
-
-        for confidence_threshold in np.arange(*confidence_range):
-            result_point = self.evaluate_classes(
-                classes=classes.copy(),
-                iou_threshold=iou_threshold,
-                confidence_threshold=confidence_threshold,
-            )
-            all_classes_f_measure = result_point[ALL_CLASSES_NAME].f_measure
-            result.all_classes_f_measure_curve.append(all_classes_f_measure)
-
-            for class_name in classes:
-                result.f_measure_curve[class_name].append(result_point[class_name].f_measure)
-                result.precision_curve[class_name].append(result_point[class_name].precision)
-                result.recall_curve[class_name].append(result_point[class_name].recall)
-            if all_classes_f_measure > 0.0 and all_classes_f_measure >= result.best_f_measure:
-                result.best_f_measure = all_classes_f_measure
-                result.best_threshold = confidence_threshold
-        return result
+        confidence_thresholds = np.arange(*confidence_range)
+        return self.__get_aggregated_results(
+            classes=classes,
+            thresholds=confidence_thresholds,
+            counters=self.__get_counters(classes, iou_threshold, confidence_thresholds),
+            num_images=len(self.ground_truth_boxes_per_image),
+            best_threshold=0.1,
+        )
 
     def get_results_per_nms(
         self,
@@ -356,8 +449,9 @@ class _FMeasureCalculator:
 
         First, we calculate the critical nms of each box, meaning the nms_threshold
         that would cause it to be disappear
-        This is an expensive O(n**2) operation, however, doing this makes filtering for every single nms_threshold much
-        faster at O(n)
+        Only the boxes above the default confidence threshold are evaluated, so only those boxes need their
+        critical nms. Doing this makes it possible to sweep every nms_threshold in one pass over the sorted
+        critical nms values.
 
         Args:
             classes (list[str]): list of classes
@@ -368,39 +462,14 @@ class _FMeasureCalculator:
         Returns:
             _AggregatedResults: Object containing the results for each NMS threshold value
         """
-        result = _AggregatedResults(classes)
-        result.best_f_measure = min_f_measure
-        result.best_threshold = 0.5
-
-        critical_nms_per_image = self.__get_critical_nms(self.prediction_boxes_per_image, cross_class_nms)
-
-        for nms_threshold in np.arange(*self.nms_range):
-            predicted_boxes_per_image_per_nms = self.__filter_nms(
-                self.prediction_boxes_per_image,
-                critical_nms_per_image,
-                nms_threshold,
-            )
-            boxes_pair_for_nms = _FMeasureCalculator(
-                self.ground_truth_boxes_per_image,
-                predicted_boxes_per_image_per_nms,
-            )
-            result_point = boxes_pair_for_nms.evaluate_classes(
-                classes=classes.copy(),
-                iou_threshold=iou_threshold,
-                confidence_threshold=self.default_confidence_threshold,
-            )
-            all_classes_f_measure = result_point[ALL_CLASSES_NAME].f_measure
-            result.all_classes_f_measure_curve.append(all_classes_f_measure)
-
-            for class_name in classes:
-                result.f_measure_curve[class_name].append(result_point[class_name].f_measure)
-                result.precision_curve[class_name].append(result_point[class_name].precision)
-                result.recall_curve[class_name].append(result_point[class_name].recall)
-
-            if all_classes_f_measure > 0.0 and all_classes_f_measure >= result.best_f_measure:
-                result.best_f_measure = all_classes_f_measure
-                result.best_threshold = nms_threshold
-        return result
+        return self.__get_aggregated_results(
+            classes=classes,
+            thresholds=np.arange(*self.nms_range),
+            counters=self.get_counters_per_nms(classes, iou_threshold, cross_class_nms),
+            num_images=len(self.ground_truth_boxes_per_image),
+            min_f_measure=min_f_measure,
+            best_threshold=0.5,
+        )
 
     def evaluate_classes(
         self,
@@ -418,26 +487,13 @@ class _FMeasureCalculator:
         Returns:
             dict[str, _Metrics]: The metrics (e.g. F-measure) for each class.
         """
-        result: dict[str, _Metrics] = {}
-
-        all_classes_counters = _ResultCounters(0, 0, 0)
-
         if ALL_CLASSES_NAME in classes:
             classes.remove(ALL_CLASSES_NAME)
-        for class_name in classes:
-            metrics, counters = self.get_f_measure_for_class(
-                class_name=class_name,
-                iou_threshold=iou_threshold,
-                confidence_threshold=confidence_threshold,
-            )
-            result[class_name] = metrics
-            all_classes_counters.n_false_negatives += counters.n_false_negatives
-            all_classes_counters.n_true += counters.n_true
-            all_classes_counters.n_predicted += counters.n_predicted
-
-        # for all classes
-        result[ALL_CLASSES_NAME] = all_classes_counters.calculate_f_measure()
-        return result
+        return self.__get_result_points(
+            classes=classes,
+            counters=self.__get_counters(classes, iou_threshold, np.array([confidence_threshold])),
+            num_images=len(self.ground_truth_boxes_per_image),
+        )[0]
 
     def get_f_measure_for_class(
         self,
@@ -447,9 +503,6 @@ class _FMeasureCalculator:
     ) -> tuple[_Metrics, _ResultCounters]:
         """Get f_measure for specific class, iou threshold, and confidence threshold.
 
-        In order to reduce the number of redundant iterations and allow for cleaner, more general code later on,
-        all boxes are filtered at this stage by class and predicted boxes are filtered by confidence threshold
-
         Args:
             class_name (str): Name of the class for which the F measure is computed
             iou_threshold (float): IoU threshold
@@ -459,93 +512,237 @@ class _FMeasureCalculator:
             tuple[_Metrics, _ResultCounters]: a structure containing the statistics (e.g. f_measure) and a structure
             containing the intermediated counters used to derive the stats (e.g. num. false positives)
         """
-        class_ground_truth_boxes_per_image = self.__filter_class(self.ground_truth_boxes_per_image, class_name)
-        confidence_predicted_boxes_per_image = self.__filter_confidence(
-            self.prediction_boxes_per_image,
-            confidence_threshold,
-        )
-        class_predicted_boxes_per_image = self.__filter_class(confidence_predicted_boxes_per_image, class_name)
-        if len(class_ground_truth_boxes_per_image) > 0:
-            boxes_pair_per_class = _FMeasureCalculator(
-                ground_truth_boxes_per_image=class_ground_truth_boxes_per_image,
-                prediction_boxes_per_image=class_predicted_boxes_per_image,
-            )
-            result_counters = boxes_pair_per_class.get_counters(iou_threshold=iou_threshold)
-            result_metrics = result_counters.calculate_f_measure()
-            results = (result_metrics, result_counters)
-        else:
+        if len(self.ground_truth_boxes_per_image) == 0:
             logger.warning("No ground truth images supplied for f-measure calculation.")
             # [f_measure, precision, recall, n_false_negatives, n_true, n_predicted]
-            results = (_Metrics(0.0, 0.0, 0.0), _ResultCounters(0, 0, 0))
-        return results
+            return (_Metrics(0.0, 0.0, 0.0), _ResultCounters(0, 0, 0))
+
+        n_false_negatives, n_true, n_predicted = self.__get_counters(
+            [class_name],
+            iou_threshold,
+            np.array([confidence_threshold]),
+        )[:, 0, 0].tolist()
+        result_counters = _ResultCounters(n_false_negatives, n_true, n_predicted)
+        return (result_counters.calculate_f_measure(), result_counters)
 
     @staticmethod
-    def __get_critical_nms(
-        boxes_per_image: list[list[tuple]],
-        cross_class_nms: bool = False,
-    ) -> list[list[float]]:
-        """Return list of critical NMS values for each box in each image.
+    def __get_aggregated_results(
+        classes: list[str],
+        thresholds: np.ndarray,
+        counters: np.ndarray,
+        num_images: int,
+        min_f_measure: float = 0.0,
+        best_threshold: float = 0.0,
+    ) -> _AggregatedResults:
+        """Returns the curves of f_measure, precision and recall, and the threshold giving the best f_measure.
+
+        Args:
+            classes (list[str]): Names of classes to be evaluated.
+            thresholds (np.ndarray): Thresholds the counters are computed for.
+            counters (np.ndarray): Counters of shape [3, classes, thresholds].
+            num_images (int): Number of images the counters are computed from.
+            min_f_measure (float): the minimum F-measure required to select a threshold. Defaults to 0.0.
+            best_threshold (float): the threshold returned if no threshold is selected. Defaults to 0.0.
+
+        Returns:
+            _AggregatedResults: _AggregatedResults object with the result statistics (e.g F-measure).
+        """
+        result = _AggregatedResults(classes)
+        result.best_f_measure = min_f_measure
+        result.best_threshold = best_threshold
+
+        result_points = _FMeasureCalculator.__get_result_points(classes, counters, num_images)
+        for threshold, result_point in zip(thresholds, result_points):
+            all_classes_f_measure = result_point[ALL_CLASSES_NAME].f_measure
+            result.all_classes_f_measure_curve.append(all_classes_f_measure)
+
+            for class_name in classes:
+                result.f_measure_curve[class_name].append(result_point[class_name].f_measure)
+                result.precision_curve[class_name].append(result_point[class_name].precision)
+                result.recall_curve[class_name].append(result_point[class_name].recall)
+            if all_classes_f_measure > 0.0 and all_classes_f_measure >= result.best_f_measure:
+                result.best_f_measure = all_classes_f_measure
+                result.best_threshold = threshold
+        return result
+
+    @staticmethod
+    def __get_result_points(
+        classes: list[str],
+        counters: np.ndarray,
+        num_images: int,
+    ) -> list[dict[str, _Metrics]]:
+        """Returns dict of f_measure, precision and recall for each class for each threshold.
+
+        Args:
+            classes (list[str]): list of classes to be evaluated.
+            counters (np.ndarray): Counters of shape [3, classes, thresholds].
+            num_images (int): Number of images the counters are computed from.
+
+        Returns:
+            list[dict[str, _Metrics]]: The metrics (e.g. F-measure) for each class for each threshold.
+        """
+        class_names = [class_name for class_name in classes if class_name != ALL_CLASSES_NAME]
+        results = []
+        for n_false_negatives, n_true, n_predicted in zip(*counters.transpose(0, 2, 1).tolist()):
+            result: dict[str, _Metrics] = {}
+            for class_name, *class_counters in zip(class_names, n_false_negatives, n_true, n_predicted):
+                result[class_name] = (
+                    _ResultCounters(*class_counters).calculate_f_measure()
+                    if num_images > 0
+                    else _Metrics(0.0, 0.0, 0.0)
+                )
+
+            # for all classes
+            result[ALL_CLASSES_NAME] = _ResultCounters(
+                sum(n_false_negatives),
+                sum(n_true),
+                sum(n_predicted),
+            ).calculate_f_measure()
+            results.append(result)
+        return results
+
+    def __get_counters(
+        self,
+        classes: list[str],
+        iou_threshold: float,
+        thresholds: np.ndarray,
+        critical_nms_per_image: list[np.ndarray] | None = None,
+    ) -> np.ndarray:
+        """Return counts of false negatives, true boxes and predicted boxes of each class for each threshold.
+
+        A predicted box is kept if its score is higher than the confidence threshold or, if critical_nms_per_image
+        is given, if its score is higher than the default confidence threshold and its critical nms is lower than
+        the nms threshold. Both cases are mapped to a sort key which has to be higher than the threshold,
+        so all thresholds are evaluated with one sort of the predicted boxes:
+            - n_predicted is the number of boxes whose key is higher than the threshold.
+            - A ground truth box is undetected if the highest key among the boxes matching it is not higher than
+              the threshold.
+            - A kept box matching several ground truth boxes adds the extra ones as false negatives,
+              which is summed over the kept boxes with a cumulative sum.
+
+        Args:
+            classes (list[str]): Names of classes for which the counters are computed
+            iou_threshold (float): IoU threshold
+            thresholds (np.ndarray): Confidence thresholds, or NMS thresholds if critical_nms_per_image is given.
+            critical_nms_per_image (list[np.ndarray] | None): Critical NMS of each predicted box in each image.
+                Defaults to None.
+
+        Returns:
+            np.ndarray: Counters of shape [3, classes, thresholds], which has the number of
+                false negatives, true boxes and predicted boxes along the first axis.
+        """
+        class_names = [class_name for class_name in classes if class_name != ALL_CLASSES_NAME]
+        counters = np.zeros((3, len(class_names), len(thresholds)), dtype=np.int64)
+        sweep_thresholds = thresholds if critical_nms_per_image is None else -thresholds
+
+        for class_idx, class_name in enumerate(class_names):
+            if class_name.lower() not in self.__get_labels():
+                continue
+            n_true = 0
+            keys_per_image = []
+            best_keys_per_image = []
+            n_shared_per_image = []
+            for image_idx, (iou_matrix, scores, prediction_indices) in enumerate(self.__get_class_ious(class_name)):
+                if critical_nms_per_image is None:
+                    keys = scores
+                else:
+                    keys = np.where(
+                        scores > self.default_confidence_threshold,
+                        -critical_nms_per_image[image_idx][prediction_indices],
+                        -np.inf,
+                    )
+                n_true += iou_matrix.shape[0]
+                keys_per_image.append(keys)
+                best_keys_per_image.append(
+                    np.where(iou_matrix >= iou_threshold, keys, -np.inf).max(axis=1, initial=-np.inf),
+                )
+                n_shared_per_image.append(np.maximum(np.count_nonzero(iou_matrix > iou_threshold, axis=0) - 1, 0))
+
+            keys = np.concatenate(keys_per_image)
+            order = np.argsort(keys, kind="stable")
+            n_dropped = np.searchsorted(keys[order], sweep_thresholds, side="right")
+            n_shared_kept = np.append(np.cumsum(np.concatenate(n_shared_per_image)[order][::-1])[::-1], 0)
+            n_undetected = np.searchsorted(np.sort(np.concatenate(best_keys_per_image)), sweep_thresholds, side="right")
+
+            counters[0, class_idx] = n_undetected + n_shared_kept[n_dropped]
+            counters[1, class_idx] = n_true
+            counters[2, class_idx] = len(keys) - n_dropped
+        return counters
+
+    def __get_labels(self) -> set[str]:
+        """Return the lower-cased labels of all ground truth and predicted boxes."""
+        if self._labels is None:
+            self._labels = {
+                box[4].lower()
+                for boxes_per_image in (self.ground_truth_boxes_per_image, self.prediction_boxes_per_image)
+                for boxes in boxes_per_image
+                for box in boxes
+            }
+        return self._labels
+
+    def __get_class_ious(self, class_name: str) -> list[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """Return the IoU matrix, the prediction scores and the prediction indices of one class for each image.
+
+        The IoU matrices do not depend on the thresholds, so they are computed once per class.
+
+        Args:
+            class_name (str): Name of the class for which the IoU matrices are computed
+
+        Returns:
+            list[tuple[np.ndarray, np.ndarray, np.ndarray]]: (IoU matrix of shape [ground_truth_boxes,
+                predicted_boxes], scores of shape [predicted_boxes], indices of the predicted boxes in the image)
+                for each image.
+        """
+        key = class_name.lower()
+        if key not in self._class_ious_cache:
+            class_ious_per_image = []
+            for ground_truth_boxes, predicted_boxes in zip(
+                self.__filter_class(self.ground_truth_boxes_per_image, class_name),
+                self.prediction_boxes_per_image,
+            ):
+                prediction_indices = np.array(
+                    [idx for idx, box in enumerate(predicted_boxes) if box[4].lower() == key],
+                    dtype=np.int64,
+                )
+                class_predicted_boxes = [predicted_boxes[idx] for idx in prediction_indices]
+                iou_matrix = get_iou_matrix(ground_truth_boxes, class_predicted_boxes)
+                scores = np.array([float(box[5]) for box in class_predicted_boxes], dtype=np.float64)
+                class_ious_per_image.append((iou_matrix, scores, prediction_indices))
+            self._class_ious_cache[key] = class_ious_per_image
+        return self._class_ious_cache[key]
+
+    def __get_critical_nms(self, cross_class_nms: bool = False) -> list[np.ndarray]:
+        """Return critical NMS values for each predicted box in each image.
 
         Maps each predicted box to the highest nms-threshold which would suppress that box, aka the smallest
         nms_threshold before the box disappears.
-        Having these values allows us to later filter by nms-threshold in O(n) rather than O(n**2)
         Highest losing iou, holds the value of the highest iou that a box has with any
         other box of the same class and higher confidence score.
+        Boxes below the default confidence threshold are never evaluated, and they cannot suppress
+        the boxes above it, so their critical nms is left as 0.
 
         Args:
-            boxes_per_image (list[list[tuple]]): list of predicted boxes per
-                image.
-                a box: [x1: float, y1, x2, y2, class: str, score: float]
-                boxes_per_image: [box1, box2, …]
             cross_class_nms (bool): Whether to use cross class NMS.
 
         Returns:
-            list[list[float]]: list of critical NMS values for each box in each image.
+            list[np.ndarray]: Critical NMS values for each box in each image.
         """
         critical_nms_per_image = []
-        for boxes in boxes_per_image:
-            critical_nms_per_box = []
-            for box1 in boxes:
-                highest_losing_iou = 0.0
-                for box2 in boxes:
-                    iou = bounding_box_intersection_over_union(box1, box2)
-                    if (
-                        (cross_class_nms or box1[4] == box2[4])
-                        and box1[5] < box2[5]  # type: ignore[operator]
-                        and iou > highest_losing_iou
-                    ):
-                        highest_losing_iou = iou
-                critical_nms_per_box.append(highest_losing_iou)
-            critical_nms_per_image.append(critical_nms_per_box)
+        for boxes in self.prediction_boxes_per_image:
+            scores = np.array([float(box[5]) for box in boxes], dtype=np.float64)
+            critical_nms = np.zeros(len(boxes), dtype=np.float64)
+            candidates = np.flatnonzero(scores > self.default_confidence_threshold)
+            if len(candidates) > 0:
+                candidate_boxes = [boxes[idx] for idx in candidates]
+                losing = scores[candidates][:, None] < scores[candidates][None, :]
+                if not cross_class_nms:
+                    labels = np.array([box[4] for box in candidate_boxes], dtype=object)
+                    losing &= labels[:, None] == labels[None, :]
+                iou_matrix = get_iou_matrix(candidate_boxes, candidate_boxes)
+                critical_nms[candidates] = np.where(losing, iou_matrix, 0.0).max(axis=1)
+            critical_nms_per_image.append(critical_nms)
         return critical_nms_per_image
 
-    @staticmethod
-    def __filter_nms(
-        boxes_per_image: list[list[tuple]],
-        critical_nms: list[list[float]],
-        nms_threshold: float,
-    ) -> list[list[tuple]]:
-        """Filters out predicted boxes whose critical nms is higher than the given nms_threshold.
-
-        Args:
-            boxes_per_image (list[list[tuple]]): list of boxes per image.
-                a box: [x1: float, y1, x2, y2, class: str, score: float]
-                boxes_per_image: [box1, box2, …]
-            critical_nms (list[list[float]]): list of list of critical nms for each box in each image
-            nms_threshold (float): NMS threshold used for filtering
-
-        Returns:
-            list[list[tuple]]: list of list of filtered boxes in each image
-        """
-        new_boxes_per_image = []
-        for boxes, boxes_nms in zip(boxes_per_image, critical_nms):
-            new_boxes = []
-            for box, nms in zip(boxes, boxes_nms):
-                if nms < nms_threshold:
-                    new_boxes.append(box)
-            new_boxes_per_image.append(new_boxes)
-        return new_boxes_per_image
-
     @staticmethod
     def __filter_class(
         boxes_per_image: list[list[tuple]],
@@ -566,29 +763,6 @@ class _FMeasureCalculator:
             filtered_boxes_per_image.append(filtered_boxes)
         return filtered_boxes_per_image
 
-    @staticmethod
-    def __filter_confidence(
-        boxes_per_image: list[list[tuple]],
-        confidence_threshold: float,
-    ) -> list[list[tuple]]:
-        """Filters boxes to only keep ones with higher confidence than a given confidence threshold.
-
-        Args:
-            boxes_per_image (list[list[tuple]]):
-                a box: [x1: float, y1, x2, y2, class: str, score: float]
-                boxes_per_image: [box1, box2, …]
-            confidence_threshold (float): Confidence threshold
-
-        Returns:
-            list[list[tuple]]: Boxes with higher confidence than the given
-                threshold.
-        """
-        filtered_boxes_per_image = []
-        for boxes in boxes_per_image:
-            filtered_boxes = [box for box in boxes if float(box[5]) > confidence_threshold]
-            filtered_boxes_per_image.append(filtered_boxes)
-        return filtered_boxes_per_image
-
     def get_counters(self, iou_threshold: float) -> _ResultCounters:
         """Return counts of true positives, false positives and false negatives for a given iou threshold.
 
@@ -639,6 +813,9 @@ class FMeasure(Metric):
             values. Defaults to False.
         cross_class_nms (bool): Whether non-max suppression should be applied cross-class. If True this will eliminate
             boxes with sufficient overlap even if they are from different classes. Defaults to False.
+        streaming (bool): If True, each batch is reduced in `update()` to the counters of each class for each
+            confidence (and NMS) threshold instead of keeping every box until `compute()`.
+            The counters are synced across processes by summing them. Defaults to False.
     """
 
     def __init__(
@@ -647,10 +824,12 @@ class FMeasure(Metric):
         *,
         vary_nms_threshold: bool = False,
         cross_class_nms: bool = False,
+        streaming: bool = False,
     ):
         super().__init__()
         self.vary_nms_threshold = vary_nms_threshold
         self.cross_class_nms = cross_class_nms
+        self.streaming = streaming
         self.label_info: LabelInfo = label_info
 
         self._f_measure_per_confidence: dict | None = None
@@ -659,6 +838,22 @@ class FMeasure(Metric):
         self._best_nms_threshold: float | None = None
         self._f_measure = float("-inf")
 
+        if self.streaming:
+            calculator = _FMeasureCalculator([], [])
+            num_classes = len(self.classes)
+            self.add_state("num_images", default=torch.tensor(0), dist_reduce_fx="sum")
+            self.add_state(
+                "counters_per_confidence",
+                default=torch.zeros((3, num_classes, len(np.arange(*calculator.confidence_range))), dtype=torch.long),
+                dist_reduce_fx="sum",
+            )
+            if self.vary_nms_threshold:
+                self.add_state(
+                    "counters_per_nms",
+                    default=torch.zeros((3, num_classes, len(np.arange(*calculator.nms_range))), dtype=torch.long),
+                    dist_reduce_fx="sum",
+                )
+
         self.reset()
 
     def reset(self) -> None:
@@ -672,8 +867,10 @@ class FMeasure(Metric):
 
     def update(self, preds: list[dict[str, Tensor]], target: list[dict[str, Tensor]]) -> None:
         """Update total predictions and targets from given batch predicitons and targets."""
+        preds_per_image = []
+        targets_per_image = []
         for pred, tget in zip(preds, target):
-            self.preds.append(
+            preds_per_image.append(
                 [
                     (*box, self.classes[label], score)
                     for box, label, score in zip(
@@ -683,13 +880,31 @@ class FMeasure(Metric):
                     )
                 ],
             )
-            self.targets.append(
+            targets_per_image.append(
                 [
                     (*box, self.classes[label], 0.0)
                     for box, label in zip(tget["boxes"].tolist(), tget["labels"].tolist())
                 ],
             )
 
+        if not self.streaming:
+            self.preds.extend(preds_per_image)
+            self.targets.extend(targets_per_image)
+            return
+
+        boxes_pair = _FMeasureCalculator(targets_per_image, preds_per_image)
+        self.num_images += len(targets_per_image)
+        self.counters_per_confidence += torch.from_numpy(
+            boxes_pair.get_counters_per_confidence(classes=self.classes),
+        ).to(self.counters_per_confidence.device)
+        if self.vary_nms_threshold:
+            self.counters_per_nms += torch.from_numpy(
+                boxes_pair.get_counters_per_nms(
+                    classes=self.classes,
+                    cross_class_nms=self.cross_class_nms,
+                ),
+            ).to(self.counters_per_nms.device)
+
     def compute(self, best_confidence_threshold: float | None = None) -> dict:
         """Compute f1 score metric.
 
@@ -698,12 +913,21 @@ class FMeasure(Metric):
                 If this value is None, then FMeasure will find best confidence threshold and
                 store it as member variable. Defaults to None.
         """
-        boxes_pair = _FMeasureCalculator(self.targets, self.preds)
-        result = boxes_pair.evaluate_detections(
-            result_based_nms_threshold=self.vary_nms_threshold,
-            classes=self.classes,
-            cross_class_nms=self.cross_class_nms,
-        )
+        if self.streaming:
+            boxes_pair = _FMeasureCalculator([], [])
+            result = boxes_pair.evaluate_counters(
+                classes=self.classes,
+                counters_per_confidence=self.counters_per_confidence.cpu().numpy(),
+                counters_per_nms=self.counters_per_nms.cpu().numpy() if self.vary_nms_threshold else None,
+                num_images=int(self.num_images),
+            )
+        else:
+            boxes_pair = _FMeasureCalculator(self.targets, self.preds)
+            result = boxes_pair.evaluate_detections(
+                result_based_nms_threshold=self.vary_nms_threshold,
+                classes=self.classes,
+                cross_class_nms=self.cross_class_nms,
+            )
         self._f_measure_per_label = {label: result.best_f_measure_per_class[label] for label in self.classes}
 
         if best_confidence_threshold is not None:
@@ -785,3 +1009,10 @@ def _f_measure_callable(label_info: LabelInfo) -> FMeasure:
 
 
 FMeasureCallable = _f_measure_callable
+
+
+def _streaming_f_measure_callable(label_info: LabelInfo) -> FMeasure:
+    return FMeasure(label_info=label_info, streaming=True)
+
+
+StreamingFMeasureCallable = _streaming_f_measure_callable
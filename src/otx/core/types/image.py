@@ -18,6 +18,18 @@ class ImageColorChannel(str, Enum):
     BGR = "BGR"
 
 
+class ImageDecodeBackend(str, Enum):
+    """ImageDecodeBackend definition.
+
+    DATUMARO decodes the images in full resolution by Datumaro's PIL backend.
+    PIL_DRAFT decodes the JPEG files by PIL in the draft mode, i.e., in reduced resolution
+    if the images are resized to `mem_cache_img_max_size` after decoding.
+    """
+
+    DATUMARO = "datumaro"
+    PIL_DRAFT = "pil_draft"
+
+
 class ImageType(IntEnum):
     """Enum to indicate the image type in `ImageInfo` class."""
 
@@ -6,7 +6,6 @@
 from __future__ import annotations
 
 from abc import abstractmethod
-from collections import defaultdict
 from typing import Generic
 
 import cv2
@@ -43,25 +42,7 @@ class TileMerge(Generic[T_OTXDataEntity, T_OTXBatchPredEntity]):
         self.tile_size = tile_config.tile_size
         self.iou_threshold = tile_config.iou_threshold
         self.max_num_instances = tile_config.max_num_instances
-
-    @abstractmethod
-    def _merge_entities(
-        self,
-        img_info: ImageInfo,
-        entities: list[T_OTXDataEntity],
-        explain_mode: bool = False,
-    ) -> T_OTXDataEntity:
-        """Merge tile predictions to one single full-size prediction data entity.
-
-        Args:
-            img_info (ImageInfo): Image information about the original image before tiling.
-            entities (list[T_OTXDataEntity]): List of tile prediction entities.
-            explain_mode (bool): Whether or not tiles have explain features. Default: False.
-
-        Returns:
-            T_OTXDataEntity: Merged prediction entity.
-        """
-        raise NotImplementedError
+        self._img_ids: dict[str, int] = {}
 
     @abstractmethod
     def merge(
@@ -77,29 +58,74 @@ class TileMerge(Generic[T_OTXDataEntity, T_OTXBatchPredEntity]):
         """
         raise NotImplementedError
 
-    def nms_postprocess(
+    def _get_img_idx(self, tile_id: str) -> int:
+        """Return the index of the original image of the tile, in the order the images are first seen."""
+        return self._img_ids.setdefault(tile_id, len(self._img_ids))
+
+    def _batched_nms(
         self,
         bboxes: torch.Tensor,
         scores: torch.Tensor,
         labels: torch.Tensor,
-        masks: None | list[torch.Tensor] = None,
-    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor, None | torch.Tensor]:
-        """Non-maximum suppression and post-process."""
-        keep = batched_nms(bboxes, scores, labels, self.iou_threshold)
-        if len(keep) > self.max_num_instances:
-            keep = keep[: self.max_num_instances]
-        bboxes = bboxes[keep]
-        labels = labels[keep]
-        scores = scores[keep]
-        if masks is not None and len(masks) > 0:
-            # coalesce sparse tensors to prevent them from growing too large.
-            masks = torch.stack([masks[idx] for idx in keep]).coalesce().to_dense()
-        return bboxes, labels, scores, masks
+        img_indices: torch.Tensor,
+        num_images: int,
+    ) -> list[torch.Tensor]:
+        """Non-maximum suppression of the boxes of all images at once.
+
+        Boxes are grouped by image and label, so one NMS call covers every image of the batch.
+
+        Args:
+            bboxes (torch.Tensor): Boxes of all images in the original image coordinates.
+            scores (torch.Tensor): Scores of the boxes.
+            labels (torch.Tensor): Labels of the boxes.
+            img_indices (torch.Tensor): Index of the image each box belongs to.
+            num_images (int): Number of images.
+
+        Returns:
+            list[torch.Tensor]: Indices of the boxes to keep for each image, sorted in decreasing order of scores.
+        """
+        if len(bboxes) == 0:
+            return [torch.empty((0,), dtype=torch.long, device=bboxes.device) for _ in range(num_images)]
+
+        # NMS of torchvision offsets the boxes by the group index, so float64 keeps large offsets accurate
+        groups = img_indices * (int(labels.max()) + 1) + labels
+        keep = batched_nms(bboxes.double(), scores.double(), groups, self.iou_threshold)
+        keep_img_indices = img_indices[keep]
+        return [keep[keep_img_indices == img_idx][: self.max_num_instances] for img_idx in range(num_images)]
 
 
 class DetectionTileMerge(TileMerge):
     """Detection tile merge."""
 
+    def __init__(
+        self,
+        img_infos: list[ImageInfo],
+        num_classes: int,
+        tile_config: TileConfig,
+    ) -> None:
+        super().__init__(img_infos, num_classes, tile_config)
+        self._saliency_maps: dict[int, _SaliencyMapAccumulator] = {}
+
+    def add_saliency_maps(self, tile_preds: DetBatchPredEntity, tile_attrs: list[dict]) -> None:
+        """Fold the saliency maps of a batch of tiles into the saliency map of their original images.
+
+        The saliency maps are released from the tile predictions afterwards,
+        so they can be folded in as soon as the batch is predicted.
+
+        Args:
+            tile_preds (DetBatchPredEntity): detection tile predictions.
+            tile_attrs (list[dict]): detection tile attributes.
+        """
+        for tile_attr, tile_saliency_map in zip(tile_attrs, tile_preds.saliency_map):
+            img_idx = self._get_img_idx(tile_attr["tile_id"])
+            if img_idx not in self._saliency_maps:
+                self._saliency_maps[img_idx] = _SaliencyMapAccumulator(
+                    self.img_infos[img_idx].ori_shape,
+                    self.tile_size,
+                )
+            self._saliency_maps[img_idx].add(tile_saliency_map, tile_attr["roi"])
+        tile_preds.saliency_map = []
+
     def merge(
         self,
         batch_tile_preds: list[DetBatchPredEntity],
@@ -107,175 +133,163 @@ class DetectionTileMerge(TileMerge):
     ) -> list[DetPredEntity]:
         """Merge batch tile predictions to a list of full-size prediction data entities.
 
+        The boxes of all tiles are concatenated and moved to the original image coordinates at once,
+        then a single NMS is applied to the boxes of all images.
+
         Args:
             batch_tile_preds (list): detection tile predictions.
             batch_tile_attrs (list): detection tile attributes.
 
         """
-        entities_to_merge = defaultdict(list)
-        img_ids = []
+        tile_img_indices: list[int] = []
+        tile_rois: list[list[int]] = []
         explain_mode = len(batch_tile_preds[0].feature_vector) > 0
+        feature_vectors: list[list[np.ndarray]] = [[] for _ in self.img_infos]
 
         for tile_preds, tile_attrs in zip(batch_tile_preds, batch_tile_attrs):
-            batch_size = tile_preds.batch_size
-            saliency_maps = tile_preds.saliency_map if explain_mode else [[] for _ in range(batch_size)]
-            feature_vectors = tile_preds.feature_vector if explain_mode else [[] for _ in range(batch_size)]
-            for tile_attr, tile_img_info, tile_bboxes, tile_labels, tile_scores, tile_s_map, tile_f_vect in zip(
-                tile_attrs,
-                tile_preds.imgs_info,
-                tile_preds.bboxes,
-                tile_preds.labels,
-                tile_preds.scores,
-                saliency_maps,
-                feature_vectors,
-            ):
-                offset_x, offset_y, _, _ = tile_attr["roi"]
-                tile_bboxes[:, 0::2] += offset_x
-                tile_bboxes[:, 1::2] += offset_y
-
-                tile_id = tile_attr["tile_id"]
-                if tile_id not in img_ids:
-                    img_ids.append(tile_id)
-                tile_img_info.padding = tile_attr["roi"]
-
-                det_pred_entity = DetPredEntity(
-                    image=torch.empty(tile_img_info.ori_shape),
-                    img_info=tile_img_info,
-                    bboxes=tile_bboxes,
-                    labels=tile_labels,
-                    score=tile_scores,
-                )
-
+            for tile_idx, tile_attr in enumerate(tile_attrs):
+                img_idx = self._get_img_idx(tile_attr["tile_id"])
+                tile_img_indices.append(img_idx)
+                tile_rois.append(tile_attr["roi"])
                 if explain_mode:
-                    det_pred_entity.feature_vector = tile_f_vect
-                    det_pred_entity.saliency_map = tile_s_map
-                entities_to_merge[tile_id].append(det_pred_entity)
-
-        return [
-            self._merge_entities(image_info, entities_to_merge[img_id], explain_mode)
-            for img_id, image_info in zip(img_ids, self.img_infos)
-        ]
-
-    def _merge_entities(
-        self,
-        img_info: ImageInfo,
-        entities: list[DetPredEntity],
-        explain_mode: bool = False,
-    ) -> DetPredEntity:
-        """Merge tile predictions to one single prediction.
-
-        Args:
-            img_info (ImageInfo): Image information about the original image before tiling.
-            entities (list[DetPredEntity]): List of tile prediction entities.
-            explain_mode (bool): Whether or not tiles have explain features. Default: False.
-
-        Returns:
-            DetPredEntity: Merged prediction entity.
-        """
-        bboxes: list | torch.Tensor = []
-        labels: list | torch.Tensor = []
-        scores: list | torch.Tensor = []
-        feature_vectors = []
-        saliency_maps = []
-        tiles_coords = []
-        img_size = img_info.ori_shape
-        for tile_entity in entities:
-            num_preds = len(tile_entity.bboxes)
-            if num_preds > 0:
-                bboxes.extend(tile_entity.bboxes)
-                labels.extend(tile_entity.labels)
-                scores.extend(tile_entity.score)
+                    feature_vectors[img_idx].append(tile_preds.feature_vector[tile_idx])
+            if explain_mode and len(tile_preds.saliency_map) > 0:
+                self.add_saliency_maps(tile_preds, tile_attrs)
+
+        tile_bboxes = [tile_bbox for tile_preds in batch_tile_preds for tile_bbox in tile_preds.bboxes]
+        bboxes, img_indices = _to_image_coordinates(tile_bboxes, tile_rois, tile_img_indices)
+        labels = torch.cat([tile_label for tile_preds in batch_tile_preds for tile_label in tile_preds.labels])
+        scores = torch.cat([tile_score for tile_preds in batch_tile_preds for tile_score in tile_preds.scores])
+
+        img_infos = self.img_infos[: len(self._img_ids)]
+        keep_per_image = self._batched_nms(bboxes, scores, labels, img_indices, len(img_infos))
+
+        predictions = []
+        for img_idx, (img_info, keep) in enumerate(zip(img_infos, keep_per_image)):
+            img_size = img_info.ori_shape
+            det_pred_entity = DetPredEntity(
+                image=torch.empty(0),
+                img_info=img_info,
+                score=scores[keep],
+                bboxes=tv_tensors.BoundingBoxes(bboxes[keep], canvas_size=img_size, format="XYXY"),
+                labels=labels[keep],
+            )
             if explain_mode:
-                tiles_coords.append(tile_entity.img_info.padding)
-                feature_vectors.append(tile_entity.feature_vector)
-                saliency_maps.append(tile_entity.saliency_map)
+                det_pred_entity.feature_vector = np.mean(feature_vectors[img_idx], axis=0)
+                det_pred_entity.saliency_map = self._saliency_maps.pop(img_idx).merge()
+            predictions.append(det_pred_entity)
+        return predictions
 
-        bboxes = torch.stack(bboxes) if len(bboxes) > 0 else torch.empty((0, 4), device=img_info.device)
-        labels = torch.stack(labels) if len(labels) > 0 else torch.empty((0,), device=img_info.device)
-        scores = torch.stack(scores) if len(scores) > 0 else torch.empty((0,), device=img_info.device)
 
-        bboxes, labels, scores, _ = self.nms_postprocess(bboxes, scores, labels)
+def _to_image_coordinates(
+    tile_bboxes: list[torch.Tensor],
+    tile_rois: list[list[int]],
+    tile_img_indices: list[int],
+) -> tuple[torch.Tensor, torch.Tensor]:
+    """Concatenate the boxes of the tiles and move them to the original image coordinates.
 
-        det_pred_entity = DetPredEntity(
-            image=torch.empty(img_size),
-            img_info=img_info,
-            score=scores,
-            bboxes=tv_tensors.BoundingBoxes(bboxes, canvas_size=img_size, format="XYXY"),
-            labels=labels,
-        )
+    Args:
+        tile_bboxes (list[torch.Tensor]): Boxes of each tile in the tile coordinates.
+        tile_rois (list[list[int]]): ROI (x, y, w, h) of each tile in the original image.
+        tile_img_indices (list[int]): Index of the original image of each tile.
 
-        if explain_mode:
-            merged_vector = np.mean(feature_vectors, axis=0)
-            merged_saliency_map = self._merge_saliency_maps(saliency_maps, img_size, tiles_coords)
-            det_pred_entity.feature_vector = merged_vector
-            det_pred_entity.saliency_map = merged_saliency_map
+    Returns:
+        tuple[torch.Tensor, torch.Tensor]: Boxes in the original image coordinates and the image index of each box.
+    """
+    bboxes = torch.cat(tile_bboxes).reshape(-1, 4)
+    num_bboxes = torch.tensor([len(tile_bbox) for tile_bbox in tile_bboxes], device=bboxes.device)
+    offsets = torch.tensor(
+        [[offset_x, offset_y, offset_x, offset_y] for offset_x, offset_y, _, _ in tile_rois],
+        dtype=bboxes.dtype,
+        device=bboxes.device,
+    ).reshape(-1, 4)
+    bboxes = bboxes + offsets.repeat_interleave(num_bboxes, dim=0)
+    img_indices = torch.tensor(tile_img_indices, device=bboxes.device).repeat_interleave(num_bboxes)
+    return bboxes, img_indices
+
+
+class _SaliencyMapAccumulator:
+    """Running sum and count of the tile saliency maps of one image for PyTorch implementation.
+
+    OV implementation is on ModelAPI side. Unlike ModelAPI implementation,
+    it doesn't have the first tile with resized untiled image.
+    The canvas has the resolution of the tile saliency maps, so its size does not depend on the number of tiles.
+    Overlapping tiles are averaged.
 
-        return det_pred_entity
+    Args:
+        shape (tuple[int, int]): shape of the original image
+        tile_size (tuple[int, int]): size of the tiles
+    """
 
-    def _merge_saliency_maps(
-        self,
-        saliency_maps: list[np.array],
-        shape: tuple[int, int],
-        tiles_coords: list[tuple[int, int, int, int]],
-    ) -> np.ndarray:
-        """Merging saliency maps from each tile for PyTorch implementation.
+    def __init__(self, shape: tuple[int, int], tile_size: tuple[int, int]) -> None:
+        self.shape = shape
+        self.tile_size = tile_size
+        self.num_tiles = 0
+        self.is_valid = True
+        self.first_saliency_map: np.ndarray | None = None
+        self.sum_map: np.ndarray | None = None
+        self.count_map: np.ndarray | None = None
+        self.ratio = (1.0, 1.0)
 
-        OV implementation is on ModelAPI side. Unlike ModelAPI implementation,
-        it doesn't have the first tile with resized untiled image.
+    def add(self, saliency_map: np.ndarray, tile_coords: tuple[int, int, int, int]) -> None:
+        """Fold the saliency map of a tile into the canvas.
 
         Args:
-            saliency_maps: list of saliency maps, shape of each map is (Nc, H, W)
-            shape: shape of the original image
-            tiles_coords: coordinates of tiles
-
-        Returns:
-            Merged saliency map with shape (Nc, H, W)
+            saliency_map (np.ndarray): saliency map of the tile with shape (Nc, H, W)
+            tile_coords (tuple[int, int, int, int]): coordinates (x, y, w, h) of the tile
         """
-        if len(saliency_maps) == 1:
-            return saliency_maps[0]
-
-        if len(saliency_maps[0].shape) == 1:
+        self.num_tiles += 1
+        # The single tile map is returned as it is, so it is kept only until the second tile comes
+        self.first_saliency_map = saliency_map if self.num_tiles == 1 else None
+        if self.num_tiles == 1 and len(saliency_map.shape) == 1:
+            self.is_valid = False
+        if not self.is_valid:
+            return
+        if self.sum_map is None:
+            self._init_canvas(saliency_map)
+        if self.sum_map is None or self.count_map is None:
+            return
+
+        x_1, y_1, map_w, map_h = tile_coords
+        x_2, y_2 = x_1 + map_w, y_1 + map_h
+
+        y_1, x_1 = int(y_1 * self.ratio[0]), int(x_1 * self.ratio[1])
+        y_2, x_2 = int(y_2 * self.ratio[0]), int(x_2 * self.ratio[1])
+
+        map_h, map_w = saliency_map.shape[1:]
+        if (map_h > y_2 - y_1 > 0) and (map_w > x_2 - x_1 > 0):
+            saliency_map = np.stack([cv2.resize(cls_map, (x_2 - x_1, y_2 - y_1)) for cls_map in saliency_map])
+
+        map_h = min(y_2 - y_1, saliency_map.shape[1], self.sum_map.shape[1] - y_1)
+        map_w = min(x_2 - x_1, saliency_map.shape[2], self.sum_map.shape[2] - x_1)
+        self.sum_map[:, y_1 : y_1 + map_h, x_1 : x_1 + map_w] += saliency_map[:, :map_h, :map_w]
+        self.count_map[y_1 : y_1 + map_h, x_1 : x_1 + map_w] += 1
+
+    def merge(self) -> np.ndarray:
+        """Return the merged saliency map with shape (Nc, H, W) after the non-linear normalization."""
+        if self.first_saliency_map is not None:
+            return self.first_saliency_map
+
+        if self.sum_map is None or self.count_map is None:
             return np.ndarray([])
 
-        num_classes = saliency_maps[0].shape[0]
-        map_h, map_w = saliency_maps[0].shape[1:]
-
-        image_h, image_w = shape
-        ratio = map_h / min(image_h, self.tile_size[0]), map_w / min(image_w, self.tile_size[1])
-
-        image_map_h = int(image_h * ratio[0])
-        image_map_w = int(image_w * ratio[1])
-        merged_map = np.zeros((num_classes, image_map_h, image_map_w))
-
-        for i, saliency_map in enumerate(saliency_maps):
-            for class_idx in range(num_classes):
-                cls_map = saliency_map[class_idx]
-
-                x_1, y_1, map_w, map_h = tiles_coords[i]
-                x_2, y_2 = x_1 + map_w, y_1 + map_h
-
-                y_1, x_1 = int(y_1 * ratio[0]), int(x_1 * ratio[1])
-                y_2, x_2 = int(y_2 * ratio[0]), int(x_2 * ratio[1])
-
-                map_h, map_w = cls_map.shape
+        merged_map = self.sum_map / np.maximum(self.count_map, 1)
+        for class_idx in range(merged_map.shape[0]):
+            merged_map[class_idx] = _non_linear_normalization(merged_map[class_idx])
 
-                if (map_h > y_2 - y_1 > 0) and (map_w > x_2 - x_1 > 0):
-                    cls_map = cv2.resize(cls_map, (x_2 - x_1, y_2 - y_1))
+        return merged_map.astype(np.uint8)
 
-                map_h, map_w = y_2 - y_1, x_2 - x_1
+    def _init_canvas(self, saliency_map: np.ndarray) -> None:
+        num_classes = saliency_map.shape[0]
+        map_h, map_w = saliency_map.shape[1:]
 
-                for hi, wi in [(h_, w_) for h_ in range(map_h) for w_ in range(map_w)]:
-                    map_pixel = cls_map[hi, wi]
-                    merged_pixel = merged_map[class_idx][y_1 + hi, x_1 + wi]
-                    if merged_pixel != 0:
-                        merged_map[class_idx][y_1 + hi, x_1 + wi] = 0.5 * (map_pixel + merged_pixel)
-                    else:
-                        merged_map[class_idx][y_1 + hi, x_1 + wi] = map_pixel
+        image_h, image_w = self.shape
+        self.ratio = map_h / min(image_h, self.tile_size[0]), map_w / min(image_w, self.tile_size[1])
 
-        for class_idx in range(num_classes):
-            merged_map[class_idx] = _non_linear_normalization(merged_map[class_idx])
-
-        return merged_map.astype(np.uint8)
+        image_map_h = int(image_h * self.ratio[0])
+        image_map_w = int(image_w * self.ratio[1])
+        self.sum_map = np.zeros((num_classes, image_map_h, image_map_w), dtype=np.float64)
+        self.count_map = np.zeros((image_map_h, image_map_w), dtype=np.float32)
 
 
 def _non_linear_normalization(saliency_map: np.ndarray) -> np.ndarray:
@@ -300,125 +314,78 @@ class InstanceSegTileMerge(TileMerge):
     ) -> list[InstanceSegPredEntity]:
         """Merge inst-seg tile predictions to one single prediction.
 
+        The boxes of all tiles are concatenated and moved to the original image coordinates at once,
+        then a single NMS is applied to the boxes of all images. Only the masks of the kept boxes are
+        pasted to the full-size masks.
+
         Args:
             batch_tile_preds (list): instance-seg tile predictions.
             batch_tile_attrs (list): instance-seg tile attributes.
 
         """
-        entities_to_merge = defaultdict(list)
-        img_ids = []
+        img_ids: dict[str, int] = {}
+        tile_img_indices: list[int] = []
+        tile_rois: list[list[int]] = []
+        tile_bboxes: list[torch.Tensor] = []
+        tile_labels: list[torch.Tensor] = []
+        tile_scores: list[torch.Tensor] = []
+        tile_masks: list[torch.Tensor] = []
         explain_mode = len(batch_tile_preds[0].feature_vector) > 0
+        feature_vectors: list[list[np.ndarray]] = [[] for _ in self.img_infos]
 
         for tile_preds, tile_attrs in zip(batch_tile_preds, batch_tile_attrs):
-            feature_vectors = tile_preds.feature_vector if explain_mode else [[] for _ in range(tile_preds.batch_size)]
-            for tile_attr, tile_img_info, tile_bboxes, tile_labels, tile_scores, tile_masks, tile_f_vect in zip(
-                tile_attrs,
-                tile_preds.imgs_info,
-                tile_preds.bboxes,
-                tile_preds.labels,
-                tile_preds.scores,
-                tile_preds.masks,
-                feature_vectors,
+            for tile_idx, (tile_attr, bboxes, labels, scores, masks) in enumerate(
+                zip(tile_attrs, tile_preds.bboxes, tile_preds.labels, tile_preds.scores, tile_preds.masks),
             ):
-                keep_indices = tile_masks.to_sparse().sum((1, 2)).to_dense() > 0
-                keep_indices = keep_indices.nonzero(as_tuple=True)[0]
-                _bboxes = tile_bboxes[keep_indices]
-                _labels = tile_labels[keep_indices]
-                _scores = tile_scores[keep_indices]
-                _masks = tile_masks[keep_indices]
-
-                offset_x, offset_y, _, _ = tile_attr["roi"]
-                _bboxes[:, 0::2] += offset_x
-                _bboxes[:, 1::2] += offset_y
-
-                tile_id = tile_attr["tile_id"]
-                if tile_id not in img_ids:
-                    img_ids.append(tile_id)
-                tile_img_info.padding = tile_attr["roi"]
-
-                inst_seg_pred_entity = InstanceSegPredEntity(
-                    image=torch.empty(tile_img_info.ori_shape),
-                    img_info=tile_img_info,
-                    bboxes=_bboxes,
-                    labels=_labels,
-                    score=_scores,
-                    masks=_masks.to_sparse(),
-                    polygons=[],
-                )
-
+                img_idx = img_ids.setdefault(tile_attr["tile_id"], len(img_ids))
+                tile_img_indices.append(img_idx)
+                tile_rois.append(tile_attr["roi"])
+
+                keep_indices = masks.flatten(1).any(dim=1).nonzero(as_tuple=True)[0]
+                tile_bboxes.append(bboxes[keep_indices])
+                tile_labels.append(labels[keep_indices])
+                tile_scores.append(scores[keep_indices])
+                tile_masks.extend(masks[keep_indices])
                 if explain_mode:
-                    inst_seg_pred_entity.feature_vector = tile_f_vect
-                    inst_seg_pred_entity.saliency_map = []
-                entities_to_merge[tile_id].append(inst_seg_pred_entity)
-
-        return [
-            self._merge_entities(image_info, entities_to_merge[img_id], explain_mode)
-            for img_id, image_info in zip(img_ids, self.img_infos)
-        ]
-
-    def _merge_entities(
-        self,
-        img_info: ImageInfo,
-        entities: list[InstanceSegPredEntity],
-        explain_mode: bool = False,
-    ) -> InstanceSegPredEntity:
-        """Merge tile predictions to one single prediction.
-
-        Args:
-            img_info (ImageInfo): Image information about the original image before tiling.
-            entities (list[InstanceSegPredEntity]): List of tile prediction entities.
-
-        Returns:
-            InstanceSegPredEntity: Merged prediction entity.
-        """
-        bboxes: list | torch.Tensor = []
-        labels: list | torch.Tensor = []
-        scores: list | torch.Tensor = []
-        masks: list | torch.Tensor = []
-        feature_vectors = []
-        img_size = img_info.ori_shape
-        for tile_entity in entities:
-            num_preds = len(tile_entity.bboxes)
-            if num_preds > 0:
-                bboxes.extend(tile_entity.bboxes)
-                labels.extend(tile_entity.labels)
-                scores.extend(tile_entity.score)
-
-                offset_x, offset_y, _, _ = tile_entity.img_info.padding
-                mask_indices = tile_entity.masks.indices()
-                mask_values = tile_entity.masks.values()
-                mask_indices[1] += offset_y
-                mask_indices[2] += offset_x
-                masks.extend(
-                    torch.sparse_coo_tensor(mask_indices, mask_values, (num_preds, *img_size)),
-                )
+                    feature_vectors[img_idx].append(tile_preds.feature_vector[tile_idx])
+
+        bboxes, img_indices = _to_image_coordinates(tile_bboxes, tile_rois, tile_img_indices)
+        labels = torch.cat(tile_labels)
+        scores = torch.cat(tile_scores)
+        num_bboxes = [len(tile_bbox) for tile_bbox in tile_bboxes]
+        mask_rois = [roi for roi, num_bbox in zip(tile_rois, num_bboxes) for _ in range(num_bbox)]
+
+        img_infos = self.img_infos[: len(img_ids)]
+        keep_per_image = self._batched_nms(bboxes, scores, labels, img_indices, len(img_infos))
+
+        predictions = []
+        for img_idx, (img_info, keep) in enumerate(zip(img_infos, keep_per_image)):
+            img_size = img_info.ori_shape
+            masks = torch.zeros((len(keep), *img_size), dtype=torch.bool, device=bboxes.device)
+            for mask, idx in zip(masks, keep.tolist()):
+                offset_x, offset_y, _, _ = mask_rois[idx]
+                tile_mask = tile_masks[idx][: img_size[0] - offset_y, : img_size[1] - offset_x]
+                mask[offset_y : offset_y + tile_mask.shape[0], offset_x : offset_x + tile_mask.shape[1]] = tile_mask
+
+            inst_seg_pred_entity = InstanceSegPredEntity(
+                image=torch.empty(0),
+                img_info=img_info,
+                score=scores[keep],
+                bboxes=tv_tensors.BoundingBoxes(bboxes[keep], canvas_size=img_size, format="XYXY"),
+                labels=labels[keep],
+                masks=tv_tensors.Mask(masks, dtype=bool),
+                polygons=[],
+            )
             if explain_mode:
-                feature_vectors.append(tile_entity.feature_vector)
-
-        bboxes = torch.stack(bboxes) if len(bboxes) > 0 else torch.empty((0, 4), device=img_info.device)
-        labels = torch.stack(labels) if len(labels) > 0 else torch.empty((0,), device=img_info.device)
-        scores = torch.stack(scores) if len(scores) > 0 else torch.empty((0,), device=img_info.device)
-        masks = masks if len(masks) > 0 else torch.empty((0, *img_size))
-
-        bboxes, labels, scores, masks = self.nms_postprocess(bboxes, scores, labels, masks)
-
-        inst_seg_pred_entity = InstanceSegPredEntity(
-            image=torch.empty(img_size),
-            img_info=img_info,
-            score=scores,
-            bboxes=tv_tensors.BoundingBoxes(bboxes, canvas_size=img_size, format="XYXY"),
-            labels=labels,
-            masks=tv_tensors.Mask(masks, dtype=bool),
-            polygons=[],
-        )
-
-        if explain_mode:
-            merged_vector = np.mean(feature_vectors, axis=0)
-            merged_saliency_map = self.get_saliency_maps_from_masks(labels, scores, masks, self.num_classes)
-            inst_seg_pred_entity.feature_vector = merged_vector
-            inst_seg_pred_entity.saliency_map = merged_saliency_map
-
-        return inst_seg_pred_entity
+                inst_seg_pred_entity.feature_vector = np.mean(feature_vectors[img_idx], axis=0)
+                inst_seg_pred_entity.saliency_map = self.get_saliency_maps_from_masks(
+                    labels[keep],
+                    scores[keep],
+                    masks,
+                    self.num_classes,
+                )
+            predictions.append(inst_seg_pred_entity)
+        return predictions
 
     def get_saliency_maps_from_masks(
         self,
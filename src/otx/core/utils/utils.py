@@ -71,7 +71,17 @@ def get_adaptive_num_workers(num_dataloader: int = 1) -> int | None:
 
 
 def get_idx_list_per_classes(dm_dataset: DmDataset, use_string_label: bool = False) -> dict[int | str, list[int]]:
-    """Compute class statistics."""
+    """Compute class statistics.
+
+    If the dataset is registered to `DatasetIndex`, the statistics are queried from the index
+    instead of iterating the dataset.
+    """
+    from otx.core.data.dataset_index import DatasetIndex
+
+    if (found := DatasetIndex.get(dm_dataset)) is not None:
+        index, subset = found
+        return defaultdict(list, index.get_idx_list_per_classes(subset, use_string_label))
+
     stats: dict[int | str, list[int]] = defaultdict(list)
     labels = dm_dataset.categories().get(AnnotationType.label, LabelCategories())
     for item_idx, item in enumerate(dm_dataset):
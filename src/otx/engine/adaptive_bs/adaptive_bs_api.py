@@ -6,6 +6,8 @@ from __future__ import annotations
 
 import logging
 import os
+import time
+from contextlib import suppress
 from functools import partial
 from math import sqrt
 from typing import TYPE_CHECKING, Any
@@ -14,10 +16,11 @@ from lightning import Callback
 from lightning.pytorch.loggers.logger import DummyLogger
 from torch.cuda import is_available as is_cuda_available
 
+from otx.core.types.device import DeviceType
 from otx.core.types.task import OTXTaskType
 from otx.utils.utils import is_xpu_available
 
-from .bs_search_algo import BsSearchAlgo
+from .bs_search_algo import BsSearchAlgo, CpuBsSearchAlgo
 
 if TYPE_CHECKING:
     from lightning import LightningModule, Trainer
@@ -38,13 +41,17 @@ def adapt_batch_size(
     If not_increase is True, check current batch size is available to GPU and if not, decrease batch size.
     If not_increase is False, increase batch size to use most of GPU memory.
 
+    On CPU, the peak memory usage of the trials is compared with the system memory instead of GPU memory.
+    If not_increase is False, the batch size with the highest training throughput within the memory is chosen.
+
     Args:
         engine (Engine): engine instnace.
         not_increase (bool) : Whether adapting batch size to larger value than default value or not.
         callbacks (list[Callback] | Callback | None, optional): callbacks used during training. Defaults to None.
     """
-    if not (is_cuda_available() or is_xpu_available()):
-        msg = "Adaptive batch size supports CUDA or XPU."
+    on_cpu = engine.device.accelerator == DeviceType.cpu or not (is_cuda_available() or is_xpu_available())
+    if on_cpu and engine.device.devices != 1:
+        msg = "Adaptive batch size supports only single process training on CPU."
         raise RuntimeError(msg)
     if engine.task == OTXTaskType.ZERO_SHOT_VISUAL_PROMPTING:  # type: ignore[has-type]
         msg = "Zero shot visual prompting task doesn't support adaptive batch size."
@@ -59,8 +66,14 @@ def adapt_batch_size(
             _apply_new_batch_size(engine, new_batch_size)
         return
 
-    train_func = partial(_train_model, engine=engine, callbacks=callbacks, **_adjust_train_args(train_args))
-    bs_search_algo = BsSearchAlgo(
+    train_func = partial(
+        _train_model,
+        engine=engine,
+        callbacks=callbacks,
+        measure_throughput=on_cpu,
+        **_adjust_train_args(train_args),
+    )
+    bs_search_algo = (CpuBsSearchAlgo if on_cpu else BsSearchAlgo)(
         train_func=train_func,
         default_bs=default_bs,
         max_bs=(
@@ -69,6 +82,8 @@ def adapt_batch_size(
     )
     if not_increase:
         new_batch_size = bs_search_algo.auto_decrease_batch_size()
+    elif isinstance(bs_search_algo, CpuBsSearchAlgo):
+        new_batch_size = bs_search_algo.find_fastest_batch_size()
     else:
         new_batch_size = bs_search_algo.find_big_enough_batch_size()
 
@@ -96,7 +111,13 @@ def _adjust_train_args(train_args: dict[str, Any]) -> dict[str, Any]:
     return train_args
 
 
-def _train_model(bs: int, engine: Engine, callbacks: list[Callback] | Callback | None = None, **train_args) -> None:
+def _train_model(
+    bs: int,
+    engine: Engine,
+    callbacks: list[Callback] | Callback | None = None,
+    measure_throughput: bool = False,
+    **train_args,
+) -> float | None:
     if bs <= 0:
         msg = f"Batch size should be greater than 0, but {bs} is given."
         raise ValueError(msg)
@@ -104,31 +125,53 @@ def _train_model(bs: int, engine: Engine, callbacks: list[Callback] | Callback |
         engine._cache.update(devices=1)  # noqa: SLF001
 
     engine.datamodule.config.train_subset.batch_size = bs
-    engine.train(callbacks=_register_callback(callbacks), **train_args)
+    if not measure_throughput:
+        engine.train(callbacks=_register_callback(callbacks), **train_args)
+        return None
+
+    # More steps than the default are needed to measure the throughput after the warm-up step
+    batch_size_finder = BatchSizeFinder(steps_per_trial=6, measure_throughput=True)
+    with suppress(TrialFinishedError):
+        engine.train(callbacks=_register_callback(callbacks, batch_size_finder), **train_args)
+    return batch_size_finder.steps_per_sec
 
 
-def _register_callback(callbacks: list[Callback] | Callback | None = None) -> list[Callback]:
+def _register_callback(
+    callbacks: list[Callback] | Callback | None = None,
+    batch_size_finder: BatchSizeFinder | None = None,
+) -> list[Callback]:
     if isinstance(callbacks, Callback):
         callbacks = [callbacks]
     elif callbacks is None:
         callbacks = []
-    callbacks.append(BatchSizeFinder())
+    callbacks.append(BatchSizeFinder() if batch_size_finder is None else batch_size_finder)
     return callbacks
 
 
+class TrialFinishedError(Exception):
+    """Exception to stop the fit after BatchSizeFinder runs the steps of the trial."""
+
+
 class BatchSizeFinder(Callback):
     """This callback makes trainer run specified iteration and exit.
 
     Args:
         steps_per_trial: number of steps to run with a given batch size.
             Ideally 1 should be enough to test if an OOM error occurs, however in practice a few are needed.
+        measure_throughput: whether to measure the number of training steps per second.
+            The first step is excluded as a warm-up. The fit is stopped by `TrialFinishedError` after the steps,
+            since the post-processing of the training needs the callbacks removed to run them.
     """
 
     def __init__(
         self,
         steps_per_trial: int = 3,
+        measure_throughput: bool = False,
     ) -> None:
         self._steps_per_trial = steps_per_trial
+        self._measure_throughput = measure_throughput
+        self._start_time: float | None = None
+        self.steps_per_sec: float | None = None
 
     def setup(self, trainer: Trainer, pl_module: LightningModule, stage: str | None = None) -> None:
         """Check current stage is fit."""
@@ -139,7 +182,27 @@ class BatchSizeFinder(Callback):
     def on_fit_start(self, trainer: Trainer, pl_module: LightningModule) -> None:
         """Run steps_per_trial iterations and exit."""
         _scale_batch_reset_params(trainer, self._steps_per_trial)
+        if self._measure_throughput:
+            trainer.callbacks = [self]
         _try_loop_run(trainer)
+        if self._measure_throughput:
+            raise TrialFinishedError
+
+    def on_train_batch_end(
+        self,
+        trainer: Trainer,
+        pl_module: LightningModule,
+        outputs: Any,  # noqa: ANN401
+        batch: Any,  # noqa: ANN401
+        batch_idx: int,
+    ) -> None:
+        """Measure the throughput from the end of the first step."""
+        if not self._measure_throughput:
+            return
+        if self._start_time is None:
+            self._start_time = time.perf_counter()
+        elif batch_idx > 0:
+            self.steps_per_sec = batch_idx / (time.perf_counter() - self._start_time)
 
 
 def _try_loop_run(trainer: Trainer) -> None:
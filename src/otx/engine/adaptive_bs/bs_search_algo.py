@@ -7,8 +7,10 @@ from __future__ import annotations
 import logging
 import multiprocessing as mp
 import queue
+from contextlib import suppress
 from typing import Any, Callable
 
+import psutil
 import torch
 
 from otx.utils.utils import is_xpu_available
@@ -45,11 +47,15 @@ class BsSearchAlgo:
         self._default_bs = default_bs
         self._max_bs = max_bs
         self._bs_try_history: dict[int, int] = {}
-        self._total_mem = _get_total_memory_size()
+        self._total_mem = self._get_total_memory_size()
         self._mem_lower_bound = 0.8 * self._total_mem
         self._mem_upper_bound = 0.85 * self._total_mem
         self._mp_ctx = mp.get_context("spawn")
 
+    @staticmethod
+    def _get_total_memory_size() -> int:
+        return _get_total_memory_size()
+
     def _try_batch_size(self, bs: int) -> tuple[bool, int]:
         trial_queue = self._mp_ctx.Queue()
         proc = self._mp_ctx.Process(target=_run_trial, args=(self._train_func, bs, trial_queue))
@@ -238,6 +244,144 @@ class BsSearchAlgo:
         return estimated_bs
 
 
+class CpuBsSearchAlgo(BsSearchAlgo):
+    """Algorithm class to find the batch size with the highest training throughput on CPU.
+
+    Each batch size is tried by a short training run in a separate process. It measures the training throughput
+    and the peak PSS (proportional set size) of the process including its dataloader workers. PSS divides
+    the shared pages, e.g., the shared memory cache, among the processes, so that they are counted once.
+    A batch size using more memory than the memory budget is regarded as out of memory,
+    so that the training doesn't cause swapping.
+
+    Args:
+        train_func (Callable[[int], float | None]): Training function with single arugment to set batch size.
+                                                    It should return the number of training steps per second.
+        default_bs (int): Default batch size. It should be bigger than 0.
+        max_bs (int): Maximum batch size. It should be bigger than 0.
+        mem_budget (int | None, optional): Memory budget in bytes for training. If None, 85% of the system memory
+                                           available now is used. Defaults to None.
+        min_speedup (float, optional): Minimum relative throughput gain to prefer other batch size
+                                       than the current best one. It's to ignore the noise in the measurement.
+                                       Defaults to 0.05.
+    """
+
+    # Interval in seconds to sample the memory usage of the trial
+    MEM_POLL_INTERVAL = 0.05
+
+    def __init__(
+        self,
+        train_func: Callable[[int], float | None],
+        default_bs: int,
+        max_bs: int,
+        mem_budget: int | None = None,
+        min_speedup: float = 0.05,
+    ):
+        super().__init__(train_func, default_bs, max_bs)
+        if mem_budget is not None:
+            if mem_budget <= 0:
+                msg = "Memory budget should be bigger than 0."
+                raise ValueError(msg)
+            # Keep the ratio between the lower and upper bounds
+            self._mem_lower_bound *= mem_budget / self._mem_upper_bound
+            self._mem_upper_bound = mem_budget
+        self._min_speedup = min_speedup
+        self._throughput_history: dict[int, float] = {}
+
+    @staticmethod
+    def _get_total_memory_size() -> int:
+        return psutil.virtual_memory().available
+
+    def _try_batch_size(self, bs: int) -> tuple[bool, int]:
+        trial_queue = self._mp_ctx.Queue()
+        proc = self._mp_ctx.Process(target=_run_cpu_trial, args=(self._train_func, bs, trial_queue))
+        proc.start()
+        output = None
+        peak_mem = 0
+        while proc.is_alive():
+            peak_mem = max(peak_mem, _get_process_tree_pss(proc.pid))
+            if peak_mem > self._mem_upper_bound:
+                # Stop the trial before it makes the system swap
+                proc.kill()
+                output = {"oom": True, "steps_per_sec": None}
+                break
+            try:
+                output = trial_queue.get(timeout=self.MEM_POLL_INTERVAL)
+                break
+            except queue.Empty:
+                pass
+        proc.join()
+        if output is None and proc.exitcode is not None and proc.exitcode < 0:
+            # Killed by the system, e.g., OOM killer
+            output = {"oom": True, "steps_per_sec": None}
+        if output is None:
+            msg = "There is no output from the trial for adaptive batch size."
+            raise RuntimeError(msg)
+
+        oom = output["oom"]
+        if not oom:
+            self._bs_try_history[bs] = peak_mem
+            if output["steps_per_sec"] is not None:
+                self._throughput_history[bs] = output["steps_per_sec"] * bs
+
+        logger.debug(
+            f"Adapting Batch size => bs : {bs}, OOM : {oom}, peak PSS : {peak_mem / 2**20:.1f} MiB, "
+            f"throughput : {self._throughput_history.get(bs)} samples / s",
+        )
+
+        return oom, peak_mem
+
+    def _try_faster_batch_size(self, bs: int, best_bs: int) -> bool:
+        """Try the batch size and check whether it's faster than the best batch size enough."""
+        oom, peak_mem = self._try_batch_size(bs)
+        if oom or peak_mem > self._mem_upper_bound or bs not in self._throughput_history:
+            return False
+        return self._throughput_history[bs] > self._throughput_history[best_bs] * (1 + self._min_speedup)
+
+    def _estimate_max_bs_in_budget(self) -> int:
+        """Estimate the largest batch size fit to the memory budget assuming that memory grows linearly."""
+        (small_bs, small_mem), (large_bs, large_mem) = sorted(self._bs_try_history.items())[-2:]
+        gradient = (large_mem - small_mem) / (large_bs - small_bs)
+        if gradient <= 0:
+            return self._max_bs
+        return large_bs + int((self._mem_upper_bound - large_mem) / gradient)
+
+    def find_fastest_batch_size(self) -> int:
+        """Find the batch size with the highest training throughput within the memory budget.
+
+        It starts from the default batch size and doubles the batch size while the throughput increases.
+        If a larger batch size isn't faster, it halves the batch size while the throughput increases.
+        The batch size is capped by the memory budget which is estimated from the peak memory usage of the trials.
+
+        Raises:
+            RuntimeError: If training with batch size 2 can't be run within the memory budget, raise an error.
+
+        Returns:
+            int: Batch size with the highest throughput.
+        """
+        oom, peak_mem = self._try_batch_size(self._default_bs)
+        if oom or peak_mem > self._mem_upper_bound or self._default_bs not in self._throughput_history:
+            return self.auto_decrease_batch_size()
+
+        best_bs = self._default_bs
+        while best_bs < self._max_bs:
+            next_bs = min(best_bs * 2, self._max_bs)
+            if len(self._bs_try_history) >= 2:
+                next_bs = min(next_bs, self._estimate_max_bs_in_budget())
+            if next_bs <= best_bs or not self._try_faster_batch_size(next_bs, best_bs):
+                break
+            best_bs = next_bs
+
+        if best_bs == self._default_bs:
+            while best_bs > 1 and self._try_faster_batch_size(best_bs // 2, best_bs):
+                best_bs //= 2
+
+        logger.info(
+            "Throughput by batch size => "
+            + ", ".join(f"{bs}: {tp:.2f} samples / s" for bs, tp in sorted(self._throughput_history.items())),
+        )
+        return best_bs
+
+
 def _run_trial(train_func: Callable[[int], Any], bs: int, trial_queue: mp.Queue) -> None:
     mp.set_start_method(None, True)  # reset mp start method
 
@@ -265,6 +409,40 @@ def _run_trial(train_func: Callable[[int], Any], bs: int, trial_queue: mp.Queue)
     )
 
 
+def _run_cpu_trial(train_func: Callable[[int], float | None], bs: int, trial_queue: mp.Queue) -> None:
+    mp.set_start_method(None, True)  # reset mp start method
+
+    oom = False
+    steps_per_sec = None
+    try:
+        steps_per_sec = train_func(bs)
+    except MemoryError:
+        oom = True
+    except RuntimeError as e:
+        if "can't allocate memory" in str(e):  # CPU OOM
+            oom = True
+        else:
+            raise
+
+    trial_queue.put({"oom": oom, "steps_per_sec": steps_per_sec})
+
+
+def _get_process_tree_pss(pid: int) -> int:
+    try:
+        process = psutil.Process(pid)
+        processes = [process, *process.children(recursive=True)]
+    except psutil.NoSuchProcess:
+        return 0
+
+    pss = 0
+    for proc in processes:
+        with suppress(psutil.NoSuchProcess, psutil.AccessDenied):
+            mem_info = proc.memory_full_info()
+            # PSS is available only on Linux. USS, which excludes the shared pages, is used on the other platforms.
+            pss += getattr(mem_info, "pss", mem_info.uss)
+    return pss
+
+
 def _get_max_memory_reserved() -> int:
     if is_xpu_available():
         return torch.xpu.max_memory_reserved(device=None)
@@ -208,6 +208,8 @@ class Engine:
             adaptive_bs (Literal["None", "Safe", "Full"]):
                 Change the actual batch size depending on the current GPU status.
                 Safe => Prevent GPU out of memory. Full => Find a batch size using most of GPU memory.
+                On CPU, Safe prevents using more than the system memory and Full finds a batch size
+                with the highest training throughput within the system memory.
             **kwargs: Additional keyword arguments for pl.Trainer configuration.
 
         Returns:
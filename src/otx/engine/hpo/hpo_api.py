@@ -10,6 +10,7 @@ import logging
 import time
 from functools import partial
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from threading import Thread
 from typing import TYPE_CHECKING, Any, Callable
 
@@ -90,20 +91,25 @@ def execute_hpo(
     if progress_update_callback is not None:
         Thread(target=_update_hpo_progress, args=[progress_update_callback, hpo_algo], daemon=True).start()
 
-    run_hpo_loop(
-        hpo_algo,
-        partial(
-            run_hpo_trial,
-            hpo_workdir=hpo_workdir,
-            engine=engine,
-            max_epochs=max_epochs,
-            callbacks=callbacks,
-            metric_name=hpo_config.metric_name,
-            **_adjust_train_args(train_args),
-        ),
-        "gpu" if torch.cuda.is_available() else "cpu",
-        num_parallel_trial=hpo_configurator.hpo_config["num_workers"],
-    )
+    # Trials share the decoded images through the spill file in addition to their own memory pool
+    cache_dir = TemporaryDirectory(prefix="OTX-HPO-CACHE-", dir=hpo_workdir)
+    with cache_dir, engine.datamodule.share_mem_cache(cache_dir.name, prefill=hpo_config.prefill_mem_cache):
+        run_hpo_loop(
+            hpo_algo,
+            partial(
+                run_hpo_trial,
+                hpo_workdir=hpo_workdir,
+                engine=engine,
+                max_epochs=max_epochs,
+                callbacks=callbacks,
+                metric_name=hpo_config.metric_name,
+                in_place_promotion=hpo_config.in_place_promotion,
+                **_adjust_train_args(train_args),
+            ),
+            "gpu" if torch.cuda.is_available() else "cpu",
+            num_parallel_trial=hpo_configurator.hpo_config["num_workers"],
+            in_place_promotion=hpo_config.in_place_promotion,
+        )
 
     best_trial = hpo_algo.get_best_config()
     if best_trial is None:
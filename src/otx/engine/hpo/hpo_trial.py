@@ -52,10 +52,15 @@ def run_hpo_trial(
     engine: Engine,
     callbacks: list[Callback] | Callback | None = None,
     metric_name: str | None = None,
+    in_place_promotion: bool = False,
     **train_args,
 ) -> None:
     """Run HPO trial. After it's done, best weight and last weight are saved for later use.
 
+    If `in_place_promotion` is true, the trial isn't limited to the epochs of its rung but keeps training
+    until the HPO loop replies to the reported score with `TrialStatus.STOP`, so that it continues in place
+    when it's promoted. The last weight is saved only once when the trial is stopped.
+
     Args:
         hp_config (dict[str, Any]): trial's hyper parameter.
         report_func (Callable): function to report score.
@@ -64,12 +69,14 @@ def run_hpo_trial(
         callbacks (list[Callback] | Callback | None, optional): callbacks used during training. Defaults to None.
         metric_name (str | None, optional):
             metric name to determine trial performance. If it's None, get it from ModelCheckpoint callback.
+        in_place_promotion (bool, optional): Whether the HPO loop continues the promoted trial in place.
+                                             Defaults to False.
         train_args: Arugments for 'engine.train'.
     """
     trial_id = hp_config["id"]
     hpo_weight_dir = get_hpo_weight_dir(hpo_workdir, trial_id)
 
-    _set_trial_hyper_parameter(hp_config["configuration"], engine, train_args)
+    _set_trial_hyper_parameter(hp_config["configuration"], engine, train_args, in_place_promotion)
 
     if (checkpoint := _find_last_weight(hpo_weight_dir)) is not None:
         train_args["checkpoint"] = checkpoint
@@ -80,15 +87,29 @@ def run_hpo_trial(
 
     with TemporaryDirectory(prefix="OTX-HPO-") as temp_dir:
         _change_work_dir(temp_dir, callbacks, engine)
+        if in_place_promotion:
+            _disable_saving_last_weight(callbacks)
         engine.train(callbacks=callbacks, **train_args)
+        if in_place_promotion:
+            engine.trainer.save_checkpoint(Path(temp_dir) / "last.ckpt")
 
         _keep_best_and_last_weight(Path(temp_dir), hpo_workdir, trial_id)
 
     report_func(0, 0, done=True)  # type: ignore[call-arg]
 
 
-def _set_trial_hyper_parameter(hyper_parameter: dict[str, Any], engine: Engine, train_args: dict[str, Any]) -> None:
-    train_args["max_epochs"] = round(hyper_parameter.pop("iterations"))
+def _set_trial_hyper_parameter(
+    hyper_parameter: dict[str, Any],
+    engine: Engine,
+    train_args: dict[str, Any],
+    in_place_promotion: bool = False,
+) -> None:
+    iterations = round(hyper_parameter.pop("iterations"))
+    if in_place_promotion:
+        # HPO stops the trial at the rung boundary, unless it's promoted
+        train_args["max_epochs"] = max(iterations, train_args.get("max_epochs", 0))
+    else:
+        train_args["max_epochs"] = iterations
     update_hyper_parameter(engine, hyper_parameter)
 
 
@@ -101,10 +122,13 @@ def _register_hpo_callback(
     callbacks: list[Callback] | Callback | None = None,
     metric_name: str | None = None,
 ) -> list[Callback]:
+    # Copy the given list, which may be reused by the next trials run in the same worker process
     if isinstance(callbacks, Callback):
         callbacks = [callbacks]
     elif callbacks is None:
         callbacks = []
+    else:
+        callbacks = list(callbacks)
     callbacks.append(HPOCallback(report_func, get_metric(callbacks) if metric_name is None else metric_name))
     return callbacks
 
@@ -126,6 +150,12 @@ def _change_work_dir(work_dir: str, callbacks: list[Callback], engine: Engine) -
     engine.work_dir = work_dir
 
 
+def _disable_saving_last_weight(callbacks: list[Callback]) -> None:
+    for callback in callbacks:
+        if isinstance(callback, ModelCheckpoint):
+            callback.save_last = False
+
+
 def _keep_best_and_last_weight(trial_work_dir: Path, hpo_workdir: Path, trial_id: str) -> None:
     weight_dir = get_hpo_weight_dir(hpo_workdir, trial_id)
     _move_all_ckpt(trial_work_dir, weight_dir)
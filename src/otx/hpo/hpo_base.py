@@ -136,6 +136,18 @@ class HpoBase(ABC):
         """Get best config of HPO algorithm."""
         raise NotImplementedError
 
+    def is_promotable(self, trial_id: Hashable) -> bool:
+        """Check whether the trial stopped by HPO algorithm can be trained further later.
+
+        Args:
+            trial_id (Hashable): Trial id.
+
+        Returns:
+            bool: Whether the trial can be trained further later.
+        """
+        del trial_id
+        return False
+
 
 class Trial:
     """Trial to train with given hyper parameters.
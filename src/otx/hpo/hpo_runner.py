@@ -8,13 +8,13 @@ from __future__ import annotations
 import logging
 import multiprocessing
 import os
-import queue
+import pickle
 import signal
-import time
 from copy import deepcopy
 from dataclasses import dataclass
 from functools import partial
-from typing import TYPE_CHECKING, Callable, Literal
+from multiprocessing.connection import wait
+from typing import TYPE_CHECKING, Any, Callable, Literal
 
 from otx.hpo.hpo_base import HpoBase, Trial, TrialStatus
 from otx.hpo.resource_manager import get_resource_manager
@@ -22,23 +22,42 @@ from otx.utils import append_main_proc_signal_handler
 
 if TYPE_CHECKING:
     from collections.abc import Hashable
+    from multiprocessing.connection import Connection
+    from multiprocessing.process import BaseProcess
     from signal import Signals
 
 logger = logging.getLogger(__name__)
 
 
 @dataclass
-class RunningTrial:
-    """Data class for a running trial."""
+class TrialWorker:
+    """Data class for a warm worker process which runs trials one after another."""
 
-    process: multiprocessing.Process
-    trial: Trial
-    queue: multiprocessing.Queue
+    uid: int
+    process: BaseProcess
+    conn: Connection
+    trial: Trial | None = None
+    # Whether the trial is stopped at the rung boundary and the worker waits for the reply to continue in place
+    paused: bool = False
+    # Trial to start after the paused trial is stopped to release the worker
+    next_trial: Trial | None = None
 
 
 class HpoLoop:
     """HPO loop manager to run trials.
 
+    Trials are run by a pool of warm worker processes, which are started once per resource
+    and pull the next trial after finishing one, instead of a new process per trial.
+    The loop sleeps until a worker reports a score, finishes a trial or exits,
+    and replies the trial status to the reported score right away.
+    The HPO results are saved only when a trial is started, reported or finished.
+
+    If `in_place_promotion` is true, a trial stopped by the HPO algorithm at the rung boundary is paused
+    instead of being stopped, as long as it can be promoted later. Its worker keeps the training state alive
+    and waits for the reply. If the trial is promoted, the worker continues to train it in place
+    without saving and loading a checkpoint. The paused trial is stopped only when its worker is needed
+    to run another trial or HPO is done.
+
     Args:
         hpo_algo (HpoBase): HPO algorithms.
         train_func (Callable): Function to train a model.
@@ -48,8 +67,14 @@ class HpoLoop:
                                                    It's used for CPUResourceManager. Defaults to None.
         num_gpu_for_single_trial (int | None, optional): How many GPUs are used for a single trial.
                                                          It's used for GPUResourceManager. Defaults to None.
+        in_place_promotion (bool, optional): Whether to continue the promoted trial in place. The training function
+                                             should keep training until the reported score is replied with
+                                             `TrialStatus.STOP`. Defaults to False.
     """
 
+    # Timeout in seconds to wait for an event if no trial is running, e.g., when waiting for a trial to start
+    IDLE_TIMEOUT = 1.0
+
     def __init__(
         self,
         hpo_algo: HpoBase,
@@ -57,12 +82,13 @@ class HpoLoop:
         resource_type: Literal["gpu", "cpu"] = "gpu",
         num_parallel_trial: int | None = None,
         num_gpu_for_single_trial: int | None = None,
+        in_place_promotion: bool = False,
     ) -> None:
         self._hpo_algo = hpo_algo
-        self._train_func = train_func
-        self._running_trials: dict[int, RunningTrial] = {}
+        self._in_place_promotion = in_place_promotion
+        self._train_func = _dump_train_func(train_func)
+        self._workers: dict[int, TrialWorker] = {}
         self._mp = multiprocessing.get_context("spawn")
-        self._report_queue = self._mp.Queue()
         self._uid_index = 0
         self._resource_manager = get_resource_manager(
             resource_type,
@@ -79,28 +105,56 @@ class HpoLoop:
         logger.info("HPO loop starts.")
         try:
             while not self._hpo_algo.is_done():
-                if self._resource_manager.have_available_resource():
-                    trial = self._hpo_algo.get_next_sample()
-                    if trial is not None:
-                        self._start_trial_process(trial)
-
-                self._remove_finished_process()
-                self._get_reports()
-
-                time.sleep(1)
+                changed = self._start_trials()
+                changed |= self._handle_events()
+                if changed:
+                    self._hpo_algo.save_results()
+
+            logger.info("HPO loop is done.")
+            self._stop_paused_trials()
+            # Let the running trials, which are done already, save their weights
+            while any(worker.trial is not None for worker in self._workers.values()):
+                self._handle_events()
+            self._hpo_algo.save_results()
         except Exception as e:
             self._terminate_all_running_processes()
             raise e  # noqa: TRY201
-        logger.info("HPO loop is done.")
 
-        self._get_reports()
         self._join_all_processes()
 
-    def _start_trial_process(self, trial: Trial) -> None:
-        logger.info(f"{trial.id} trial is now running.")
-        logger.debug(f"{trial.id} hyper paramter => {trial.configuration}")
-
-        trial.status = TrialStatus.RUNNING
+    def _start_trials(self) -> bool:
+        started = False
+        while (worker := self._get_idle_worker()) is not None or (paused_workers := self._get_paused_workers()):
+            trial = self._hpo_algo.get_next_sample()
+            if trial is None:
+                break
+            if (paused_worker := self._find_paused_worker(trial)) is not None:
+                self._resume_trial(paused_worker)
+            elif worker is not None:
+                self._start_trial(worker, trial)
+            else:
+                self._preempt_trial(paused_workers[0], trial)
+            started = True
+        return started
+
+    def _get_paused_workers(self) -> list[TrialWorker]:
+        return [worker for worker in self._workers.values() if worker.paused]
+
+    def _find_paused_worker(self, trial: Trial) -> TrialWorker | None:
+        for worker in self._workers.values():
+            if worker.paused and worker.trial is trial:
+                return worker
+        return None
+
+    def _get_idle_worker(self) -> TrialWorker | None:
+        for worker in self._workers.values():
+            if worker.trial is None:
+                return worker
+        if self._resource_manager.have_available_resource():
+            return self._start_worker()
+        return None
+
+    def _start_worker(self) -> TrialWorker:
         uid = self._get_uid()
 
         origin_env = deepcopy(os.environ)
@@ -109,66 +163,138 @@ class HpoLoop:
             for key, val in env.items():
                 os.environ[key] = val
 
-        trial_queue = self._mp.Queue()
-        process = self._mp.Process(
-            target=_run_train,
-            args=(
-                self._train_func,
-                trial.get_train_configuration(),
-                partial(
-                    _report_score,
-                    recv_queue=trial_queue,
-                    send_queue=self._report_queue,
-                    uid=uid,
-                    trial_id=trial.id,
-                ),
-            ),
-        )
-        self._running_trials[uid] = RunningTrial(process, trial, trial_queue)  # type: ignore[arg-type]
+        conn, worker_conn = self._mp.Pipe()
+        process = self._mp.Process(target=_run_worker, args=(self._train_func, worker_conn))
+        self._workers[uid] = TrialWorker(uid, process, conn)
         process.start()
+        worker_conn.close()
         os.environ.clear()
         for key, val in origin_env.items():
             os.environ[key] = val
 
-    def _remove_finished_process(self) -> None:
-        trial_to_remove = []
-        for uid, trial in self._running_trials.items():
-            if not trial.process.is_alive():
-                if trial.process.exitcode != 0:
-                    self._terminate_all_running_processes()
-                    msg = "One of HPO trials exit abnormally."
-                    raise RuntimeError(msg)
-                trial.queue.close()
-                trial.process.join()
-                trial_to_remove.append(uid)
-
-        for uid in trial_to_remove:
-            self._running_trials[uid].trial.status = TrialStatus.STOP
-            self._resource_manager.release_resource(uid)
-            del self._running_trials[uid]
-
-    def _get_reports(self) -> None:
-        while not self._report_queue.empty():
-            report = self._report_queue.get_nowait()
+        logger.debug(f"Worker {uid} (pid {process.pid}) is started.")
+        return self._workers[uid]
+
+    def _start_trial(self, worker: TrialWorker, trial: Trial) -> None:
+        logger.info(f"{trial.id} trial is now running.")
+        logger.debug(f"{trial.id} hyper paramter => {trial.configuration}")
+
+        trial.status = TrialStatus.RUNNING
+        worker.trial = trial
+        worker.conn.send(trial.get_train_configuration())
+
+    def _resume_trial(self, worker: TrialWorker) -> None:
+        trial: Trial = worker.trial  # type: ignore[assignment]
+        logger.info(f"{trial.id} trial is promoted and continues in place.")
+
+        trial.status = TrialStatus.RUNNING
+        worker.paused = False
+        worker.conn.send(TrialStatus.RUNNING)
+
+    def _preempt_trial(self, worker: TrialWorker, next_trial: Trial) -> None:
+        """Stop the paused trial to run the next trial on its worker after it's finished."""
+        logger.info(f"{worker.trial.id} trial is stopped to run {next_trial.id} trial.")  # type: ignore[union-attr]
+
+        # Reserve the next trial, so that it isn't sampled again until the worker is released
+        next_trial.status = TrialStatus.RUNNING
+        worker.next_trial = next_trial
+        self._stop_paused_trial(worker)
+
+    def _stop_paused_trials(self) -> None:
+        for worker in self._get_paused_workers():
+            self._stop_paused_trial(worker)
+
+    def _stop_paused_trial(self, worker: TrialWorker) -> None:
+        # The trial can't be promoted until it's finished and its weights are saved
+        worker.trial.status = TrialStatus.RUNNING  # type: ignore[union-attr]
+        worker.paused = False
+        worker.conn.send(TrialStatus.STOP)
+
+    def _handle_events(self) -> bool:
+        """Wait for the events of the workers and handle them.
+
+        Returns:
+            bool: Whether any trial is reported or finished.
+        """
+        is_running = any(worker.trial is not None and not worker.paused for worker in self._workers.values())
+        conns: dict[Any, TrialWorker] = {worker.conn: worker for worker in self._workers.values()}
+        sentinels: dict[Any, TrialWorker] = {worker.process.sentinel: worker for worker in self._workers.values()}
+        ready = wait([*conns, *sentinels], timeout=None if is_running else self.IDLE_TIMEOUT)
+
+        changed = False
+        for obj in ready:
+            if (worker := conns.get(obj)) is not None:
+                changed |= self._handle_message(worker)
+
+        for obj in ready:
+            if (worker := sentinels.get(obj)) is not None:
+                self._remove_worker(worker)
+                changed = True
+
+        return changed
+
+    def _handle_message(self, worker: TrialWorker) -> bool:
+        try:
+            message, payload = worker.conn.recv()
+        except EOFError:
+            # The worker exits, which is handled by its sentinel
+            return False
+
+        if worker.trial is None:
+            return False
+
+        if message == "report":
             trial_status = self._hpo_algo.report_score(
-                report["score"],
-                report["progress"],
-                report["trial_id"],
-                report["done"],
+                payload["score"],
+                payload["progress"],
+                payload["trial_id"],
+                payload["done"],
             )
-            if report["uid"] in self._running_trials:
-                self._running_trials[report["uid"]].queue.put_nowait(trial_status)
+            if (
+                self._in_place_promotion
+                and trial_status == TrialStatus.STOP
+                and not payload["done"]
+                and self._hpo_algo.is_promotable(payload["trial_id"])
+            ):
+                # Leave the worker waiting for the reply until the trial is promoted or its worker is needed
+                logger.debug(f"{worker.trial.id} trial is paused.")
+                worker.trial.status = TrialStatus.STOP
+                worker.paused = True
+            else:
+                worker.conn.send(trial_status)
+        elif message == "finished":
+            worker.trial.status = TrialStatus.STOP
+            worker.trial = None
+            if worker.next_trial is not None:
+                self._start_trial(worker, worker.next_trial)
+                worker.next_trial = None
+        return True
+
+    def _remove_worker(self, worker: TrialWorker) -> None:
+        worker.process.join()
+        if worker.process.exitcode != 0:
+            self._terminate_all_running_processes()
+            msg = "One of HPO trials exit abnormally."
+            raise RuntimeError(msg)
 
-        self._hpo_algo.save_results()
+        if worker.trial is not None:
+            worker.trial.status = TrialStatus.STOP
+        if worker.next_trial is not None:
+            worker.next_trial.status = TrialStatus.READY
+        worker.conn.close()
+        self._resource_manager.release_resource(worker.uid)
+        del self._workers[worker.uid]
 
     def _join_all_processes(self) -> None:
-        for val in self._running_trials.values():
-            val.queue.close()
+        for worker in self._workers.values():
+            worker.conn.send(None)
+            worker.conn.close()
 
-        for val in self._running_trials.values():
-            val.process.join()
+        for worker in self._workers.values():
+            worker.process.join()
+            self._resource_manager.release_resource(worker.uid)
 
-        self._running_trials = {}
+        self._workers = {}
 
     def _get_uid(self) -> int:
         uid = self._uid_index
@@ -176,9 +302,9 @@ class HpoLoop:
         return uid
 
     def _terminate_all_running_processes(self) -> None:
-        for trial in self._running_trials.values():
-            trial.queue.close()
-            process = trial.process
+        for worker in self._workers.values():
+            worker.conn.close()
+            process = worker.process
             if process.is_alive():
                 logger.info(f"Kill child process {process.pid}")
                 process.terminate()
@@ -190,47 +316,39 @@ class HpoLoop:
         logger.warning(f"{singal_name[signum]} is sent. process exited.")
 
 
-def _run_train(train_func: Callable, hp_config: dict, report_func: Callable) -> None:
+def _dump_train_func(train_func: Callable) -> bytes | Callable:
+    """Pickle the training function, so that each trial runs with its own copy of it and its arguments."""
+    try:
+        return pickle.dumps(train_func)
+    except (pickle.PicklingError, RuntimeError, TypeError, AttributeError):
+        # e.g., multiprocessing locks can be pickled only for spawning a process
+        logger.warning("The training function can't be copied for each trial. The trials of a worker share it.")
+        return train_func
+
+
+def _run_worker(train_func: bytes | Callable, conn: Connection) -> None:
     # set multi process method as default
     multiprocessing.set_start_method(None, True)
-    train_func(hp_config, report_func)
+    while (hp_config := conn.recv()) is not None:
+        func = pickle.loads(train_func) if isinstance(train_func, bytes) else train_func  # noqa: S301
+        func(hp_config, partial(_report_score, conn=conn, trial_id=hp_config["id"]))
+        conn.send(("finished", hp_config["id"]))
 
 
 def _report_score(
     score: int | float,
     progress: int | float,
-    recv_queue: multiprocessing.Queue,
-    send_queue: multiprocessing.Queue,
-    uid: Hashable,
+    conn: Connection,
     trial_id: Hashable,
     done: bool = False,
 ) -> TrialStatus:
-    logger.debug(
-        f"score : {score}, progress : {progress}, uid : {uid}, trial_id : {trial_id}, "
-        f"pid : {os.getpid()}, done : {done}",
-    )
+    logger.debug(f"score : {score}, progress : {progress}, trial_id : {trial_id}, pid : {os.getpid()}, done : {done}")
     try:
-        send_queue.put_nowait(
-            {
-                "score": score,
-                "progress": progress,
-                "uid": uid,
-                "trial_id": trial_id,
-                "pid": os.getpid(),
-                "done": done,
-            },
-        )
-    except ValueError:
+        conn.send(("report", {"score": score, "progress": progress, "trial_id": trial_id, "done": done}))
+        trial_status = conn.recv()
+    except (OSError, EOFError):
         return TrialStatus.STOP
 
-    try:
-        trial_status = recv_queue.get(timeout=3)
-    except queue.Empty:
-        return TrialStatus.RUNNING
-
-    while not recv_queue.empty():
-        trial_status = recv_queue.get_nowait()
-
     logger.debug(f"trial_status : {trial_status}")
     return trial_status
 
@@ -241,6 +359,7 @@ def run_hpo_loop(
     resource_type: Literal["gpu", "cpu"] = "gpu",
     num_parallel_trial: int | None = None,
     num_gpu_for_single_trial: int | None = None,
+    in_place_promotion: bool = False,
 ) -> None:
     """Run the HPO loop.
 
@@ -253,6 +372,14 @@ def run_hpo_loop(
                                                    It's used for CPUResourceManager. Defaults to None.
         num_gpu_for_single_trial (int | None, optional): How many GPUs are used for a single trial.
                                                          It's used for GPUResourceManager. Defaults to None.
+        in_place_promotion (bool, optional): Whether to continue the promoted trial in place. Defaults to False.
     """
-    hpo_loop = HpoLoop(hpo_algo, train_func, resource_type, num_parallel_trial, num_gpu_for_single_trial)
+    hpo_loop = HpoLoop(
+        hpo_algo,
+        train_func,
+        resource_type,
+        num_parallel_trial,
+        num_gpu_for_single_trial,
+        in_place_promotion,
+    )
     hpo_loop.run()
@@ -12,9 +12,8 @@ from copy import copy
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Literal
 
-from scipy.stats.qmc import LatinHypercube
-
 from otx.hpo.hpo_base import HpoBase, Trial, TrialStatus
+from otx.hpo.sampler import ConfigurationSampler, create_sampler
 from otx.hpo.utils import (
     check_mode_input,
     check_not_negative,
@@ -526,6 +525,10 @@ class HyperBand(HpoBase):
         asynchronous_sha (bool, optional): Whether to operate SHA asynchronously. Defaults to True.
         asynchronous_bracket (bool, optional): Whether SHAs(brackets) are running parallelly or not.
                                                Defaults to True. Defaults to False.
+        sampler ("lhs" | "tpe" | ConfigurationSampler, optional): Sampler to draw configurations of new trials.
+                                                                  "lhs" is Latin hypercube sampling and "tpe" is
+                                                                  BOHB-style TPE drawing the configurations from
+                                                                  the scores reported so far. Defaults to "lhs".
     """
 
     # pylint: disable=too-many-instance-attributes
@@ -548,6 +551,7 @@ class HyperBand(HpoBase):
         reduction_factor: int = 3,
         asynchronous_sha: bool = True,
         asynchronous_bracket: bool = False,
+        sampler: Literal["lhs", "tpe"] | ConfigurationSampler = "lhs",
     ) -> None:
         super().__init__(
             search_space,
@@ -575,6 +579,10 @@ class HyperBand(HpoBase):
         self._asynchronous_bracket = asynchronous_bracket
         self._trials: dict[Hashable, AshaTrial] = {}
         self._brackets: dict[int, Bracket] = {}
+        self._sampler = create_sampler(sampler, self.search_space, mode) if isinstance(sampler, str) else sampler
+        # Sampled trials which haven't started yet. Their configurations are sampled again right before they start
+        # if the sampler samples on demand.
+        self._trials_to_resample: set[Hashable] = set()
 
         if not self._need_to_find_resource_value():
             self._brackets = self._make_brackets()
@@ -702,17 +710,20 @@ class HyperBand(HpoBase):
         return hp_configs
 
     def _get_random_hyper_parameter(self, num_samples: int) -> list[AshaTrial]:
-        hp_configs = []
-        latin_hypercube = LatinHypercube(len(self.search_space))
-        configurations = latin_hypercube.random(num_samples)
-        for config in configurations:
-            config_with_key = {key: config[idx] for idx, key in enumerate(self.search_space)}
-            hp_configs.append(
-                self._make_trial(self.search_space.convert_from_zero_one_scale_to_real_space(config_with_key)),
-            )
+        configurations = self._sampler.sample(num_samples, list(self._trials.values()))
+        hp_configs = [self._make_trial(config) for config in configurations]
+        if self._sampler.sample_on_demand:
+            self._trials_to_resample.update(trial.id for trial in hp_configs)
 
         return hp_configs
 
+    def _resample_hyper_parameter(self, trial: AshaTrial) -> None:
+        """Sample the configuration of the trial again from the scores reported until it starts."""
+        self._trials_to_resample.discard(trial.id)
+        configuration = self._sampler.resample(dict(trial.configuration), list(self._trials.values()))
+        trial.configuration.clear()
+        trial.configuration.update(configuration)
+
     def _make_trial(self, hyper_parameter: dict) -> AshaTrial:
         trial_id = self._get_new_trial_id()
         trial = AshaTrial(trial_id, hyper_parameter)
@@ -741,6 +752,9 @@ class HyperBand(HpoBase):
                     continue
                 break
 
+        if next_sample is not None and next_sample.id in self._trials_to_resample:
+            self._resample_hyper_parameter(next_sample)
+
         return next_sample
 
     def _make_trial_to_estimate_resource(self) -> AshaTrial:
@@ -980,6 +994,20 @@ class HyperBand(HpoBase):
 
         return TrialStatus.RUNNING
 
+    def is_promotable(self, trial_id: Hashable) -> bool:
+        """Check whether the trial can be promoted to the next rung of its bracket.
+
+        Args:
+            trial_id (Hashable): Trial id.
+
+        Returns:
+            bool: Whether the trial can be promoted.
+        """
+        trial = self._trials[trial_id]
+        if trial.bracket is None or trial.rung is None or trial.bracket not in self._brackets:
+            return False
+        return trial.rung < self._brackets[trial.bracket].max_rung
+
     def is_done(self) -> bool:
         """Check that the ASHA is done.
 
@@ -0,0 +1,322 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+"""Samplers drawing hyper parameter configurations of new trials."""
+
+from __future__ import annotations
+
+import math
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, ClassVar, Literal
+
+import numpy as np
+from scipy.stats import truncnorm
+from scipy.stats.qmc import LatinHypercube
+
+from otx.hpo.utils import check_mode_input, check_positive
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from otx.hpo.hpo_base import Trial
+    from otx.hpo.search_space import SearchSpace, SingleSearchSpace
+
+
+class ConfigurationSampler(ABC):
+    """Base class for samplers drawing hyper parameter configurations of new trials.
+
+    Args:
+        search_space (SearchSpace): hyper parameter search space.
+        mode ("max" | "min", optional): Decide which score is better between highest score or lowest score.
+                                        Defaults to "max".
+        seed (int | None, optional): Random seed. Defaults to None.
+    """
+
+    # If true, the configuration of a new trial is sampled again right before it starts,
+    # so that it is drawn from the latest scores.
+    sample_on_demand: ClassVar[bool] = False
+
+    def __init__(self, search_space: SearchSpace, mode: Literal["max", "min"] = "max", seed: int | None = None):
+        check_mode_input(mode)
+        self._search_space = search_space
+        self._mode = mode
+        self._rng = np.random.default_rng(seed)
+
+    @abstractmethod
+    def sample(self, num_samples: int, trials: Iterable[Trial] = ()) -> list[dict[str, Any]]:
+        """Sample hyper parameter configurations.
+
+        Args:
+            num_samples (int): Number of configurations to sample.
+            trials (Iterable[Trial], optional): Trials made so far including their scores. Defaults to ().
+
+        Returns:
+            list[dict[str, Any]]: Configurations in the real space.
+        """
+        raise NotImplementedError
+
+    def resample(self, configuration: dict[str, Any], trials: Iterable[Trial] = ()) -> dict[str, Any]:
+        """Sample the configuration of a trial again right before it starts.
+
+        It is called only if `sample_on_demand` is true. The configuration is kept as it is by default.
+
+        Args:
+            configuration (dict[str, Any]): Configuration sampled when the trial was made.
+            trials (Iterable[Trial], optional): Trials made so far including their scores. Defaults to ().
+
+        Returns:
+            dict[str, Any]: Configuration in the real space.
+        """
+        del trials
+        return configuration
+
+
+class LatinHypercubeSampler(ConfigurationSampler):
+    """Sampler spreading the configurations evenly over the search space by Latin hypercube sampling.
+
+    It doesn't use the scores of the trials.
+    """
+
+    def sample(self, num_samples: int, trials: Iterable[Trial] = ()) -> list[dict[str, Any]]:
+        """Sample hyper parameter configurations by Latin hypercube sampling."""
+        latin_hypercube = LatinHypercube(len(self._search_space), seed=self._rng)
+        configurations = latin_hypercube.random(num_samples)
+        return [
+            self._search_space.convert_from_zero_one_scale_to_real_space(
+                {key: config[idx] for idx, key in enumerate(self._search_space)},
+            )
+            for config in configurations
+        ]
+
+
+class TPESampler(ConfigurationSampler):
+    """Tree-structured Parzen estimator sampler used by BOHB.
+
+    The configurations are represented in the search space scaled to [0, 1], i.e., in log scale if needed,
+    and categorical hyper parameters are represented by the indices of the choices.
+    The observations are taken from the largest resource (rung) where enough trials have reported a score.
+    They are split into good and bad ones by the score, and a kernel density estimator is fitted to each.
+    Candidates are drawn around the good configurations with the widened bandwidth,
+    and the one maximizing the ratio of the good density to the bad density is chosen.
+    Until there are enough observations, the configurations are drawn by Latin hypercube sampling.
+
+    Please refer the below paper for the detailed algorithm.
+
+    [1] "BOHB: Robust and Efficient Hyperparameter Optimization at Scale", ICML 2018
+        https://arxiv.org/abs/1807.01774
+
+    Args:
+        search_space (SearchSpace): hyper parameter search space.
+        mode ("max" | "min", optional): Decide which score is better between highest score or lowest score.
+                                        Defaults to "max".
+        seed (int | None, optional): Random seed. Defaults to None.
+        min_points_in_model (int | None, optional): Minimum number of good and bad observations to fit each model.
+                                                    If None, the number of hyper parameters + 1 is used.
+        top_n_percent (int, optional): Percentage of the observations considered as good ones. Defaults to 15.
+        num_candidates (int, optional): Number of candidates to draw to choose a configuration. Defaults to 64.
+        random_fraction (float, optional): Fraction of the configurations drawn at random
+                                           even if the model is available. Defaults to 1 / 3.
+        bandwidth_factor (float, optional): Factor to widen the bandwidth to draw the candidates. Defaults to 3.
+        min_bandwidth (float, optional): Minimum bandwidth of the kernels. Defaults to 1e-3.
+    """
+
+    sample_on_demand: ClassVar[bool] = True
+
+    def __init__(
+        self,
+        search_space: SearchSpace,
+        mode: Literal["max", "min"] = "max",
+        seed: int | None = None,
+        min_points_in_model: int | None = None,
+        top_n_percent: int = 15,
+        num_candidates: int = 64,
+        random_fraction: float = 1 / 3,
+        bandwidth_factor: float = 3,
+        min_bandwidth: float = 1e-3,
+    ):
+        super().__init__(search_space, mode, seed)
+        if min_points_in_model is None:
+            min_points_in_model = len(search_space) + 1
+        check_positive(min_points_in_model, "min_points_in_model")
+        check_positive(top_n_percent, "top_n_percent")
+        check_positive(num_candidates, "num_candidates")
+        check_positive(bandwidth_factor, "bandwidth_factor")
+        check_positive(min_bandwidth, "min_bandwidth")
+        if not 0 <= random_fraction <= 1:
+            error_msg = f"random_fraction should be between 0 and 1.\nyour value : {random_fraction}"
+            raise ValueError(error_msg)
+
+        self._min_points_in_model = min_points_in_model
+        self._top_n_percent = top_n_percent
+        self._num_candidates = num_candidates
+        self._random_fraction = random_fraction
+        self._bandwidth_factor = bandwidth_factor
+        self._min_bandwidth = min_bandwidth
+        self._random_sampler = LatinHypercubeSampler(search_space, mode, seed)
+        # Number of choices for categorical hyper parameters and 0 for the others
+        self._num_choices = np.array(
+            [
+                len(search_space[key].choice_list) if search_space[key].is_categorical() else 0  # type: ignore[arg-type]
+                for key in search_space
+            ],
+        )
+        # Kernels of the quantized hyper parameters should cover at least one step
+        self._min_bandwidths = np.array(
+            [max(min_bandwidth, self._get_step_in_unit_scale(search_space[key])) for key in search_space],
+        )
+        # Densities are mixed with the uniform prior, so that they are not collapsed to the few observations
+        self._prior_pdf = float(np.prod(1 / self._num_choices[self._num_choices > 0]))
+
+    def sample(self, num_samples: int, trials: Iterable[Trial] = ()) -> list[dict[str, Any]]:
+        """Sample hyper parameter configurations from the models fitted to the scores of the trials."""
+        if (observations := self._get_observations(trials)) is None:
+            return self._random_sampler.sample(num_samples)
+
+        random_configurations = self._random_sampler.sample(num_samples)
+        return [
+            config if self._rng.random() < self._random_fraction else self._sample_from_model(*observations)
+            for config in random_configurations
+        ]
+
+    def resample(self, configuration: dict[str, Any], trials: Iterable[Trial] = ()) -> dict[str, Any]:
+        """Sample the configuration from the latest scores.
+
+        The configuration drawn by Latin hypercube sampling is kept if the model isn't available yet
+        or with `random_fraction` probability, so that the random configurations stay spread evenly.
+        """
+        if self._rng.random() < self._random_fraction or (observations := self._get_observations(trials)) is None:
+            return configuration
+        return self._sample_from_model(*observations)
+
+    def _sample_from_model(self, good: np.ndarray, bad: np.ndarray) -> dict[str, Any]:
+        """Choose the candidate maximizing the ratio of the good density to the bad density."""
+        good_bandwidth = self._get_bandwidth(good)
+        bad_bandwidth = self._get_bandwidth(bad)
+        candidates = self._draw_candidates(good, good_bandwidth)
+        good_pdf = self._get_pdf(candidates, good, good_bandwidth)
+        bad_pdf = self._get_pdf(candidates, bad, bad_bandwidth)
+        best = np.argmax(np.maximum(good_pdf, 1e-32) / np.maximum(bad_pdf, 1e-32))
+        return self._vector_to_config(candidates[best])
+
+    @staticmethod
+    def _get_step_in_unit_scale(search_space: SingleSearchSpace) -> float:
+        if not search_space.use_quantized_step():
+            return 0
+        lower, upper = search_space.lower_space(), search_space.upper_space()
+        step_end = search_space.real_to_space(search_space.min + search_space.step)  # type: ignore[operator]
+        return min((step_end - lower) / (upper - lower), 1)  # type: ignore[operator]
+
+    def _get_observations(self, trials: Iterable[Trial]) -> tuple[np.ndarray, np.ndarray] | None:
+        """Get the good and bad observations at the largest resource where there are enough observations."""
+        trials = [trial for trial in trials if trial.score]
+        for resource in sorted({trial.get_progress() for trial in trials}, reverse=True):
+            vectors, scores = [], []
+            for trial in trials:
+                if trial.get_progress() < resource or (vector := self._config_to_vector(trial.configuration)) is None:
+                    continue
+                vectors.append(vector)
+                scores.append(trial.get_best_score(self._mode, resource))
+
+            num_good = max(self._min_points_in_model, self._top_n_percent * len(vectors) // 100)
+            num_bad = max(self._min_points_in_model, (100 - self._top_n_percent) * len(vectors) // 100)
+            if len(vectors) < num_good + self._min_points_in_model:
+                continue
+
+            order = np.argsort(scores)
+            if self._mode == "max":
+                order = order[::-1]
+            vectors_array = np.array(vectors)
+            return vectors_array[order[:num_good]], vectors_array[order[num_good : num_good + num_bad]]
+
+        return None
+
+    def _config_to_vector(self, configuration: dict[str, Any]) -> np.ndarray | None:
+        """Convert the configuration to [0, 1] scale, or the choice index for the categorical hyper parameters."""
+        vector = []
+        for key in self._search_space:
+            search_space = self._search_space[key]
+            if (value := configuration.get(key)) is None:
+                return None
+            if search_space.is_categorical():
+                if value not in search_space.choice_list:  # type: ignore[operator]
+                    return None
+                vector.append(search_space.choice_list.index(value))  # type: ignore[union-attr]
+            else:
+                lower, upper = search_space.lower_space(), search_space.upper_space()
+                vector.append((search_space.real_to_space(value) - lower) / (upper - lower))  # type: ignore[operator]
+        return np.clip(vector, 0, np.maximum(self._num_choices - 1, 1))
+
+    def _vector_to_config(self, vector: np.ndarray) -> dict[str, Any]:
+        space_config = {}
+        for idx, key in enumerate(self._search_space):
+            search_space = self._search_space[key]
+            if search_space.is_categorical():
+                space_config[key] = int(vector[idx])
+            else:
+                lower, upper = search_space.lower_space(), search_space.upper_space()
+                space_config[key] = (upper - lower) * vector[idx] + lower  # type: ignore[operator]
+        return self._search_space.get_real_config(space_config)
+
+    def _get_bandwidth(self, observations: np.ndarray) -> np.ndarray:
+        """Get the bandwidth of each hyper parameter by the normal reference rule."""
+        num_points, num_dims = observations.shape
+        bandwidth = 1.06 * observations.std(axis=0) * num_points ** (-1 / (4 + num_dims))
+        # Aitchison-Aitken kernel of the categorical hyper parameters is defined up to (num_choices - 1) / num_choices
+        max_bandwidth = np.where(self._num_choices > 0, (self._num_choices - 1) / np.maximum(self._num_choices, 1), 1)
+        return np.clip(bandwidth, self._min_bandwidths, np.maximum(max_bandwidth, self._min_bandwidths))
+
+    def _draw_candidates(self, good: np.ndarray, bandwidth: np.ndarray) -> np.ndarray:
+        """Draw the candidates around the good observations with the widened bandwidth or from the uniform prior."""
+        center_indices = self._rng.integers(len(good) + 1, size=self._num_candidates)
+        from_prior = center_indices == len(good)
+        centers = good[np.minimum(center_indices, len(good) - 1)]
+        categorical = self._num_choices > 0
+
+        # Categorical hyper parameters are drawn separately below
+        loc = np.where(categorical, 0.5, centers)
+        scale = np.broadcast_to(bandwidth * self._bandwidth_factor, centers.shape)
+        candidates = truncnorm.rvs(-loc / scale, (1 - loc) / scale, loc=loc, scale=scale, random_state=self._rng)
+
+        # Keep the choice of the center with 1 - widened bandwidth probability, otherwise choose at random
+        max_bandwidth = (self._num_choices - 1) / np.maximum(self._num_choices, 1)
+        keep = self._rng.random(centers.shape) >= np.minimum(scale, max_bandwidth)
+        random_choices = np.floor(self._rng.random(centers.shape) * np.maximum(self._num_choices, 1))
+        candidates[:, categorical] = np.where(keep, centers, random_choices)[:, categorical]
+
+        uniform = self._rng.random(centers.shape)
+        candidates[from_prior] = np.where(categorical, random_choices, uniform)[from_prior]
+        return candidates
+
+    def _get_pdf(self, points: np.ndarray, observations: np.ndarray, bandwidth: np.ndarray) -> np.ndarray:
+        """Evaluate the kernel density estimator fitted to the observations and mixed with the prior at the points."""
+        diff = points[:, None, :] - observations[None, :, :]
+        continuous_kernel = np.exp(-0.5 * (diff / bandwidth) ** 2) / (math.sqrt(2 * math.pi) * bandwidth)
+        categorical_kernel = np.where(diff == 0, 1 - bandwidth, bandwidth / np.maximum(self._num_choices - 1, 1))
+        kernel = np.where(self._num_choices > 0, categorical_kernel, continuous_kernel)
+        return (kernel.prod(axis=-1).sum(axis=-1) + self._prior_pdf) / (len(observations) + 1)
+
+
+SAMPLERS: dict[str, type[ConfigurationSampler]] = {"lhs": LatinHypercubeSampler, "tpe": TPESampler}
+
+
+def create_sampler(
+    sampler: Literal["lhs", "tpe"],
+    search_space: SearchSpace,
+    mode: Literal["max", "min"] = "max",
+) -> ConfigurationSampler:
+    """Create the configuration sampler by its name.
+
+    Args:
+        sampler ("lhs" | "tpe"): Name of the sampler. "lhs" is Latin hypercube sampling
+                                 and "tpe" is BOHB-style tree-structured Parzen estimator.
+        search_space (SearchSpace): hyper parameter search space.
+        mode ("max" | "min", optional): Decide which score is better between highest score or lowest score.
+                                        Defaults to "max".
+
+    Returns:
+        ConfigurationSampler: Configuration sampler.
+    """
+    if sampler not in SAMPLERS:
+        error_msg = f"sampler should be one of {', '.join(SAMPLERS)}.\nyour value : {sampler}"
+        raise ValueError(error_msg)
+    return SAMPLERS[sampler](search_space, mode)
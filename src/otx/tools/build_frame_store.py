@@ -0,0 +1,56 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Build or validate the frame clip store of an action dataset.
+
+Example:
+    $ python -m otx.tools.build_frame_store -i data/kinetics -f kinetics -o data/kinetics_frames
+    $ python -m otx.tools.build_frame_store -i data/kinetics -f kinetics -o data/kinetics_frames --validate
+
+The store is then used by giving its directory to the `frame_store` argument of `DecodeVideo`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from datumaro import Dataset
+from datumaro.components.media import Video
+
+from otx.core.data.frame_store import FrameClipStore
+
+
+def get_video_paths(data_root: str, data_format: str) -> list[str]:
+    """Get the paths of all videos in the dataset."""
+    dataset = Dataset.import_from(data_root, format=data_format)
+    return sorted({item.media.path for item in dataset if isinstance(item.media, Video)})
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Build or validate the frame clip store of the dataset."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-i", "--data_root", required=True, help="Input dataset root path")
+    parser.add_argument("-f", "--data_format", default="kinetics", help="Datumaro format of the dataset")
+    parser.add_argument("-o", "--store_dir", required=True, help="Directory of the frame clip store")
+    parser.add_argument("--short_side", type=int, default=256, help="Shorter side of the stored frames")
+    parser.add_argument("--chunk_size", type=int, default=2**30, help="Size of the chunk files in bytes")
+    parser.add_argument("--validate", action="store_true", help="Only validate the existing store")
+    args = parser.parse_args(argv)
+
+    video_paths = get_video_paths(args.data_root, args.data_format)
+    if args.validate:
+        store = FrameClipStore(args.store_dir)
+    else:
+        store = FrameClipStore.build(args.store_dir, video_paths, args.short_side, args.chunk_size)
+
+    errors = store.validate(video_paths)
+    for error in errors:
+        print(error)
+    print(f"{Path(args.store_dir)}: {len(store)} videos, {len(errors)} problems")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
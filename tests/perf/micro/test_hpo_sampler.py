@@ -0,0 +1,86 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""HPO configuration sampler micro benchmark."""
+
+from __future__ import annotations
+
+import logging
+import math
+import statistics
+
+import numpy as np
+import pytest
+from otx.hpo.hpo_base import TrialStatus
+from otx.hpo.hyperband import HyperBand
+from otx.hpo.sampler import LatinHypercubeSampler, TPESampler
+from otx.hpo.search_space import SearchSpace
+
+log = logging.getLogger(__name__)
+
+SEARCH_SPACE = {
+    "lr": {"type": "loguniform", "min": 1e-5, "max": 1e-1, "log_base": 10},
+    "bs": {"type": "quniform", "min": 8, "max": 128, "step": 8},
+    "optimizer": {"type": "choice", "choice_list": ["sgd", "adam", "adamw"]},
+}
+
+
+def _get_score(configuration: dict, epoch: int, rng: np.random.Generator) -> float:
+    """Synthetic learning curve converging to the quality of the configuration with the noise."""
+    quality = math.exp(-((math.log10(configuration["lr"]) + 3.5) ** 2) / 2)
+    quality *= math.exp(-(((configuration["bs"] - 48) / 80) ** 2))
+    quality *= {"sgd": 1.0, "adam": 0.9, "adamw": 0.8}[configuration["optimizer"]]
+    return quality * (1 - math.exp(-epoch / 3)) + rng.normal(0, 0.01)
+
+
+def _run_until_target(sampler_name: str, seed: int, target: float, save_path: str) -> tuple[int, int] | None:
+    """Run HyperBand and return the number of trials and epochs to reach the target score."""
+    rng = np.random.default_rng(seed)
+    search_space = SearchSpace(SEARCH_SPACE)
+    sampler_cls = TPESampler if sampler_name == "tpe" else LatinHypercubeSampler
+    hyper_band = HyperBand(
+        search_space=SEARCH_SPACE,
+        save_path=save_path,
+        num_full_iterations=27,
+        full_dataset_size=1,
+        maximum_resource=27,
+        minimum_resource=1,
+        reduction_factor=3,
+        sampler=sampler_cls(search_space, seed=seed),
+    )
+
+    started_trials = set()
+    num_epochs = 0
+    while (trial := hyper_band.get_next_sample()) is not None:
+        trial.status = TrialStatus.RUNNING
+        configuration = trial.get_train_configuration()["configuration"]
+        started_trials.add(trial.id)
+        for epoch in range(int(trial.get_progress()) + 1, round(configuration["iterations"]) + 1):
+            num_epochs += 1
+            score = _get_score(configuration, epoch, rng)
+            if score >= target:
+                return len(started_trials), num_epochs
+            if hyper_band.report_score(score, epoch, trial.id) == TrialStatus.STOP:
+                break
+        hyper_band.report_score(0, 0, trial.id, done=True)
+        trial.status = TrialStatus.STOP
+
+    return None
+
+
+@pytest.mark.parametrize("target", [0.7, 0.8, 0.9])
+def test_hpo_sampler(target: float, tmp_path) -> None:
+    num_runs = 20
+
+    for sampler_name in ["lhs", "tpe"]:
+        results = [
+            result
+            for seed in range(num_runs)
+            if (result := _run_until_target(sampler_name, seed, target, str(tmp_path / f"{sampler_name}-{seed}")))
+        ]
+        num_trials = statistics.median(num_trials for num_trials, _ in results) if results else math.nan
+        num_epochs = statistics.median(num_epochs for _, num_epochs in results) if results else math.nan
+        log.info(
+            f"[target={target}] {sampler_name}: reached {len(results)} / {num_runs} runs, "
+            f"median {num_trials} trials / {num_epochs} epochs",
+        )
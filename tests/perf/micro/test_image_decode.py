@@ -0,0 +1,73 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Image decode backend micro benchmark."""
+
+from __future__ import annotations
+
+import logging
+import time
+
+import cv2
+import numpy as np
+import pytest
+from datumaro.components.annotation import Label
+from datumaro.components.dataset import Dataset as DmDataset
+from datumaro.components.dataset_base import DatasetItem
+from datumaro.components.media import Image
+from datumaro.util.image_cache import ImageCache
+from otx.core.data.dataset.classification import OTXMulticlassClsDataset
+from otx.core.data.mem_cache import MemCacheHandlerForSP
+from otx.core.types.image import ImageDecodeBackend
+
+log = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope="module", params=[(3000, 4000), (6000, 8000)], ids=["12MP", "48MP"])
+def fxt_dm_subset(request, tmp_path_factory):
+    height, width = request.param
+    rng = np.random.default_rng(0)
+    # Smooth noise looks like a photo to the JPEG encoder, unlike white noise
+    img = cv2.resize(rng.integers(0, 256, (height // 16, width // 16, 3), dtype=np.uint8), (width, height))
+
+    num_items = 4
+    paths = []
+    for idx in range(num_items):
+        path = tmp_path_factory.mktemp("images") / f"{idx}.jpg"
+        cv2.imwrite(str(path), np.roll(img, idx, axis=1), [cv2.IMWRITE_JPEG_QUALITY, 90])
+        paths.append(str(path))
+
+    dataset = DmDataset.from_iterable(
+        [
+            DatasetItem(id=str(idx), subset="train", media=Image.from_file(path), annotations=[Label(label=0)])
+            for idx, path in enumerate(paths)
+        ],
+        categories=["label"],
+    )
+    return dataset.get_subset("train"), f"{height * width // 10**6}MP"
+
+
+@pytest.mark.parametrize("mem_cache_img_max_size", [(1024, 1024), (512, 512)])
+def test_image_decode_backend(fxt_dm_subset, mem_cache_img_max_size: tuple[int, int]) -> None:
+    dm_subset, image_size = fxt_dm_subset
+    num_epochs = 3
+
+    results = {}
+    for backend in ImageDecodeBackend:
+        dataset = OTXMulticlassClsDataset(
+            dm_subset=dm_subset,
+            transforms=lambda x: x,
+            mem_cache_img_max_size=mem_cache_img_max_size,
+            image_decode_backend=backend,
+        )
+        start = time.perf_counter()
+        for _ in range(num_epochs):
+            # The images are decoded and resized before caching in every epoch
+            dataset.mem_cache_handler = MemCacheHandlerForSP(mem_size=64 * 2**20)
+            for idx in range(len(dataset)):
+                ImageCache.get_instance().clear()
+                assert max(dataset[idx].image.shape[:2]) <= max(mem_cache_img_max_size)
+        results[backend.value] = num_epochs * len(dataset) / (time.perf_counter() - start)
+
+    for backend, throughput in results.items():
+        log.info(f"[{image_size} -> {mem_cache_img_max_size}] {backend}: {throughput:.2f} images / s")
@@ -0,0 +1,71 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Memory cache handler micro benchmark."""
+
+from __future__ import annotations
+
+import ctypes as ct
+import logging
+import multiprocessing as mp
+import time
+
+import numpy as np
+import pytest
+from otx.core.data.mem_cache import MemCacheHandlerForMP
+
+log = logging.getLogger(__name__)
+
+
+class _DictProxyMemCacheHandler(MemCacheHandlerForMP):
+    """Previous implementation which keeps the item addresses in a Manager DictProxy."""
+
+    def _init_data_structs(self, mem_size: int) -> None:
+        self._arr = mp.Array(ct.c_uint8, mem_size, lock=False)
+        self._cur_page = mp.Value(ct.c_size_t, 0, lock=False)
+        self._manager = mp.Manager()
+        self._cache_addr = self._manager.dict()
+        self._lock = mp.Lock()
+        self._freeze = mp.Value(ct.c_bool, False, lock=False)
+
+    def shutdown(self) -> None:
+        self._manager.shutdown()
+
+
+def _get_worker(handler: MemCacheHandlerForMP, keys: list[str], num_iters: int, latencies: mp.Queue) -> None:
+    start = time.perf_counter()
+    for idx in range(num_iters):
+        handler.get(keys[idx % len(keys)])
+    latencies.put((time.perf_counter() - start) / num_iters)
+
+
+def _measure_hit_latency(handler: MemCacheHandlerForMP, keys: list[str], num_workers: int, num_iters: int) -> float:
+    ctx = mp.get_context("fork")
+    latencies = ctx.Queue()
+    workers = [ctx.Process(target=_get_worker, args=(handler, keys, num_iters, latencies)) for _ in range(num_workers)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return float(np.mean([latencies.get() for _ in workers]))
+
+
+@pytest.mark.parametrize("num_workers", [1, 4, 8, 16])
+def test_mem_cache_hit_latency(num_workers: int) -> None:
+    num_items, num_iters = 1000, 2000
+    item = np.zeros((64, 64, 3), dtype=np.uint8)
+    keys = [f"/dataset/images/{idx:08d}.jpg" for idx in range(num_items)]
+
+    results = {}
+    for handler_cls in (_DictProxyMemCacheHandler, MemCacheHandlerForMP):
+        handler = handler_cls(mem_size=2 * num_items * item.nbytes)
+        for key in keys:
+            handler.put(key, item)
+        assert len(handler) == num_items
+        results[handler_cls.__name__] = _measure_hit_latency(handler, keys, num_workers, num_iters)
+        handler.shutdown()
+
+    for name, latency in results.items():
+        log.info(f"[{num_workers} workers] {name}: {latency * 1e6:.1f} us / hit")
+
+    assert results[MemCacheHandlerForMP.__name__] < results[_DictProxyMemCacheHandler.__name__]
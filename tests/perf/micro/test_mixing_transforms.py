@@ -0,0 +1,82 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Mixing transform cache micro benchmark."""
+
+from __future__ import annotations
+
+import logging
+import time
+
+import psutil
+import pytest
+import torch
+from otx.core.data.entity.base import ImageInfo
+from otx.core.data.entity.detection import DetDataEntity
+from otx.core.data.transform_libs.torchvision import CachedMixUp, CachedMosaic
+from torch.utils.data import DataLoader, Dataset
+from torchvision import tv_tensors
+
+log = logging.getLogger(__name__)
+
+
+class _DetDataset(Dataset):
+    def __init__(self, transform: CachedMosaic | CachedMixUp, num_items: int = 400) -> None:
+        self.transform = transform
+        self.num_items = num_items
+        self.image = torch.randint(0, 256, (3, 480, 640), dtype=torch.uint8, generator=torch.Generator().manual_seed(0))
+
+    def __len__(self) -> int:
+        return self.num_items
+
+    def __getitem__(self, idx: int) -> DetDataEntity:
+        entity = DetDataEntity(
+            image=tv_tensors.Image(self.image.clone()),
+            img_info=ImageInfo(img_idx=idx, img_shape=(480, 640), ori_shape=(480, 640)),
+            bboxes=tv_tensors.BoundingBoxes(
+                data=torch.Tensor([[10, 10, 200, 200], [300, 100, 600, 400]]),
+                format="xyxy",
+                canvas_size=(480, 640),
+            ),
+            labels=torch.LongTensor([0, 1]),
+        )
+        return self.transform(entity)
+
+
+def _collate(batch: list[DetDataEntity]) -> int:
+    return len(batch)
+
+
+def _total_pss() -> int:
+    processes = [psutil.Process(), *psutil.Process().children(recursive=True)]
+    return sum(process.memory_full_info().pss for process in processes)
+
+
+@pytest.mark.parametrize("num_workers", [2, 4])
+@pytest.mark.parametrize("transform_cls", [CachedMosaic, CachedMixUp])
+def test_mixing_transform_cache(transform_cls: type, num_workers: int) -> None:
+    results = {}
+    for use_shared_pool in (False, True):
+        transform = transform_cls(img_scale=(640, 640), max_cached_images=40, use_shared_pool=use_shared_pool)
+        loader = DataLoader(
+            _DetDataset(transform),
+            batch_size=8,
+            num_workers=num_workers,
+            collate_fn=_collate,
+            multiprocessing_context="fork",
+        )
+
+        base_pss = _total_pss()
+        peak_pss, num_images = 0, 0
+        start = time.perf_counter()
+        for batch_size in loader:
+            num_images += batch_size
+            peak_pss = max(peak_pss, _total_pss())
+        elapsed = time.perf_counter() - start
+        results["shared pool" if use_shared_pool else "per-worker cache"] = (num_images / elapsed, peak_pss - base_pss)
+
+    for name, (throughput, peak_pss) in results.items():
+        log.info(
+            f"[{transform_cls.__name__}, {num_workers} workers] {name}: "
+            f"{throughput:.1f} images / s, peak PSS +{peak_pss / 2**20:.1f} MiB",
+        )
@@ -0,0 +1,66 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Sampler epoch index generation micro benchmark."""
+
+from __future__ import annotations
+
+import logging
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import torch
+from otx.algo.samplers import balanced_sampler
+from otx.algo.samplers.balanced_sampler import BalancedSampler
+
+log = logging.getLogger(__name__)
+
+
+class _LoopBalancedSampler(BalancedSampler):
+    """Previous implementation which draws an index per class per trial in Python loops."""
+
+    def __iter__(self):
+        indices = []
+        for _ in range(self.repeat):
+            for _ in range(self.num_trials):
+                index = torch.cat(
+                    [
+                        self.img_indices[cls_indices][
+                            torch.randint(0, len(self.img_indices[cls_indices]), (1,), generator=self.generator)
+                        ]
+                        for cls_indices in self.img_indices
+                    ],
+                )
+                indices.append(index)
+
+        return iter(torch.cat(indices).tolist())
+
+
+@pytest.fixture()
+def fxt_dataset(monkeypatch, request) -> MagicMock:
+    num_classes, num_samples = request.param
+    labels = torch.randint(0, num_classes, (num_samples,), generator=torch.Generator().manual_seed(0))
+    order = torch.argsort(labels, stable=True)
+    ann_stats = {
+        label: indices.tolist()
+        for label, indices in enumerate(torch.split(order, torch.bincount(labels, minlength=num_classes).tolist()))
+    }
+    monkeypatch.setattr(balanced_sampler, "get_idx_list_per_classes", lambda *_: ann_stats)
+
+    dataset = MagicMock()
+    dataset.__len__.return_value = num_samples
+    return dataset
+
+
+@pytest.mark.parametrize("fxt_dataset", [(10, 1_000_000), (1_000, 1_000_000)], indirect=True)
+@pytest.mark.parametrize("sampler_cls", [_LoopBalancedSampler, BalancedSampler])
+def test_balanced_sampler_iter(fxt_dataset, sampler_cls) -> None:
+    sampler = sampler_cls(fxt_dataset, generator=torch.Generator().manual_seed(3003))
+
+    start = time.perf_counter()
+    indices = list(iter(sampler))
+    elapsed = time.perf_counter() - start
+
+    log.info(f"[{sampler.num_cls} classes x {len(fxt_dataset)} samples] {sampler_cls.__name__}: {elapsed:.3f} s")
+    assert len(indices) == len(sampler)
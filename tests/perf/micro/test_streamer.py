@@ -0,0 +1,73 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Threaded streamer micro benchmark."""
+
+from __future__ import annotations
+
+import importlib.util
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pytest
+from otx.core.exporter.exportable_code import demo
+
+log = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope="module")
+def fxt_threaded_streamer_cls() -> Iterator[type]:
+    # demo_package is a standalone package importing itself as 'demo_package', see the exportable code conftest
+    demo_package_file = Path(demo.__file__).parent / "demo_package" / "__init__.py"
+    spec = importlib.util.spec_from_file_location("demo_package", demo_package_file)
+    tmp_mod_demo_package = sys.modules.get("demo_package")
+    sys.modules["demo_package"] = importlib.util.module_from_spec(spec)
+
+    from otx.core.exporter.exportable_code.demo.demo_package.streamer.streamer import ThreadedStreamer
+
+    yield ThreadedStreamer
+
+    if tmp_mod_demo_package is not None:
+        sys.modules["demo_package"] = tmp_mod_demo_package
+    else:
+        sys.modules.pop("demo_package")
+
+
+class _SyntheticStreamer:
+    """Streamer yielding pre-generated frames as fast as possible."""
+
+    def __init__(self, height: int, width: int, num_frames: int) -> None:
+        self.frames = [np.full((height, width, 3), idx % 256, dtype=np.uint8) for idx in range(4)]
+        self.num_frames = num_frames
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for idx in range(self.num_frames):
+            yield self.frames[idx % len(self.frames)]
+
+
+@pytest.mark.parametrize("shared_memory", [False, True])
+@pytest.mark.parametrize("resolution", [(720, 1280), (2160, 3840)])
+def test_threaded_streamer(fxt_threaded_streamer_cls: type, resolution: tuple[int, int], shared_memory: bool) -> None:
+    num_frames = 100
+    streamer = fxt_threaded_streamer_cls(_SyntheticStreamer(*resolution, num_frames), shared_memory=shared_memory)
+
+    latencies = []
+    count = 0
+    start = last = time.perf_counter()
+    for frame in streamer:
+        now = time.perf_counter()
+        latencies.append(now - last)
+        last = now
+        count += int(frame[0, 0, 0] == count % 4)
+    elapsed = time.perf_counter() - start
+
+    transport = "shared memory" if shared_memory else "queue"
+    log.info(
+        f"[{resolution[1]}x{resolution[0]}, {transport}] {num_frames / elapsed:.1f} FPS, "
+        f"frame latency mean {np.mean(latencies) * 1e3:.2f} ms, p95 {np.percentile(latencies, 95) * 1e3:.2f} ms",
+    )
+    assert count == num_frames
@@ -0,0 +1,89 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tile merge micro benchmark."""
+
+from __future__ import annotations
+
+import logging
+import time
+
+import pytest
+import torch
+from otx.core.config.data import TileConfig
+from otx.core.data.entity.base import ImageInfo
+from otx.core.data.entity.detection import DetBatchPredEntity
+from otx.core.utils.tile_merge import DetectionTileMerge
+from torchvision import tv_tensors
+
+log = logging.getLogger(__name__)
+
+
+def _make_tile_preds(
+    num_images: int,
+    num_tiles_per_side: int,
+    tile_size: int,
+    num_boxes: int,
+    batch_size: int,
+) -> tuple[list[ImageInfo], list[DetBatchPredEntity], list[list[dict]]]:
+    img_size = tile_size * num_tiles_per_side
+    img_infos = [
+        ImageInfo(img_idx=idx, img_shape=(img_size, img_size), ori_shape=(img_size, img_size))
+        for idx in range(num_images)
+    ]
+    tile_attrs = [
+        {"tile_id": f"image_{img_idx}", "roi": [x * tile_size, y * tile_size, tile_size, tile_size]}
+        for img_idx in range(num_images)
+        for y in range(num_tiles_per_side)
+        for x in range(num_tiles_per_side)
+    ]
+
+    batch_tile_preds, batch_tile_attrs = [], []
+    for start in range(0, len(tile_attrs), batch_size):
+        attrs = tile_attrs[start : start + batch_size]
+        corners = torch.rand(len(attrs), num_boxes, 2) * tile_size * 0.8
+        sizes = torch.rand(len(attrs), num_boxes, 2) * tile_size * 0.2 + 1
+        batch_tile_preds.append(
+            DetBatchPredEntity(
+                batch_size=len(attrs),
+                images=[torch.empty(0) for _ in attrs],
+                imgs_info=[
+                    ImageInfo(img_idx=0, img_shape=(tile_size, tile_size), ori_shape=(tile_size, tile_size))
+                    for _ in attrs
+                ],
+                bboxes=[
+                    tv_tensors.BoundingBoxes(
+                        torch.cat([corner, corner + size], dim=1),
+                        format="XYXY",
+                        canvas_size=(tile_size, tile_size),
+                    )
+                    for corner, size in zip(corners, sizes)
+                ],
+                labels=[torch.randint(0, 10, (num_boxes,)) for _ in attrs],
+                scores=[torch.rand(num_boxes) for _ in attrs],
+            ),
+        )
+        batch_tile_attrs.append(attrs)
+    return img_infos, batch_tile_preds, batch_tile_attrs
+
+
+@pytest.mark.parametrize("num_tiles_per_side", [4, 8, 12])
+def test_detection_tile_merge(num_tiles_per_side: int) -> None:
+    num_images, num_iters = 2, 5
+    img_infos, batch_tile_preds, batch_tile_attrs = _make_tile_preds(
+        num_images=num_images,
+        num_tiles_per_side=num_tiles_per_side,
+        tile_size=400,
+        num_boxes=50,
+        batch_size=8,
+    )
+    merger = DetectionTileMerge(img_infos, num_classes=10, tile_config=TileConfig(enable_tiler=True))
+
+    start = time.perf_counter()
+    for _ in range(num_iters):
+        predictions = merger.merge(batch_tile_preds, batch_tile_attrs)
+    elapsed = (time.perf_counter() - start) / num_iters
+
+    num_tiles = num_tiles_per_side**2
+    log.info(f"[{num_tiles} tiles x {num_images} images] merge: {elapsed * 1e3:.1f} ms")
+    assert len(predictions) == num_images
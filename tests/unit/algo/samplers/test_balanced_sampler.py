@@ -4,6 +4,7 @@
 import math
 
 import pytest
+import torch
 from datumaro.components.annotation import Label
 from datumaro.components.dataset import Dataset as DmDataset
 from datumaro.components.dataset_base import DatasetItem
@@ -95,3 +96,16 @@ class TestBalancedSampler:
             batch = sorted(list_iter[i : i + batch_size])
             assert all(idx in class_0_idx for idx in batch[:2])
             assert all(idx in class_1_idx for idx in batch[2:])
+
+    def test_sampler_iter_with_fixed_seed(self, fxt_imbalanced_dataset):
+        sampler = BalancedSampler(fxt_imbalanced_dataset, generator=torch.Generator().manual_seed(3003))
+        indices = list(iter(sampler))
+
+        # Indices should be the same as drawing them one by one
+        generator = torch.Generator().manual_seed(3003)
+        expected = [
+            cls_indices[torch.randint(0, len(cls_indices), (1,), generator=generator)].item()
+            for _ in range(sampler.num_trials)
+            for cls_indices in sampler.img_indices.values()
+        ]
+        assert indices == expected
@@ -2,6 +2,7 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import pytest
+import torch
 from datumaro.components.annotation import Label
 from datumaro.components.dataset import Dataset as DmDataset
 from datumaro.components.dataset_base import DatasetItem
@@ -112,3 +113,25 @@ class TestBalancedSampler:
             batch = sorted(list_iter[i : i + batch_size])
             assert all(idx in old_idx for idx in batch[: sampler.old_new_ratio])
             assert all(idx in new_idx for idx in batch[sampler.old_new_ratio :])
+
+    def test_sampler_iter_with_fixed_seed(self, fxt_old_new_dataset):
+        batch_size = 4
+        sampler = ClassIncrementalSampler(
+            dataset=fxt_old_new_dataset,
+            batch_size=batch_size,
+            old_classes=["0", "1"],
+            new_classes=["2"],
+            drop_last=True,
+            generator=torch.Generator().manual_seed(3003),
+        )
+        indices = list(iter(sampler))
+
+        # Indices should be the same as drawing them batch by batch
+        generator = torch.Generator().manual_seed(3003)
+        num_new_per_batch = batch_size // (1 + sampler.old_new_ratio)
+        expected = []
+        for _ in range(sampler.data_length // batch_size):
+            new = torch.randint(0, len(sampler.new_indices), (num_new_per_batch,), generator=generator)
+            old = torch.randint(0, len(sampler.old_indices), (batch_size - num_new_per_batch,), generator=generator)
+            expected += sampler.new_indices[new].tolist() + sampler.old_indices[old].tolist()
+        assert [int(idx) for idx in indices] == expected
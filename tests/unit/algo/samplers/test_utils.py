@@ -0,0 +1,20 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import torch
+from otx.algo.samplers.utils import sequential_randint
+
+
+def test_sequential_randint() -> None:
+    high = torch.tensor([[1, 7, 100], [2**31 + 11, 12345, 2**32 - 5]]).repeat(100, 1)
+
+    generator = torch.Generator().manual_seed(3003)
+    expected = [torch.randint(0, int(bound), (1,), generator=generator).item() for bound in high.flatten()]
+    expected_state = generator.get_state()
+
+    generator = torch.Generator().manual_seed(3003)
+    draws = sequential_randint(high, generator=generator)
+
+    assert draws.shape == high.shape
+    assert draws.flatten().tolist() == expected
+    assert torch.equal(generator.get_state(), expected_state)
@@ -313,6 +313,45 @@ class TestZeroShotSegmentAnything:
                 for pm, up in zip(predicted_mask, used_points[label]):
                     assert pm[int(up[1]), int(up[0])] == up[2]
 
+    def test_infer_batch_prompts(self, mocker, build_zero_shot_segment_anything) -> None:
+        """Test infer with batch_prompts=True."""
+        mocker.patch("otx.algo.visual_prompting.segment_anything.SegmentAnything.load_checkpoint")
+        zero_shot_segment_anything = build_zero_shot_segment_anything()
+        mocker.patch.object(
+            zero_shot_segment_anything.prompt_getter,
+            "get_prompt_candidates",
+            return_value=(
+                {0: torch.tensor([[1000, 1000, 0.7], [0, 0, 0.5], [1000, 1000, 0.4]])},
+                {0: torch.tensor([[500, 500]])},
+            ),
+        )
+
+        def _patch_predict_batched_masks(**kwargs) -> Tensor:
+            point_coords = kwargs.get("point_coords")
+            masks = torch.zeros(len(point_coords), *kwargs["ori_shape"], dtype=torch.bool)
+            for mask, coords in zip(masks, point_coords):
+                mask[int(coords[0, 1]), int(coords[0, 0])] = True
+            return masks
+
+        zero_shot_segment_anything._predict_batched_masks = mocker.MagicMock(side_effect=_patch_predict_batched_masks)
+        zero_shot_segment_anything._predict_masks = mocker.MagicMock()
+
+        results = zero_shot_segment_anything.infer(
+            images=[tv_tensors.Image(torch.zeros((1, 3, 1024, 1024), dtype=torch.float32))],
+            reference_feats=torch.rand(1, 1, 1, 256),
+            used_indices={0: [0]},
+            ori_shapes=[torch.tensor((1024, 1024))],
+            batch_prompts=True,
+        )
+
+        zero_shot_segment_anything._predict_batched_masks.assert_called_once()
+        zero_shot_segment_anything._predict_masks.assert_not_called()
+        predicted_masks, used_points = results[0]
+        # the last point is already covered by the mask of the first one
+        assert len(predicted_masks[0]) == len(used_points[0]) == 2
+        for pm, up in zip(predicted_masks[0], used_points[0]):
+            assert pm[int(up[1]), int(up[0])] == up[2]
+
     def test_inspect_overlapping_areas(self, mocker, build_zero_shot_segment_anything) -> None:
         """Test _inspect_overlapping_areas."""
         mocker.patch("otx.algo.visual_prompting.segment_anything.SegmentAnything.load_checkpoint")
@@ -433,6 +472,85 @@ class TestZeroShotSegmentAnything:
         )
         assert mask.shape == (8, 8)
 
+    @pytest.mark.parametrize("is_cascade", [True, False])
+    def test_predict_batched_masks(self, mocker, build_zero_shot_segment_anything, is_cascade: bool) -> None:
+        """Test _predict_batched_masks."""
+
+        def _patch_forward(**kwargs) -> tuple[Tensor, Tensor, Tensor]:
+            point_coords = kwargs["point_coords"]
+            num_prompts = len(point_coords)
+            high_res_masks = torch.zeros(num_prompts, 4, 8, 8)
+            high_res_masks[:, :, 2:5, 3:7] = 1.0
+            # prompts with negative coordinates get empty masks
+            high_res_masks[point_coords[:, 0, 0] < 0] = 0.0
+            scores = torch.tensor([[0.1, 0.2, 0.5, 0.7]]).expand(num_prompts, -1)
+            return high_res_masks, scores, torch.ones(num_prompts, 4, 4, 4)
+
+        mocker.patch("otx.algo.visual_prompting.segment_anything.SegmentAnything.load_checkpoint")
+        mocker.patch("otx.algo.visual_prompting.segment_anything.SegmentAnything.forward", side_effect=_patch_forward)
+
+        zero_shot_segment_anything = build_zero_shot_segment_anything()
+        zero_shot_segment_anything.image_size = 6
+
+        masks = zero_shot_segment_anything._predict_batched_masks(
+            mode="infer",
+            image_embeddings=torch.rand(1),
+            point_coords=torch.tensor([[[1.0, 1.0], [2.0, 2.0]], [[-1.0, 1.0], [2.0, 2.0]], [[3.0, 3.0], [2.0, 2.0]]]),
+            point_labels=torch.tensor([[1.0, 0.0]]).expand(3, -1),
+            ori_shape=torch.tensor([8, 8], dtype=torch.int64),
+            is_cascade=is_cascade,
+        )
+
+        assert masks.shape == (3, 8, 8)
+        assert masks.dtype == torch.bool
+        assert masks[[0, 2], 2:5, 3:7].all()
+        assert masks.sum() == 2 * 12
+
+    def test_get_mask_boxes(self, mocker, build_zero_shot_segment_anything) -> None:
+        """Test _get_mask_boxes."""
+        mocker.patch("otx.algo.visual_prompting.segment_anything.SegmentAnything.load_checkpoint")
+        zero_shot_segment_anything = build_zero_shot_segment_anything()
+        masks = torch.zeros(2, 8, 10, dtype=torch.bool)
+        masks[0, 2:5, 3:7] = True
+        masks[1, 7, 9] = True
+
+        boxes = zero_shot_segment_anything._get_mask_boxes(masks)
+
+        assert torch.equal(boxes, torch.tensor([[[3.0, 2.0], [6.0, 4.0]], [[9.0, 7.0], [9.0, 7.0]]]))
+
+    @pytest.mark.parametrize(
+        ("masks", "logits", "expected"),
+        [
+            (torch.ones(2, 4, 8, 8, dtype=torch.bool), torch.ones(2, 4, 4, 4), torch.ones(2, 8, 8, dtype=torch.bool)),
+            (
+                torch.zeros(2, 4, 8, 8, dtype=torch.bool),
+                torch.zeros(2, 4, 4, 4),
+                torch.zeros(2, 8, 8, dtype=torch.bool),
+            ),
+        ],
+    )
+    def test_decide_batched_cascade_results(
+        self,
+        mocker,
+        build_zero_shot_segment_anything,
+        masks: Tensor,
+        logits: Tensor,
+        expected: Tensor,
+    ) -> None:
+        mocker.patch("otx.algo.visual_prompting.segment_anything.SegmentAnything.load_checkpoint")
+        zero_shot_segment_anything = build_zero_shot_segment_anything()
+        scores = torch.tensor([[0.0, 0.1, 0.2, 0.3]]).expand(2, -1)
+
+        mask_input, result, is_valid = zero_shot_segment_anything._decide_batched_cascade_results(
+            masks,
+            logits,
+            scores,
+        )
+
+        assert mask_input.shape == (2, 1, 4, 4)
+        assert torch.equal(result, expected)
+        assert torch.equal(is_valid, expected.flatten(1).any(dim=1))
+
     @pytest.mark.parametrize(
         ("masks", "logits", "expected"),
         [
@@ -3,11 +3,21 @@
 
 from unittest.mock import MagicMock
 
+import cv2
+import numpy as np
 import pytest
-from datumaro.components.annotation import Mask
+import torch
+from datumaro.components.annotation import Label, Mask
+from datumaro.components.dataset import DatasetSubset
+from datumaro.components.dataset_base import DatasetItem
+from datumaro.components.media import Image
+from otx.core.data.dataset import base, instance_segmentation, segmentation
 from otx.core.data.dataset.action_classification import OTXActionClsDataset
-from otx.core.data.dataset.classification import HLabelInfo
-from otx.core.data.dataset.segmentation import OTXSegmentationDataset
+from otx.core.data.dataset.classification import HLabelInfo, OTXMulticlassClsDataset
+from otx.core.data.dataset.instance_segmentation import OTXInstanceSegDataset
+from otx.core.data.dataset.segmentation import OTXSegmentationDataset, _extract_class_mask
+from otx.core.data.mem_cache import MemCacheHandlerForSP
+from otx.core.types.image import ImageDecodeBackend
 
 
 class TestDataset:
@@ -55,11 +65,13 @@ class TestDataset:
         dataset.num_classes = 1
         assert dataset._sample_another_idx() < len(dataset)
 
+    @pytest.mark.parametrize("image_decode_backend", [ImageDecodeBackend.DATUMARO, ImageDecodeBackend.PIL_DRAFT])
     @pytest.mark.parametrize("mem_cache_img_max_size", [(3, 5), (5, 3)])
     def test_mem_cache_resize(
         self,
         mocker,
         mem_cache_img_max_size,
+        image_decode_backend,
         fxt_mem_cache_handler,
         fxt_dataset_and_data_entity_cls,
         fxt_mock_dm_subset: MagicMock,
@@ -73,6 +85,7 @@ class TestDataset:
             transforms=lambda x: x,
             mem_cache_handler=fxt_mem_cache_handler,
             mem_cache_img_max_size=mem_cache_img_max_size,
+            image_decode_backend=image_decode_backend,
             **kwargs,
         )
         dataset.num_classes = 1
@@ -90,6 +103,38 @@ class TestDataset:
             assert item.image.shape[:2] == (h_expected, w_expected)
             assert item.img_info.img_shape == (h_expected, w_expected)
 
+    @pytest.mark.parametrize("mem_cache_img_max_size", [None, (3, 5)])
+    def test_image_decode_backend(self, mocker, mem_cache_img_max_size, tmp_path) -> None:
+        np_img = np.random.default_rng(0).integers(0, 256, size=(10, 20, 3), dtype=np.uint8)
+        cv2.imwrite(str(tmp_path / "image.png"), np_img)
+        dm_item = DatasetItem(
+            id="item",
+            subset="train",
+            media=Image.from_file(str(tmp_path / "image.png")),
+            annotations=[Label(label=0)],
+        )
+        mock_dm_subset = mocker.MagicMock(spec=DatasetSubset)
+        mock_dm_subset.name = dm_item.subset
+        mock_dm_subset.get.return_value = dm_item
+        mock_dm_subset.__iter__.side_effect = lambda: iter([dm_item])
+        spy_decode = mocker.spy(base, "decode_image_reduced")
+
+        items = [
+            OTXMulticlassClsDataset(
+                dm_subset=mock_dm_subset,
+                transforms=lambda x: x,
+                mem_cache_handler=MemCacheHandlerForSP(mem_size=1024 * 1024),
+                mem_cache_img_max_size=mem_cache_img_max_size,
+                image_decode_backend=image_decode_backend,
+            )[0]
+            for image_decode_backend in [ImageDecodeBackend.DATUMARO, ImageDecodeBackend.PIL_DRAFT]
+        ]
+
+        spy_decode.assert_called_once()
+        # PNG files are decoded in full resolution by both backends
+        assert np.array_equal(items[0].image, items[1].image)
+        assert items[0].img_info.img_shape == items[1].img_info.img_shape
+
 
 class TestOTXSegmentationDataset:
     def test_ignore_index(self, fxt_mock_dm_subset):
@@ -141,3 +186,88 @@ class TestOTXSegmentationDataset:
             match="Mask's label index should not be (.*).",
         ):
             _ = next(iter(dataset))
+
+    def test_extract_class_mask(self):
+        # The upper mask is painted over the lower one, and the smaller one is resized
+        lower = np.zeros((4, 4), dtype=bool)
+        lower[:2] = True
+        upper = np.zeros((2, 2), dtype=bool)
+        upper[0, 0] = True
+        item = DatasetItem(
+            id="item",
+            annotations=[
+                Mask(image=upper, label=2, z_order=1),
+                Mask(image=lower, label=1, z_order=0),
+            ],
+        )
+
+        class_mask = _extract_class_mask(item=item, img_shape=(4, 4), ignore_index=255)
+
+        expected = np.full((4, 4), 255, dtype=np.uint8)
+        expected[:2] = 1
+        expected[:2, :2] = 2
+        assert class_mask.dtype == np.uint8
+        assert np.array_equal(class_mask, expected)
+
+    def test_class_mask_cache(self, mocker, fxt_mock_dm_subset, fxt_mem_cache_handler):
+        dataset = OTXSegmentationDataset(
+            dm_subset=fxt_mock_dm_subset,
+            transforms=lambda x: x,
+            mem_cache_handler=fxt_mem_cache_handler,
+            mem_cache_img_max_size=None,
+            ignore_index=100,
+        )
+        spy = mocker.spy(segmentation, "_extract_class_mask")
+
+        first = next(iter(dataset)).gt_seg_map
+        second = next(iter(dataset)).gt_seg_map
+
+        assert spy.call_count == 1
+        assert torch.equal(first, second)
+
+    def test_fill_mem_cache(self, mocker, tmp_path):
+        cv2.imwrite(str(tmp_path / "image.png"), np.zeros((4, 4, 3), dtype=np.uint8))
+        dm_item = DatasetItem(
+            id="item",
+            subset="train",
+            media=Image.from_file(str(tmp_path / "image.png")),
+            annotations=[Mask(label=0, image=np.eye(4, dtype=np.uint8))],
+        )
+        mock_dm_subset = mocker.MagicMock(spec=DatasetSubset)
+        mock_dm_subset.name = dm_item.subset
+        mock_dm_subset.get.return_value = dm_item
+        mock_dm_subset.__iter__.side_effect = lambda: iter([dm_item])
+        dataset = OTXSegmentationDataset(dm_subset=mock_dm_subset, transforms=lambda x: x)
+
+        spill_kwargs = {"spill_dir": str(tmp_path / "cache"), "spill_annotation_namespace": "labels"}
+        dataset.fill_mem_cache(MemCacheHandlerForSP(mem_size=0, **spill_kwargs))
+
+        # The other processes attach to the spill file and take the image and the class mask from it
+        spy = mocker.spy(segmentation, "_extract_class_mask")
+        dataset.mem_cache_handler = MemCacheHandlerForSP(mem_size=0, **spill_kwargs)
+        item = dataset[0]
+
+        spy.assert_not_called()
+        assert dataset.mem_cache_handler.stats["spill_hits"] == 2
+        assert dataset.mem_cache_handler.stats["misses"] == 0
+        assert item.gt_seg_map.shape == (4, 4)
+
+
+class TestOTXInstanceSegDataset:
+    def test_masks_cache(self, mocker, fxt_mock_dm_subset, fxt_mem_cache_handler):
+        dataset = OTXInstanceSegDataset(
+            dm_subset=fxt_mock_dm_subset,
+            transforms=lambda x: x,
+            mem_cache_handler=fxt_mem_cache_handler,
+            mem_cache_img_max_size=None,
+            include_polygons=False,
+        )
+        spy = mocker.spy(instance_segmentation, "polygon_to_bitmap")
+
+        first = next(iter(dataset)).masks
+        second = next(iter(dataset)).masks
+
+        assert spy.call_count == 1
+        assert first.shape == (1, 10, 10)
+        assert torch.equal(first, second)
+        assert fxt_mem_cache_handler.occupancy["masks"]["items"] == 1
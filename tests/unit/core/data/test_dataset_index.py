@@ -0,0 +1,159 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from datumaro import Dataset as DmDataset
+from datumaro.components.annotation import Bbox, Label, Polygon
+from datumaro.components.dataset_base import DatasetItem
+from datumaro.components.media import Image, ImageFromFile
+from otx.core.data.dataset_index import DatasetIndex
+from otx.core.data.tile_adaptor import compute_robust_dataset_statistics
+from otx.core.utils.utils import get_idx_list_per_classes
+
+
+@pytest.fixture()
+def fxt_dm_dataset() -> DmDataset:
+    rng = np.random.default_rng(3003)
+    items = []
+    for idx in range(20):
+        annotations = []
+        for _ in range(rng.integers(0, 4)):
+            x, y, w, h = rng.integers(0, 50, size=4).tolist()
+            label = int(rng.integers(0, 3))
+            annotations.append(Bbox(x, y, w + 1, h + 1, label=label))
+            annotations.append(Polygon([x, y, x + w + 1, y, x + w + 1, y + h + 1], label=label))
+        annotations.append(Label(label=idx % 3))
+        items.append(
+            DatasetItem(
+                id=f"item_{idx}",
+                subset="train" if idx < 15 else "val",
+                media=Image.from_numpy(np.zeros((60 + idx, 80, 3), dtype=np.uint8)),
+                annotations=annotations,
+            ),
+        )
+    return DmDataset.from_iterable(items, categories=["a", "b", "c"])
+
+
+class TestDatasetIndex:
+    def test_build(self, fxt_dm_dataset) -> None:
+        index = DatasetIndex.build(fxt_dm_dataset, num_workers=2)
+
+        items = list(fxt_dm_dataset)
+        assert len(index) == len(items)
+        assert index.ids.tolist() == [item.id for item in items]
+        assert index.subsets.tolist() == [item.subset for item in items]
+        assert index.image_sizes.tolist() == [[0, 0]] * len(items)
+        rows = np.array([3, 1, 3])
+        assert index.get_image_sizes(fxt_dm_dataset, rows).tolist() == [list(items[row].media.size) for row in rows]
+        assert index.image_sizes[[1, 3]].tolist() == [list(items[row].media.size) for row in (1, 3)]
+        assert index.num_annotations.tolist() == [len(item.annotations) for item in items]
+        assert index.label_names.tolist() == ["a", "b", "c"]
+
+        anns = [ann for item in items for ann in item.annotations]
+        assert index.ann_labels.tolist() == [ann.label for ann in anns]
+        for ann, kind, bbox, area in zip(anns, index.ann_kinds, index.ann_bboxes, index.ann_areas):
+            if isinstance(ann, Label):
+                assert kind == DatasetIndex.OTHER
+                assert np.isnan(area)
+            else:
+                assert kind == (DatasetIndex.BBOX if isinstance(ann, Bbox) else DatasetIndex.POLYGON)
+                assert bbox.tolist() == pytest.approx(ann.get_bbox())
+                assert area == ann.get_area()
+
+    def test_build_from_files(self, mocker, tmp_path) -> None:
+        image_sizes = {}
+        for label in ("cat", "dog"):
+            (tmp_path / label).mkdir()
+            for idx in range(3):
+                height, width = image_sizes[f"{label}:{idx}"] = (30 + idx, 40 if label == "cat" else 20 + idx)
+                cv2.imwrite(str(tmp_path / label / f"{idx}.png"), np.zeros((height, width, 3), np.uint8))
+        dataset = DmDataset.import_from(str(tmp_path), "imagenet")
+        expected = get_idx_list_per_classes(dataset)
+        mock_data = mocker.patch.object(ImageFromFile, "data", new_callable=mocker.PropertyMock)
+
+        DatasetIndex.register(dataset)
+        stats = get_idx_list_per_classes(dataset)
+        index, _ = DatasetIndex.get(dataset)
+
+        # Labels only queries do not read the images
+        assert list(stats.items()) == list(expected.items())
+        assert (index.image_sizes == 0).all()
+
+        # The image sizes are read from the image headers in the worker threads
+        sizes = index.get_image_sizes(dataset, index.get_rows(), num_workers=2)
+        assert sizes.tolist() == [list(image_sizes[item_id]) for item_id in index.ids]
+        mock_data.assert_not_called()
+
+    @pytest.mark.parametrize("subset", [None, "train", "val"])
+    @pytest.mark.parametrize("use_string_label", [True, False])
+    def test_get_idx_list_per_classes(self, fxt_dm_dataset, subset, use_string_label) -> None:
+        dataset = fxt_dm_dataset if subset is None else fxt_dm_dataset.get_subset(subset)
+        expected = get_idx_list_per_classes(dataset, use_string_label)
+
+        DatasetIndex.register(fxt_dm_dataset)
+        stats = get_idx_list_per_classes(dataset, use_string_label)
+
+        assert list(stats.items()) == list(expected.items())
+        assert stats["unknown" if use_string_label else 5] == []
+
+    def test_compute_robust_dataset_statistics(self, fxt_dm_dataset) -> None:
+        subset = fxt_dm_dataset.get_subset("train")
+        expected = compute_robust_dataset_statistics(subset, ann_stat=True, max_samples=10)
+
+        DatasetIndex.register(fxt_dm_dataset)
+        stat = compute_robust_dataset_statistics(subset, ann_stat=True, max_samples=10)
+
+        assert stat == expected
+
+    def test_get(self, fxt_dm_dataset) -> None:
+        assert DatasetIndex.get(fxt_dm_dataset) is None
+
+        DatasetIndex.register(fxt_dm_dataset)
+        index, subset = DatasetIndex.get(fxt_dm_dataset.get_subset("val"))
+        assert subset == "val"
+        assert DatasetIndex.get(fxt_dm_dataset)[0] is index
+
+        # Changed dataset should not be answered by the index
+        fxt_dm_dataset.remove("item_15", "val")
+        assert DatasetIndex.get(fxt_dm_dataset.get_subset("val")) is None
+
+    def test_load_or_build(self, fxt_dm_dataset, mocker, tmp_path) -> None:
+        data_root = tmp_path / "data"
+        data_root.mkdir()
+        (data_root / "annotations.json").write_text("{}")
+        cache_dir = tmp_path / "cache"
+        index = DatasetIndex.load_or_build(fxt_dm_dataset, data_root=str(data_root), cache_dir=str(cache_dir))
+
+        spy_build = mocker.spy(DatasetIndex, "build")
+        loaded = DatasetIndex.load_or_build(fxt_dm_dataset, data_root=str(data_root), cache_dir=str(cache_dir))
+        spy_build.assert_not_called()
+        for name in ("ids", "image_sizes", "ann_offsets", "ann_labels", "ann_kinds", "ann_areas", "label_names"):
+            assert np.array_equal(getattr(loaded, name), getattr(index, name), equal_nan=name == "ann_areas")
+
+        # Changed source files invalidate the persisted index
+        (data_root / "annotations.json").write_text('{"changed": true}')
+        DatasetIndex.load_or_build(fxt_dm_dataset, data_root=str(data_root), cache_dir=str(cache_dir))
+        spy_build.assert_called_once()
+        assert len(list(cache_dir.iterdir())) == 2
+
+    def test_compute_content_hash(self, fxt_dm_dataset, mocker, tmp_path) -> None:
+        (tmp_path / "annotations").mkdir()
+        (tmp_path / "annotations" / "instances.json").write_text("{}")
+        (tmp_path / "images").mkdir()
+        (tmp_path / "images" / "0.jpg").write_bytes(b"jpg")
+        content_hash = DatasetIndex.compute_content_hash(fxt_dm_dataset, str(tmp_path))
+
+        # The images are not looked at
+        spy_stat = mocker.spy(Path, "stat")
+        (tmp_path / "images" / "0.jpg").write_bytes(b"other jpg")
+        assert DatasetIndex.compute_content_hash(fxt_dm_dataset, str(tmp_path)) == content_hash
+        assert all(call.args[0].suffix != ".jpg" for call in spy_stat.call_args_list)
+
+        (tmp_path / "annotations" / "instances.json").write_text('{"changed": true}')
+        assert DatasetIndex.compute_content_hash(fxt_dm_dataset, str(tmp_path)) != content_hash
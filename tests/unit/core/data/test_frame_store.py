@@ -0,0 +1,121 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+#
+from __future__ import annotations
+
+import pickle
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from datumaro.components.media import Video
+from otx.core.data.frame_store import FrameClipStore, FrameClipStoreError
+from otx.core.data.transform_libs.torchvision import DecodeVideo
+
+
+@pytest.fixture()
+def fxt_video_paths(tmp_path) -> list[str]:
+    rng = np.random.default_rng(0)
+    video_paths = []
+    for idx, (num_frames, height, width) in enumerate([(20, 48, 64), (12, 32, 32)]):
+        video_path = str(tmp_path / f"video_{idx}.avi")
+        writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (width, height))
+        for _ in range(num_frames):
+            writer.write(rng.integers(0, 255, (height, width, 3), dtype=np.uint8))
+        writer.release()
+        video_paths.append(video_path)
+    return video_paths
+
+
+class TestFrameClipStore:
+    def test_build_and_get(self, tmp_path, fxt_video_paths) -> None:
+        store = FrameClipStore.build(tmp_path / "store", fxt_video_paths, short_side=24, chunk_size=1)
+
+        assert len(store) == 2
+        assert all(video_path in store for video_path in fxt_video_paths)
+        assert store.validate(fxt_video_paths) == []
+
+        frames = store.get(fxt_video_paths[0])
+        assert isinstance(frames, np.memmap)
+        assert frames.shape == (20, 24, 32, 3)
+        assert store.get(fxt_video_paths[1]).shape == (12, 24, 24, 3)
+        assert store.get(tmp_path / "unknown.avi") is None
+
+        # the first frame is the resized first frame of the video
+        video = Video(fxt_video_paths[0])
+        expected = cv2.resize(video[0].data.astype(np.uint8), (32, 24), interpolation=cv2.INTER_AREA)
+        assert np.array_equal(frames[0], expected)
+
+        # a reloaded or unpickled store gives the same frames
+        assert np.array_equal(FrameClipStore(store.root).get(fxt_video_paths[0]), frames)
+        assert np.array_equal(pickle.loads(pickle.dumps(store)).get(fxt_video_paths[0]), frames)  # noqa: S301
+
+    def test_rebuild(self, tmp_path, fxt_video_paths) -> None:
+        store = FrameClipStore.build(tmp_path / "store", fxt_video_paths[:1], short_side=None)
+        chunk_size = (tmp_path / "store" / "chunk_00000.bin").stat().st_size
+        assert store.get(fxt_video_paths[0]).shape == (20, 48, 64, 3)
+        assert store.validate(fxt_video_paths) == [f"Video {Path(fxt_video_paths[1]).resolve()} is not in the store."]
+
+        # only the missing video is decoded
+        store = FrameClipStore.build(tmp_path / "store", fxt_video_paths, short_side=None)
+        assert store.validate(fxt_video_paths) == []
+        assert (tmp_path / "store" / "chunk_00000.bin").stat().st_size == chunk_size + 12 * 32 * 32 * 3
+
+        with pytest.raises(FrameClipStoreError):
+            FrameClipStore.build(tmp_path / "store", fxt_video_paths, short_side=128)
+
+    def test_validate(self, tmp_path, fxt_video_paths) -> None:
+        store = FrameClipStore.build(tmp_path / "store", fxt_video_paths)
+        Path(fxt_video_paths[1]).unlink()
+        (tmp_path / "store" / "chunk_00000.bin").write_bytes(b"")
+
+        errors = store.validate()
+
+        assert len(errors) == 3
+        assert "truncated" in errors[0]
+        assert "truncated" in errors[1]
+        assert "does not exist anymore" in errors[2]
+
+    def test_get_stale(self, tmp_path, fxt_video_paths) -> None:
+        store = FrameClipStore.build(tmp_path / "store", fxt_video_paths)
+        assert store.get(fxt_video_paths[0]) is not None
+
+        # the video edited after building is not served, checked once when it is read first
+        Path(fxt_video_paths[1]).write_bytes(Path(fxt_video_paths[0]).read_bytes())
+        assert store.get(fxt_video_paths[1]) is None
+        assert FrameClipStore(store.root).get(fxt_video_paths[1]) is None
+
+    def test_build_drop_partial_frames(self, tmp_path, fxt_video_paths, mocker) -> None:
+        FrameClipStore.build(tmp_path / "store", fxt_video_paths[:1], short_side=24)
+        chunk_size = (tmp_path / "store" / "chunk_00000.bin").stat().st_size
+
+        # decoding of the second video fails after some of its frames are written
+        resize = cv2.resize
+        mocker.patch(
+            "otx.core.data.frame_store.cv2.resize",
+            side_effect=[resize(np.zeros((32, 32, 3), np.uint8), (24, 24))] * 3 + [cv2.error],
+        )
+        with pytest.raises(cv2.error):
+            FrameClipStore.build(tmp_path / "store", fxt_video_paths, short_side=24)
+
+        # the partially written frames are dropped
+        store = FrameClipStore(tmp_path / "store")
+        assert len(store) == 1
+        assert (tmp_path / "store" / "chunk_00000.bin").stat().st_size == chunk_size
+        assert store.validate() == []
+
+    def test_missing_store(self, tmp_path) -> None:
+        with pytest.raises(FrameClipStoreError):
+            FrameClipStore(tmp_path)
+
+    def test_decode_video(self, tmp_path, fxt_video_paths) -> None:
+        FrameClipStore.build(tmp_path / "store", fxt_video_paths, short_side=None)
+        transform = DecodeVideo(test_mode=True, frame_store=str(tmp_path / "store"))
+
+        outputs = transform._transform(Video(fxt_video_paths[0]), {})
+        expected = DecodeVideo(test_mode=True)._transform(Video(fxt_video_paths[0]), {})
+
+        assert outputs.shape == (8, 3, 48, 64)
+        assert outputs.dtype == expected.dtype
+        assert np.array_equal(outputs.numpy(), expected.numpy())
@@ -0,0 +1,62 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+import cv2
+import numpy as np
+import pytest
+from datumaro.components.media import Image
+from otx.core.data.image_decoder import decode_image_reduced, fit_to_max_size
+from otx.core.types.image import ImageColorChannel
+
+
+@pytest.fixture()
+def fxt_bgr_image() -> np.ndarray:
+    height, width = 600, 800
+    y, x = np.mgrid[:height, :width]
+    # Smooth image, so that the reduced-resolution decoding is close to the full-resolution one
+    return np.stack([x * 255 // width, y * 255 // height, (x + y) * 255 // (width + height)], axis=-1).astype(np.uint8)
+
+
+@pytest.fixture(params=[".jpg", ".png"])
+def fxt_image_path(request, tmp_path, fxt_bgr_image) -> str:
+    path = str(tmp_path / f"image{request.param}")
+    cv2.imwrite(path, fxt_bgr_image)
+    return path
+
+
+@pytest.mark.parametrize(
+    ("img_shape", "max_size", "expected"),
+    [
+        ((600, 800), None, (600, 800)),
+        ((600, 800), (1000, 1000), (600, 800)),
+        ((600, 800), (100, 100), (75, 100)),
+        ((800, 600), (100, 200), (100, 75)),
+    ],
+)
+def test_fit_to_max_size(img_shape, max_size, expected) -> None:
+    assert fit_to_max_size(img_shape, max_size) == expected
+
+
+@pytest.mark.parametrize("image_color_channel", [ImageColorChannel.RGB, ImageColorChannel.BGR])
+@pytest.mark.parametrize("max_size", [None, (150, 150), (300, 500)])
+def test_decode_image_reduced(fxt_image_path, image_color_channel, max_size) -> None:
+    img = Image.from_file(fxt_image_path)
+    img_data = decode_image_reduced(img, image_color_channel, max_size)
+
+    expected = img.data  # Decoded in full resolution in BGR
+    height, width = fit_to_max_size(expected.shape[:2], max_size)
+    expected = cv2.resize(expected, (width, height), interpolation=cv2.INTER_LINEAR)
+    if image_color_channel == ImageColorChannel.RGB:
+        expected = expected[..., ::-1]
+
+    assert img_data.shape == (height, width, 3)
+    assert img_data.dtype == np.uint8
+    assert img_data.flags.writeable
+    if fxt_image_path.endswith(".png") or max_size is None:
+        assert np.array_equal(img_data, expected)
+    else:
+        assert np.abs(img_data.astype(np.int32) - expected).mean() < 2
+
+
+def test_decode_image_reduced_unsupported(fxt_bgr_image) -> None:
+    assert decode_image_reduced(Image.from_numpy(fxt_bgr_image), max_size=(100, 100)) is None
@@ -3,13 +3,17 @@
 #
 from __future__ import annotations
 
+import multiprocessing as mp
 import string
 
 import numpy as np
 import psutil
 import pytest
 from otx.core.data.mem_cache import (
+    MemCacheHandlerBase,
+    MemCacheHandlerForMP,
     MemCacheHandlerSingleton,
+    _SharedAddrTable,
     parse_mem_cache_size_to_int,
 )
 
@@ -100,6 +104,260 @@ class TestMemCacheHandler:
         # Unfully (half) cached
         assert len(handler) == len(fxt_data_list) // 2
 
+    def test_shared_across_processes(self, fxt_data_list, monkeypatch) -> None:
+        mem_size = get_data_list_size(fxt_data_list)
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        handler = MemCacheHandlerSingleton.create("multiprocessing", mem_size)
+
+        def _put(items: list) -> None:
+            for key, data, meta in items:
+                handler.put(key, data, meta)
+
+        # Items cached by the worker processes should be visible to the main process
+        ctx = mp.get_context("fork")
+        workers = [ctx.Process(target=_put, args=(fxt_data_list[idx::2],)) for idx in range(2)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert len(handler) == len(fxt_data_list)
+        for key, data, meta in fxt_data_list:
+            get_data, get_meta = handler.get(key)
+            assert np.array_equal(get_data, data)
+            assert get_meta == meta
+
+    def test_addr_table_full(self, fxt_data_list, monkeypatch, caplog) -> None:
+        mem_size = get_data_list_size(fxt_data_list)
+        monkeypatch.setattr(MemCacheHandlerForMP, "MIN_NUM_SLOTS", 4)
+        monkeypatch.setattr(MemCacheHandlerForMP, "MIN_ITEM_BYTES", mem_size)
+        monkeypatch.setattr(_SharedAddrTable, "DESC_BYTES", 1024)
+        handler = MemCacheHandlerForMP(mem_size)
+
+        # 4 slots with 0.75 max load factor can hold only 3 items
+        for idx, (key, data, meta) in enumerate(fxt_data_list):
+            if idx < 3:
+                assert handler.put(key, data, meta) > 0
+            else:
+                assert handler.put(key, data, meta) is None
+
+        # The items are skipped, but the pool with free bytes is not frozen
+        assert not handler.frozen
+        assert len(handler) == 3
+        assert handler._cur_page.value == 3 * fxt_data_list[0][1].nbytes
+        assert "Skip caching" in caplog.text
+
+    def test_addr_too_large(self, fxt_data_list) -> None:
+        handler = MemCacheHandlerForMP(get_data_list_size(fxt_data_list))
+        (key, data, _), (other_key, other_data, other_meta) = fxt_data_list[:2]
+
+        # An item which address does not fit in a slot is skipped without freezing the others
+        assert handler.put(key, data, {"key": "x" * _SharedAddrTable.DESC_BYTES}) is None
+        assert handler.put(other_key, other_data, other_meta) == other_data.nbytes
+
+        assert not handler.frozen
+        assert handler.get(key)[0] is None
+        assert np.array_equal(handler.get(other_key)[0], other_data)
+
+    @pytest.mark.parametrize("mode", ["singleprocessing", "multiprocessing"])
+    def test_eviction(self, mode, fxt_data_list, monkeypatch) -> None:
+        # Each item (768 bytes) takes one page, so that the pool can hold 5 items
+        mem_size = 5 * MemCacheHandlerBase.PAGE_BYTES
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        handler = MemCacheHandlerSingleton.create(mode, mem_size, eviction=True)
+
+        for key, data, meta in fxt_data_list[:5]:
+            assert handler.put(key, data, meta) > 0
+
+        # The first item gets the second chance
+        assert handler.get(fxt_data_list[0][0])[0] is not None
+
+        for key, data, meta in fxt_data_list[5:9]:
+            assert handler.put(key, data, meta) > 0
+
+        assert not handler.frozen
+        assert len(handler) == 5
+        for idx, (key, data, meta) in enumerate(fxt_data_list[:9]):
+            get_data, get_meta = handler.get(key)
+            if idx == 0 or idx >= 5:
+                assert np.array_equal(get_data, data)
+                assert get_meta == meta
+            else:
+                assert get_data is None
+
+        assert handler.stats["evictions"] == 4
+
+    @pytest.mark.parametrize("mode", ["singleprocessing", "multiprocessing"])
+    def test_eviction_addr_table_full(self, mode, fxt_data_list, monkeypatch, caplog) -> None:
+        # The pool can hold 8 items, but the address table of 4 slots can hold only 3 items
+        mem_size = 8 * MemCacheHandlerBase.PAGE_BYTES
+        monkeypatch.setattr(MemCacheHandlerBase, "MIN_NUM_SLOTS", 4)
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        handler = MemCacheHandlerSingleton.create(mode, mem_size, eviction=True, max_items=3)
+
+        for key, data, meta in fxt_data_list[:3]:
+            assert handler.put(key, data, meta) > 0
+        assert handler.get(fxt_data_list[0][0])[0] is not None
+
+        # The items are evicted by the clock algorithm to free the address table slots
+        for key, data, meta in fxt_data_list[3:6]:
+            assert handler.put(key, data, meta) > 0
+
+        assert len(handler) == 3
+        assert handler.stats["evictions"] == 3
+        for key, data, meta in fxt_data_list[3:6]:
+            get_data, get_meta = handler.get(key)
+            assert np.array_equal(get_data, data)
+            assert get_meta == meta
+
+        # The item which address cannot be stored is skipped without evicting the others
+        key, data, _ = fxt_data_list[6]
+        assert handler.put(key, data, {"key": "x" * _SharedAddrTable.DESC_BYTES}) is None
+        assert len(handler) == 3
+        assert handler.stats["evictions"] == 3
+        assert "Skip caching" in caplog.text
+
+    @pytest.mark.parametrize("mode", ["singleprocessing", "multiprocessing"])
+    @pytest.mark.parametrize("eviction", [True, False])
+    def test_put_same_key_concurrently(self, mode, eviction, fxt_data_list, monkeypatch) -> None:
+        mem_size = 5 * MemCacheHandlerBase.PAGE_BYTES
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        handler = MemCacheHandlerSingleton.create(mode, mem_size, eviction=eviction)
+        key, data, meta = fxt_data_list[0]
+        lock = handler._lock
+
+        class _RacingLock:
+            def __enter__(self) -> None:
+                # The other worker caches the same key after the lock-free lookup of this worker
+                handler._lock = lock
+                handler.put(key, data, meta)
+                lock.__enter__()
+
+            def __exit__(self, *args) -> None:
+                lock.__exit__(*args)
+
+        handler._lock = _RacingLock()
+        handler.put(key, data, meta)
+
+        assert len(handler) == 1
+        assert handler.occupancy["image"] == {"items": 1, "bytes": data.nbytes}
+        assert handler.stats["evictions"] == 0
+        if eviction:
+            assert np.count_nonzero(handler._page_owner) == 1
+        else:
+            assert handler._cur_page.value == data.nbytes
+
+    @pytest.mark.parametrize("mode", ["singleprocessing", "multiprocessing"])
+    def test_spill(self, mode, fxt_data_list, monkeypatch, tmp_path) -> None:
+        mem_size = get_data_list_size(fxt_data_list) // 2
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        handler = MemCacheHandlerSingleton.create(mode, mem_size, spill_dir=str(tmp_path))
+
+        for key, data, meta in fxt_data_list:
+            handler.put(key, data, meta)
+
+        # All items are spilled even if the memory pool is full
+        assert not handler.frozen
+        assert len(handler) == len(fxt_data_list) // 2
+
+        # New handler (e.g. the next run) should start with the warm cache
+        new_handler = MemCacheHandlerSingleton.create(mode, mem_size, spill_dir=str(tmp_path))
+        for key, data, meta in fxt_data_list:
+            get_data, get_meta = new_handler.get(key)
+            assert np.array_equal(get_data, data)
+            assert get_meta == meta
+
+        assert new_handler.stats["spill_hits"] == len(fxt_data_list)
+        assert new_handler.stats["misses"] == 0
+        assert "spill_hits=10" in repr(new_handler)
+
+        # Different namespace should not share the spill file
+        other_handler = MemCacheHandlerSingleton.create(mode, mem_size, spill_dir=str(tmp_path), spill_namespace="x")
+        assert other_handler.get(fxt_data_list[0][0])[0] is None
+
+    def test_spill_dir_wrong_type(self) -> None:
+        with pytest.raises(TypeError, match="spill_dir should be a str or Path"):
+            MemCacheHandlerSingleton.create("singleprocessing", 0, spill_dir=object())
+
+    def test_spill_max_size(self, fxt_data_list, tmp_path) -> None:
+        data_bytes = fxt_data_list[0][1].nbytes
+        # Each record has the header and the key in addition to the data
+        handler = MemCacheHandlerBase(mem_size=0, spill_dir=str(tmp_path), spill_max_size=3 * data_bytes)
+
+        for key, data, meta in fxt_data_list:
+            handler.put(key, data, meta)
+
+        assert handler.frozen
+        assert handler._spill.path.stat().st_size <= 3 * data_bytes
+        assert len(MemCacheHandlerBase(mem_size=0, spill_dir=str(tmp_path))._spill) == 2
+
+    def test_spill_drop_partial_record(self, fxt_data_list, tmp_path) -> None:
+        handler = MemCacheHandlerBase(mem_size=0, spill_dir=str(tmp_path))
+        for key, data, meta in fxt_data_list:
+            handler.put(key, data, meta)
+
+        spill_path = next(tmp_path.iterdir())
+        with spill_path.open("ab") as fp:
+            fp.write(b"OTXC" + b"\x00" * 10)
+
+        new_handler = MemCacheHandlerBase(mem_size=0, spill_dir=str(tmp_path))
+        key, data, _ = fxt_data_list[-1]
+        assert np.array_equal(new_handler.get(key)[0], data)
+
+        # Appending after the dropped partial record works
+        new_handler.put("new_key", data)
+        assert np.array_equal(MemCacheHandlerBase(mem_size=0, spill_dir=str(tmp_path)).get("new_key")[0], data)
+
+    def test_spill_annotation(self, fxt_data_list, tmp_path) -> None:
+        handler = MemCacheHandlerBase(mem_size=0, spill_dir=str(tmp_path), spill_annotation_namespace="labels")
+        key, _, _ = fxt_data_list[0]
+        class_mask = np.ones((16, 16), dtype=np.uint8)
+        handler.put((key, "class_mask"), class_mask, {"width": 16})
+        handler.put(1234, class_mask)  # In-memory images are not valid across runs
+
+        new_handler = MemCacheHandlerBase(mem_size=0, spill_dir=str(tmp_path), spill_annotation_namespace="labels")
+        get_data, get_meta = new_handler.get((key, "class_mask"))
+        assert np.array_equal(get_data, class_mask)
+        assert get_meta == {"width": 16}
+        assert new_handler.get(1234)[0] is None
+
+        # Annotations decoded with the other labels or annotation files are not shared
+        other_handler = MemCacheHandlerBase(mem_size=0, spill_dir=str(tmp_path), spill_annotation_namespace="other")
+        assert other_handler.get((key, "class_mask"))[0] is None
+
+        # Annotations are not stored without the annotation namespace
+        handler = MemCacheHandlerBase(mem_size=0, spill_dir=str(tmp_path / "images_only"))
+        handler.put((key, "class_mask"), class_mask)
+        assert len(handler._spill) == 0
+
+    @pytest.mark.parametrize("mode", ["singleprocessing", "multiprocessing"])
+    @pytest.mark.parametrize("eviction", [True, False])
+    def test_occupancy(self, mode, eviction, fxt_data_list, monkeypatch) -> None:
+        mem_size = 4 * MemCacheHandlerBase.PAGE_BYTES
+        monkeypatch.setattr(MemCacheHandlerSingleton, "check_system_memory", lambda *_: True)
+        handler = MemCacheHandlerSingleton.create(mode, mem_size, eviction=eviction)
+
+        key, data, meta = fxt_data_list[0]
+        class_mask = np.zeros((16, 16), dtype=np.uint8)
+        assert handler.put(key, data, meta) > 0
+        assert handler.put((key, "class_mask"), class_mask) > 0
+        assert handler.put((key, "unknown"), class_mask) > 0
+
+        assert np.array_equal(handler.get((key, "class_mask"))[0], class_mask)
+        assert handler.occupancy["image"] == {"items": 1, "bytes": data.nbytes}
+        assert handler.occupancy["class_mask"] == {"items": 1, "bytes": class_mask.nbytes}
+        assert handler.occupancy["other"] == {"items": 1, "bytes": class_mask.nbytes}
+        assert handler.occupancy["masks"] == {"items": 0, "bytes": 0}
+        assert "class_mask=1 items / 256 bytes" in repr(handler)
+
+        if eviction:
+            # Evicted items are not counted anymore
+            for key, data, meta in fxt_data_list[1:]:
+                handler.put(key, data, meta)
+            assert handler.occupancy["image"] == {"items": 4, "bytes": 4 * data.nbytes}
+            assert handler.occupancy["class_mask"] == {"items": 0, "bytes": 0}
+            assert handler.occupancy["other"] == {"items": 0, "bytes": 0}
+
 
 @pytest.mark.parametrize(
     ("mem_size_arg", "expected"),
@@ -4,6 +4,7 @@ from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
+import torch
 from datumaro.components.dataset import Dataset as DmDataset
 from importlib_resources import files
 from lightning.pytorch.loggers import CSVLogger
@@ -13,10 +14,17 @@ from otx.core.config.data import (
     SubsetConfig,
     TileConfig,
 )
+from otx.core.data.entity.base import ImageInfo
+from otx.core.data.entity.detection import DetBatchDataEntity
+from otx.core.data.mem_cache import MemCacheHandlerSingleton
 from otx.core.data.module import (
     OTXDataModule,
     OTXTaskType,
 )
+from otx.core.types.image import ImageDecodeBackend
+from otx.core.types.transformer_libs import TransformLibType
+from torchvision import tv_tensors
+from torchvision.transforms.v2 import Compose
 
 
 def mock_data_filtering(dataset: DmDataset, data_format: str, unannotated_items_ratio: float) -> DmDataset:
@@ -32,6 +40,12 @@ class TestModule:
         mock.data_format = "coco_instances"
         mock.data_root = "."
         mock.mem_cache_size = "1GB"
+        mock.mem_cache_img_max_size = None
+        mock.mem_cache_eviction = False
+        mock.mem_cache_spill_dir = None
+        mock.mem_cache_spill_size = None
+        mock.dataset_index_dir = None
+        mock.image_decode_backend = ImageDecodeBackend.DATUMARO
         mock.train_subset = MagicMock(spec=SubsetConfig)
         mock.train_subset.sampler = DictConfig(
             {"class_path": "torch.utils.data.RandomSampler", "init_args": {"num_samples": 4}},
@@ -110,6 +124,11 @@ class TestModule:
         cfg.test_subset.subset_name = "test"
         cfg.test_subset.num_workers = 0
         cfg.mem_cache_size = "1GB"
+        cfg.mem_cache_eviction = False
+        cfg.mem_cache_spill_dir = None
+        cfg.mem_cache_spill_size = None
+        cfg.dataset_index_dir = None
+        cfg.image_decode_backend = "datumaro"
         cfg.tile_config = {}
         cfg.tile_config.enable_tiler = False
         cfg.auto_num_workers = False
@@ -139,3 +158,90 @@ class TestModule:
 
         hparams_path = Path(logger.log_dir) / "hparams.yaml"
         assert hparams_path.exists()
+
+    @patch("otx.core.data.module.OTXDatasetFactory")
+    @patch("otx.core.data.module.DmDataset.import_from")
+    def test_on_after_batch_transfer(
+        self,
+        mock_dm_dataset,
+        mock_otx_dataset_factory,
+        fxt_config,
+        mocker,
+    ) -> None:
+        fxt_config.train_subset.subset_name = "train"
+        fxt_config.val_subset.subset_name = "val"
+        fxt_config.test_subset.subset_name = "test"
+        fxt_config.train_subset.transform_lib_type = TransformLibType.TORCHVISION
+        fxt_config.train_subset.batch_transforms = [
+            {"class_path": "otx.core.data.transform_libs.batch.BatchRandomFlip", "init_args": {"prob": 1.0}},
+        ]
+        mock_dm_subsets = {name: MagicMock() for name in ["train", "val", "test"]}
+        mock_dm_dataset.return_value.subsets.return_value = mock_dm_subsets
+        mocker.patch("otx.core.data.module.pre_filtering", side_effect=mock_data_filtering)
+
+        module = OTXDataModule(task=OTXTaskType.DETECTION, config=fxt_config)
+        assert isinstance(module.batch_transforms["train"], Compose)
+        assert module.batch_transforms["val"] is None
+        assert module.batch_transforms["test"] is None
+
+        image = torch.arange(6, dtype=torch.uint8).reshape(1, 1, 2, 3).repeat(2, 3, 1, 1)
+        batch = DetBatchDataEntity(
+            batch_size=2,
+            images=tv_tensors.Image(image),
+            imgs_info=[ImageInfo(img_idx=idx, img_shape=(2, 3), ori_shape=(2, 3)) for idx in range(2)],
+            bboxes=[tv_tensors.BoundingBoxes(torch.zeros(0, 4), format="xyxy", canvas_size=(2, 3))] * 2,
+            labels=[torch.zeros(0, dtype=torch.long)] * 2,
+        )
+        # Without a trainer, the batch is not transformed
+        assert module.on_after_batch_transfer(batch, 0) is batch
+
+        module.trainer = MagicMock(training=True)
+        assert torch.equal(module.on_after_batch_transfer(batch, 0).images, image.flip(-1))
+
+        module.trainer = MagicMock(training=False, validating=True)
+        assert module.on_after_batch_transfer(batch, 0) is batch
+
+    @patch("otx.core.data.module.OTXDatasetFactory")
+    @patch("otx.core.data.module.DmDataset.import_from")
+    @pytest.mark.parametrize("mem_cache_size", ["1MB", "0"])
+    @pytest.mark.parametrize("prefill", [True, False])
+    def test_share_mem_cache(
+        self,
+        mock_dm_dataset,
+        mock_otx_dataset_factory,
+        mem_cache_size,
+        prefill,
+        fxt_config,
+        mocker,
+        tmp_path,
+    ) -> None:
+        fxt_config.train_subset.subset_name = "train"
+        fxt_config.val_subset.subset_name = "val"
+        fxt_config.test_subset.subset_name = "test"
+        fxt_config.data_root = str(tmp_path)
+        fxt_config.mem_cache_size = mem_cache_size
+        fxt_config.mem_cache_spill_dir = None
+        mock_dm_subsets = {name: MagicMock() for name in ["train", "val", "test"]}
+        mock_dm_dataset.return_value.subsets.return_value = mock_dm_subsets
+        mocker.patch("otx.core.data.module.pre_filtering", side_effect=mock_data_filtering)
+        mocker.patch.object(MemCacheHandlerSingleton, "check_system_memory", return_value=True)
+        module = OTXDataModule(task=OTXTaskType.MULTI_CLASS_CLS, config=fxt_config)
+
+        with module.share_mem_cache(tmp_path, prefill=prefill):
+            if mem_cache_size == "0":
+                assert module.config is fxt_config
+            else:
+                # Data modules unpickled in this context attach to the spill file in addition to their own memory pool
+                assert module.config.mem_cache_size == mem_cache_size
+                assert module.config.mem_cache_spill_dir == str(tmp_path)
+                # The spill file is limited to the memory cache size
+                assert module.config.mem_cache_spill_size == str(10**6)
+
+        assert module.config is fxt_config
+        assert fxt_config.mem_cache_size == mem_cache_size
+        # Only the training and validation subsets are decoded and only if it is requested
+        fill_mem_cache = mock_otx_dataset_factory.create.return_value.fill_mem_cache
+        assert fill_mem_cache.call_count == (2 if prefill and mem_cache_size != "0" else 0)
+        if fill_mem_cache.called:
+            # Annotations are stored in the spill file with the namespace of the labels and the annotation files
+            assert fill_mem_cache.call_args.args[0]._spill_annotation_namespace is not None
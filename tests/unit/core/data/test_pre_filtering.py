@@ -1,11 +1,15 @@
 # Copyright (C) 2024 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pytest
 from datumaro.components.annotation import AnnotationType, Bbox, Label, Polygon
 from datumaro.components.dataset import Dataset as DmDataset
 from datumaro.components.dataset_base import DatasetItem
-from otx.core.data.pre_filtering import pre_filtering
+from otx.core.data import pre_filtering as target_file
+from otx.core.data.pre_filtering import filter_invalid_annotations, is_valid_annot, pre_filtering
 
 
 @pytest.fixture()
@@ -83,3 +87,64 @@ def test_pre_filtering(fxt_dm_dataset_with_unannotated: DmDataset, unannotated_i
     )
     assert len(filtered_dataset) == 82 + int(len(empty_items) * unannotated_items_ratio)
     assert len(filtered_dataset.categories()[AnnotationType.label]) == 3
+
+
+@pytest.fixture()
+def fxt_dm_dataset_with_random_annotations() -> DmDataset:
+    rng = np.random.default_rng(3003)
+    dataset_items = []
+    for i in range(30):
+        annotations = [Label(label=0)]
+        for _ in range(rng.integers(0, 5)):
+            x, y = rng.integers(0, 20, size=2).tolist()
+            w, h = rng.integers(-2, 3, size=2).tolist()
+            annotations.append(Bbox(x=x, y=y, w=w, h=h, label=1))
+            # Degenerated polygons, thin polygons having no area and small triangles
+            points = np.stack([x + rng.random(3) * w, y + rng.random(3) * h], axis=1)
+            annotations.append(Polygon(points=points.flatten().tolist(), label=2))
+        dataset_items.append(DatasetItem(id=f"item{i}", subset="train", media=None, annotations=annotations))
+    return DmDataset.from_iterable(dataset_items, categories=["0", "1", "2"])
+
+
+@pytest.mark.parametrize("chunk_size", [7, 100_000])
+def test_filter_invalid_annotations(
+    fxt_dm_dataset_with_random_annotations: DmDataset,
+    chunk_size: int,
+    monkeypatch,
+) -> None:
+    # Spawning processes is too slow for the unit test
+    monkeypatch.setattr(
+        target_file,
+        "ProcessPoolExecutor",
+        lambda max_workers, mp_context: ThreadPoolExecutor(max_workers),  # noqa: ARG005
+    )
+    expected = {
+        item.id: item.annotations
+        for item in DmDataset.filter(
+            DmDataset.from_extractors(fxt_dm_dataset_with_random_annotations),
+            is_valid_annot,
+            filter_annotations=True,
+        )
+    }
+    num_anns = {
+        ann_type: sum(
+            isinstance(ann, ann_type) for item in fxt_dm_dataset_with_random_annotations for ann in item.annotations
+        )
+        for ann_type in (Bbox, Polygon)
+    }
+
+    dataset, summary = filter_invalid_annotations(
+        fxt_dm_dataset_with_random_annotations,
+        num_workers=2,
+        chunk_size=chunk_size,
+    )
+
+    assert {item.id: item.annotations for item in dataset} == expected
+    assert summary["bboxes"] == num_anns[Bbox] - sum(
+        isinstance(ann, Bbox) for anns in expected.values() for ann in anns
+    )
+    assert summary["polygons"] == num_anns[Polygon] - sum(
+        isinstance(ann, Polygon) for anns in expected.values() for ann in anns
+    )
+    assert summary["bboxes"] > 0
+    assert summary["polygons"] > 0
@@ -21,6 +21,7 @@ from otx.core.config.data import (
     VisualPromptingConfig,
 )
 from otx.core.data.dataset.tile import OTXTileTransform
+from otx.core.data.entity.base import ImageInfo
 from otx.core.data.entity.detection import DetBatchDataEntity, DetBatchPredEntity
 from otx.core.data.entity.instance_segmentation import InstanceSegBatchDataEntity, InstanceSegBatchPredEntity
 from otx.core.data.entity.tile import TileBatchDetDataEntity
@@ -28,6 +29,7 @@ from otx.core.data.module import OTXDataModule
 from otx.core.model.detection import OTXDetectionModel
 from otx.core.model.instance_segmentation import OTXInstanceSegModel
 from otx.core.types.task import OTXTaskType
+from otx.core.utils.tile_merge import DetectionTileMerge, InstanceSegTileMerge, _SaliencyMapAccumulator
 from torchvision import tv_tensors
 
 from tests.test_helpers import generate_random_bboxes
@@ -400,3 +402,69 @@ class TestOTXTiling:
             prediction = model.forward_tiles(batch)
             assert prediction.saliency_map[0].ndim == 3
         self.explain_mode = False
+
+    @pytest.mark.parametrize("task", [OTXTaskType.DETECTION, OTXTaskType.INSTANCE_SEGMENTATION])
+    def test_tile_merge_offsets_and_nms(self, task) -> None:
+        """Check tile boxes are moved to image coordinates and suppressed only within the same image."""
+        img_infos = [ImageInfo(img_idx=idx, img_shape=(200, 200), ori_shape=(200, 200)) for idx in range(2)]
+        tile_attrs = [
+            {"tile_id": "img_a", "roi": [0, 0, 100, 100]},
+            {"tile_id": "img_a", "roi": [90, 0, 100, 100]},
+            {"tile_id": "img_b", "roi": [0, 0, 200, 200]},
+        ]
+        tile_bboxes = [
+            torch.tensor([[80.0, 10.0, 100.0, 50.0]]),
+            torch.tensor([[0.0, 10.0, 10.0, 50.0]]),
+            torch.tensor([[90.0, 10.0, 100.0, 50.0]]),
+        ]
+        tile_masks = []
+        for tile_bbox, tile_attr in zip(tile_bboxes, tile_attrs):
+            mask = torch.zeros((1, tile_attr["roi"][3], tile_attr["roi"][2]), dtype=torch.bool)
+            x1, y1, x2, y2 = tile_bbox[0].long().tolist()
+            mask[0, y1:y2, x1:x2] = True
+            tile_masks.append(tv_tensors.Mask(mask))
+
+        kwargs = {
+            "batch_size": 3,
+            "images": [torch.empty(0) for _ in tile_attrs],
+            "imgs_info": [ImageInfo(img_idx=0, img_shape=(100, 100), ori_shape=(100, 100)) for _ in tile_attrs],
+            "bboxes": tile_bboxes,
+            "labels": [torch.LongTensor([0]) for _ in tile_attrs],
+            "scores": [torch.tensor([0.9]), torch.tensor([0.8]), torch.tensor([0.7])],
+        }
+        tile_config = TileConfig(enable_tiler=True, iou_threshold=0.45)
+        if task == OTXTaskType.DETECTION:
+            merger = DetectionTileMerge(img_infos, 1, tile_config)
+            tile_preds = DetBatchPredEntity(**kwargs)
+        else:
+            merger = InstanceSegTileMerge(img_infos, 1, tile_config)
+            tile_preds = InstanceSegBatchPredEntity(**kwargs, masks=tile_masks, polygons=[[] for _ in tile_attrs])
+
+        pred_a, pred_b = merger.merge([tile_preds], [tile_attrs])
+
+        # The box of the second tile overlaps the box of the first tile after moving it by the tile offset
+        assert torch.allclose(pred_a.bboxes, torch.tensor([[80.0, 10.0, 100.0, 50.0]]))
+        assert torch.allclose(pred_a.score, torch.tensor([0.9]))
+        # The same box in another image is not suppressed
+        assert torch.allclose(pred_b.bboxes, torch.tensor([[90.0, 10.0, 100.0, 50.0]]))
+        if task == OTXTaskType.INSTANCE_SEGMENTATION:
+            assert pred_a.masks.shape == (1, 200, 200)
+            assert pred_a.masks.sum() == 20 * 40
+            assert pred_b.masks[0, 10:50, 90:100].all()
+
+    def test_saliency_map_accumulator(self) -> None:
+        """Check tile saliency maps are placed on the downscaled canvas and overlapping tiles are averaged."""
+        accumulator = _SaliencyMapAccumulator(shape=(100, 150), tile_size=(100, 100))
+        accumulator.add(np.full((2, 10, 10), 10, dtype=np.uint8), (0, 0, 100, 100))
+        # A single tile map is returned as it is
+        assert accumulator.merge().shape == (2, 10, 10)
+
+        accumulator.add(np.full((2, 10, 10), 30, dtype=np.uint8), (50, 0, 100, 100))
+        assert accumulator.sum_map.shape == (2, 10, 15)
+        assert (accumulator.count_map[:, 5:10] == 2).all()
+
+        merged_map = accumulator.merge()
+        assert merged_map.shape == (2, 10, 15)
+        assert merged_map.dtype == np.uint8
+        # 10 (first tile only) < 20 (average of the overlap) < 30 (second tile only)
+        assert merged_map[0, 0, 0] < merged_map[0, 0, 7] < merged_map[0, 0, 14]
@@ -0,0 +1,153 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Unit tests of batch data transform."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+
+import pytest
+import torch
+from otx.core.data.entity.base import ImageInfo
+from otx.core.data.entity.detection import DetBatchDataEntity, DetDataEntity
+from otx.core.data.entity.segmentation import SegBatchDataEntity, SegDataEntity
+from otx.core.data.transform_libs.batch import BatchNormalize, BatchPad, BatchRandomFlip, BatchResize
+from otx.core.data.transform_libs.torchvision import Pad, RandomFlip, Resize
+from torchvision import tv_tensors
+from torchvision.transforms import v2
+
+
+def _make_det_entity(idx: int, img_shape: tuple[int, int]) -> DetDataEntity:
+    generator = torch.Generator().manual_seed(idx)
+    height, width = img_shape
+    return DetDataEntity(
+        image=tv_tensors.Image(torch.randint(0, 256, (3, height, width), dtype=torch.uint8, generator=generator)),
+        img_info=ImageInfo(img_idx=idx, img_shape=img_shape, ori_shape=img_shape),
+        bboxes=tv_tensors.BoundingBoxes(
+            data=torch.Tensor([[idx, 2 * idx, 30 + idx, 40 + idx], [5, 6, width - 1, height - 1]]),
+            format="xyxy",
+            canvas_size=img_shape,
+        ),
+        labels=torch.LongTensor([0, 1]),
+    )
+
+
+@pytest.fixture()
+def fxt_det_entities() -> list[DetDataEntity]:
+    return [_make_det_entity(idx, (64, 96)) for idx in range(4)]
+
+
+@pytest.fixture()
+def fxt_det_entities_with_various_shapes() -> list[DetDataEntity]:
+    return [_make_det_entity(idx, (64 + 4 * idx, 96 - 8 * idx)) for idx in range(4)]
+
+
+def _collate(entities: list[DetDataEntity]) -> DetBatchDataEntity:
+    return DetBatchDataEntity.collate_fn(deepcopy(entities))
+
+
+class TestBatchRandomFlip:
+    @pytest.mark.parametrize("direction", ["horizontal", "vertical", "diagonal"])
+    @pytest.mark.parametrize("entities", ["fxt_det_entities", "fxt_det_entities_with_various_shapes"])
+    def test_transform_batch(self, entities, direction, request) -> None:
+        entities = request.getfixturevalue(entities)
+        expected = [RandomFlip(prob=1.0, direction=direction)(entity) for entity in deepcopy(entities)]
+
+        results = BatchRandomFlip(prob=1.0, direction=direction)(_collate(entities))
+
+        for image, bboxes, entity in zip(results.images, results.bboxes, expected):
+            assert torch.equal(image, entity.image)
+            assert torch.equal(bboxes, entity.bboxes)
+
+    def test_transform_batch_with_padding(self, fxt_det_entities_with_various_shapes) -> None:
+        batch = BatchPad(size_divisor=32)(_collate(fxt_det_entities_with_various_shapes))
+        expected = [RandomFlip(prob=1.0)(entity) for entity in deepcopy(fxt_det_entities_with_various_shapes)]
+
+        results = BatchRandomFlip(prob=1.0)(batch)
+
+        assert results.images.shape == batch.images.shape
+        for image, img_info, entity in zip(results.images, results.imgs_info, expected):
+            height, width = img_info.img_shape
+            assert torch.equal(image[:, :height, :width], entity.image)
+            assert torch.all(image[:, height:] == 0)
+            assert torch.all(image[:, :, width:] == 0)
+
+    def test_transform_batch_probability(self, fxt_det_entities) -> None:
+        batch = _collate(fxt_det_entities)
+        assert BatchRandomFlip(prob=0.0)(batch) is batch
+
+        torch.manual_seed(0)
+        results = BatchRandomFlip(prob=0.5)(_collate(fxt_det_entities * 4))
+        is_flipped = [
+            not torch.equal(image, entity.image) for image, entity in zip(results.images, fxt_det_entities * 4)
+        ]
+        assert 0 < sum(is_flipped) < len(is_flipped)
+
+
+class TestBatchResize:
+    @pytest.mark.parametrize("keep_ratio", [True, False])
+    @pytest.mark.parametrize("entities", ["fxt_det_entities", "fxt_det_entities_with_various_shapes"])
+    def test_transform_batch(self, entities, keep_ratio, request) -> None:
+        entities = request.getfixturevalue(entities)
+        expected = [Resize(scale=(128, 128), keep_ratio=keep_ratio)(entity) for entity in deepcopy(entities)]
+
+        results = BatchResize(scale=(128, 128), keep_ratio=keep_ratio)(_collate(entities))
+
+        for image, bboxes, img_info, entity in zip(results.images, results.bboxes, results.imgs_info, expected):
+            assert image.shape == entity.image.shape
+            assert image.dtype == torch.uint8
+            # cv2 and torch bilinear interpolations are different by rounding
+            assert (image.int() - entity.image.int()).abs().max() <= 1
+            assert torch.allclose(bboxes, entity.bboxes)
+            assert bboxes.canvas_size == entity.bboxes.canvas_size
+            assert img_info.img_shape == entity.img_info.img_shape
+            assert img_info.scale_factor == pytest.approx(entity.img_info.scale_factor)
+
+    def test_transform_batch_with_masks(self) -> None:
+        masks = [tv_tensors.Mask(torch.randint(0, 3, (64, 96), dtype=torch.uint8)) for _ in range(2)]
+        batch = SegBatchDataEntity.collate_fn(
+            [
+                SegDataEntity(
+                    image=tv_tensors.Image(torch.zeros((3, 64, 96), dtype=torch.uint8)),
+                    img_info=ImageInfo(img_idx=idx, img_shape=(64, 96), ori_shape=(64, 96)),
+                    gt_seg_map=mask,
+                )
+                for idx, mask in enumerate(masks)
+            ],
+        )
+
+        results = BatchResize(scale=(32, 48))(batch)
+
+        for mask, result in zip(masks, results.masks):
+            assert torch.equal(result, mask[::2, ::2])
+
+
+class TestBatchPad:
+    def test_transform_batch(self, fxt_det_entities_with_various_shapes) -> None:
+        expected = [Pad(size_divisor=32)(entity) for entity in deepcopy(fxt_det_entities_with_various_shapes)]
+
+        results = BatchPad(size_divisor=32)(_collate(fxt_det_entities_with_various_shapes))
+
+        assert isinstance(results.images, tv_tensors.Image)
+        assert results.images.shape == (4, 3, 96, 96)
+        for image, img_info, entity in zip(results.images, results.imgs_info, expected):
+            height, width = entity.image.shape[-2:]
+            assert torch.equal(image[:, :height, :width], entity.image)
+            assert img_info.pad_shape == (96, 96)
+            assert img_info.img_shape == entity.img_info.img_shape
+
+
+class TestBatchNormalize:
+    def test_transform_batch(self, fxt_det_entities) -> None:
+        mean, std = [123.675, 116.28, 103.53], [58.395, 57.12, 57.375]
+        normalize = v2.Compose([v2.ToDtype(torch.float32), v2.Normalize(mean=mean, std=std)])
+        expected = [normalize(entity) for entity in deepcopy(fxt_det_entities)]
+
+        results = BatchNormalize(mean=mean, std=std)(_collate(fxt_det_entities))
+
+        assert results.images.dtype == torch.float32
+        for image, img_info, entity in zip(results.images, results.imgs_info, expected):
+            assert torch.allclose(image, entity.image, atol=1e-5)
+            assert img_info.normalized
+            assert img_info.norm_mean == tuple(mean)
+            assert img_info.norm_std == tuple(std)
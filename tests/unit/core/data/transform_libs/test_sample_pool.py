@@ -0,0 +1,72 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+"""Unit tests of the shared sample pool."""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+
+import numpy as np
+import pytest
+import torch
+from otx.core.data.transform_libs.sample_pool import SharedSamplePool
+
+
+def _put_samples(pool: SharedSamplePool, value: int) -> None:
+    pool.put(
+        np.full((8, 16, 3), value, dtype=np.uint8),
+        torch.Tensor([[0, 0, value, value]]),
+        torch.LongTensor([value]),
+    )
+
+
+class TestSharedSamplePool:
+    @pytest.fixture()
+    def fxt_pool(self) -> SharedSamplePool:
+        return SharedSamplePool(num_slots=3, img_shape=(10, 20), max_bboxes=2, random_pop=False)
+
+    def test_put_and_get(self, fxt_pool) -> None:
+        image = np.random.default_rng(0).integers(0, 256, (10, 15, 3), dtype=np.uint8)
+        bboxes = torch.Tensor([[0, 1, 2, 3], [4, 5, 6, 7]])
+        labels = torch.LongTensor([3, 1])
+        assert fxt_pool.put(image, bboxes, labels)
+        assert fxt_pool.put(image[..., 0], bboxes[:0], labels[:0])
+
+        sample = fxt_pool.get(0)
+        assert np.array_equal(sample.image, image)
+        assert torch.equal(sample.bboxes, bboxes)
+        assert torch.equal(sample.labels, labels)
+        assert fxt_pool.num_bboxes(0) == 2
+
+        sample = fxt_pool.get(1)
+        assert np.array_equal(sample.image, image[..., 0])
+        assert sample.bboxes.shape == (0, 4)
+        assert fxt_pool.num_bboxes(1) == 0
+
+    def test_put_not_fit(self, fxt_pool) -> None:
+        bboxes = torch.zeros((1, 4))
+        labels = torch.LongTensor([0])
+        assert not fxt_pool.put(np.zeros((11, 20, 3), dtype=np.uint8), bboxes, labels)
+        assert not fxt_pool.put(np.zeros((10, 20, 4), dtype=np.uint8), bboxes, labels)
+        assert not fxt_pool.put(np.zeros((10, 20, 3), dtype=np.float32), bboxes, labels)
+        assert not fxt_pool.put(np.zeros((10, 20, 3), dtype=np.uint8), torch.zeros((3, 4)), torch.zeros(3))
+        assert len(fxt_pool) == 0
+
+    def test_fifo_pop(self, fxt_pool) -> None:
+        for value in range(5):
+            _put_samples(fxt_pool, value)
+
+        assert len(fxt_pool) == 3
+        assert [fxt_pool.get(i).labels.item() for i in range(3)] == [3, 4, 2]
+
+    def test_shared_by_workers(self, fxt_pool) -> None:
+        ctx = mp.get_context("fork")
+        workers = [ctx.Process(target=_put_samples, args=(fxt_pool, value)) for value in (5, 6)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert len(fxt_pool) == 2
+        assert sorted(fxt_pool.get(i).labels.item() for i in range(2)) == [5, 6]
+        assert all(np.all(fxt_pool.get(i).image == fxt_pool.get(i).labels.item()) for i in range(2))
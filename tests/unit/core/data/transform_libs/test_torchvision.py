@@ -6,9 +6,11 @@ from __future__ import annotations
 
 from copy import deepcopy
 
+import cv2
 import numpy as np
 import pytest
 import torch
+from datumaro.components.media import Video
 from otx.core.data.entity.action_classification import ActionClsDataEntity
 from otx.core.data.entity.base import ImageInfo
 from otx.core.data.entity.detection import DetDataEntity
@@ -61,6 +63,28 @@ class TestDecodeVideo:
         transform = DecodeVideo(test_mode=True, out_of_bound_opt="repeat_last")
         assert len(transform._transform(video, {})) == 8
 
+    def test_video_file(self, tmp_path):
+        video_path = str(tmp_path / "video.avi")
+        writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (32, 24))
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            writer.write(rng.integers(0, 255, (24, 32, 3), dtype=np.uint8))
+        writer.release()
+
+        transform = DecodeVideo(test_mode=True)
+        assert transform._get_total_frames(Video(video_path)) == 50
+        assert DecodeVideo._frame_counts[video_path] == 50
+
+        frame_inds = np.array([40, 0, 1, 40, 49, 20])
+        video = Video(video_path)
+        expected = [video[idx].data for idx in frame_inds]
+        frames = transform._decode_frames(Video(video_path), frame_inds)
+        for frame, expected_frame in zip(frames, expected):
+            assert np.array_equal(frame, expected_frame)
+
+        outputs = transform._transform(Video(video_path), {})
+        assert outputs.shape == (8, 3, 24, 32)
+
 
 class TestPackVideo:
     def test_forward(self):
@@ -237,6 +261,47 @@ class TestCachedMosaic:
         assert results.bboxes.dtype == torch.float32
         assert results.img_info.img_shape == results.image.shape[-2:]
 
+    def test_forward_with_shared_pool(self, det_data_entity) -> None:
+        """Test forward with the shared pool gives the same results as the per-worker cache."""
+        cached_mosaic = CachedMosaic(img_scale=(64, 96), random_pop=False, max_cached_images=20)
+        pooled_mosaic = CachedMosaic(img_scale=(64, 96), random_pop=False, max_cached_images=20, use_shared_pool=True)
+
+        for seed in range(8):
+            entity = deepcopy(det_data_entity)
+            entity.image = tv_tensors.Image(torch.randint(0, 256, (3, 112, 224), dtype=torch.uint8))
+            entity.bboxes = tv_tensors.BoundingBoxes(
+                data=torch.Tensor([[seed, seed, 50 + seed, 60 + seed]]),
+                format="xyxy",
+                canvas_size=(112, 224),
+            )
+            np.random.seed(seed)
+            expected = cached_mosaic(deepcopy(entity))
+            np.random.seed(seed)
+            results = pooled_mosaic(deepcopy(entity))
+
+            assert torch.equal(results.image, expected.image)
+            assert torch.allclose(results.bboxes, expected.bboxes)
+            assert torch.equal(results.labels, expected.labels)
+        assert len(pooled_mosaic.shared_pool) == len(cached_mosaic.results_cache)
+
+    def test_forward_with_shared_pool_rejection(self, det_data_entity) -> None:
+        """Test the samples not fitting in the shared pool are warned once."""
+        pooled_mosaic = CachedMosaic(
+            img_scale=(64, 96),
+            max_cached_images=20,
+            use_shared_pool=True,
+            max_pooled_bboxes=0,
+        )
+        entity = deepcopy(det_data_entity)
+        entity.image = tv_tensors.Image(torch.randint(0, 256, (3, 112, 224), dtype=torch.uint8))
+
+        with pytest.warns(UserWarning, match="cannot put the sample into the shared pool") as record:
+            for _ in range(3):
+                pooled_mosaic(deepcopy(entity))
+
+        assert len(record) == 1
+        assert len(pooled_mosaic.shared_pool) == 0
+
 
 class TestCachedMixUp:
     @pytest.fixture()
@@ -263,6 +328,23 @@ class TestCachedMixUp:
         assert results.bboxes.dtype == torch.float32
         assert results.img_info.img_shape == results.image.shape[-2:]
 
+    def test_forward_with_shared_pool(self, det_data_entity) -> None:
+        """Test forward with the shared pool gives the same results as the per-worker cache."""
+        cached_mixup = CachedMixUp(img_scale=(64, 96), random_pop=False, max_cached_images=10)
+        pooled_mixup = CachedMixUp(img_scale=(64, 96), random_pop=False, max_cached_images=10, use_shared_pool=True)
+
+        for seed in range(8):
+            entity = deepcopy(det_data_entity)
+            entity.image = tv_tensors.Image(torch.randint(0, 256, (3, 112, 224), dtype=torch.uint8))
+            np.random.seed(seed)
+            expected = cached_mixup(deepcopy(entity))
+            np.random.seed(seed)
+            results = pooled_mixup(deepcopy(entity))
+
+            assert torch.equal(results.image, expected.image)
+            assert torch.allclose(results.bboxes, expected.bboxes)
+            assert torch.equal(results.labels, expected.labels)
+
 
 class TestYOLOXHSVRandomAug:
     @pytest.fixture()
@@ -2,8 +2,12 @@
 # SPDX-License-Identifier: Apache-2.0
 """Test of AsyncExecutor in demo_package."""
 
+import logging
+import queue
+import threading
 from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 
 target_file = None
@@ -39,6 +43,20 @@ class MockAsyncPipeline:
     def await_all(self):
         pass
 
+    def await_any(self):
+        pass
+
+    def is_ready(self):
+        return True
+
+
+def reused_buffer_streamer(*_, **__):
+    # The shared memory streamer reuses the same buffer for every frame
+    buffer = np.zeros(1)
+    for i in range(1, 4):
+        buffer[:] = i
+        yield buffer
+
 
 class TestAsyncExecutor:
     @pytest.fixture(autouse=True)
@@ -80,6 +98,49 @@ class TestAsyncExecutor:
             assert mock_visualizer.show.call_args_list[i - 1].args == (i,)
         mock_dump_frames.assert_called()
 
+    def test_run_pipelined(self, mocker, mock_model, mock_visualizer, mock_streamer, mock_dump_frames, caplog):
+        mock_render_result = mocker.patch.object(AsyncExecutor, "render_result", side_effect=lambda x: x)
+        executor = AsyncExecutor(mock_model, mock_visualizer, pipelined=True, queue_size=1)
+        with caplog.at_level(logging.INFO):
+            executor.run(MagicMock())
+
+        assert [call.args for call in mock_render_result.call_args_list] == [(1,), (2,), (3,)]
+        assert [call.args for call in mock_visualizer.show.call_args_list] == [(1,), (2,), (3,)]
+        mock_dump_frames.assert_called()
+        for name in ("decode", "infer", "render"):
+            assert executor.counters[name].num_frames == 3
+            assert executor.counters[name].max_queue_depth <= 1
+            assert executor.counters[name].num_dropped == 0
+        assert caplog.messages == [str(counter) for counter in executor.counters.values()]
+
+    @pytest.mark.parametrize("pipelined", [True, False])
+    def test_run_shared_memory(self, mocker, mock_model, mock_visualizer, mock_dump_frames, pipelined):
+        mock_get_streamer = mocker.patch.object(target_file, "get_streamer", side_effect=reused_buffer_streamer)
+        mocker.patch.object(AsyncExecutor, "render_result", side_effect=lambda x: x)
+        executor = AsyncExecutor(mock_model, mock_visualizer, pipelined=pipelined, shared_memory=True)
+        mock_input_stream = MagicMock()
+        executor.run(mock_input_stream)
+
+        mock_get_streamer.assert_called_once_with(mock_input_stream, False, threaded=True, shared_memory=True)
+        # The frames rendered after the next frames are read are not overwritten
+        assert [call.args[0].tolist() for call in mock_visualizer.show.call_args_list] == [[1], [2], [3]]
+
+    def test_decode_stage_drop_frames(self, mock_model, mock_visualizer):
+        executor = AsyncExecutor(mock_model, mock_visualizer, pipelined=True, drop_frames=True)
+        executor.counters = {"decode": target_file.StageCounter("decode")}
+        frames = queue.Queue(maxsize=2)
+        stop_event = threading.Event()
+        thread = threading.Thread(target=executor._decode_stage, args=(range(1, 5), frames, stop_event))
+        thread.start()
+        # The stage blocks on the end of stream marker until a consumer frees a slot
+        thread.join(timeout=0.5)
+
+        assert [frames.get(timeout=1) for _ in range(3)] == [3, 4, target_file._END_OF_STREAM]
+        thread.join(timeout=1)
+        assert not thread.is_alive()
+        assert executor.counters["decode"].num_frames == 4
+        assert executor.counters["decode"].num_dropped == 2
+
     def test_render_result(self, mock_model, mock_visualizer):
         executor = AsyncExecutor(mock_model, mock_visualizer)
         mock_pred = MagicMock()
@@ -4,6 +4,7 @@
 
 from unittest.mock import MagicMock
 
+import numpy as np
 import pytest
 
 target_file = None
@@ -21,6 +22,14 @@ def fxt_import_module():
     SyncExecutor = Cls1
 
 
+def reused_buffer_streamer(*_, **__):
+    # The shared memory streamer reuses the same buffer for every frame
+    buffer = np.zeros(2)
+    for i in range(3):
+        buffer[:] = i
+        yield buffer
+
+
 class TestSyncExecutor:
     @pytest.fixture()
     def mock_model(self):
@@ -64,3 +73,13 @@ class TestSyncExecutor:
             mock_input_stream,
             range(3),
         )
+
+    def test_run_shared_memory(self, mocker, mock_model, mock_visualizer, mock_dump_frames):
+        mock_get_streamer = mocker.patch.object(target_file, "get_streamer", side_effect=reused_buffer_streamer)
+        executor = SyncExecutor(mock_model, mock_visualizer, shared_memory=True)
+        mock_input_stream = MagicMock()
+        executor.run(mock_input_stream)
+
+        mock_get_streamer.assert_called_once_with(mock_input_stream, False, threaded=True, shared_memory=True)
+        saved_frames = mock_dump_frames.call_args.args[0]
+        assert [frame.tolist() for frame in saved_frames] == [[i, i] for i in range(3)]
@@ -209,6 +209,31 @@ class TestStreamer:
         streamer = VideoStreamer(random_single_video)
         self.assert_streamer_element(streamer)
 
+    @pytest.mark.parametrize("shared_memory", [False, True])
+    def test_threaded_streamer(self, random_image_folder, shared_memory):
+        """
+        <b>Description:</b>
+        Test that ThreadedStreamer works correctly with the queue and shared memory transports
+
+        <b>Input data:</b>
+        Folder with 10 random images
+
+        <b>Expected results:</b>
+        Test passes if ThreadedStreamer returns the same images as DirStreamer in the same order
+
+        <b>Steps</b>
+        1. Create ThreadedStreamer over DirStreamer
+        2. Request images from streamer and compare them with the ones from DirStreamer
+        """
+        expected = list(DirStreamer(random_image_folder))
+        streamer = ThreadedStreamer(DirStreamer(random_image_folder), shared_memory=shared_memory)
+
+        frames = [frame.copy() for frame in streamer]
+
+        assert len(frames) == len(expected)
+        for frame, expected_frame in zip(frames, expected):
+            assert np.array_equal(frame, expected_frame)
+
     def test_video_streamer_with_loop_flag(self, random_single_video):
         """
         <b>Description:</b>
@@ -326,6 +351,11 @@ class TestStreamer:
 
         streamer = get_streamer(input_stream="0", threaded=True)
         assert isinstance(streamer, ThreadedStreamer)
+        assert not streamer.shared_memory
+
+        streamer = get_streamer(random_image_folder, threaded=True, shared_memory=True)
+        assert isinstance(streamer, ThreadedStreamer)
+        assert streamer.shared_memory
 
     def test_video_file_fails_on_image_streamer(self, random_single_video):
         """
@@ -5,9 +5,16 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pytest
 import torch
-from otx.core.metrics.fmeasure import FMeasure
+from otx.core.metrics.fmeasure import (
+    FMeasure,
+    _FMeasureCalculator,
+    bounding_box_intersection_over_union,
+    get_iou_matrix,
+    get_n_false_negatives,
+)
 from otx.core.types.label import LabelInfo
 
 
@@ -65,3 +72,82 @@ class TestFMeasure:
         metric.update(fxt_preds, fxt_targets)
         result = metric.compute(best_confidence_threshold=0.85)
         assert result["f1-score"] == 0.3333333432674408
+
+    @pytest.mark.parametrize("vary_nms_threshold", [True, False])
+    def test_fmeasure_streaming(self, fxt_preds, fxt_targets, vary_nms_threshold) -> None:
+        """Check streaming fmeasure gives the same results as keeping every box until compute()."""
+        label_info = LabelInfo.from_num_classes(2)
+        metric = FMeasure(label_info=label_info, vary_nms_threshold=vary_nms_threshold)
+        streaming_metric = FMeasure(label_info=label_info, vary_nms_threshold=vary_nms_threshold, streaming=True)
+        fxt_preds[1]["labels"] = torch.IntTensor([0, 1])
+        fxt_targets[1]["labels"] = torch.IntTensor([1, 1])
+
+        # Update the streaming metric per image
+        metric.update(fxt_preds, fxt_targets)
+        for pred, target in zip(fxt_preds, fxt_targets):
+            streaming_metric.update([pred], [target])
+        assert streaming_metric.preds == []
+        assert streaming_metric.num_images == 2
+
+        assert metric.compute() == streaming_metric.compute()
+        assert metric.best_confidence_threshold == streaming_metric.best_confidence_threshold
+        assert metric.f_measure_per_label == streaming_metric.f_measure_per_label
+        assert metric.f_measure_per_confidence == streaming_metric.f_measure_per_confidence
+        assert metric.f_measure_per_nms == streaming_metric.f_measure_per_nms
+        assert metric.best_nms_threshold == streaming_metric.best_nms_threshold
+        assert metric.compute(best_confidence_threshold=0.85) == streaming_metric.compute(
+            best_confidence_threshold=0.85,
+        )
+
+        streaming_metric.reset()
+        assert streaming_metric.num_images == 0
+        assert not streaming_metric.counters_per_confidence.any()
+
+
+def test_get_iou_matrix() -> None:
+    """Check the vectorized IoU matrix matches the pairwise IoU of the boxes."""
+    ground_truth = [(0.0, 0.0, 2.0, 2.0, "a", 0.0), (1.0, 1.0, 3.0, 3.0, "a", 0.0), (5.0, 5.0, 5.0, 6.0, "a", 0.0)]
+    predicted = [(0.0, 0.0, 2.0, 2.0, "a", 0.9), (1.0, 0.0, 3.0, 2.0, "a", 0.8), (4.0, 4.0, 6.0, 6.0, "a", 0.7)]
+
+    iou_matrix = get_iou_matrix(ground_truth, predicted)
+
+    expected = [[bounding_box_intersection_over_union(gt, pred) for pred in predicted] for gt in ground_truth]
+    assert iou_matrix.shape == (3, 3)
+    assert np.array_equal(iou_matrix, np.array(expected))
+    assert get_iou_matrix(ground_truth, []).shape == (3, 0)
+
+
+def test_get_n_false_negatives() -> None:
+    """Check undetected ground truths and ground truths sharing one prediction are counted."""
+    iou_matrix = np.array(
+        [
+            [0.9, 0.0, 0.0],
+            [0.6, 0.0, 0.0],
+            [0.0, 0.2, 0.0],
+        ],
+    )
+    # The third ground truth is undetected and the first two share the first prediction
+    assert get_n_false_negatives(iou_matrix, iou_threshold=0.5) == 2
+    assert get_n_false_negatives(iou_matrix, iou_threshold=0.1) == 1
+
+
+def test_fmeasure_calculator_threshold_sweep() -> None:
+    """Check the counters of the threshold sweep match counting the filtered boxes for each threshold."""
+    rng = np.random.default_rng(0)
+
+    def _boxes(num_boxes: int, scores: np.ndarray) -> list[tuple]:
+        corners = rng.uniform(0, 50, size=(num_boxes, 2))
+        boxes = np.concatenate([corners, corners + rng.uniform(1, 30, size=(num_boxes, 2))], axis=1)
+        return [(*box, "a", score) for box, score in zip(boxes.tolist(), scores.tolist())]
+
+    ground_truths = [_boxes(5, np.zeros(5)) for _ in range(4)]
+    predictions = [_boxes(8, rng.uniform(size=8)) + [(*box[:4], "a", 0.9) for box in gts[:2]] for gts in ground_truths]
+    calculator = _FMeasureCalculator(ground_truths, predictions)
+
+    for confidence_threshold in np.arange(*calculator.confidence_range):
+        _, counters = calculator.get_f_measure_for_class("a", 0.5, confidence_threshold)
+        filtered_predictions = [[box for box in boxes if box[5] > confidence_threshold] for boxes in predictions]
+        expected = _FMeasureCalculator(ground_truths, filtered_predictions).get_counters(iou_threshold=0.5)
+        assert counters.n_false_negatives == expected.n_false_negatives
+        assert counters.n_true == expected.n_true
+        assert counters.n_predicted == expected.n_predicted
@@ -1,8 +1,9 @@
+import math
 from unittest.mock import MagicMock
 
 import pytest
 from otx.engine.adaptive_bs import bs_search_algo as target_file
-from otx.engine.adaptive_bs.bs_search_algo import BsSearchAlgo
+from otx.engine.adaptive_bs.bs_search_algo import BsSearchAlgo, CpuBsSearchAlgo, _get_process_tree_pss
 
 
 class TestBsSearchAlgo:
@@ -164,3 +165,88 @@ class TestBsSearchAlgo:
         adapted_bs = bs_search_algo.find_big_enough_batch_size(True)
 
         assert adapted_bs == 100
+
+
+class TestCpuBsSearchAlgo:
+    @pytest.fixture(autouse=True)
+    def setup_test(self, mocker):
+        self.mock_mp = mocker.patch.object(target_file, "mp")
+        self.mock_psutil = mocker.patch.object(target_file, "psutil")
+        self.mock_psutil.virtual_memory.return_value.available = 10000
+        self.mock_get_pss = mocker.patch.object(target_file, "_get_process_tree_pss")
+
+    def set_mp_process(self, mem_per_sample: int, fastest_bs: int) -> None:
+        def mock_process(target, args) -> MagicMock:  # noqa: ARG001
+            batch_size = args[-2]
+            # Peak memory grows linearly and throughput is the highest at fastest_bs
+            self.mock_get_pss.return_value = 1000 + mem_per_sample * batch_size
+            throughput = 100 - 10 * abs(math.log2(batch_size / fastest_bs))
+            trial_queue = args[-1]
+            trial_queue.get.return_value = {"oom": False, "steps_per_sec": throughput / batch_size}
+
+            self.procs.append(MagicMock())
+            return self.procs[-1]
+
+        self.procs = []
+        self.mock_mp.get_context.return_value.Process.side_effect = mock_process
+
+    @pytest.mark.parametrize(("default_bs", "fastest_bs"), [(4, 32), (32, 8), (16, 16)])
+    def test_find_fastest_batch_size(self, default_bs, fastest_bs):
+        self.set_mp_process(mem_per_sample=10, fastest_bs=fastest_bs)
+
+        bs_search_algo = CpuBsSearchAlgo(MagicMock(), default_bs, 1000)
+        adapted_bs = bs_search_algo.find_fastest_batch_size()
+
+        assert adapted_bs == fastest_bs
+
+    def test_find_fastest_batch_size_within_memory_budget(self):
+        # 85% of available memory (8500) can hold 30 samples
+        self.set_mp_process(mem_per_sample=250, fastest_bs=64)
+
+        bs_search_algo = CpuBsSearchAlgo(MagicMock(), 4, 1000)
+        adapted_bs = bs_search_algo.find_fastest_batch_size()
+
+        assert adapted_bs == 30
+        assert max(bs for bs in bs_search_algo._bs_try_history) == 30
+
+    def test_find_fastest_batch_size_default_over_budget(self):
+        self.set_mp_process(mem_per_sample=10, fastest_bs=64)
+
+        bs_search_algo = CpuBsSearchAlgo(MagicMock(), 64, 1000, mem_budget=1500)
+        adapted_bs = bs_search_algo.find_fastest_batch_size()
+
+        assert adapted_bs == 50
+
+    def test_try_batch_size_over_budget(self):
+        self.set_mp_process(mem_per_sample=10, fastest_bs=64)
+
+        bs_search_algo = CpuBsSearchAlgo(MagicMock(), 64, 1000, mem_budget=1500)
+        oom, _ = bs_search_algo._try_batch_size(64)
+
+        # The trial using more memory than the budget is stopped
+        assert oom is True
+        self.procs[-1].kill.assert_called_once()
+        assert 64 not in bs_search_algo._throughput_history
+
+    def test_auto_decrease_batch_size_within_memory_budget(self):
+        self.set_mp_process(mem_per_sample=10, fastest_bs=64)
+
+        bs_search_algo = CpuBsSearchAlgo(MagicMock(), 64, 1000, mem_budget=1500)
+
+        # Both bounds are derived from the memory budget
+        assert bs_search_algo._mem_lower_bound < bs_search_algo._mem_upper_bound == 1500
+        assert bs_search_algo.auto_decrease_batch_size() == 50
+
+    def test_get_process_tree_pss(self):
+        process = self.mock_psutil.Process.return_value
+        process.memory_full_info.return_value.pss = 100
+        worker = MagicMock()
+        worker.memory_full_info.return_value.pss = 50
+        process.children.return_value = [worker]
+
+        # Shared pages are divided among the processes by PSS instead of being counted by each process
+        assert _get_process_tree_pss(1) == 150
+
+    def test_init_w_wrong_mem_budget(self):
+        with pytest.raises(ValueError, match="Memory budget should be bigger than 0."):
+            CpuBsSearchAlgo(MagicMock(), 4, 10, mem_budget=0)
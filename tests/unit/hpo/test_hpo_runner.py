@@ -0,0 +1,115 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import os
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from otx.hpo import hpo_runner
+from otx.hpo.hpo_base import TrialStatus
+from otx.hpo.hpo_runner import HpoLoop, run_hpo_loop
+from otx.hpo.hyperband import HyperBand
+
+
+def _train(hp_config: dict, report_func: Callable, work_dir: Path, state: list) -> None:
+    # `state` is a fresh copy for every trial, so that it should be empty at first
+    state.append(hp_config["id"])
+    (work_dir / f"{hp_config['id']}-{os.getpid()}-{len(state)}").touch()
+
+    for epoch in range(1, round(hp_config["configuration"]["iterations"]) + 1):
+        if report_func(hp_config["configuration"]["hp1"] * epoch, epoch) == TrialStatus.STOP:
+            break
+    report_func(0, 0, done=True)
+
+
+def _train_in_place(hp_config: dict, report_func: Callable, work_dir: Path, max_epochs: int) -> None:
+    # Train until HPO stops the trial, so that it continues in place when it's promoted
+    start = max((int(path.name.split("-")[-1]) for path in work_dir.glob(f"{hp_config['id']}-stop-*")), default=0)
+    (work_dir / f"{hp_config['id']}-run-{start}").touch()
+    for epoch in range(start + 1, max_epochs + 1):
+        if report_func(hp_config["configuration"]["hp1"] * epoch, epoch) == TrialStatus.STOP:
+            (work_dir / f"{hp_config['id']}-stop-{epoch}").touch()
+            break
+    report_func(0, 0, done=True)
+
+
+def _fail(*_) -> None:
+    msg = "Training failed"
+    raise RuntimeError(msg)
+
+
+@pytest.fixture()
+def fxt_hyper_band(tmp_path) -> HyperBand:
+    return HyperBand(
+        search_space={"hp1": {"type": "uniform", "max": 100, "min": 10}},
+        save_path=str(tmp_path / "hpo"),
+        num_workers=2,
+        num_full_iterations=8,
+        full_dataset_size=100,
+        maximum_resource=8,
+        minimum_resource=1,
+        reduction_factor=2,
+    )
+
+
+class TestHpoLoop:
+    def test_run(self, fxt_hyper_band, tmp_path, mocker) -> None:
+        spy_save_results = mocker.spy(fxt_hyper_band, "save_results")
+        work_dir = tmp_path / "work_dir"
+        work_dir.mkdir()
+
+        run_hpo_loop(fxt_hyper_band, partial(_train, work_dir=work_dir, state=[]), "cpu", num_parallel_trial=2)
+
+        assert fxt_hyper_band.is_done()
+        assert fxt_hyper_band.get_best_config() is not None
+        # The trials are run by two warm workers with their own copy of the training function
+        runs = [path.name.split("-") for path in work_dir.iterdir()]
+        assert len({pid for _, pid, _ in runs}) == 2
+        assert len(runs) > 2
+        assert all(num_runs == "1" for _, _, num_runs in runs)
+        # The results are saved whenever a trial is started, reported or finished, not periodically
+        num_reports = sum(len(trial.score) for trial in fxt_hyper_band._trials.values())
+        assert spy_save_results.call_count <= 3 * len(runs) + num_reports + 1
+
+    @pytest.mark.parametrize("num_parallel_trial", [1, 2])
+    def test_run_in_place_promotion(self, fxt_hyper_band, tmp_path, mocker, num_parallel_trial) -> None:
+        spy_is_promotable = mocker.spy(fxt_hyper_band, "is_promotable")
+        work_dir = tmp_path / "work_dir"
+        work_dir.mkdir()
+
+        run_hpo_loop(
+            fxt_hyper_band,
+            partial(_train_in_place, work_dir=work_dir, max_epochs=8),
+            "cpu",
+            num_parallel_trial=num_parallel_trial,
+            in_place_promotion=True,
+        )
+
+        assert fxt_hyper_band.is_done()
+        assert spy_is_promotable.call_count > 0
+        trials = fxt_hyper_band._trials.values()
+        for trial in trials:
+            # Every epoch is reported once and the trial is stopped at its last rung
+            assert list(trial.score) == list(range(1, round(trial.iteration) + 1))
+        # The promoted trials continue in place instead of starting again from the last epoch
+        num_runs = len(list(work_dir.glob("*-run-*")))
+        assert len(list(work_dir.glob("*-run-0"))) == len(trials)
+        assert num_runs < sum(trial.rung + 1 for trial in trials)
+
+    def test_run_with_failed_trial(self, fxt_hyper_band) -> None:
+        hpo_loop = HpoLoop(fxt_hyper_band, _fail, "cpu", num_parallel_trial=1)
+
+        with pytest.raises(RuntimeError, match="exit abnormally"):
+            hpo_loop.run()
+
+        assert all(not worker.process.is_alive() for worker in hpo_loop._workers.values())
+
+    def test_dump_train_func_not_picklable(self) -> None:
+        def train_func(*_) -> None:
+            pass
+
+        assert hpo_runner._dump_train_func(train_func) is train_func
@@ -654,6 +654,20 @@ class TestHyperBand:
         hyper_band.report_score(0, 0, trial.id, done=True)
         assert trial.is_done()
 
+    def test_is_promotable(self, hyper_band):
+        while (trial := hyper_band.get_next_sample()) is not None:
+            trial.status = TrialStatus.RUNNING
+            hyper_band.report_score(100, trial.iteration, trial.id)
+            bracket = hyper_band._brackets[trial.bracket]
+            # The trials in the first bracket run the maximum resource at once
+            assert hyper_band.is_promotable(trial.id) == (bracket.max_rung > 0)
+            if bracket.max_rung > 0:
+                break
+
+        # The trials in the last rung can't be promoted anymore
+        trial.rung = bracket.max_rung
+        assert not hyper_band.is_promotable(trial.id)
+
     def test_get_best_config(self, hyper_band):
         max_score = 9999999
         trial = hyper_band.get_next_sample()
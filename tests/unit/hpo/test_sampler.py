@@ -0,0 +1,144 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from __future__ import annotations
+
+import math
+
+import pytest
+from otx.hpo.hpo_base import Trial
+from otx.hpo.hyperband import HyperBand
+from otx.hpo.sampler import LatinHypercubeSampler, TPESampler, create_sampler
+from otx.hpo.search_space import SearchSpace
+
+SEARCH_SPACE = {
+    "lr": {"type": "qloguniform", "min": 1e-5, "max": 1e-1, "step": 1e-5, "log_base": 10},
+    "bs": {"type": "quniform", "min": 8, "max": 128, "step": 8},
+    "momentum": {"type": "uniform", "min": 0.5, "max": 0.99},
+    "optimizer": {"type": "choice", "choice_list": ["sgd", "adam", "adamw"]},
+}
+
+
+@pytest.fixture()
+def search_space() -> SearchSpace:
+    return SearchSpace(SEARCH_SPACE)
+
+
+def objective(configuration: dict) -> float:
+    # The best configuration is around lr=1e-3, bs=32 and adam
+    score = math.exp(-((math.log10(configuration["lr"]) + 3) ** 2))
+    score *= math.exp(-(((configuration["bs"] - 32) / 64) ** 2))
+    return score * (1.0 if configuration["optimizer"] == "adam" else 0.5)
+
+
+def make_trials(configurations: list[dict]) -> list[Trial]:
+    trials = []
+    for idx, configuration in enumerate(configurations):
+        trial = Trial(idx, configuration)
+        trial.register_score(objective(configuration), 1)
+        trials.append(trial)
+    return trials
+
+
+def check_configuration(configuration: dict) -> None:
+    assert 1e-5 <= configuration["lr"] <= 1e-1
+    assert configuration["bs"] in range(8, 129, 8)
+    assert 0.5 <= configuration["momentum"] <= 0.99
+    assert configuration["optimizer"] in ["sgd", "adam", "adamw"]
+
+
+@pytest.mark.parametrize("sampler_cls", [LatinHypercubeSampler, TPESampler])
+def test_sample_without_scores(sampler_cls, search_space) -> None:
+    configurations = sampler_cls(search_space, seed=0).sample(10)
+
+    assert len(configurations) == 10
+    for configuration in configurations:
+        check_configuration(configuration)
+
+
+class TestTPESampler:
+    def test_sample_from_scores(self, search_space) -> None:
+        trials = make_trials(LatinHypercubeSampler(search_space, seed=0).sample(30))
+        sampler = TPESampler(search_space, seed=0, random_fraction=0)
+
+        configurations = sampler.sample(20, trials)
+
+        for configuration in configurations:
+            check_configuration(configuration)
+        # The configurations are drawn around the good ones
+        mean_score = sum(objective(config) for config in configurations) / len(configurations)
+        assert mean_score > sum(objective(trial.configuration) for trial in trials) / len(trials)
+
+    @pytest.mark.parametrize("mode", ["max", "min"])
+    def test_sample_by_mode(self, search_space, mode) -> None:
+        trials = make_trials(LatinHypercubeSampler(search_space, seed=0).sample(30))
+        if mode == "min":
+            for trial in trials:
+                trial.score = {resource: -score for resource, score in trial.score.items()}
+        sampler = TPESampler(search_space, mode=mode, seed=0, random_fraction=0)
+
+        configurations = sampler.sample(20, trials)
+
+        assert sum(config["optimizer"] == "adam" for config in configurations) > len(configurations) // 2
+
+    def test_sample_at_largest_resource(self, search_space) -> None:
+        trials = make_trials(LatinHypercubeSampler(search_space, seed=0).sample(30))
+        # Scores at the larger resource are used if there are enough trials which reached it
+        for trial in trials[:10]:
+            score = 1.0 if trial.configuration["optimizer"] == "sgd" else 0.0
+            trial.register_score(score, 3)
+        sampler = TPESampler(search_space, seed=0, random_fraction=0, min_points_in_model=2)
+
+        configurations = sampler.sample(20, trials)
+
+        assert sum(config["optimizer"] == "sgd" for config in configurations) > len(configurations) // 2
+
+    def test_resample(self, search_space) -> None:
+        sampler = TPESampler(search_space, seed=0, random_fraction=0)
+        configuration = sampler.sample(1)[0]
+
+        # The configuration is kept until the model is available
+        assert sampler.resample(configuration) is configuration
+        trials = make_trials(LatinHypercubeSampler(search_space, seed=0).sample(30))
+        new_configuration = sampler.resample(configuration, trials)
+        assert new_configuration != configuration
+        check_configuration(new_configuration)
+
+    def test_init_wrong_random_fraction(self, search_space) -> None:
+        with pytest.raises(ValueError, match="random_fraction"):
+            TPESampler(search_space, random_fraction=1.5)
+
+
+def test_create_sampler(search_space) -> None:
+    assert isinstance(create_sampler("lhs", search_space), LatinHypercubeSampler)
+    assert isinstance(create_sampler("tpe", search_space, "min"), TPESampler)
+    with pytest.raises(ValueError, match="sampler should be one of"):
+        create_sampler("random", search_space)
+
+
+def test_hyperband_with_tpe_sampler(tmp_path, mocker) -> None:
+    hyper_band = HyperBand(
+        search_space=SEARCH_SPACE,
+        save_path=str(tmp_path),
+        num_full_iterations=9,
+        full_dataset_size=100,
+        maximum_resource=9,
+        minimum_resource=1,
+        reduction_factor=3,
+        sampler="tpe",
+    )
+    spy_resample = mocker.spy(hyper_band._sampler, "resample")
+
+    num_trials = 0
+    while (trial := hyper_band.get_next_sample()) is not None:
+        configuration = trial.get_train_configuration()["configuration"]
+        check_configuration(configuration)
+        for resource in range(int(trial.get_progress()) + 1, math.ceil(configuration["iterations"]) + 1):
+            hyper_band.report_score(objective(configuration), resource, trial.id)
+        hyper_band.report_score(0, 0, trial.id, done=True)
+        num_trials += 1
+
+    assert hyper_band.is_done()
+    # The configurations of the new trials are sampled right before they start, not when they are made
+    assert spy_resample.call_count == len(hyper_band._trials)
+    assert num_trials >= len(hyper_band._trials)
@@ -0,0 +1,15 @@
+# Copyright (C) 2024 Intel Corporation
+# SPDX-License-Identifier: Apache-2.0
+
+from otx.core.data.frame_store import FrameClipStore
+from otx.tools.build_frame_store import get_video_paths, main
+
+
+def test_build_frame_store_tool(tmp_path) -> None:
+    data_root = "tests/assets/action_classification_dataset"
+    video_paths = get_video_paths(data_root, "kinetics")
+    assert len(video_paths) > 0
+
+    assert main(["-i", data_root, "-o", str(tmp_path / "store"), "--short_side", "32"]) == 0
+    assert main(["-i", data_root, "-o", str(tmp_path / "store"), "--validate"]) == 0
+    assert len(FrameClipStore(tmp_path / "store")) == len(video_paths)